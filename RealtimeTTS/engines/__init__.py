@@ -31,6 +31,11 @@ __all__ = [
     "SoproTTSEngine", "SoproTTSVoice",
     "SopranoEngine", "SopranoVoice",
     "MossTTSEngine", "MossTTSVoice",
+    "HttpClient", "HttpPoolStats", "RetryPolicy", "get_http_client",
+    "ConditioningCache", "get_conditioning_cache",
+    "G2PCache", "G2PCacheStats",
+    "QualityLevel", "QualityGovernor",
+    "PieceLimits",
 ]
 
 
@@ -248,6 +253,42 @@ def _load_moss_tts_engine():
     globals()["MossTTSVoice"] = MossTTSVoice
     return MossTTSEngine
 
+
+def _load_http_client():
+    from .http_client import HttpClient, HttpPoolStats, RetryPolicy, get_http_client
+    globals()["HttpClient"] = HttpClient
+    globals()["HttpPoolStats"] = HttpPoolStats
+    globals()["RetryPolicy"] = RetryPolicy
+    globals()["get_http_client"] = get_http_client
+    return HttpClient
+
+
+def _load_conditioning_cache():
+    from .conditioning_cache import ConditioningCache, get_conditioning_cache
+    globals()["ConditioningCache"] = ConditioningCache
+    globals()["get_conditioning_cache"] = get_conditioning_cache
+    return ConditioningCache
+
+
+def _load_g2p_cache():
+    from .g2p_cache import G2PCache, G2PCacheStats
+    globals()["G2PCache"] = G2PCache
+    globals()["G2PCacheStats"] = G2PCacheStats
+    return G2PCache
+
+
+def _load_quality_levels():
+    from .quality_levels import QualityGovernor, QualityLevel
+    globals()["QualityGovernor"] = QualityGovernor
+    globals()["QualityLevel"] = QualityLevel
+    return QualityLevel
+
+
+def _load_utterance_pieces():
+    from .utterance_pieces import PieceLimits
+    globals()["PieceLimits"] = PieceLimits
+    return PieceLimits
+
 # Map attribute names to lazy loader functions.
 _lazy_imports = {
     "AzureEngine": _load_azure_engine,
@@ -309,6 +350,17 @@ _lazy_imports = {
     "SopranoVoice": _load_soprano_engine,
     "MossTTSEngine": _load_moss_tts_engine,
     "MossTTSVoice": _load_moss_tts_engine,
+    "HttpClient": _load_http_client,
+    "HttpPoolStats": _load_http_client,
+    "RetryPolicy": _load_http_client,
+    "get_http_client": _load_http_client,
+    "ConditioningCache": _load_conditioning_cache,
+    "get_conditioning_cache": _load_conditioning_cache,
+    "G2PCache": _load_g2p_cache,
+    "G2PCacheStats": _load_g2p_cache,
+    "QualityLevel": _load_quality_levels,
+    "QualityGovernor": _load_quality_levels,
+    "PieceLimits": _load_utterance_pieces,
 }
 
 
@@ -1,9 +1,9 @@
 import azure.cognitiveservices.speech as tts
 from azure.cognitiveservices.speech import SpeechSynthesisOutputFormat
 from .base_engine import BaseEngine, TimingInfo
+from .http_client import get_http_client
 from typing import Union
 import traceback 
-import requests
 import pyaudio
 import logging
 
@@ -22,6 +22,7 @@ class PushAudioOutputStreamSampleCallback(tts.audio.PushAudioOutputStreamCallbac
         self.sample_rate = sample_rate
 
     def write(self, audio_buffer: memoryview) -> int:
+        # buffer can be retargeted between sentences by a long-lived synthesizer
         self.buffer.put(audio_buffer.tobytes())
         return audio_buffer.nbytes
 
@@ -70,7 +71,8 @@ class AzureEngine(BaseEngine):
         rate: float = 0.0,
         pitch: float = 0.0,
         audio_format: str = "riff-16khz-16bit-mono-pcm",
-        debug: bool = False
+        debug: bool = False,
+        prewarm_connection: bool = True,
     ):
         """
         Initializes an Azure voice realtime text-to-speech engine object.
@@ -83,6 +85,9 @@ class AzureEngine(BaseEngine):
             pitch (float, optional): Speech pitch as a percentage. Defaults to 0.0.
             audio_format (str, optional): Audio format for output. Defaults to "riff-16khz-16bit-mono-pcm".
                 Must be one of: "riff-16khz-16bit-mono-pcm", "riff-24khz-16bit-mono-pcm", "riff-48khz-16bit-mono-pcm".
+            debug (bool, optional): Prints word boundary events. Defaults to False.
+            prewarm_connection (bool, optional): Opens the connection to the Azure
+                service at engine creation instead of with the first sentence. Defaults to True.
         Raises:
             ValueError: If the provided audio_format is not supported.
         """
@@ -96,6 +101,7 @@ class AzureEngine(BaseEngine):
 
         self.audio_format = audio_format
         self.sample_rate = self.SUPPORTED_AUDIO_FORMATS[audio_format]
+        self.prewarm_connection = prewarm_connection
         self.speech_key = speech_key
         self.service_region = service_region
         self.language = voice[:5]
@@ -153,8 +159,23 @@ class AzureEngine(BaseEngine):
             "unfriendly",
         ]
 
+        # Long-lived synthesizer, rebuilt only if key, region or format change.
+        self._synthesizer = None
+        self._synthesizer_key = None
+        self._stream_callback = None
+        self._connection = None
+
+        # SSML around the sentence text, rebuilt only if voice settings change.
+        self._ssml_parts = None
+        self._ssml_key = None
+
     def post_init(self):
         self.engine_name = "azure"
+        if self.prewarm_connection and self.speech_key and self.service_region:
+            try:
+                self._get_synthesizer()
+            except Exception as e:
+                logging.warning(f"Could not pre-open Azure connection: {e}")
 
     def get_stream_info(self):
         """
@@ -202,33 +223,66 @@ class AzureEngine(BaseEngine):
             print(f"[AzureEngine] Error in _handle_word_boundary: {e}")
             return False
 
-    def synthesize(self, text: str, sentence_count: int = 0) -> bool:
+    def _get_synthesizer(self):
         """
-        Synthesizes text to audio stream.
+        Returns the long-lived SpeechSynthesizer, creating it and opening its connection if needed.
 
-        Args:
-            text (str): Text to synthesize.
-            sentence_count (int): The count of sentences synthesized so far, used for tracking progress.
-
-        Returns:
-            bool: True if successful, False otherwise.
+        Voice, emotion and prosody are set per request in the SSML, so one
+        synthesizer serves all of them. It is only rebuilt if the subscription
+        key, the region or the output format change.
         """
-        super().synthesize(text, sentence_count)
+        key = (self.speech_key, self.service_region, self.audio_format)
+        if self._synthesizer is not None and self._synthesizer_key == key:
+            return self._synthesizer
+
+        self._close_synthesizer()
 
-        # Set up the Azure TTS configuration.
         speech_config = tts.SpeechConfig(
             subscription=self.speech_key, region=self.service_region
         )
         speech_config.set_speech_synthesis_output_format(self.AUDIO_FORMAT_MAP[self.audio_format])
-        stream_callback = PushAudioOutputStreamSampleCallback(self.queue, self.sample_rate)
-        push_stream = tts.audio.PushAudioOutputStream(stream_callback)
+        self._stream_callback = PushAudioOutputStreamSampleCallback(self.queue, self.sample_rate)
+        push_stream = tts.audio.PushAudioOutputStream(self._stream_callback)
         stream_config = tts.audio.AudioOutputConfig(stream=push_stream)
-        speech_synthesizer = tts.SpeechSynthesizer(
+        synthesizer = tts.SpeechSynthesizer(
             speech_config=speech_config, audio_config=stream_config
         )
-
-        # Initialize word timings list and register the word-boundary callback.
-        speech_synthesizer.synthesis_word_boundary.connect(self._handle_word_boundary)
+        synthesizer.synthesis_word_boundary.connect(self._handle_word_boundary)
+
+        # Open the service connection now instead of with the first sentence.
+        self._connection = tts.Connection.from_speech_synthesizer(synthesizer)
+        self._connection.open(True)
+
+        self._synthesizer = synthesizer
+        self._synthesizer_key = key
+        return synthesizer
+
+    def _close_synthesizer(self):
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+        self._synthesizer = None
+        self._synthesizer_key = None
+        self._stream_callback = None
+        self._connection = None
+
+    def _get_ssml_parts(self):
+        """
+        Returns the SSML before and after the sentence text for the current voice settings.
+        """
+        key = (
+            self.language,
+            self.voice_name,
+            self.emotion,
+            self.emotion_degree,
+            self.emotion_role,
+            self.rate,
+            self.pitch,
+        )
+        if self._ssml_parts is not None and self._ssml_key == key:
+            return self._ssml_parts
 
         emotion_start_tag = f'<mstts:express-as style="{self.emotion}" styledegree="{self.emotion_degree}" role="{self.emotion_role}">'
         emotion_end_tag = "</mstts:express-as>"
@@ -236,17 +290,38 @@ class AzureEngine(BaseEngine):
             emotion_start_tag = ""
             emotion_end_tag = ""
 
-        ssml_string = f"""
-        <speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" xmlns:mstts="https://www.w3.org/2001/mstts" xml:lang="{self.language}">
-            <voice name="{self.voice_name}">
-                {emotion_start_tag}
-                    <prosody rate="{self.rate}%" pitch="{self.pitch}%">
-                        {text}
-                    </prosody>
-                {emotion_end_tag}
-            </voice>
-        </speak>
+        prefix = (
+            f'<speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" '
+            f'xmlns:mstts="https://www.w3.org/2001/mstts" xml:lang="{self.language}">'
+            f'<voice name="{self.voice_name}">'
+            f'{emotion_start_tag}'
+            f'<prosody rate="{self.rate}%" pitch="{self.pitch}%">'
+        )
+        suffix = f"</prosody>{emotion_end_tag}</voice></speak>"
+
+        self._ssml_parts = (prefix, suffix)
+        self._ssml_key = key
+        return self._ssml_parts
+
+    def synthesize(self, text: str, sentence_count: int = 0) -> bool:
         """
+        Synthesizes text to audio stream.
+
+        Args:
+            text (str): Text to synthesize.
+            sentence_count (int): The count of sentences synthesized so far, used for tracking progress.
+
+        Returns:
+            bool: True if successful, False otherwise.
+        """
+        super().synthesize(text, sentence_count)
+
+        speech_synthesizer = self._get_synthesizer()
+        # Route this sentence's audio into the current engine queue.
+        self._stream_callback.buffer = self.queue
+
+        prefix, suffix = self._get_ssml_parts()
+        ssml_string = prefix + text + suffix
 
         logging.debug(f"SSML:\n{ssml_string}")
 
@@ -265,6 +340,8 @@ class AzureEngine(BaseEngine):
             print(ssml_string)
             if cancellation_details.reason == tts.CancellationReason.Error:
                 print("Error details: {}".format(cancellation_details.error_details))
+                # Start over with a fresh connection for the next sentence.
+                self._close_synthesizer()
         else:
             print(f"Speech synthesis failed: {result.reason}")
             print(f"Result: {result}")
@@ -341,12 +418,12 @@ class AzureEngine(BaseEngine):
         """
         token_endpoint = f"https://{self.service_region}.api.cognitive.microsoft.com/sts/v1.0/issueToken"
         headers = {"Ocp-Apim-Subscription-Key": self.speech_key}
-        response = requests.post(token_endpoint, headers=headers)
+        response = get_http_client().post(token_endpoint, headers=headers)
         access_token = str(response.text)
 
         fetch_voices_endpoint = f"https://{self.service_region}.tts.speech.microsoft.com/cognitiveservices/voices/list"
         voice_headers = {"Authorization": "Bearer " + access_token}
-        response = requests.get(fetch_voices_endpoint, headers=voice_headers)
+        response = get_http_client().get(fetch_voices_endpoint, headers=voice_headers)
 
         voice_objects = []
 
@@ -392,3 +469,9 @@ class AzureEngine(BaseEngine):
             self.rate = voice_parameters["rate"]
         if "pitch" in voice_parameters:
             self.pitch = voice_parameters["pitch"]
+
+    def shutdown(self):
+        """
+        Closes the Azure connection.
+        """
+        self._close_synthesizer()
@@ -6,11 +6,14 @@ This module defines a base framework for speech synthesis engines. It includes:
 
 import multiprocessing as mp
 from abc import ABCMeta, ABC
-from typing import Union
+from typing import Iterator, List, Optional, Union
 import numpy as np
 import shutil
 import queue
 
+from .quality_levels import QualityLevel
+from .utterance_pieces import PieceJoiner, PieceLimits, split_utterance
+
 class TimingInfo:
     def __init__(self, start_time, end_time, word):
         self.start_time = start_time
@@ -42,12 +45,30 @@ class BaseInitMeta(ABCMeta):
 class BaseEngine(ABC, metaclass=BaseInitMeta):
     _SILENCE_TRIM_WINDOW_MS = 5
 
+    # Length limits for splitting long sentences of whole_utterance_only
+    # engines. None synthesizes every sentence in one piece.
+    piece_limits: Optional[PieceLimits] = None
+
     def __init__(self):
         self.engine_name = "unknown"
 
         # Indicates if the engine can handle generators.
         self.can_consume_generators = False
 
+        # Indicates if the engine wants upcoming sentences passed to prefetch()
+        # before they are synthesized.
+        self.can_prefetch = False
+
+        # Indicates if synthesize_batch() needs fewer model passes than
+        # synthesizing the sentences one by one.
+        self.can_batch = False
+
+        # Indicates if the engine only queues audio once the whole text of a
+        # synthesize() call is generated. TextToAudioStream then splits long
+        # sentences into pieces (piece_limits) to bound the time to first audio.
+        self.whole_utterance_only = False
+        self._piece_joiner = None
+
         # Engines with an expensive first sentence-splitter import can opt in
         # to loading it when TextToAudioStream is constructed.
         self.preload_sentence_tokenizer = False
@@ -285,6 +306,117 @@ class BaseEngine(ABC, metaclass=BaseInitMeta):
         self.stop_synthesis_event.clear()
         self._trim_silence_start_pending = True
 
+    def synthesize_batch(self, sentences: List[str], sentence_count: int = 0) -> Iterator[bool]:
+        """
+        Synthesizes several sentences in order, for throughput-oriented rendering.
+
+        Yields one success flag per sentence. When a flag is yielded, the audio
+        of that sentence is in the queue, so callers can add silence or run
+        callbacks between sentences. Engines with can_batch set override this;
+        the default synthesizes the sentences one by one.
+
+        Args:
+            sentences (List[str]): Sentences to synthesize.
+            sentence_count (int): The count of sentences synthesized before this batch.
+        """
+        for index, sentence in enumerate(sentences):
+            yield self.synthesize(sentence, sentence_count + index + 1)
+
+    def split_into_pieces(self, text: str) -> List[str]:
+        """
+        Splits a sentence into the pieces synthesize_pieces() expects.
+
+        Returns the sentence as the only piece unless the engine is
+        whole_utterance_only, has piece_limits and the sentence is longer
+        than the lead piece limit.
+        """
+        if not self.whole_utterance_only or self.piece_limits is None:
+            return [text]
+        return split_utterance(text, self.piece_limits)
+
+    def synthesize_pieces(self, pieces: List[str], sentence_count: int = 0) -> bool:
+        """
+        Synthesizes the pieces of one sentence in order and joins their audio.
+
+        The audio of each piece is queued as soon as it is generated, except
+        for a short tail that is crossfaded into the next piece. Engines queue
+        their audio with _queue_pcm16() for this to work.
+
+        Args:
+            pieces (List[str]): Pieces from split_into_pieces().
+            sentence_count (int): The count of sentences synthesized so far.
+
+        Returns:
+            bool: True if all pieces were synthesized, False otherwise
+                (also when synthesis was stopped between pieces).
+        """
+        _, _, sample_rate = self.get_stream_info()
+        crossfade_ms = self.piece_limits.crossfade_ms if self.piece_limits else 0
+        joiner = PieceJoiner(sample_rate, crossfade_ms)
+        self._piece_joiner = joiner
+        try:
+            for index, piece in enumerate(pieces):
+                # synthesize() clears the stop event, so check it between pieces
+                if index and self.stop_synthesis_event.is_set():
+                    return False
+                joiner.final = index == len(pieces) - 1
+                if not self.synthesize(piece, sentence_count):
+                    return False
+            return True
+        finally:
+            self._piece_joiner = None
+            tail = joiner.flush()
+            if tail.size and not self.stop_synthesis_event.is_set():
+                self.queue.put(tail.tobytes())
+
+    def _queue_pcm16(self, pcm: np.ndarray):
+        """
+        Puts 16-bit mono audio into the queue, joined to the previous piece
+        while synthesize_pieces() runs.
+        """
+        if self._piece_joiner is not None:
+            pcm = self._piece_joiner.join(pcm)
+        if len(pcm):
+            self.queue.put(pcm.tobytes())
+
+    def _is_inner_piece(self) -> bool:
+        """
+        True while synthesize_pieces() synthesizes any piece but the last one.
+        """
+        return self._piece_joiner is not None and not self._piece_joiner.final
+
+    def get_quality_levels(self) -> List[QualityLevel]:
+        """
+        Returns the quality levels the engine can switch between per sentence.
+
+        Levels are ordered from the fastest to the best. TextToAudioStream's
+        quality governor (play(adaptive_quality=True)) picks one for every
+        sentence. Engines without a speed/quality setting return an empty list.
+        """
+        return []
+
+    def set_quality_level(self, level: Optional[int]):
+        """
+        Applies one of the levels from get_quality_levels() to the following sentences.
+
+        Args:
+            level (int, optional): Index into get_quality_levels(). None restores
+                the engine's own configuration.
+        """
+        pass
+
+    def prefetch(self, text: str):
+        """
+        Announces an upcoming sentence, in synthesis order, before synthesize() is called for it.
+
+        Only called if can_prefetch is True. Engines can use this to start
+        remote jobs or downloads early, for example with a SentencePrefetcher.
+
+        Args:
+            text (str): Text of the upcoming sentence.
+        """
+        pass
+
     def get_voices(self):
         """
         Retrieves the voices available from the specific voice source.
@@ -5,6 +5,7 @@ from typing import Optional, Union
 import numpy as np
 
 from .base_engine import BaseEngine
+from .utterance_pieces import PieceLimits
 
 
 class ChatterboxVoice:
@@ -45,7 +46,8 @@ class ChatterboxEngine(BaseEngine):
 
     Chatterbox Turbo currently exposes a full-waveform `generate()` API. Stop
     requests are honored before queueing generated audio, so aborting a Zaphod
-    utterance discards late chunks instead of releasing stale speech.
+    utterance discards late chunks instead of releasing stale speech. Long
+    sentences are synthesized in pieces (`piece_limits`, None disables it).
     """
 
     def __init__(
@@ -67,6 +69,7 @@ class ChatterboxEngine(BaseEngine):
         extra_end_ms: int = 15,
         fade_in_ms: int = 10,
         fade_out_ms: int = 10,
+        piece_limits: Optional[PieceLimits] = PieceLimits(),
     ):
         try:
             from chatterbox.tts_turbo import ChatterboxTurboTTS
@@ -92,6 +95,7 @@ class ChatterboxEngine(BaseEngine):
         self.extra_end_ms = extra_end_ms
         self.fade_in_ms = fade_in_ms
         self.fade_out_ms = fade_out_ms
+        self.piece_limits = piece_limits
         self.voice = None
         self._prepared_voice_path = None
 
@@ -108,6 +112,7 @@ class ChatterboxEngine(BaseEngine):
 
     def post_init(self):
         self.engine_name = "chatterbox"
+        self.whole_utterance_only = True
 
     def get_stream_info(self):
         import pyaudio
@@ -210,7 +215,7 @@ class ChatterboxEngine(BaseEngine):
                     fade_in_ms=self.fade_in_ms,
                     fade_out_ms=self.fade_out_ms,
                 )
-            self.queue.put((audio * 32767).astype(np.int16).tobytes())
+            self._queue_pcm16((audio * 32767).astype(np.int16))
             return True
         except Exception:
             logging.exception("Chatterbox synthesis failed")
@@ -0,0 +1,501 @@
+"""
+Persistent speaker-conditioning cache shared by the voice-cloning engines.
+
+Cloning engines turn a reference recording into model inputs (latents, codec
+codes, prompt features, voice states) before they can speak. That step takes
+from a fraction of a second to several seconds, and used to be cached per
+engine: as JSON float lists, engine specific files, or unbounded dicts that
+were lost on restart.
+
+ConditioningCache keeps these results in one place:
+
+- Keys are built from the SHA-256 of the reference files' content, the model
+  identity and every setting the result depends on, so renamed or copied
+  files still hit and edited files miss.
+- Entries are stored as one binary file each: a JSON header describing the
+  structure (dicts, lists, tuples, scalars) followed by the raw array data,
+  which is memory-mapped on load instead of parsed.
+- Recently used entries stay in memory up to a byte limit (LRU).
+- Creation of a key is serialized across processes with a lock file, so two
+  engines starting together compute a voice once.
+
+Values that contain other objects than arrays, tensors, dataclasses,
+containers and plain scalars are kept in memory only.
+"""
+
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import platform
+import struct
+import sys
+import threading
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional, Union
+
+import numpy as np
+
+_MAGIC = b"RTTSCND1"
+_ALIGNMENT = 64
+_FORMAT_VERSION = 1
+
+
+def default_cache_dir() -> Path:
+    """
+    Returns the directory used when no cache_dir is given.
+
+    REALTIMETTS_CONDITIONING_CACHE overrides the platform default.
+    """
+    override = os.environ.get("REALTIMETTS_CONDITIONING_CACHE")
+    if override:
+        return Path(override)
+    if platform.system() == "Windows":
+        root = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+        return root / "RealtimeTTS" / "conditioning"
+    root = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return root / "realtimetts" / "conditioning"
+
+
+_content_hashes = {}
+_content_hashes_lock = threading.Lock()
+
+
+def content_hash(path: Union[str, Path]) -> str:
+    """
+    Returns the SHA-256 of a file's content.
+
+    Results are memoized per path, modification time and size, so repeated
+    voice switches do not re-read the file.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    identity = (path, stat.st_mtime_ns, stat.st_size)
+    with _content_hashes_lock:
+        cached = _content_hashes.get(identity)
+    if cached is not None:
+        return cached
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(block)
+    result = digest.hexdigest()
+    with _content_hashes_lock:
+        _content_hashes[identity] = result
+    return result
+
+
+def make_key(model: str, sources: Iterable[Union[str, Path]] = (), **settings) -> str:
+    """
+    Builds a cache key.
+
+    Args:
+        model (str): Engine and model identity, e.g. "neutts:neuphonic/neutts-air".
+        sources: Reference files the entry is computed from (hashed by content).
+        **settings: Everything else the result depends on (transcript, durations, ...).
+    """
+    identity = {
+        "format": _FORMAT_VERSION,
+        "model": model,
+        "sources": [content_hash(source) for source in sources],
+        "settings": settings,
+    }
+    encoded = json.dumps(identity, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:32]
+
+
+def _is_tensor(value) -> bool:
+    return type(value).__module__.startswith("torch") and hasattr(value, "detach") and hasattr(value, "numel")
+
+
+def _nbytes(value, seen=None) -> int:
+    """Bytes held by the arrays and tensors reachable from value."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if _is_tensor(value):
+        return value.numel() * value.element_size()
+    if isinstance(value, (str, bytes, int, float, bool)) or value is None:
+        return 0
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, dict):
+        return sum(_nbytes(item, seen) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_nbytes(item, seen) for item in value)
+    if hasattr(value, "__dict__"):
+        return sum(_nbytes(item, seen) for item in vars(value).values())
+    return 0
+
+
+def _encode(value, arrays: list):
+    """Turns value into a JSON-able tree and collects its arrays."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return {"t": "value", "v": value}
+    if isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            raise TypeError("object arrays cannot be stored")
+        arrays.append({"kind": "numpy", "array": np.ascontiguousarray(value)})
+        return {"t": "array", "i": len(arrays) - 1}
+    if _is_tensor(value):
+        import torch
+
+        tensor = value.detach().cpu().contiguous()
+        entry = {"kind": "torch", "torch_dtype": str(tensor.dtype).replace("torch.", "")}
+        if tensor.dtype == torch.bfloat16:
+            tensor = tensor.view(torch.int16)
+        entry["array"] = tensor.numpy()
+        arrays.append(entry)
+        return {"t": "array", "i": len(arrays) - 1}
+    if isinstance(value, dict):
+        if not all(isinstance(key, str) for key in value):
+            raise TypeError("only string dict keys can be stored")
+        return {"t": "dict", "items": [[key, _encode(item, arrays)] for key, item in value.items()]}
+    if isinstance(value, (list, tuple)):
+        return {
+            "t": "tuple" if isinstance(value, tuple) else "list",
+            "items": [_encode(item, arrays) for item in value],
+        }
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        fields = dataclasses.fields(value)
+        if not all(field.init for field in fields):
+            raise TypeError(f"{type(value).__name__} has fields that are not set by __init__")
+        return {
+            "t": "dataclass",
+            "type": f"{type(value).__module__}:{type(value).__qualname__}",
+            "fields": [[field.name, _encode(getattr(value, field.name), arrays)] for field in fields],
+        }
+    raise TypeError(f"cannot store {type(value).__name__} in the conditioning cache")
+
+
+def _decode(node, arrays: list):
+    kind = node["t"]
+    if kind == "value":
+        return node["v"]
+    if kind == "array":
+        return arrays[node["i"]]
+    if kind == "dict":
+        return {key: _decode(item, arrays) for key, item in node["items"]}
+    if kind == "dataclass":
+        # Only classes of modules the engine already imported are rebuilt.
+        module_name, qualname = node["type"].split(":")
+        target = sys.modules.get(module_name)
+        for part in qualname.split("."):
+            target = getattr(target, part, None)
+        if not dataclasses.is_dataclass(target):
+            raise ValueError(f"cannot rebuild {node['type']}")
+        return target(**{name: _decode(item, arrays) for name, item in node["fields"]})
+    items = [_decode(item, arrays) for item in node["items"]]
+    return tuple(items) if kind == "tuple" else items
+
+
+def to_device(value, device):
+    """
+    Returns value with all torch tensors moved to device.
+
+    Entries loaded from disk hold CPU tensors; engines call this before use.
+    Tensors already on device are returned as they are.
+    """
+    if _is_tensor(value):
+        return value.to(device)
+    if isinstance(value, dict):
+        return {key: to_device(item, device) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        items = [to_device(item, device) for item in value]
+        return tuple(items) if isinstance(value, tuple) else items
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.replace(
+            value,
+            **{field.name: to_device(getattr(value, field.name), device)
+               for field in dataclasses.fields(value) if field.init},
+        )
+    return value
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def write_entry(path: Union[str, Path], value) -> None:
+    """
+    Writes value to path atomically. Raises TypeError for unsupported values.
+    """
+    arrays = []
+    tree = _encode(value, arrays)
+
+    offset = 0
+    descriptors = []
+    for entry in arrays:
+        array = entry["array"]
+        offset = _aligned(offset)
+        descriptor = {
+            "kind": entry["kind"],
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "offset": offset,
+        }
+        if "torch_dtype" in entry:
+            descriptor["torch_dtype"] = entry["torch_dtype"]
+        descriptors.append(descriptor)
+        offset += array.nbytes
+
+    header = json.dumps({"tree": tree, "arrays": descriptors}, separators=(",", ":")).encode("utf-8")
+    data_start = _aligned(len(_MAGIC) + 8 + len(header))
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with temporary.open("wb") as handle:
+            handle.write(_MAGIC)
+            handle.write(struct.pack("<Q", len(header)))
+            handle.write(header)
+            for entry, descriptor in zip(arrays, descriptors):
+                handle.write(b"\0" * (data_start + descriptor["offset"] - handle.tell()))
+                handle.write(entry["array"].tobytes())
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, path)
+    finally:
+        temporary.unlink(missing_ok=True)
+
+
+def read_entry(path: Union[str, Path]):
+    """
+    Loads an entry written by write_entry. Array data is memory-mapped copy-on-write.
+    """
+    with open(path, "rb") as handle:
+        if handle.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f"{path} is not a conditioning cache entry")
+        (header_size,) = struct.unpack("<Q", handle.read(8))
+        header = json.loads(handle.read(header_size).decode("utf-8"))
+    data_start = _aligned(len(_MAGIC) + 8 + header_size)
+
+    mapped = None
+    arrays = []
+    for descriptor in header["arrays"]:
+        dtype = np.dtype(descriptor["dtype"])
+        shape = tuple(descriptor["shape"])
+        if dtype.itemsize * int(np.prod(shape)) == 0:
+            array = np.empty(shape, dtype=dtype)
+        else:
+            if mapped is None:
+                mapped = np.memmap(path, dtype=np.uint8, mode="c")
+            start = data_start + descriptor["offset"]
+            size = dtype.itemsize * int(np.prod(shape))
+            array = mapped[start:start + size].view(dtype).reshape(shape)
+        if descriptor["kind"] == "torch":
+            import torch
+
+            tensor = torch.from_numpy(array)
+            if descriptor.get("torch_dtype") == "bfloat16":
+                tensor = tensor.view(torch.bfloat16)
+            array = tensor
+        arrays.append(array)
+    return _decode(header["tree"], arrays)
+
+
+def _lock_file(handle) -> None:
+    if os.name == "nt":
+        import msvcrt
+
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+
+
+def _unlock_file(handle) -> None:
+    if os.name == "nt":
+        import msvcrt
+
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+# Creation locks are striped over a fixed set of files, so unrelated keys rarely
+# wait for each other and the files never need to be removed.
+_LOCK_STRIPES = 64
+
+
+@contextmanager
+def _file_lock(path: Path):
+    """Exclusive lock shared by all processes using the same cache directory."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handle = open(path, "a+b")
+    except OSError as e:
+        logging.warning(f"Conditioning cache lock unavailable, continuing without it: {e}")
+        yield
+        return
+    try:
+        _lock_file(handle)
+        try:
+            yield
+        finally:
+            _unlock_file(handle)
+    finally:
+        handle.close()
+
+
+class ConditioningCache:
+    """
+    Byte-limited in-memory LRU in front of a directory of memory-mapped entries.
+    """
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_memory_bytes: int = 256 * 1024 * 1024,
+        persist: bool = True,
+    ):
+        """
+        Args:
+            cache_dir (str or Path, optional): Directory for stored entries.
+                Defaults to default_cache_dir().
+            max_memory_bytes (int): Upper bound for the array data kept in memory.
+                The most recently used entry is always kept.
+            persist (bool): Store entries on disk. If False, only the memory LRU is used.
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_memory_bytes = max_memory_bytes
+        self.persist = persist
+        self._entries = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._memory_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.cond"
+
+    def _lock_path(self, key: str) -> Path:
+        stripe = int(hashlib.sha256(key.encode("utf-8")).hexdigest()[:8], 16) % _LOCK_STRIPES
+        return self.cache_dir / "locks" / f"{stripe}.lock"
+
+    def _remember(self, key: str, value) -> None:
+        size = _nbytes(value)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._memory_bytes += size
+            while self._memory_bytes > self.max_memory_bytes and len(self._entries) > 1:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._memory_bytes -= evicted_size
+
+    def _from_memory(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def _from_disk(self, key: str):
+        if not self.persist:
+            return None
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            return read_entry(path)
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable conditioning cache entry {path}: {e}")
+            return None
+
+    def get(self, key: str):
+        """
+        Returns the cached value for key, or None.
+        """
+        value = self._from_memory(key)
+        if value is None:
+            value = self._from_disk(key)
+            if value is not None:
+                self._remember(key, value)
+        return value
+
+    def put(self, key: str, value) -> None:
+        """
+        Stores value in memory and, if supported and persist is set, on disk.
+        """
+        self._remember(key, value)
+        if not self.persist:
+            return
+        try:
+            write_entry(self._path(key), value)
+        except TypeError as e:
+            logging.debug(f"Conditioning cache entry {key} kept in memory only: {e}")
+        except OSError as e:
+            logging.warning(f"Could not write conditioning cache entry {key}: {e}")
+
+    def get_or_create(self, key: str, create: Callable[[], Any]):
+        """
+        Returns the cached value for key, computing and storing it with create() if missing.
+
+        While one process computes an entry, others asking for the same key wait
+        and then load the stored result.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        if not self.persist:
+            value = create()
+            self._remember(key, value)
+            return value
+
+        with _file_lock(self._lock_path(key)):
+            value = self.get(key)
+            if value is None:
+                value = create()
+                self.put(key, value)
+        return value
+
+    def discard(self, key: str) -> None:
+        """
+        Removes key from memory and disk.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._memory_bytes -= entry[1]
+        if self.persist:
+            self._path(key).unlink(missing_ok=True)
+
+    def clear_memory(self) -> None:
+        """
+        Drops all in-memory entries. Stored entries stay on disk.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._memory_bytes = 0
+
+
+_shared_cache: Optional[ConditioningCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_conditioning_cache() -> ConditioningCache:
+    """
+    Returns the process wide ConditioningCache shared by the voice-cloning engines.
+    """
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = ConditioningCache()
+    return _shared_cache
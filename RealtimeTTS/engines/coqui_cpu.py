@@ -0,0 +1,129 @@
+"""
+CPU acceleration for the XTTS model in CoquiEngine's worker process.
+
+Without a GPU, XTTS runs in fp32 and most of the time goes into the GPT
+transformer's matrix multiplications. Two opt-in steps speed this up:
+
+- Dynamic int8 quantization of the Linear layers of the GPT model and the
+  HiFiGAN decoder. GPT-2 blocks use transformers' Conv1D (a transposed Linear),
+  so those are converted to nn.Linear first, otherwise quantization skips them.
+- torch.compile of the HiFiGAN waveform decoder with inductor's FX graph cache
+  on disk, so later starts reuse the compiled kernels.
+
+Both need a warmup: the first inference triggers compilation and allocator
+growth, which would otherwise land on the first sentence.
+"""
+
+import logging
+import os
+import time
+
+import torch
+
+WARMUP_TEXT = "This is a short warmup sentence to prepare the model."
+
+
+def _is_gpt2_conv1d(module: torch.nn.Module) -> bool:
+    # transformers.pytorch_utils.Conv1D, matched by shape to avoid importing transformers
+    return type(module).__name__ == "Conv1D" and hasattr(module, "nf") and module.weight.dim() == 2
+
+
+def _linear_from_conv1d(conv: torch.nn.Module) -> torch.nn.Linear:
+    in_features, out_features = conv.weight.shape
+    linear = torch.nn.Linear(in_features, out_features, bias=conv.bias is not None)
+    linear.to(conv.weight.device)
+    with torch.no_grad():
+        linear.weight.copy_(conv.weight.t())
+        if conv.bias is not None:
+            linear.bias.copy_(conv.bias)
+    return linear
+
+
+def replace_conv1d_with_linear(module: torch.nn.Module) -> int:
+    """
+    Replaces GPT-2 Conv1D layers below module with equivalent nn.Linear layers in place.
+
+    Returns:
+        int: Number of replaced layers.
+    """
+    replaced = 0
+    for name, child in list(module.named_children()):
+        if _is_gpt2_conv1d(child):
+            setattr(module, name, _linear_from_conv1d(child))
+            replaced += 1
+        else:
+            replaced += replace_conv1d_with_linear(child)
+    return replaced
+
+
+def quantize_int8(module: torch.nn.Module) -> torch.nn.Module:
+    """
+    Applies dynamic int8 quantization to all Linear layers of module in place.
+
+    In place matters for XTTS: the inference wrapper of the GPT model shares
+    its transformer blocks with the training model.
+    """
+    replace_conv1d_with_linear(module)
+    return torch.ao.quantization.quantize_dynamic(
+        module, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+    )
+
+
+def enable_compile_cache(cache_dir: str):
+    """
+    Points inductor's on-disk FX graph cache at cache_dir.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", cache_dir)
+    os.environ.setdefault("TORCHINDUCTOR_FX_GRAPH_CACHE", "1")
+    try:
+        import torch._inductor.config as inductor_config
+
+        inductor_config.fx_graph_cache = True
+    except Exception as e:
+        logging.debug(f"Could not enable the inductor graph cache: {e}")
+
+
+def optimize_for_cpu(tts, quantize: bool = False, compile_decoder: bool = False, cache_dir: str = None):
+    """
+    Applies the selected CPU optimizations to a loaded XTTS model.
+
+    Args:
+        tts: Loaded XTTS model on the CPU.
+        quantize (bool): Quantize the GPT and HiFiGAN Linear layers to int8.
+        compile_decoder (bool): Compile the HiFiGAN waveform decoder.
+        cache_dir (str): Directory for compiled graphs.
+    """
+    if quantize:
+        start = time.time()
+        quantize_int8(tts.gpt)
+        quantize_int8(tts.hifigan_decoder)
+        logging.info(f"Quantized XTTS to int8 in {time.time() - start:.2f}s")
+
+    if compile_decoder:
+        if not hasattr(torch, "compile"):
+            logging.warning("torch.compile needs torch 2.0 or newer, decoder is not compiled")
+            return
+        if cache_dir:
+            enable_compile_cache(os.path.join(cache_dir, f"torch-{torch.__version__}"))
+        decoder = tts.hifigan_decoder
+        decoder.waveform_decoder = torch.compile(decoder.waveform_decoder, dynamic=True)
+        logging.info("Compiled the XTTS waveform decoder")
+
+
+def warmup(tts, language, gpt_cond_latent, speaker_embedding, text: str = WARMUP_TEXT, **inference_kwargs) -> float:
+    """
+    Runs one streamed inference to trigger compilation and allocations.
+
+    Returns:
+        float: Realtime factor (synthesis seconds per audio second) of the run.
+    """
+    start = time.time()
+    audio_seconds = 0.0
+    with torch.inference_mode():
+        for chunk in tts.inference_stream(
+            text, language, gpt_cond_latent, speaker_embedding, **inference_kwargs
+        ):
+            audio_seconds += chunk.shape[-1] / 24000
+    seconds = time.time() - start
+    return seconds / audio_seconds if audio_seconds > 0 else 0.0
@@ -2,6 +2,10 @@ from .base_engine import BaseEngine
 import torch.multiprocessing as mp
 from threading import Lock, Thread
 from .safepipe import SafePipe
+from .shared_audio_ring import SharedAudioRing
+from .stream_chunk_schedule import StreamChunkScheduler
+from .coqui_cpu import optimize_for_cpu, warmup
+from .conditioning_cache import get_conditioning_cache, make_key
 from typing import Union, List
 from pathlib import Path
 from tqdm import tqdm
@@ -81,6 +85,12 @@ class CoquiEngine(BaseEngine):
         load_balancing=False,
         load_balancing_buffer_length=0,
         load_balancing_cut_off=0,
+        audio_transport: str = "shared_memory",
+        audio_ring_size: int = 4 * 1024 * 1024,
+        stream_chunk_schedule: List[int] = None,
+        cpu_quantize: bool = False,
+        cpu_compile: bool = False,
+        compile_cache_dir: str = None,
     ):
         """
         Initializes a coqui voice realtime text to speech engine object.
@@ -108,6 +118,7 @@ class CoquiEngine(BaseEngine):
               Number of threads to use for the coqui model.
             stream_chunk_size (int):
               Chunk size for the coqui model.
+              Used for every sentence unless stream_chunk_schedule is set.
             overlap_wav_len (int):
               Overlap length for the coqui model.
             temperature (float):
@@ -142,11 +153,35 @@ class CoquiEngine(BaseEngine):
             print_realtime_factor (bool):
                 Print the realtime factor for the coqui model.
             load_balancing (bool):
-                Enable load balancing for the coqui model.
+                Pause synthesis while enough audio is buffered for playback,
+                leaving the GPU to other work.
             load_balancing_buffer_length (int):
-                Buffer length for the load balancing.
+                Seconds of audio to keep buffered ahead of playback
+                when load balancing.
             load_balancing_cut_off (int):
-                Cut off for the load balancing.
+                Extra seconds of buffered audio tolerated before pausing.
+            audio_transport (str):
+                How audio chunks get from the worker process to the engine.
+                "shared_memory" writes them into a shared ring buffer,
+                "pipe" sends every chunk over the command pipe.
+            audio_ring_size (int):
+                Size of the shared ring buffer in bytes
+                (4 MiB hold about 40 seconds of audio).
+            stream_chunk_schedule (List[int]):
+                Chunk sizes (in GPT tokens) to choose from per sentence, e.g.
+                [10, 20, 40, 80]. The smallest is used while no audio is
+                buffered (first sentence, after a pause); larger ones as the
+                playback buffer fills, based on the measured realtime factor.
+                If None, stream_chunk_size is used throughout.
+            cpu_quantize (bool):
+                When running on the CPU, quantize the GPT and HiFiGAN
+                linear layers to int8 (dynamic quantization).
+            cpu_compile (bool):
+                When running on the CPU, compile the HiFiGAN decoder with
+                torch.compile. Compiled graphs are cached on disk.
+            compile_cache_dir (str):
+                Directory for compiled graphs.
+                Defaults to a "torch_compile_cache" folder in the model directory.
         """
 
         self._synthesize_lock = Lock()
@@ -171,6 +206,16 @@ class CoquiEngine(BaseEngine):
         self.load_balancing = load_balancing
         self.load_balancing_buffer_length = load_balancing_buffer_length
         self.load_balancing_cut_off = load_balancing_cut_off
+        if audio_transport not in ("shared_memory", "pipe"):
+            raise ValueError("audio_transport must be 'shared_memory' or 'pipe'")
+        self.audio_transport = audio_transport
+        self.audio_ring_size = audio_ring_size
+        self.audio_ring = None
+        self.stream_chunk_schedule = stream_chunk_schedule
+        self.cpu_quantize = cpu_quantize
+        self.cpu_compile = cpu_compile
+        self.compile_cache_dir = compile_cache_dir
+        self.realtime_factor = None
 
         self.cloning_reference_wav = voice
         self.speed = speed
@@ -239,6 +284,13 @@ class CoquiEngine(BaseEngine):
         self.main_synthesize_ready_event = mp.Event()
         self.parent_synthesize_pipe, child_synthesize_pipe = SafePipe()
 
+        self.audio_ring = None
+        if self.audio_transport == "shared_memory":
+            try:
+                self.audio_ring = SharedAudioRing(self.audio_ring_size, context=mp)
+            except OSError as e:
+                logging.warning(f"Shared memory unavailable, sending audio over the pipe: {e}")
+
         self.voices_list = []
         self.retrieve_coqui_voices()
 
@@ -274,6 +326,11 @@ class CoquiEngine(BaseEngine):
                 self.load_balancing,
                 self.load_balancing_buffer_length,
                 self.load_balancing_cut_off,
+                self.audio_ring,
+                self.stream_chunk_schedule,
+                self.cpu_quantize,
+                self.cpu_compile,
+                self.compile_cache_dir,
             ),
         )
         self.synthesize_process.start()
@@ -313,6 +370,11 @@ class CoquiEngine(BaseEngine):
         load_balancing,
         load_balancing_buffer_length,
         load_balancing_cut_off,
+        audio_ring=None,
+        stream_chunk_schedule=None,
+        cpu_quantize=False,
+        cpu_compile=False,
+        compile_cache_dir=None,
     ):
         """
         Worker process for the coqui text to speech synthesis model.
@@ -326,6 +388,14 @@ class CoquiEngine(BaseEngine):
             language (str): Language to use for the coqui model.
             ready_event (multiprocessing.Event):
               Event to signal when the model is ready.
+            audio_ring (SharedAudioRing, optional):
+              Shared ring buffer for audio chunks. If None, chunks are sent
+              over conn.
+            stream_chunk_schedule (List[int], optional):
+              Chunk sizes chosen per sentence from the playback buffer estimate.
+            cpu_quantize (bool): Quantize the model to int8 when running on the CPU.
+            cpu_compile (bool): Compile the HiFiGAN decoder when running on the CPU.
+            compile_cache_dir (str, optional): Directory for compiled graphs.
         """
         sys.stdout = QueueWriter(output_queue)
         sys.stderr = QueueWriter(output_queue)
@@ -340,6 +410,43 @@ class CoquiEngine(BaseEngine):
 
         logging.info("Starting CoquiEngine")
 
+        conditioning_cache = get_conditioning_cache()
+
+        def compute_latents(audio_paths: List[str], tts):
+            """
+            Returns speaker latents for the given WAV file(s) from the shared conditioning cache, computing them if needed.
+            """
+            # quantized and compiled CPU models produce different latents, so
+            # every model variant gets its own entries
+            parameter = next(tts.parameters(), None)
+            device_type = parameter.device.type if parameter is not None else "cpu"
+            on_cpu = device_type == "cpu"
+            key = make_key(
+                f"coqui:{model_name}:{os.path.basename(os.path.normpath(checkpoint))}",
+                audio_paths,
+                gpt_cond_len=30,
+                max_ref_length=60,
+                device=device_type,
+                dtype=str(parameter.dtype) if parameter is not None else None,
+                quantize=bool(cpu_quantize and on_cpu),
+                compile_decoder=bool(cpu_compile and on_cpu),
+            )
+
+            def compute():
+                logging.debug(f"Computing latents for {audio_paths}")
+                gpt_cond_latent, speaker_embedding = tts.get_conditioning_latents(
+                    audio_path=audio_paths[0] if len(audio_paths) == 1 else audio_paths,
+                    gpt_cond_len=30,
+                    max_ref_length=60,
+                )
+                return {
+                    "gpt_cond_latent": gpt_cond_latent,
+                    "speaker_embedding": speaker_embedding,
+                }
+
+            latents = conditioning_cache.get_or_create(key, compute)
+            return latents["gpt_cond_latent"], latents["speaker_embedding"]
+
         def get_conditioning_latents(filenames: Union[str, List[str]], tts):
             """
             Computes and/or loads speaker latents for the given filename(s).
@@ -357,6 +464,7 @@ class CoquiEngine(BaseEngine):
                 logging.debug("Handling of single voice file")
 
                 filename = filenames[0]
+                latents_requested = filename.endswith(".json")
                 if filename.endswith(".json"):
                     filename_json = filename
                     filename = filename[:-5]
@@ -409,7 +517,10 @@ class CoquiEngine(BaseEngine):
                             f"Default voice file {filename_voice_json} not found."
                         )
 
-                # check if latents are already computed
+                if not latents_requested and os.path.exists(filename_voice_wav):
+                    return compute_latents([filename_voice_wav], tts)
+
+                # read latents stored as JSON (explicit latents file or default voice)
                 if os.path.exists(filename_voice_json):
                     logging.debug(
                         f"Latents already computed, reading from {filename_voice_json}"
@@ -430,24 +541,7 @@ class CoquiEngine(BaseEngine):
 
                     return gpt_cond_latent, speaker_embedding
 
-                # compute and write latents to json file
-                logging.debug(f"Computing latents for {filename}")
-
-                gpt_cond_latent, speaker_embedding = tts.get_conditioning_latents(
-                    audio_path=filename_voice_wav, gpt_cond_len=30, max_ref_length=60
-                )
-
-                latents = {
-                    "gpt_cond_latent": gpt_cond_latent.cpu().squeeze().half().tolist(),
-                    "speaker_embedding": speaker_embedding.cpu()
-                    .squeeze()
-                    .half()
-                    .tolist(),
-                }
-                with open(filename_voice_json, "w") as new_file:
-                    json.dump(latents, new_file)
-
-                return gpt_cond_latent, speaker_embedding
+                return compute_latents([filename_voice_wav], tts)
 
             else:
                 audio_path_list = []
@@ -478,24 +572,7 @@ class CoquiEngine(BaseEngine):
                         )
 
                 logging.debug(f"Computing latents for the provided list: {filenames}")
-
-                gpt_cond_latent, speaker_embedding = tts.get_conditioning_latents(
-                    audio_path=audio_path_list, gpt_cond_len=30, max_ref_length=60
-                )
-
-                latents = {
-                    "gpt_cond_latent": gpt_cond_latent.cpu().squeeze().half().tolist(),
-                    "speaker_embedding": speaker_embedding.cpu()
-                    .squeeze()
-                    .half()
-                    .tolist(),
-                }
-                # Save latents alongside the first WAV
-                filename_voice_json = audio_path_list[0][:-3] + "json"
-                with open(filename_voice_json, "w") as new_file:
-                    json.dump(latents, new_file)
-
-                return gpt_cond_latent, speaker_embedding
+                return compute_latents(audio_path_list, tts)
 
         def postprocess_wave(chunk):
             """Post process the output waveform"""
@@ -507,6 +584,21 @@ class CoquiEngine(BaseEngine):
             chunk = chunk.astype(np.float32)
             return chunk
 
+        def send_status(status, result):
+            """Sends a message over the pipe and tells the parent to read it"""
+            conn.send((status, result))
+            if audio_ring is not None:
+                audio_ring.notify()
+
+        def send_chunk(chunk):
+            """Hands one audio chunk (float32 array or bytes) to the parent process"""
+            if audio_ring is not None and audio_ring.fits(chunk.nbytes if isinstance(chunk, np.ndarray) else len(chunk)):
+                if audio_ring.write(chunk, stop_event):
+                    return
+                if stop_event.is_set():
+                    return
+            send_status("success", chunk.tobytes() if isinstance(chunk, np.ndarray) else chunk)
+
         def load_model(checkpoint, tts):
             global config
             try:
@@ -551,6 +643,17 @@ class CoquiEngine(BaseEngine):
                     use_deepspeed=use_deepspeed,
                 )
                 tts.to(torch_device)
+
+                if cpu_quantize or cpu_compile:
+                    if torch_device.type == "cpu":
+                        optimize_for_cpu(
+                            tts,
+                            quantize=cpu_quantize,
+                            compile_decoder=cpu_compile,
+                            cache_dir=compile_cache_dir or os.path.join(checkpoint, "torch_compile_cache"),
+                        )
+                    else:
+                        logging.warning(f"cpu_quantize and cpu_compile are ignored on {torch_device.type}")
             except Exception as e:
                 print(f"Error loading model for checkpoint {checkpoint}: {e}")
                 raise
@@ -600,6 +703,25 @@ class CoquiEngine(BaseEngine):
             logging.exception(f"Error initializing main coqui engine model: {e}")
             raise
 
+        scheduler = StreamChunkScheduler(stream_chunk_schedule, stream_chunk_size)
+
+        if cpu_quantize or cpu_compile:
+            try:
+                warmup_factor = warmup(
+                    tts,
+                    language,
+                    gpt_cond_latent,
+                    speaker_embedding,
+                    stream_chunk_size=stream_chunk_size,
+                    overlap_wav_len=overlap_wav_len,
+                    temperature=temperature,
+                    top_k=top_k,
+                    top_p=top_p,
+                )
+                logging.info(f"Warmup realtime factor: {warmup_factor:.3f}")
+            except Exception as e:
+                logging.warning(f"Warmup failed: {e}")
+
         ready_event.set()
 
         logging.info("Coqui text to speech synthesize model initialized successfully")
@@ -643,6 +765,7 @@ class CoquiEngine(BaseEngine):
 
                 elif command == "set_stream_chunk_size":
                     stream_chunk_size = data["stream_chunk_size"]
+                    scheduler.set_fixed(stream_chunk_size)
                     conn.send(("success", "stream_chunk_size updated successfully"))
 
                 elif command == "set_model":
@@ -661,21 +784,24 @@ class CoquiEngine(BaseEngine):
                         stop_event.clear()
                         text = data["text"]
                         language = data["language"]
+                        chunk_size = CoquiEngine._next_chunk_size(scheduler, data)
 
-                        logging.debug(f"Starting inference for text: {text}")
+                        logging.debug(f"Starting inference for text: {text} (stream_chunk_size {chunk_size})")
 
                         time_start = time.time()
                         seconds_to_first_chunk = 0.0
                         full_generated_seconds = 0.0
+                        realtime_factor = None
                         raw_inference_start = 0.0
                         first_chunk_length_seconds = 0.0
+                        paced_seconds = 0.0
 
                         chunks = tts.inference_stream(
                             text,
                             language,
                             gpt_cond_latent,
                             speaker_embedding,
-                            stream_chunk_size=stream_chunk_size,
+                            stream_chunk_size=chunk_size,
                             overlap_wav_len=overlap_wav_len,
                             temperature=temperature,
                             length_penalty=length_penalty,
@@ -716,7 +842,8 @@ class CoquiEngine(BaseEngine):
 
                             if not stop_event.is_set():
                                 for chunk in chunklist:
-                                    conn.send(("success", chunk))
+                                    send_chunk(chunk)
+                                    scheduler.add_audio(len(chunk) / (4 * 24000))
                         else:
                             for i, chunk in enumerate(chunks):
                                 if stop_event.is_set():
@@ -724,10 +851,10 @@ class CoquiEngine(BaseEngine):
                                     break # Exit the for loop
 
                                 chunk = postprocess_wave(chunk)
-                                chunk_bytes = chunk.tobytes()
 
-                                conn.send(("success", chunk_bytes))
-                                chunk_duration = len(chunk_bytes) / (4 * 24000)  # 4 bytes per sample, 24000 Hz
+                                send_chunk(chunk)
+                                chunk_duration = chunk.nbytes / (4 * 24000)  # 4 bytes per sample, 24000 Hz
+                                scheduler.add_audio(chunk_duration)
                                 full_generated_seconds += chunk_duration
                                 if i == 0:
                                     first_chunk_length_seconds = chunk_duration
@@ -735,17 +862,17 @@ class CoquiEngine(BaseEngine):
                                     seconds_to_first_chunk = (
                                         raw_inference_start - time_start
                                     )
-                                else:
-                                    chunk_production_seconds = time.time() - time_start
-                                    generated_audio_seconds = full_generated_seconds
-
-                                    # wait only if we are faster than realtime
-                                    if load_balancing:
-                                        if chunk_production_seconds < (generated_audio_seconds + load_balancing_buffer_length):
-                                            waiting_time = generated_audio_seconds - chunk_production_seconds - load_balancing_cut_off
-                                            if waiting_time > 0:
-                                                print(f"Waiting for {waiting_time} seconds")
-                                                time.sleep(waiting_time)
+
+                                # wait only while more audio is buffered than needed
+                                if load_balancing:
+                                    waiting_time = scheduler.pacing_delay(
+                                        load_balancing_buffer_length + load_balancing_cut_off
+                                    )
+                                    if waiting_time > 0:
+                                        logging.debug(f"Waiting for {waiting_time:.2f} seconds")
+                                        paced_start = time.time()
+                                        stop_event.wait(waiting_time)
+                                        paced_seconds += time.time() - paced_start
 
                         time_end = time.time()
                         seconds = time_end - time_start
@@ -755,6 +882,9 @@ class CoquiEngine(BaseEngine):
                             and (full_generated_seconds - first_chunk_length_seconds) > 0
                         ):
                             realtime_factor = seconds / full_generated_seconds
+                            scheduler.record_realtime_factor(
+                                (seconds - paced_seconds) / full_generated_seconds
+                            )
                             raw_inference_time = seconds - seconds_to_first_chunk
                             raw_inference_factor = raw_inference_time / (
                                 full_generated_seconds - first_chunk_length_seconds
@@ -763,7 +893,7 @@ class CoquiEngine(BaseEngine):
                                 print(f"Realtime Factor: {realtime_factor}")
                                 print(f"Raw Inference Factor: {raw_inference_factor}")
 
-                        conn.send(("finished", ""))
+                        send_status("finished", {"realtime_factor": realtime_factor})
 
                     except Exception as e:
                         logging.error(
@@ -772,7 +902,7 @@ class CoquiEngine(BaseEngine):
                         tb_str = traceback.format_exc()
                         print(f"Traceback: {tb_str}")
                         print(f"Error: {e}")
-                        conn.send(("error", str(e)))
+                        send_status("error", str(e))
 
         except KeyboardInterrupt:
             logging.info("Keyboard interrupt received. Exiting worker process.")
@@ -788,11 +918,24 @@ class CoquiEngine(BaseEngine):
             print(f"Traceback: {tb_str}")
             print(f"Error: {e}")
 
-            conn.send(("error", str(e)))
+            send_status("error", str(e))
+
+        if audio_ring is not None:
+            audio_ring.close()
 
         sys.stdout = sys.__stdout__
         sys.stderr = sys.__stderr__
 
+    @staticmethod
+    def _next_chunk_size(scheduler: StreamChunkScheduler, data: dict) -> int:
+        """
+        Returns the stream_chunk_size for a synthesize command.
+        """
+        if data.get("reset_schedule"):
+            # playback was stopped, nothing is buffered anymore
+            scheduler.reset()
+        return scheduler.next_chunk_size()
+
     def send_command(self, command, data):
         """
         Send a command to the worker process.
@@ -929,6 +1072,8 @@ class CoquiEngine(BaseEngine):
         Returns:
             bool: True if successful, False otherwise.
         """
+        # BaseEngine.synthesize() clears the stop event, so remember a stop for the worker first
+        reset_schedule = self.stop_synthesis_event.is_set()
         super().synthesize(text, sentence_count)
 
 
@@ -940,9 +1085,12 @@ class CoquiEngine(BaseEngine):
             if len(text) < 1:
                 return
 
-            data = {"text": text, "language": self.language}
+            data = {"text": text, "language": self.language, "reset_schedule": reset_schedule}
             self.send_command("synthesize", data)
 
+            if self.audio_ring is not None:
+                return self._receive_from_ring(text)
+
             status, result = self.parent_synthesize_pipe.recv()
 
             while "finished" not in status:
@@ -964,8 +1112,55 @@ class CoquiEngine(BaseEngine):
 
                 status, result = self.parent_synthesize_pipe.recv()
 
+            self._record_finished(result)
             return True
 
+    def _record_finished(self, result):
+        """Stores the statistics the worker reports at the end of a sentence"""
+        if isinstance(result, dict):
+            self.realtime_factor = result.get("realtime_factor")
+
+    def _receive_from_ring(self, text: str) -> bool:
+        """
+        Moves audio chunks from the shared ring buffer into the queue until the worker reports the end of the sentence.
+
+        The worker rings the doorbell for every chunk and posts a notice after
+        every message it sends over the pipe, so the pipe is only read when
+        there is something to read.
+        """
+        ring = self.audio_ring
+        while True:
+            if self.stop_synthesis_event.is_set():
+                return False
+
+            rang = ring.wait(timeout=0.1)
+            for chunk in ring.read_available():
+                self.queue.put(chunk)
+
+            # Timeouts also check the pipe in case the worker died.
+            if rang and not ring.take_notice():
+                continue
+
+            while self.parent_synthesize_pipe.poll(0):
+                status, result = self.parent_synthesize_pipe.recv()
+                if "finished" in status:
+                    # Everything written before the status message is in the ring.
+                    for chunk in ring.read_available():
+                        self.queue.put(chunk)
+                    self._record_finished(result)
+                    return True
+                if "shutdown" in status or "error" in status:
+                    if "error" in status:
+                        logging.error(f"Error synthesizing text: {text}")
+                        logging.error(f"Error: {result}")
+                    return False
+                if isinstance(result, bytes):
+                    # Chunk too large for the ring, sent over the pipe after
+                    # everything already in the ring.
+                    for chunk in ring.read_available():
+                        self.queue.put(chunk)
+                    self.queue.put(result)
+
     @staticmethod
     def download_file(url, destination):
         response = requests.get(url, stream=True)
@@ -1116,6 +1311,10 @@ class CoquiEngine(BaseEngine):
         self.synthesize_process.join()
         logging.info("Worker process has been terminated")
 
+        if self.audio_ring is not None:
+            self.audio_ring.close()
+            self.audio_ring = None
+
 
     def set_language(self, language: str):
         """
@@ -1136,6 +1335,7 @@ class CoquiEngine(BaseEngine):
     def set_stream_chunk_size(self, stream_chunk_size: int):
         """
         Sets the stream chunk size for the speech synthesis.
+        Also turns off the stream_chunk_schedule.
 
         Args:
             stream_chunk_size (int): The number of samples to process at a time.
@@ -1144,6 +1344,7 @@ class CoquiEngine(BaseEngine):
         status, result = self.parent_synthesize_pipe.recv()
         if status == "success":
             self.stream_chunk_size = stream_chunk_size
+            self.stream_chunk_schedule = None
             logging.info("Stream chunk size updated successfully")
         else:
             logging.error("Error updating stream chunk size")
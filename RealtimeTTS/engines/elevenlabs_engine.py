@@ -1,11 +1,19 @@
 from elevenlabs.client import ElevenLabs
-from typing import Union
+from typing import Iterator, List, Optional, Union
+from urllib.parse import urlencode
 from .base_engine import BaseEngine
+import threading
 import logging
+import base64
 import pyaudio
+import json
 import os
 import traceback
 
+# Characters after which buffered input text is forwarded to the websocket.
+# ElevenLabs expects whole words, so single characters are never sent alone.
+_INPUT_FLUSH_CHARACTERS = " \n\t.,?!;:…"
+
 
 class ElevenlabsVoice:
     def __init__(self, name, voice_id, category, description, labels):
@@ -31,6 +39,10 @@ class ElevenlabsEngine(BaseEngine):
         stability: float = 50.0,
         style_exxageration: float = 0.0,
         model: str = "eleven_multilingual_v2",
+        output_format: str = "mp3_44100_128",
+        input_streaming: bool = False,
+        chunk_length_schedule: Optional[List[int]] = None,
+        websocket_url: str = "wss://api.elevenlabs.io",
     ):
         """
         Initializes an elevenlabs voice realtime text to speech engine object.
@@ -44,6 +56,15 @@ class ElevenlabsEngine(BaseEngine):
             stability (float, optional): Stability. Controls the voice performance, with higher values producing a steadier tone and lower values giving a more emotive output. Defaults to "50.0".
             style_exxageration (float, optional): Style Exxageration. Controls the voice performance, with higher values giving a more emotive output and lower values producing a steadier tone. Defaults to "0.0".
             model (str, optional): Model. Defaults to "eleven_multilingual_v2". Some models may not work with real time inference.
+            output_format (str, optional): ElevenLabs output format, for example "mp3_44100_128" or "pcm_24000".
+                MP3 formats are played through the external mpeg player, "pcm_<rate>" formats are played directly as 16-bit PCM.
+                Defaults to "mp3_44100_128".
+            input_streaming (bool, optional): If True, the engine consumes the text generator directly and forwards
+                the text over the ElevenLabs websocket input-streaming API as it arrives. The service does the
+                chunking, so no local sentence splitting and no per-sentence HTTP request is needed. Defaults to False.
+            chunk_length_schedule (List[int], optional): Character thresholds the service uses to decide when to start
+                generating audio in input streaming mode. None uses the service default.
+            websocket_url (str, optional): Base URL of the websocket API. Defaults to "wss://api.elevenlabs.io".
         """
 
         self.voice_name = voice
@@ -53,6 +74,10 @@ class ElevenlabsEngine(BaseEngine):
         self.stability = stability
         self.style_exxageration = style_exxageration
         self.model = model
+        self.output_format = output_format
+        self.input_streaming = input_streaming
+        self.chunk_length_schedule = chunk_length_schedule
+        self.websocket_url = websocket_url.rstrip("/")
         if not api_key:
             api_key = os.environ.get("ELEVENLABS_API_KEY")
         if not api_key:
@@ -62,31 +87,44 @@ class ElevenlabsEngine(BaseEngine):
                 "2. Set ELEVENLABS_API_KEY environment variable"
             )
 
+        self.api_key = api_key
         self.client = ElevenLabs(api_key=api_key)
 
     def post_init(self):
         """Set engine name and generator consumption capability."""
-        self.can_consume_generators = False
+        self.can_consume_generators = self.input_streaming
         self.engine_name = "elevenlabs"
 
+    def _pcm_sample_rate(self) -> int:
+        """
+        Returns the sample rate of a "pcm_<rate>" output format or -1 for compressed formats.
+        """
+        if not self.output_format.startswith("pcm_"):
+            return -1
+        return int(self.output_format.split("_")[1])
+
     def get_stream_info(self):
         """
         Returns the audio stream configuration information suitable for PyAudio.
 
         Returns:
             tuple: A tuple containing the audio format, number of channels, and the sample rate.
-                  - Format (int): The format of the audio stream. pyaudio.paCustomFormat for mpeg.
+                  - Format (int): The format of the audio stream. pyaudio.paCustomFormat for mpeg, pyaudio.paInt16 for pcm.
                   - Channels (int): The number of audio channels. -1 for mpeg.
                   - Sample Rate (int): The sample rate of the audio in Hz. -1 for mpeg.
         """
+        sample_rate = self._pcm_sample_rate()
+        if sample_rate > 0:
+            return pyaudio.paInt16, 1, sample_rate
         return pyaudio.paCustomFormat, -1, -1
 
-    def synthesize(self, text: str, sentence_count: int = 0) -> bool:
+    def synthesize(self, text: Union[str, Iterator[str]], sentence_count: int = 0) -> bool:
         """
         Synthesizes text to audio stream.
 
         Args:
-            text (str): Text to synthesize.
+            text (Union[str, Iterator[str]]): Text to synthesize. In input streaming mode
+                this is the character iterator fed by TextToAudioStream.
             sentence_count (int): The count of sentences synthesized so far, used for tracking progress.
 
         Returns:
@@ -94,6 +132,9 @@ class ElevenlabsEngine(BaseEngine):
         """
         super().synthesize(text, sentence_count)
 
+        if not isinstance(text, str):
+            return self._synthesize_input_stream(text)
+
         # NOTE: The new elevenlabs API (v1.0.0+) does not allow setting
         # voice settings (stability, clarity, etc.) per-request on the stream endpoint.
         # These settings are now configured with the voice itself in the Voice Lab
@@ -105,6 +146,7 @@ class ElevenlabsEngine(BaseEngine):
                 text=text,
                 voice_id=self.id,
                 model_id=self.model,
+                output_format=self.output_format,
             )
 
             for chunk in audio_stream:
@@ -117,6 +159,107 @@ class ElevenlabsEngine(BaseEngine):
             traceback.print_exc()
             return False
 
+    def _input_stream_uri(self) -> str:
+        query = urlencode({"model_id": self.model, "output_format": self.output_format})
+        return f"{self.websocket_url}/v1/text-to-speech/{self.id}/stream-input?{query}"
+
+    def _input_stream_init_message(self) -> dict:
+        message = {
+            "text": " ",
+            "voice_settings": {
+                "stability": self.stability / 100,
+                "similarity_boost": self.clarity / 100,
+                "style": self.style_exxageration / 100,
+                "use_speaker_boost": True,
+            },
+        }
+        if self.chunk_length_schedule:
+            message["generation_config"] = {
+                "chunk_length_schedule": list(self.chunk_length_schedule)
+            }
+        return message
+
+    def _forward_input_text(self, connection, generator: Iterator[str]):
+        """
+        Forwards text from the generator to the websocket as whole words and closes the input.
+        """
+        from websockets.exceptions import ConnectionClosed
+
+        buffer = ""
+        try:
+            for char in generator:
+                if self.stop_synthesis_event.is_set():
+                    return
+                buffer += char
+                if char in _INPUT_FLUSH_CHARACTERS and buffer.strip():
+                    connection.send(json.dumps({"text": buffer}))
+                    buffer = ""
+
+            if buffer.strip():
+                connection.send(json.dumps({"text": buffer + " "}))
+
+            # An empty text message tells the service the input is complete.
+            connection.send(json.dumps({"text": ""}))
+        except ConnectionClosed:
+            pass
+        except Exception as e:
+            logging.error(f"Elevenlabs input streaming error: {e}")
+            traceback.print_exc()
+            connection.close()
+
+    def _synthesize_input_stream(self, generator: Iterator[str]) -> bool:
+        """
+        Streams text from the generator to the ElevenLabs websocket and queues the audio it returns.
+        """
+        from websockets.sync.client import connect
+        from websockets.exceptions import ConnectionClosed
+
+        sample_rate = self._pcm_sample_rate()
+
+        try:
+            with connect(
+                self._input_stream_uri(),
+                additional_headers={"xi-api-key": self.api_key},
+            ) as connection:
+                connection.send(json.dumps(self._input_stream_init_message()))
+
+                sender = threading.Thread(
+                    target=self._forward_input_text,
+                    args=(connection, generator),
+                    daemon=True,
+                )
+                sender.start()
+
+                while not self.stop_synthesis_event.is_set():
+                    try:
+                        message = connection.recv(timeout=0.1)
+                    except TimeoutError:
+                        continue
+                    except ConnectionClosed:
+                        break
+
+                    data = json.loads(message)
+                    if data.get("error"):
+                        logging.error(f"Elevenlabs input streaming error: {data.get('message', data['error'])}")
+                        return False
+
+                    audio = data.get("audio")
+                    if audio:
+                        chunk = base64.b64decode(audio)
+                        self.queue.put(chunk)
+                        if sample_rate > 0:
+                            self.audio_duration += len(chunk) / (2 * sample_rate)
+
+                    if data.get("isFinal"):
+                        break
+
+            return True
+
+        except Exception as e:
+            logging.error(f"Elevenlabs input streaming error: {e}")
+            traceback.print_exc()
+            return False
+
     def set_api_key(self, api_key: str):
         """
         Sets the elevenlabs api key.
@@ -200,200 +343,3 @@ class ElevenlabsEngine(BaseEngine):
             self.stability = voice_parameters["stability"]
         if "style_exxageration" in voice_parameters:
             self.style_exxageration = voice_parameters["style_exxageration"]
-            
-# from elevenlabs.client import ElevenLabs
-# from elevenlabs import Voice, VoiceSettings
-# from typing import Iterator, Union
-# from .base_engine import BaseEngine
-# import subprocess
-# import threading
-# import logging
-# import pyaudio
-# import os
-
-
-# class ElevenlabsVoice:
-#     def __init__(self, name, voice_id, category, description, labels):
-#         self.name = name
-#         self.voice_id = voice_id
-#         self.category = category
-#         self.description = description
-#         self.labels = labels
-
-#     def __repr__(self):
-#         label_string = ", ".join(self.labels.values())
-#         return f"{self.name} ({self.category}, id: {self.voice_id}, {label_string})"
-
-
-# class ElevenlabsEngine(BaseEngine):
-#     def __init__(
-#         self,
-#         api_key: str = "",
-#         voice: str = "Nicole",
-#         id: str = "piTKgcLEGmPE4e6mEKli",
-#         category: str = "premade",
-#         clarity: float = 75.0,
-#         stability: float = 50.0,
-#         style_exxageration: float = 0.0,
-#         model: str = "eleven_multilingual_v1",
-#     ):
-#         """
-#         Initializes an elevenlabs voice realtime text to speech engine object.
-
-#         Args:
-#             api_key (str): Elevenlabs API key. (TTS API key)
-#             voice (str, optional): Voice name. Defaults to "Nicole".
-#             id (str, optional): Voice ID. Defaults to "piTKgcLEGmPE4e6mEKli".
-#             category (str, optional): Voice category. Defaults to "premade".
-#             clarity (float, optional): Clarity / Similarity. Adjusts voice similarity and resemblance. Defaults to "75.0".
-#             stability (float, optional): Stability. Controls the voice performance, with higher values producing a steadier tone and lower values giving a more emotive output. Defaults to "50.0".
-#             style_exxageration (float, optional): Style Exxageration. Controls the voice performance, with higher values giving a more emotive output and lower values producing a steadier tone. Defaults to "0.0".
-#             model (str, optional): Model. Defaults to "eleven_multilingual_v1". Some models may not work with real time inference.
-#         """
-
-#         self.voice_name = voice
-#         self.id = id
-#         self.category = category
-#         self.clarity = clarity
-#         self.stability = stability
-#         self.style_exxageration = style_exxageration
-#         self.model = model
-#         if not api_key:
-#             api_key = os.environ.get("ELEVENLABS_API_KEY")
-#         if not api_key:
-#             raise ValueError(
-#                 "Missing ElevenLabs API key. Either:\n"
-#                 "1. Pass the API key as a parameter\n" 
-#                 "2. Set ELEVENLABS_API_KEY environment variable"
-#             )
-
-#         self.client = ElevenLabs(api_key=api_key)
-
-#     def post_init(self):
-#         """Information that this engine can handle generators directly"""
-#         self.can_consume_generators = True
-#         self.engine_name = "elevenlabs"
-
-#     def get_stream_info(self):
-#         """
-#         Returns the audio stream configuration information suitable for PyAudio.
-
-#         Returns:
-#             tuple: A tuple containing the audio format, number of channels, and the sample rate.
-#                   - Format (int): The format of the audio stream. pyaudio.paInt16 represents 16-bit integers.
-#                   - Channels (int): The number of audio channels. 1 represents mono audio.
-#                   - Sample Rate (int): The sample rate of the audio in Hz. 16000 represents 16kHz sample rate.
-#         """
-#         return pyaudio.paCustomFormat, -1, -1
-
-#     def synthesize(self, generator: Iterator[str]) -> bool:
-#         """
-#         Synthesizes text to audio stream.
-
-#         Args:
-#             text (str): Text to synthesize.
-#         """
-#         voice = Voice(
-#             voice_id=self.id,
-#             settings=VoiceSettings(
-#                 stability=self.stability / 100,
-#                 similarity_boost=self.clarity / 100,
-#                 style=self.style_exxageration / 100,
-#                 use_speaker_boost=True,
-#             ),
-#         )
-
-#         self.audio_stream = self.client.generate(
-#             text=generator, voice=voice, model=self.model, stream=True
-#         )
-
-#         # self.stream(self.audio_stream)
-#         for chunk in self.audio_stream:
-#             if chunk is not None:
-#                 self.queue.put(chunk)
-
-#         return True
-
-#     def set_api_key(self, api_key: str):
-#         """
-#         Sets the elevenlabs api key.
-
-#         Args:
-#             api_key (str): Elevenlabs API key. (TTS API key)
-#         """
-#         self.api_key = api_key
-#         if api_key:
-#             self.client = ElevenLabs(api_key=api_key)
-
-#     def get_voices(self):
-#         """
-#         Retrieves the voices available from the Elevenlabs voice source.
-
-#         Calling this takes time, it sends a request to the Elevenlabs API to fetch the list of available voices.
-#         This method fetches the list of available voices using the elevenlabs `voices()` function and then
-#         constructs a list of `ElevenlabsVoice` objects to represent each voice's details.
-
-#         Returns:
-#             list[ElevenlabsVoice]: A list containing ElevenlabsVoice objects representing each available voice.
-#                                 Each ElevenlabsVoice object encapsulates information such as the voice's name,
-#                                 ID, category, description, and associated labels.
-
-#         Note:
-#             This method relies on the `voices()` function to obtain the raw voice data. Ensure that the
-#             `voices()` function is accessible and functional before calling this method.
-#         """
-#         fetched_voices = self.client.voices.get_all()
-
-#         voices_list = fetched_voices.voices
-
-#         voice_objects = []
-#         for voice in voices_list:
-#             voice_object = ElevenlabsVoice(
-#                 name=voice.name,
-#                 voice_id=voice.voice_id,
-#                 category=voice.category,
-#                 description=voice.description,
-#                 labels=voice.labels,
-#             )
-#             voice_objects.append(voice_object)
-
-#         return voice_objects
-
-#     def set_voice(self, voice: Union[str, ElevenlabsVoice]):
-#         """
-#         Sets the voice to be used for speech synthesis.
-
-#         Args:
-#             voice (Union[str, ElevenlabsVoice]): The voice to be used for speech synthesis.
-#         """
-#         if isinstance(voice, ElevenlabsVoice):
-#             logging.info(f"Setting voice to {voice.name}")
-#             self.voice_name = voice.name
-#             self.id = voice.voice_id
-#             self.category = voice.category
-#             return
-#         else:
-#             installed_voices = self.get_voices()
-#             for installed_voice in installed_voices:
-#                 if voice in installed_voice.name:
-#                     logging.info(f"Setting voice to {installed_voice.name}")
-#                     self.voice_name = installed_voice.name
-#                     self.id = installed_voice.voice_id
-#                     self.category = installed_voice.category
-#                     return
-
-#         logging.warning(f"Voice {voice} not found.")
-
-#     def set_voice_parameters(self, **voice_parameters):
-#         """
-#         Sets the voice parameters to be used for speech synthesis.
-
-#         Args:
-#             **voice_parameters: The voice parameters to be used for speech synthesis.
-#         """
-#         if "clarity" in voice_parameters:
-#             self.clarity = voice_parameters["clarity"]
-#         if "stability" in voice_parameters:
-#             self.stability = voice_parameters["stability"]
-#         if "style_exxageration" in voice_parameters:
-#             self.style_exxageration = voice_parameters["style_exxageration"]
@@ -0,0 +1,256 @@
+"""
+Memoization for the grapheme-to-phoneme front end of phoneme-based engines.
+
+Kokoro's KPipeline runs misaki (English) or espeak-ng (other languages) on
+every text chunk before the acoustic model sees it. For repeated sentences
+(templated prompts, product names) that work is identical every time, so
+G2PCache stores the G2P result per namespace (engine, library versions and
+language code) and normalized text chunk:
+
+- a bounded in-memory LRU,
+- optionally a SQLite file on disk, shared by processes and kept across runs.
+
+The cached tokens are handed out as deep copies. KPipeline writes start_ts and
+end_ts into the tokens after inference, so every call needs its own objects;
+timings are therefore identical to an uncached run.
+"""
+
+import copy
+import dataclasses
+import json
+import logging
+import sqlite3
+import sys
+import threading
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+
+@dataclass
+class G2PCacheStats:
+    """
+    Lookup statistics of a G2PCache.
+
+    Attributes:
+        hits (int): Lookups served from memory.
+        disk_hits (int): Lookups served from the on-disk store.
+        misses (int): Lookups that ran the wrapped G2P.
+    """
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.disk_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups that did not run the wrapped G2P."""
+        if self.lookups == 0:
+            return 0.0
+        return (self.hits + self.disk_hits) / self.lookups
+
+
+def normalize_text(text: str) -> str:
+    """
+    Returns the cache key form of a text chunk.
+
+    Only Unicode NFC normalization is applied: G2P output depends on case,
+    punctuation and whitespace, so folding those would change the phonemes.
+    """
+    return unicodedata.normalize("NFC", text)
+
+
+def _encode(value):
+    """Turns a G2P result into a JSON-able tree."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return {"t": "tuple" if isinstance(value, tuple) else "list", "items": [_encode(item) for item in value]}
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        fields = dataclasses.fields(value)
+        if not all(field.init for field in fields):
+            raise TypeError(f"{type(value).__name__} has fields that are not set by __init__")
+        return {
+            "t": "dataclass",
+            "type": f"{type(value).__module__}:{type(value).__qualname__}",
+            "fields": {field.name: _encode(getattr(value, field.name)) for field in fields},
+        }
+    raise TypeError(f"cannot store {type(value).__name__} in the G2P cache")
+
+
+def _decode(node):
+    if not isinstance(node, dict):
+        return node
+    if node["t"] == "dataclass":
+        # Only classes of modules the G2P already imported are rebuilt.
+        module_name, qualname = node["type"].split(":")
+        target = sys.modules.get(module_name)
+        for part in qualname.split("."):
+            target = getattr(target, part, None)
+        if not dataclasses.is_dataclass(target):
+            raise ValueError(f"cannot rebuild {node['type']}")
+        return target(**{name: _decode(item) for name, item in node["fields"].items()})
+    items = [_decode(item) for item in node["items"]]
+    return tuple(items) if node["t"] == "tuple" else items
+
+
+class G2PCache:
+    """
+    Entry-limited in-memory LRU in front of an optional SQLite store.
+    """
+    def __init__(self, max_entries: int = 4096, path: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            max_entries (int): Upper bound for the results kept in memory.
+            path (str or Path, optional): SQLite file for persisted results.
+                If None, results are only kept in memory.
+        """
+        self.max_entries = max_entries
+        self.path = Path(path) if path else None
+        self._entries = OrderedDict()
+        self._stats = G2PCacheStats()
+        self._lock = threading.Lock()
+        self._db = None
+        if self.path is not None:
+            self._open_store()
+
+    def _open_store(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS g2p ("
+                "namespace TEXT NOT NULL, text TEXT NOT NULL, result TEXT NOT NULL, "
+                "PRIMARY KEY (namespace, text))"
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            logging.warning(f"G2P cache store {self.path} unavailable, using memory only: {e}")
+            self._db = None
+
+    def stats(self) -> G2PCacheStats:
+        """
+        Returns a snapshot of the lookup statistics.
+        """
+        with self._lock:
+            return dataclasses.replace(self._stats)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remember(self, key, value) -> None:
+        # called with self._lock held
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, namespace: str, text: str):
+        # called with self._lock held
+        if self._db is None:
+            return None
+        try:
+            row = self._db.execute(
+                "SELECT result FROM g2p WHERE namespace = ? AND text = ?", (namespace, text)
+            ).fetchone()
+            return _decode(json.loads(row[0])) if row else None
+        except (sqlite3.Error, ValueError, TypeError, KeyError) as e:
+            logging.warning(f"Ignoring unreadable G2P cache entry: {e}")
+            return None
+
+    def _store(self, namespace: str, text: str, value) -> None:
+        # called with self._lock held
+        if self._db is None:
+            return
+        try:
+            encoded = json.dumps(_encode(value), separators=(",", ":"))
+        except TypeError as e:
+            logging.debug(f"G2P result kept in memory only: {e}")
+            return
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO g2p (namespace, text, result) VALUES (?, ?, ?)",
+                (namespace, text, encoded),
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            logging.warning(f"Could not write G2P cache entry: {e}")
+
+    def lookup(self, namespace: str, text: str, g2p: Callable[[str], Any]):
+        """
+        Returns g2p(text), served from the cache when possible.
+
+        The result is a deep copy, callers may modify it.
+        """
+        key = (namespace, normalize_text(text))
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                return copy.deepcopy(value)
+            value = self._load(*key)
+            if value is not None:
+                self._stats.disk_hits += 1
+                self._remember(key, value)
+                return copy.deepcopy(value)
+            self._stats.misses += 1
+
+        # G2P runs outside the lock, two threads may compute the same chunk.
+        value = g2p(text)
+        with self._lock:
+            self._remember(key, value)
+            self._store(*key, value)
+        return copy.deepcopy(value)
+
+    def wrap(self, g2p: Callable[[str], Any], namespace: str) -> "CachedG2P":
+        """
+        Returns a drop-in replacement for g2p that goes through this cache.
+        """
+        return CachedG2P(g2p, namespace, self)
+
+    def clear_memory(self) -> None:
+        """
+        Drops all in-memory entries and resets the statistics. Stored entries stay on disk.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._stats = G2PCacheStats()
+
+    def close(self) -> None:
+        """
+        Closes the on-disk store.
+        """
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+class CachedG2P:
+    """
+    Callable wrapper around a G2P object, e.g. KPipeline.g2p.
+
+    Calls with only the text are memoized, any other call goes to the wrapped
+    G2P unchanged. Attribute access is forwarded as well.
+    """
+    def __init__(self, g2p: Callable[[str], Any], namespace: str, cache: G2PCache):
+        self.g2p = g2p
+        self.namespace = namespace
+        self.cache = cache
+
+    def __call__(self, text, *args, **kwargs):
+        if args or kwargs or not isinstance(text, str):
+            return self.g2p(text, *args, **kwargs)
+        return self.cache.lookup(self.namespace, text, self.g2p)
+
+    def __getattr__(self, name):
+        if name == "g2p":
+            raise AttributeError(name)
+        return getattr(self.g2p, name)
@@ -1,15 +1,63 @@
 from .base_engine import BaseEngine
+from .sentence_prefetcher import SentencePrefetcher
 from pydub import AudioSegment
 from typing import Union
-import tempfile
-import wave
-import os
+import numpy as np
 import io
 import pyaudio
 from gtts import gTTS
 import gtts.lang
 
-SYNTHESIS_FILE = "gtts_speech_synthesis.wav"
+SAMPLE_RATE = 22050
+
+
+def _speedup(samples: np.ndarray, speed: float, chunk_length: int, crossfade_length: int) -> np.ndarray:
+    """
+    Changes the tempo of int16 mono samples by overlap-add without changing the pitch.
+
+    Segments of chunk_length + crossfade_length ms are taken every
+    chunk_length * speed ms and laid out every chunk_length ms, linearly
+    crossfaded over crossfade_length ms. This is the same chunk based method
+    as pydub's speedup, done in a few array operations for all chunks at once.
+
+    Args:
+        samples (np.ndarray): int16 samples at SAMPLE_RATE.
+        speed (float): Playback speed, e.g. 1.2 for 20% faster.
+        chunk_length (int): Chunk length in ms.
+        crossfade_length (int): Crossfade length in ms.
+    """
+    synthesis_hop = max(1, SAMPLE_RATE * chunk_length // 1000)
+    crossfade = min(SAMPLE_RATE * crossfade_length // 1000, synthesis_hop)
+    analysis_hop = max(1, int(round(synthesis_hop * speed)))
+    segment = synthesis_hop + crossfade
+
+    count = 1 + max(0, -(-(len(samples) - segment) // analysis_hop))
+    padded = np.zeros((count - 1) * analysis_hop + segment, dtype=np.float32)
+    padded[:len(samples)] = samples
+
+    offsets = np.arange(segment)
+    frames = padded[np.arange(count)[:, None] * analysis_hop + offsets]
+
+    window = np.ones(segment, dtype=np.float32)
+    if crossfade:
+        ramp = np.linspace(0.0, 1.0, crossfade, endpoint=False, dtype=np.float32)
+        window[:crossfade] = ramp
+        window[synthesis_hop:] = 1.0 - ramp
+    frames *= window
+    if crossfade:
+        # No fades at the very start and end of the sentence.
+        frames[0, :crossfade] = padded[:crossfade]
+        frames[-1, synthesis_hop:] = padded[(count - 1) * analysis_hop + synthesis_hop:]
+
+    out = np.zeros((count - 1) * synthesis_hop + segment, dtype=np.float32)
+    positions = np.arange(count)[:, None] * synthesis_hop + offsets
+    # Segments only overlap their direct neighbours, so even and odd segments
+    # can each be added in one step.
+    out[positions[0::2]] += frames[0::2]
+    out[positions[1::2]] += frames[1::2]
+
+    length = min(len(out), int(np.ceil(len(samples) / speed)))
+    return np.clip(out[:length], -32768, 32767).astype(np.int16)
 
 
 class GTTSVoice:
@@ -36,6 +84,7 @@ class GTTSEngine(BaseEngine):
         self,
         voice: Union[str, GTTSVoice] = GTTSVoice("en", "com"),
         print_installed_voices: bool = False,
+        prefetch_sentences: int = 2,
     ):
         """
         Initializes a gTTS text-to-speech engine object.
@@ -43,16 +92,23 @@ class GTTSEngine(BaseEngine):
         Args:
             voice (Union[str, GTTSVoice], optional): Voice configuration. Defaults to GTTSVoice("en", "com").
             print_installed_voices (bool, optional): Indicates if the list of available languages should be printed. Defaults to False.
+            prefetch_sentences (int, optional): Number of upcoming sentences downloaded and decoded
+                while the current one plays. 0 disables prefetching. Defaults to 2.
         """
         self.set_voice(voice)
-        temp_file_path = tempfile.gettempdir()
-        self.file_path = os.path.join(temp_file_path, SYNTHESIS_FILE)
+        self.prefetch_sentences = prefetch_sentences
+        self._prefetcher = SentencePrefetcher(
+            self._synthesize_pcm,
+            max_ahead=max(1, prefetch_sentences),
+            name="gtts",
+        )
 
         if print_installed_voices:
             print(self.get_voices())
 
     def post_init(self):
         self.engine_name = "gtts"
+        self.can_prefetch = self.prefetch_sentences > 0
 
     def get_stream_info(self):
         """
@@ -64,7 +120,17 @@ class GTTSEngine(BaseEngine):
                   - Channels (int): The number of audio channels. 1 represents mono audio.
                   - Sample Rate (int): The sample rate of the audio in Hz. 22050 represents 22.05kHz sample rate.
         """
-        return pyaudio.paInt16, 1, 22050
+        return pyaudio.paInt16, 1, SAMPLE_RATE
+
+    def prefetch(self, text: str):
+        """
+        Starts downloading and decoding an upcoming sentence in the background.
+
+        Args:
+            text (str): Text of the upcoming sentence.
+        """
+        args = self._request_args(text)
+        self._prefetcher.submit(args, *args)
 
     def synthesize(self, text: str, sentence_count: int = 0) -> bool:
         """
@@ -80,32 +146,56 @@ class GTTSEngine(BaseEngine):
         super().synthesize(text, sentence_count)
 
         try:
-            # Generate audio with gTTS
-            with io.BytesIO() as f:
-                tts = gTTS(text=text, lang=self.voice.language, tld=self.voice.tld)
-                tts.write_to_fp(f)
-                f.seek(0)
+            args = self._request_args(text)
+            audio_data = self._prefetcher.take(args, *args)
+            if self.stop_synthesis_event.is_set():
+                return False
+            self.queue.put(audio_data)
+            return True
 
-                audio = AudioSegment.from_file(f, format="mp3")
+        except Exception as e:
+            print(f"Error in synthesizing text: {e}")
+            return False
 
-                if self.voice.speed != 1.0:
-                    audio = audio.speedup(
-                        playback_speed=self.voice.speed,
-                        chunk_size=self.voice.chunk_length,
-                        crossfade=self.voice.crossfade_length,
-                    )
+    def _request_args(self, text: str) -> tuple:
+        # Everything the audio depends on, so prefetched sentences for an
+        # outdated voice are not played.
+        return (
+            text,
+            self.voice.language,
+            self.voice.tld,
+            self.voice.speed,
+            self.voice.chunk_length,
+            self.voice.crossfade_length,
+        )
+
+    def _synthesize_pcm(
+        self,
+        text: str,
+        language: str,
+        tld: str,
+        speed: float,
+        chunk_length: int,
+        crossfade_length: int,
+    ) -> bytes:
+        """
+        Downloads the gTTS MP3 for text and decodes it to 16-bit mono PCM at SAMPLE_RATE in memory.
+        """
+        with io.BytesIO() as f:
+            tts = gTTS(text=text, lang=language, tld=tld)
+            tts.write_to_fp(f)
+            samples = self._decode_mp3(f.getvalue())
 
-                audio.export(self.file_path, format="wav")
+        if speed != 1.0:
+            samples = _speedup(samples, speed, chunk_length, crossfade_length)
 
-            # Now open the WAV file and read the chunks
-            with wave.open(self.file_path, "rb") as wf:
-                audio_data = wf.readframes(wf.getnframes())
-                self.queue.put(audio_data)
-                return True
+        return samples.tobytes()
 
-        except Exception as e:
-            print(f"Error in synthesizing text: {e}")
-            return False
+    @staticmethod
+    def _decode_mp3(mp3: bytes) -> np.ndarray:
+        audio = AudioSegment.from_file(io.BytesIO(mp3), format="mp3")
+        audio = audio.set_channels(1).set_frame_rate(SAMPLE_RATE).set_sample_width(2)
+        return np.frombuffer(audio.raw_data, dtype=np.int16)
 
     def get_voices(self):
         """
@@ -135,3 +225,13 @@ class GTTSEngine(BaseEngine):
             self.voice = voice
         else:
             self.voice = GTTSVoice(language=voice, tld="com")
+
+    def stop(self):
+        """
+        Stops the current synthesis and drops prefetched sentences.
+        """
+        self._prefetcher.clear()
+        super().stop()
+
+    def shutdown(self):
+        self._prefetcher.shutdown()
@@ -0,0 +1,317 @@
+"""
+Shared pooled HTTP client for the REST based engines.
+
+Engines that talk to a cloud or local HTTP API (MiniMax, ModelsLab, Orpheus,
+Azure voice listing) send one or more requests per sentence. Calling
+requests.post/get at module level opens a fresh connection every time, so each
+sentence pays DNS, TCP and TLS setup. HttpClient keeps one requests.Session with
+per-host keep-alive connection pools, default timeouts, retry with exponential
+backoff for transient failures and per-host statistics (requests sent, new
+connections opened, time spent connecting) for tuning pool sizes.
+
+Most engines should use the process wide instance from get_http_client().
+"""
+
+from __future__ import annotations
+
+import threading
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+TimeoutType = Union[float, Tuple[float, float]]
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Retry behaviour for transient failures.
+
+    Attributes:
+        total (int): Maximum number of retries per request (0 disables retries).
+        backoff_factor (float): Base for the exponential backoff between attempts in seconds.
+        status_forcelist (tuple): HTTP status codes that are retried.
+        methods (tuple): HTTP methods that may be retried. TTS requests have no
+            side effects besides billing, so POST is retried as well.
+    """
+    total: int = 2
+    backoff_factor: float = 0.25
+    status_forcelist: Tuple[int, ...] = (429, 500, 502, 503, 504)
+    methods: Tuple[str, ...] = ("GET", "POST")
+
+    def to_urllib3(self):
+        from urllib3.util.retry import Retry
+
+        return Retry(
+            total=self.total,
+            connect=self.total,
+            read=self.total,
+            status=self.total,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=self.status_forcelist,
+            allowed_methods=frozenset(self.methods),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+
+
+@dataclass
+class HttpPoolStats:
+    """
+    Connection statistics for a single host.
+
+    Attributes:
+        requests (int): Requests sent to the host.
+        connections (int): New connections opened to the host.
+        connect_time (float): Total seconds spent opening connections (TCP and TLS).
+    """
+    requests: int = 0
+    connections: int = 0
+    connect_time: float = 0.0
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Share of requests that were served over an already open connection."""
+        if self.requests == 0:
+            return 0.0
+        return max(0.0, 1.0 - self.connections / self.requests)
+
+    @property
+    def average_connect_time(self) -> float:
+        if self.connections == 0:
+            return 0.0
+        return self.connect_time / self.connections
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "connections": self.connections,
+            "connect_time": self.connect_time,
+            "reuse_ratio": self.reuse_ratio,
+            "average_connect_time": self.average_connect_time,
+        }
+
+
+@dataclass
+class _StatsRecorder:
+    hosts: Dict[str, HttpPoolStats] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def _host(self, host: str) -> HttpPoolStats:
+        stats = self.hosts.get(host)
+        if stats is None:
+            stats = self.hosts[host] = HttpPoolStats()
+        return stats
+
+    def record_request(self, host: str):
+        with self.lock:
+            self._host(host).requests += 1
+
+    def record_connect(self, host: str, seconds: float):
+        with self.lock:
+            stats = self._host(host)
+            stats.connections += 1
+            stats.connect_time += seconds
+
+    def snapshot(self) -> Dict[str, HttpPoolStats]:
+        with self.lock:
+            return {
+                host: HttpPoolStats(s.requests, s.connections, s.connect_time)
+                for host, s in self.hosts.items()
+            }
+
+
+def _create_adapter(recorder: _StatsRecorder, **kwargs):
+    """
+    Builds a requests adapter whose connections report requests and connect time to recorder.
+    """
+    from requests.adapters import HTTPAdapter
+    from urllib3.connection import HTTPConnection, HTTPSConnection
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    class TimedHTTPConnection(HTTPConnection):
+        def connect(self):
+            start = time.perf_counter()
+            super().connect()
+            recorder.record_connect(self.host, time.perf_counter() - start)
+
+    class TimedHTTPSConnection(HTTPSConnection):
+        def connect(self):
+            start = time.perf_counter()
+            super().connect()
+            recorder.record_connect(self.host, time.perf_counter() - start)
+
+    class TimedHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = TimedHTTPConnection
+
+    class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = TimedHTTPSConnection
+
+    class PooledAdapter(HTTPAdapter):
+        def init_poolmanager(self, *args, **pool_kwargs):
+            super().init_poolmanager(*args, **pool_kwargs)
+            self.poolmanager.pool_classes_by_scheme = {
+                "http": TimedHTTPConnectionPool,
+                "https": TimedHTTPSConnectionPool,
+            }
+
+        def send(self, request, **send_kwargs):
+            recorder.record_request(urlsplit(request.url).hostname or "")
+            return super().send(request, **send_kwargs)
+
+    return PooledAdapter(**kwargs)
+
+
+class HttpClient:
+    """
+    A thread-safe pooled HTTP client with keep-alive, timeouts and retries.
+
+    Requests to the same host reuse open connections, so only the first request
+    of a session pays connection setup. The client can be shared between engines
+    and threads.
+    """
+    def __init__(
+        self,
+        pool_connections: int = 8,
+        pool_maxsize: int = 8,
+        timeout: TimeoutType = (5.0, 60.0),
+        retry: Optional[RetryPolicy] = None,
+        headers: Optional[dict] = None,
+    ):
+        """
+        Args:
+            pool_connections (int): Number of hosts to keep connection pools for.
+            pool_maxsize (int): Maximum number of open connections kept per host.
+            timeout (float or tuple): Default (connect, read) timeout in seconds.
+            retry (RetryPolicy, optional): Retry policy. Defaults to RetryPolicy().
+            headers (dict, optional): Headers sent with every request.
+        """
+        self.timeout = timeout
+        self.retry = retry if retry is not None else RetryPolicy()
+        self._recorder = _StatsRecorder()
+
+        self.session = requests.Session()
+        if headers:
+            self.session.headers.update(headers)
+
+        adapter = _create_adapter(
+            self._recorder,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=self.retry.to_urllib3(),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, method: str, url: str, timeout: Optional[TimeoutType] = None, **kwargs) -> requests.Response:
+        """
+        Sends a request over the pooled session.
+
+        Accepts the same keyword arguments as requests.request. Uses the client
+        default timeout if none is given.
+        """
+        return self.session.request(
+            method,
+            url,
+            timeout=self.timeout if timeout is None else timeout,
+            **kwargs,
+        )
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    @contextmanager
+    def stream(self, method: str, url: str, **kwargs) -> Iterator[requests.Response]:
+        """
+        Sends a streaming request and releases the connection back to the pool afterwards.
+
+        Usage:
+            with client.stream("POST", url, json=payload) as response:
+                for chunk in response.iter_content(chunk_size=None):
+                    ...
+        """
+        response = self.request(method, url, stream=True, **kwargs)
+        try:
+            yield response
+        finally:
+            response.close()
+
+    def stats(self) -> Dict[str, HttpPoolStats]:
+        """
+        Returns a snapshot of the connection statistics per host.
+        """
+        return self._recorder.snapshot()
+
+    def close(self):
+        """
+        Closes all pooled connections.
+        """
+        self.session.close()
+
+
+def iter_sse_data(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Incrementally parses a server-sent event stream.
+
+    Works on raw byte chunks as they arrive from the network (for example
+    response.iter_content(chunk_size=None)), so events are yielded as soon as
+    their terminating blank line is received. Multi-line data fields are joined
+    with newlines, other fields and comments are ignored.
+
+    Yields:
+        bytes: The data payload of each event.
+    """
+    buffer = bytearray()
+    data_lines = []
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buffer += chunk
+        start = 0
+        while True:
+            newline = buffer.find(b"\n", start)
+            if newline < 0:
+                break
+            line = bytes(buffer[start:newline]).rstrip(b"\r")
+            start = newline + 1
+            if not line:
+                if data_lines:
+                    yield b"\n".join(data_lines)
+                    data_lines = []
+            elif line.startswith(b"data:"):
+                value = line[5:]
+                data_lines.append(value[1:] if value.startswith(b" ") else value)
+        del buffer[:start]
+
+    line = bytes(buffer).rstrip(b"\r")
+    if line.startswith(b"data:"):
+        value = line[5:]
+        data_lines.append(value[1:] if value.startswith(b" ") else value)
+    if data_lines:
+        yield b"\n".join(data_lines)
+
+
+_shared_client: Optional[HttpClient] = None
+_shared_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """
+    Returns the process wide HttpClient shared by the REST based engines.
+    """
+    global _shared_client
+    if _shared_client is None:
+        with _shared_client_lock:
+            if _shared_client is None:
+                _shared_client = HttpClient()
+    return _shared_client
@@ -21,6 +21,8 @@ from typing import Any, Optional, Union
 import numpy as np
 
 from .base_engine import BaseEngine
+from .onnx_sessions import cpu_session_options, create_session
+from .utterance_pieces import PieceLimits
 
 
 logger = logging.getLogger(__name__)
@@ -272,6 +274,9 @@ class InflectEngine(BaseEngine):
 
     ``backend="auto"`` selects optimized PyTorch when CUDA is available, ONNX
     on CPU when it is installed, and PyTorch CPU otherwise.
+
+    Long sentences are synthesized in pieces (``piece_limits``; ``None``
+    disables it).
     """
 
     def __init__(
@@ -288,9 +293,12 @@ class InflectEngine(BaseEngine):
         variation: float = 0.667,
         seed: int = 0,
         cpu_threads: Optional[int] = None,
+        cache_optimized_model: bool = True,
+        onnx_cache_dir: Optional[Union[str, Path]] = None,
         warmup: bool = True,
         warmup_text: str = "Ready.",
         verify_files: bool = True,
+        piece_limits: Optional[PieceLimits] = PieceLimits(),
         debug: bool = False,
     ) -> None:
         self.debug = bool(debug)
@@ -314,6 +322,11 @@ class InflectEngine(BaseEngine):
         self.variation = self._validate_variation(variation)
         self.seed = self._validate_seed(seed)
         self.cpu_threads = self._validate_cpu_threads(cpu_threads)
+        self.cache_optimized_model = bool(cache_optimized_model)
+        self.onnx_cache_dir = (
+            str(Path(onnx_cache_dir).expanduser()) if onnx_cache_dir is not None else None
+        )
+        self.piece_limits = piece_limits
         self.voice = InflectVoice()
         if voice is not None:
             self.set_voice(voice)
@@ -343,6 +356,7 @@ class InflectEngine(BaseEngine):
     def post_init(self) -> None:
         self.engine_name = "inflect"
         self.preload_sentence_tokenizer = True
+        self.whole_utterance_only = True
 
     @staticmethod
     def _validate_speed(value: Real) -> float:
@@ -539,26 +553,31 @@ class InflectEngine(BaseEngine):
         if selected_provider != "CPUExecutionProvider":
             providers.append("CPUExecutionProvider")
 
-        options = ort.SessionOptions()
-        options.intra_op_num_threads = self.cpu_threads
-        options.inter_op_num_threads = 1
-        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
-        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
-
         runtime = entry_module.InflectONNX.__new__(entry_module.InflectONNX)
-        onnx_dir = self.model_dir / "onnx"
-        runtime.duration = ort.InferenceSession(
-            str(onnx_dir / "duration.onnx"),
-            sess_options=options,
-            providers=providers,
-        )
-        runtime.decode = ort.InferenceSession(
-            str(onnx_dir / "decode.onnx"),
-            sess_options=options,
-            providers=providers,
-        )
+        runtime.duration = self._create_onnx_session(ort, "onnx/duration.onnx", providers)
+        runtime.decode = self._create_onnx_session(ort, "onnx/decode.onnx", providers)
         return runtime
 
+    def _create_onnx_session(self, ort: Any, relative: str, providers: list[str]) -> Any:
+        options = cpu_session_options(ort, self.cpu_threads)
+        model_path = self.model_dir / relative
+        if not self.cache_optimized_model:
+            return ort.InferenceSession(
+                str(model_path),
+                sess_options=options,
+                providers=providers,
+            )
+        # Verified files match the pinned digest, which saves hashing them again.
+        digest = _PINNED_HASHES["onnx"][relative] if self.verify_files else None
+        return create_session(
+            ort,
+            model_path,
+            options,
+            providers,
+            cache_dir=self.onnx_cache_dir,
+            model_digest=digest,
+        )
+
     def get_stream_info(self) -> tuple[int, int, int]:
         import pyaudio
 
@@ -599,7 +618,7 @@ class InflectEngine(BaseEngine):
                     )
                 pcm = (np.clip(audio, -1.0, 1.0) * 32767.0).astype(np.int16)
                 self.audio_duration += audio.size / sample_rate
-                self.queue.put(pcm.tobytes())
+                self._queue_pcm16(pcm)
                 return True
             except Exception as exc:
                 if self.debug:
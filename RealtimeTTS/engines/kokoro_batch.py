@@ -0,0 +1,102 @@
+"""
+Sentence packing for KokoroEngine.synthesize_batch.
+
+Kokoro-82M takes one phoneme sequence of up to 510 phonemes per forward pass
+and has no padded batch mode. To render many short sentences with fewer
+passes, consecutive sentences are packed into one sequence, separated by a
+space, the same way KPipeline joins the sentences of a paragraph. The
+predicted phoneme durations then locate every sentence in the output audio,
+which is cut in the middle of the separating pause.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .kokoro_onnx import MAX_PHONEMES
+
+SEPARATOR = " "
+
+
+def pack_sentences(phonemes: Sequence[Optional[str]], max_phonemes: int = MAX_PHONEMES) -> List[List[int]]:
+    """
+    Groups consecutive sentence indices whose joined phonemes fit into one model input.
+
+    Args:
+        phonemes: Phonemes per sentence. None or an empty string marks a
+            sentence that cannot be packed; it gets a group of its own.
+        max_phonemes (int): Length limit of the joined phonemes.
+
+    Returns:
+        List of groups of sentence indices, in order.
+    """
+    groups = []
+    current: List[int] = []
+    length = 0
+    for index, sentence_phonemes in enumerate(phonemes):
+        if not sentence_phonemes:
+            if current:
+                groups.append(current)
+                current, length = [], 0
+            groups.append([index])
+            continue
+        added = len(sentence_phonemes) + (len(SEPARATOR) if current else 0)
+        if current and length + added > max_phonemes:
+            groups.append(current)
+            current, length = [], 0
+            added = len(sentence_phonemes)
+        current.append(index)
+        length += added
+    if current:
+        groups.append(current)
+    return groups
+
+
+def split_packed_output(
+    audio: np.ndarray,
+    durations: np.ndarray,
+    id_counts: Sequence[int],
+    separator_ids: int = 1,
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Splits the output of a packed model pass back into sentences.
+
+    Args:
+        audio (np.ndarray): Audio of the packed pass.
+        durations (np.ndarray): Predicted frames per input id, including the
+            start and end ids the model adds.
+        id_counts: Number of input ids per sentence.
+        separator_ids (int): Input ids between two sentences.
+
+    Returns:
+        Per sentence its audio and its durations in the layout
+        KPipeline.join_timestamps expects for a single sentence: lead-in
+        frames, one entry per input id, trailing frames.
+    """
+    durations = np.asarray(durations, dtype=np.float64).reshape(-1)
+    edges = np.concatenate([[0.0], np.cumsum(durations)])
+    samples_per_frame = len(audio) / edges[-1] if edges[-1] > 0 else 0.0
+
+    spans = []
+    cuts = [0.0]
+    position = 1  # id 0 is the start id
+    for index, count in enumerate(id_counts):
+        spans.append((position, position + count))
+        position += count
+        if index < len(id_counts) - 1:
+            cuts.append((edges[position] + edges[position + separator_ids]) / 2)
+            position += separator_ids
+    cuts.append(edges[-1])
+
+    results = []
+    for index, (first, last) in enumerate(spans):
+        begin, end = cuts[index], cuts[index + 1]
+        start_sample = int(round(begin * samples_per_frame))
+        end_sample = len(audio) if index == len(spans) - 1 else int(round(end * samples_per_frame))
+        sentence_durations = np.concatenate([
+            [edges[first] - begin],
+            durations[first:last],
+            [end - edges[last]],
+        ])
+        results.append((audio[start_sample:end_sample], sentence_durations))
+    return results
@@ -6,11 +6,17 @@ Requires:
 """
 
 from .base_engine import BaseEngine, TimingInfo
+from .g2p_cache import G2PCache, G2PCacheStats
+from .kokoro_batch import SEPARATOR, pack_sentences, split_packed_output
+from .kokoro_onnx import DEFAULT_ONNX_MODEL, KokoroOnnxModel
+from collections import namedtuple
+from importlib import metadata
 from queue import Queue
-from typing import List, Union
+from typing import List, Optional, Union
 import numpy as np
 import traceback
 import pyaudio
+import copy
 import time
 
 # Make sure torch is installed
@@ -20,6 +26,9 @@ import re
 # Import the text-to-speech pipeline from the Kokoro package.
 from kokoro import KPipeline
 
+# Pipeline result of the ONNX backend, audio is a float32 numpy array.
+_OnnxResult = namedtuple("_OnnxResult", ["graphemes", "phonemes", "tokens", "audio"])
+
 
 def get_lang_code_from_voice(voice_name: str) -> str:
     """
@@ -97,6 +106,13 @@ class KokoroEngine(BaseEngine):
             extra_end_ms: int = 15,
             fade_in_ms: int = 10,
             fade_out_ms: int = 10,
+            g2p_cache_size: int = 4096,
+            g2p_cache_path: Optional[str] = None,
+            g2p_cache: Optional[G2PCache] = None,
+            backend: str = "torch",
+            onnx_model_path: Optional[str] = None,
+            onnx_model_file: str = DEFAULT_ONNX_MODEL,
+            onnx_threads: Optional[int] = None,
             debug: bool = False):
         """
         Initializes the KokoroEngine with default settings.
@@ -105,13 +121,32 @@ class KokoroEngine(BaseEngine):
             default_lang_code (str): Fallback language code if the voice doesn't specify one.
             default_voice (str): Default voice to use (e.g., "af_heart").
             default_speed (float): Default speed factor for speech synthesis.
+            g2p_cache_size (int): Number of text chunks whose phonemes and tokens
+                are kept in memory. 0 turns G2P memoization off.
+            g2p_cache_path (str, optional): SQLite file to persist G2P results
+                across runs and processes.
+            g2p_cache (G2PCache, optional): Cache to use instead of creating one
+                from g2p_cache_size and g2p_cache_path, e.g. to share it between engines.
+            backend (str): "torch" runs the PyTorch model, "onnx" runs a (by default
+                int8 quantized) ONNX Runtime export on the CPU without loading the
+                PyTorch weights.
+            onnx_model_path (str, optional): Local Kokoro .onnx file for the onnx backend.
+                Downloaded from Hugging Face if None.
+            onnx_model_file (str): File of the ONNX export to download, e.g.
+                "onnx/model.onnx" for fp32.
+            onnx_threads (int, optional): ONNX Runtime intra-op threads. Defaults to
+                the number of CPU cores.
             debug (bool): If True, prints detailed debug output.
         """
         super().__init__()
+        if backend not in ("torch", "onnx"):
+            raise ValueError("backend must be 'torch' or 'onnx'")
         self.debug = debug
         self.engine_name = "kokoro"
+        self.backend = backend
         self.queue = Queue()  # Queue for streaming audio data.
         self.pipelines = {}  # Cache pipelines based on language code.
+        self._frontends = {}  # Model-free copies of the pipelines for batching.
         self.speed = default_speed
         self.trim_silence = trim_silence
         self.silence_threshold = silence_threshold
@@ -119,14 +154,24 @@ class KokoroEngine(BaseEngine):
         self.extra_end_ms = extra_end_ms
         self.fade_in_ms = fade_in_ms
         self.fade_out_ms = fade_out_ms
+        self._owns_g2p_cache = g2p_cache is None and g2p_cache_size > 0
+        if self._owns_g2p_cache:
+            g2p_cache = G2PCache(max_entries=g2p_cache_size, path=g2p_cache_path)
+        self.g2p_cache = g2p_cache
+
+        # One session serves all language pipelines.
+        self.onnx_model = None
+        if self.backend == "onnx":
+            self.onnx_model = KokoroOnnxModel(
+                model_path=onnx_model_path,
+                model_file=onnx_model_file,
+                threads=onnx_threads,
+            )
 
         self.set_voice(voice)
 
         # Create and cache the pipeline for the current language.
-        self.pipelines[self.current_lang] = KPipeline(
-            repo_id = 'hexgrad/Kokoro-82M',
-            lang_code = self.current_lang
-        )
+        self._get_pipeline(self.current_lang)
 
         # Cache for formula-based blended voices: { formula_str: torch.FloatTensor }
         self.blended_voices = {}
@@ -198,12 +243,54 @@ class KokoroEngine(BaseEngine):
         if lang_code not in self.pipelines:
             if self.debug:
                 print(f"[KokoroEngine] Creating new pipeline for language code: {lang_code}")
-            self.pipelines[lang_code] = KPipeline(
+            pipeline = KPipeline(
                 repo_id='hexgrad/Kokoro-82M',
-                lang_code=lang_code
+                lang_code=lang_code,
+                model=self.backend == "torch"
             )
+            if self.g2p_cache is not None and getattr(pipeline, "g2p", None) is not None:
+                pipeline.g2p = self.g2p_cache.wrap(pipeline.g2p, self._g2p_namespace(lang_code))
+            self.pipelines[lang_code] = pipeline
         return self.pipelines[lang_code]
 
+    def _get_frontend(self, lang_code: str):
+        """
+        Returns a pipeline for the language that only runs the text front end.
+
+        It shares G2P and voices with the regular pipeline, but yields phonemes
+        and tokens without running the model.
+        """
+        pipeline = self._get_pipeline(lang_code)
+        if not pipeline.model:
+            return pipeline
+        if lang_code not in self._frontends:
+            frontend = copy.copy(pipeline)
+            frontend.model = False
+            self._frontends[lang_code] = frontend
+        return self._frontends[lang_code]
+
+    @staticmethod
+    def _g2p_namespace(lang_code: str) -> str:
+        """
+        Returns the G2P cache namespace. Library versions are part of it, so an
+        upgrade of kokoro or misaki does not serve stale phonemes.
+        """
+        versions = []
+        for package in ("kokoro", "misaki"):
+            try:
+                versions.append(f"{package}-{metadata.version(package)}")
+            except metadata.PackageNotFoundError:
+                versions.append(f"{package}-none")
+        return f"kokoro:{lang_code}:" + ":".join(versions)
+
+    def get_g2p_stats(self) -> Optional[G2PCacheStats]:
+        """
+        Returns hit and miss counts of the G2P cache, or None if it is turned off.
+        """
+        if self.g2p_cache is None:
+            return None
+        return self.g2p_cache.stats()
+
     def _parse_mixed_voice_formula(self, formula: str, pipeline: KPipeline) -> torch.FloatTensor:
         """
         Parse a formula like "0.3*af_sarah + 0.7*am_adam" to create a weighted blend of voice Tensors.
@@ -259,6 +346,9 @@ class KokoroEngine(BaseEngine):
         self.blended_voices[formula] = sum_tensor
         return sum_tensor
 
+    def post_init(self):
+        self.can_batch = True
+
     def get_stream_info(self):
         """
         Provides the PyAudio stream configuration for the synthesized audio.
@@ -308,7 +398,10 @@ class KokoroEngine(BaseEngine):
 
         try:
             # Generate audio in chunks from the pipeline
-            generator = pipeline(text, voice=voice_arg, speed=self.speed)
+            if self.backend == "onnx":
+                generator = self._generate_onnx(pipeline, text, voice_arg)
+            else:
+                generator = pipeline(text, voice=voice_arg, speed=self.speed)
 
         except Exception as e:
             traceback.print_exc()
@@ -318,66 +411,10 @@ class KokoroEngine(BaseEngine):
         try:
             if generator and generator is not None:
                 for index, result in enumerate(generator):
-                    graphemes = result.graphemes  # str
-                    phonemes = result.phonemes  # str
-                    audio_float32 = result.audio.cpu().numpy()
-                    tokens = result.tokens  # List[en.MToken]
-
-                    if self.debug:
-                        if graphemes:
-                            print(f"Graphemes available for chunk {index}: {graphemes}")
-                        else:
-                            print(f"No graphemes available for chunk {index}")
-                        if phonemes:
-                            print(f"Phonemes available for chunk {index}: {phonemes}")
-                        else:
-                            print(f"No phonemes available for chunk {index}")
-
-                    if tokens:
-                        if self.debug:
-                            print(f"Timing tokens available for chunk {index}:")
-                        for t in tokens:
-                            if t and t.start_ts is not None and t.end_ts is not None and t.text is not None:
-                                timingInfo = TimingInfo(
-                                    t.start_ts + self.audio_duration,
-                                    t.end_ts + self.audio_duration,
-                                    t.text
-                                )
-                                self.timings.put(timingInfo)
-                                if self.debug:
-                                    print(f"Token: {t.text} ({t.start_ts:.2f}s - {t.end_ts:.2f}s)")
-                                continue
-
-                            if self.debug:
-                                if not t:
-                                    print(f"Token is None for chunk {index}")
-                                else:
-                                    print(f"Token: {t}")
-                                if not t.start_ts:
-                                    print(f"Token start_ts is None for chunk {index}")
-                                if not t.end_ts:
-                                    print(f"Token end_ts is None for chunk {index}")
-                                if not t.text:
-                                    print(f"Token text is None for chunk {index}")
-                                if not self.audio_duration:
-                                    print(f"Audio duration is None for chunk {index}")
-                    else:
-                        if self.debug:
-                            print(f"No timing tokens available for chunk {index}")
-
-                    if self.trim_silence:
-                        audio_float32 = self._trim_silence(
-                            audio_float32,
-                            silence_threshold=self.silence_threshold,
-                            extra_start_ms=self.extra_start_ms,
-                            extra_end_ms=self.extra_end_ms,
-                            fade_in_ms=self.fade_in_ms,
-                            fade_out_ms=self.fade_out_ms,
-                        )
-                    audio_int16 = (audio_float32 * 32767).astype(np.int16).tobytes()
-                    audio_length_in_seconds = len(audio_float32) / 24000
-                    self.audio_duration += audio_length_in_seconds
-                    self.queue.put(audio_int16)
+                    audio_float32 = result.audio
+                    if not isinstance(audio_float32, np.ndarray):
+                        audio_float32 = audio_float32.cpu().numpy()
+                    self._emit_chunk(index, result.graphemes, result.phonemes, audio_float32, result.tokens)
 
                 if self.debug:
                     duration = time.time() - start_time
@@ -393,6 +430,166 @@ class KokoroEngine(BaseEngine):
             print(f"[KokoroEngine] Error generating audio: {e}")
             return False
 
+    def _emit_chunk(self, index: int, graphemes: str, phonemes: str, audio_float32: np.ndarray, tokens):
+        """
+        Queues the word timings and the (trimmed) audio of one synthesized chunk.
+
+        Args:
+            index (int): Chunk index within the sentence, for debug output.
+            graphemes (str): Text of the chunk.
+            phonemes (str): Phonemes of the chunk.
+            audio_float32 (np.ndarray): Audio of the chunk at 24 kHz.
+            tokens (List[en.MToken]): Tokens with timestamps relative to the chunk, or None.
+        """
+        if self.debug:
+            if graphemes:
+                print(f"Graphemes available for chunk {index}: {graphemes}")
+            else:
+                print(f"No graphemes available for chunk {index}")
+            if phonemes:
+                print(f"Phonemes available for chunk {index}: {phonemes}")
+            else:
+                print(f"No phonemes available for chunk {index}")
+
+        if tokens:
+            if self.debug:
+                print(f"Timing tokens available for chunk {index}:")
+            for t in tokens:
+                if t and t.start_ts is not None and t.end_ts is not None and t.text is not None:
+                    timingInfo = TimingInfo(
+                        t.start_ts + self.audio_duration,
+                        t.end_ts + self.audio_duration,
+                        t.text
+                    )
+                    self.timings.put(timingInfo)
+                    if self.debug:
+                        print(f"Token: {t.text} ({t.start_ts:.2f}s - {t.end_ts:.2f}s)")
+                    continue
+
+                if self.debug:
+                    if not t:
+                        print(f"Token is None for chunk {index}")
+                    else:
+                        print(f"Token: {t}")
+                    if not t.start_ts:
+                        print(f"Token start_ts is None for chunk {index}")
+                    if not t.end_ts:
+                        print(f"Token end_ts is None for chunk {index}")
+                    if not t.text:
+                        print(f"Token text is None for chunk {index}")
+                    if not self.audio_duration:
+                        print(f"Audio duration is None for chunk {index}")
+        else:
+            if self.debug:
+                print(f"No timing tokens available for chunk {index}")
+
+        if self.trim_silence:
+            audio_float32 = self._trim_silence(
+                audio_float32,
+                silence_threshold=self.silence_threshold,
+                extra_start_ms=self.extra_start_ms,
+                extra_end_ms=self.extra_end_ms,
+                fade_in_ms=self.fade_in_ms,
+                fade_out_ms=self.fade_out_ms,
+            )
+        audio_int16 = (audio_float32 * 32767).astype(np.int16).tobytes()
+        audio_length_in_seconds = len(audio_float32) / 24000
+        self.audio_duration += audio_length_in_seconds
+        self.queue.put(audio_int16)
+
+    def synthesize_batch(self, sentences: List[str], sentence_count: int = 0):
+        """
+        Synthesizes several sentences with as few model passes as possible.
+
+        Consecutive sentences that fit into one model input are packed and
+        synthesized together, the audio is split back per sentence by the
+        predicted durations. Longer sentences are synthesized one by one.
+
+        Args:
+            sentences (List[str]): Sentences to synthesize.
+            sentence_count (int): The count of sentences synthesized before this batch.
+
+        Yields:
+            bool: Success per sentence, after its audio and timings are queued.
+        """
+        try:
+            pipeline = self._get_pipeline(self.current_lang)
+            voice_arg: Union[str, torch.FloatTensor] = self.current_voice
+            if "*" in self.current_voice:
+                voice_arg = self._parse_mixed_voice_formula(self.current_voice, pipeline)
+            frontend = self._get_frontend(self.current_lang)
+            chunks = [
+                [result for result in frontend(sentence, speed=self.speed) if result.phonemes]
+                for sentence in sentences
+            ]
+        except Exception as e:
+            traceback.print_exc()
+            print(f"[KokoroEngine] Error preparing batch, synthesizing sentences one by one: {e}")
+            yield from super().synthesize_batch(sentences, sentence_count)
+            return
+
+        packable = [sentence_chunks[0].phonemes if len(sentence_chunks) == 1 else None for sentence_chunks in chunks]
+        for group in pack_sentences(packable):
+            outputs = None
+            if len(group) > 1:
+                try:
+                    outputs = self._synthesize_packed([chunks[index][0] for index in group], pipeline, voice_arg)
+                except Exception as e:
+                    traceback.print_exc()
+                    print(f"[KokoroEngine] Error synthesizing packed sentences, synthesizing them one by one: {e}")
+
+            for position, index in enumerate(group):
+                if outputs is None:
+                    yield self.synthesize(sentences[index], sentence_count + index + 1)
+                    continue
+
+                super().synthesize(sentences[index], sentence_count + index + 1)
+                chunk = chunks[index][0]
+                audio_float32, durations = outputs[position]
+                if chunk.tokens:
+                    KPipeline.join_timestamps(chunk.tokens, durations)
+                self._emit_chunk(0, chunk.graphemes, chunk.phonemes, audio_float32, chunk.tokens)
+                yield True
+
+    def _synthesize_packed(self, chunks, pipeline: KPipeline, voice_arg: Union[str, torch.FloatTensor]):
+        """
+        Runs one model pass over the joined phonemes of chunks and splits the result.
+
+        Returns:
+            List of (audio, durations) per chunk, or None if the model does not
+            report durations.
+        """
+        phonemes = SEPARATOR.join(chunk.phonemes for chunk in chunks)
+        if self.backend == "onnx":
+            if not self.onnx_model.returns_durations:
+                return None
+            vocab = self.onnx_model.vocab
+            voice_pack = pipeline.load_voice(voice_arg).cpu().numpy()
+            audio, durations = self.onnx_model.infer(phonemes, voice_pack, self.speed)
+        else:
+            model = pipeline.model
+            vocab = model.vocab
+            voice_pack = pipeline.load_voice(voice_arg).to(model.device)
+            output = KPipeline.infer(model, phonemes, voice_pack, self.speed)
+            audio = output.audio.cpu().numpy()
+            durations = output.pred_dur.cpu().numpy()
+
+        id_counts = [sum(phoneme in vocab for phoneme in chunk.phonemes) for chunk in chunks]
+        return split_packed_output(audio, durations, id_counts, separator_ids=int(SEPARATOR in vocab))
+
+    def _generate_onnx(self, pipeline: KPipeline, text: str, voice_arg: Union[str, torch.FloatTensor]):
+        """
+        Runs the pipeline front end only and synthesizes each chunk with the ONNX model.
+        """
+        voice_pack = pipeline.load_voice(voice_arg).cpu().numpy()
+        for result in pipeline(text, speed=self.speed):
+            if not result.phonemes:
+                continue
+            audio, durations = self.onnx_model.infer(result.phonemes, voice_pack, self.speed)
+            if durations is not None and result.tokens:
+                KPipeline.join_timestamps(result.tokens, durations)
+            yield _OnnxResult(result.graphemes, result.phonemes, result.tokens, audio)
+
     def set_voice(self, voice: Union[str, KokoroVoice]):
         """
         Updates the current voice or voice formula. If it's a single voice (e.g. "af_heart"),
@@ -503,6 +700,8 @@ class KokoroEngine(BaseEngine):
         """
         if self.debug:
             print("[KokoroEngine] Shutdown called.")
+        if self._owns_g2p_cache:
+            self.g2p_cache.close()
 
     def set_voice_parameters(self, **voice_parameters):
         """
@@ -0,0 +1,127 @@
+"""
+ONNX Runtime backend for KokoroEngine.
+
+The KPipeline front end (text chunking, G2P, voice packs) is kept, but created
+with model=False so the PyTorch weights are never loaded. The acoustic model
+runs as one ONNX Runtime session shared by all language pipelines; the model
+itself is language independent.
+
+The default model is the int8 quantized export of Kokoro-82M that also returns
+the predicted phoneme durations, which KPipeline.join_timestamps turns into
+word timings exactly like on the PyTorch path.
+"""
+
+import json
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+
+DEFAULT_ONNX_REPO_ID = "onnx-community/Kokoro-82M-v1.0-ONNX-timestamped"
+DEFAULT_ONNX_MODEL = "onnx/model_quantized.onnx"
+# Phoneme vocabulary of the model, shared with the PyTorch release.
+VOCAB_REPO_ID = "hexgrad/Kokoro-82M"
+MAX_PHONEMES = 510
+
+
+class KokoroOnnxModel:
+    """
+    ONNX Runtime session for Kokoro-82M with the KModel inputs and outputs.
+    """
+    def __init__(
+        self,
+        model_path: Optional[str] = None,
+        repo_id: str = DEFAULT_ONNX_REPO_ID,
+        model_file: str = DEFAULT_ONNX_MODEL,
+        vocab: Optional[dict] = None,
+        threads: Optional[int] = None,
+        providers: Optional[list] = None,
+    ):
+        """
+        Args:
+            model_path (str, optional): Local .onnx file. Downloaded from repo_id if None.
+            repo_id (str): Hugging Face repository of the ONNX export.
+            model_file (str): File in repo_id, e.g. "onnx/model_quantized.onnx" (int8)
+                or "onnx/model.onnx" (fp32).
+            vocab (dict, optional): Phoneme to id mapping. Read from the Kokoro-82M
+                config.json if None.
+            threads (int, optional): Intra-op threads. Defaults to the number of CPU cores.
+            providers (list, optional): ONNX Runtime execution providers.
+        """
+        import onnxruntime as ort
+
+        if model_path is None:
+            from huggingface_hub import hf_hub_download
+
+            model_path = hf_hub_download(repo_id=repo_id, filename=model_file)
+        if vocab is None:
+            vocab = load_vocab()
+        self.vocab = vocab
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = threads or os.cpu_count() or 1
+        options.inter_op_num_threads = 1
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            str(model_path),
+            sess_options=options,
+            providers=providers or ["CPUExecutionProvider"],
+        )
+
+        inputs = {node.name: node for node in self.session.get_inputs()}
+        # onnx-community exports call the ids "input_ids", kokoro-onnx calls them "tokens"
+        self._ids_name = "input_ids" if "input_ids" in inputs else "tokens"
+        self._output_names = [node.name for node in self.session.get_outputs()]
+
+    @property
+    def returns_durations(self) -> bool:
+        return "durations" in self._output_names
+
+    def encode(self, phonemes: str) -> np.ndarray:
+        """
+        Maps a phoneme string to the padded id sequence the model expects.
+        """
+        ids = [self.vocab[p] for p in phonemes if p in self.vocab]
+        return np.array([[0, *ids[:MAX_PHONEMES], 0]], dtype=np.int64)
+
+    def infer(self, phonemes: str, voice_pack: np.ndarray, speed: float = 1.0) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Synthesizes one phoneme chunk.
+
+        Args:
+            phonemes (str): Phonemes of the chunk, at most 510.
+            voice_pack (np.ndarray): Voice pack of shape (510, 1, 256).
+            speed (float): Speed factor.
+
+        Returns:
+            Tuple of the float32 waveform at 24 kHz and the per-id durations in
+            frames (None if the model does not return them).
+        """
+        input_ids = self.encode(phonemes)
+        # Like KPipeline.infer: the style vector is chosen by phoneme count.
+        style = voice_pack[min(len(phonemes), MAX_PHONEMES) - 1].reshape(1, -1).astype(np.float32)
+        outputs = self.session.run(
+            None,
+            {
+                self._ids_name: input_ids,
+                "style": style,
+                "speed": np.array([speed], dtype=np.float32),
+            },
+        )
+        results = dict(zip(self._output_names, outputs))
+        audio = np.asarray(results.get("waveform", outputs[0]), dtype=np.float32).reshape(-1)
+        durations = results.get("durations")
+        if durations is not None:
+            durations = np.asarray(durations).reshape(-1)
+        return audio, durations
+
+
+def load_vocab(repo_id: str = VOCAB_REPO_ID) -> dict:
+    """
+    Returns the phoneme vocabulary from a Kokoro config.json.
+    """
+    from huggingface_hub import hf_hub_download
+
+    with open(hf_hub_download(repo_id=repo_id, filename="config.json"), encoding="utf-8") as handle:
+        return json.load(handle)["vocab"]
@@ -8,6 +8,8 @@ import numpy as np
 import torch
 
 from .base_engine import BaseEngine
+from .conditioning_cache import ConditioningCache, get_conditioning_cache, make_key, to_device
+from .utterance_pieces import PieceLimits
 
 
 def _disable_torchcodec_for_windows():
@@ -54,7 +56,9 @@ class LuxTTSEngine(BaseEngine):
     """
     LuxTTS engine for RealtimeTTS.
 
-    LuxTTS is based on ZipVoice/flow matching and returns a full utterance.
+    LuxTTS is based on ZipVoice/flow matching and returns a full utterance,
+    so long sentences are synthesized in pieces (`piece_limits`, None
+    disables it).
     It does not currently expose native mid-inference cancellation; stop requests
     are honored before queueing audio if they arrive while generation is running.
     """
@@ -75,6 +79,8 @@ class LuxTTSEngine(BaseEngine):
         target_rms: float = 0.01,
         use_autocast: bool = False,
         autocast_dtype: str = "float16",
+        conditioning_cache: Optional[ConditioningCache] = None,
+        piece_limits: Optional[PieceLimits] = PieceLimits(),
     ):
         self.lux_root = None
         self._added_sys_path = None
@@ -113,10 +119,11 @@ class LuxTTSEngine(BaseEngine):
         self.use_autocast = use_autocast
         self.autocast_dtype = autocast_dtype
         self.sampling_rate = 24000 if self.return_smooth else 48000
+        self.piece_limits = piece_limits
 
         self.voice = None
         self._encoded_prompt = None
-        self._prompt_cache = {}
+        self.conditioning_cache = conditioning_cache or get_conditioning_cache()
 
         _disable_torchcodec_for_windows()
         logging.info("Loading LuxTTS model from %s on %s", model_path, device)
@@ -126,6 +133,7 @@ class LuxTTSEngine(BaseEngine):
 
     def post_init(self):
         self.engine_name = "luxtts"
+        self.whole_utterance_only = True
 
     def get_stream_info(self):
         import pyaudio
@@ -133,31 +141,24 @@ class LuxTTSEngine(BaseEngine):
         return pyaudio.paInt16, 1, self.sampling_rate
 
     def _prompt_cache_key(self, voice: LuxTTSVoice):
-        try:
-            mtime = os.path.getmtime(voice.prompt_wav_path)
-        except OSError:
-            mtime = 0
-        return (
-            os.path.abspath(voice.prompt_wav_path),
-            mtime,
-            self.prompt_duration,
-            self.target_rms,
+        return make_key(
+            f"luxtts:{self.model_path}",
+            [voice.prompt_wav_path],
+            prompt_duration=self.prompt_duration,
+            target_rms=self.target_rms,
         )
 
     def _encode_prompt(self, voice: LuxTTSVoice):
-        key = self._prompt_cache_key(voice)
-        cached = self._prompt_cache.get(key)
-        if cached is not None:
-            return cached
-
-        logging.info("Encoding LuxTTS prompt: %s", voice.prompt_wav_path)
-        encoded = self._model.encode_prompt(
-            voice.prompt_wav_path,
-            duration=self.prompt_duration,
-            rms=self.target_rms,
-        )
-        self._prompt_cache[key] = encoded
-        return encoded
+        def encode():
+            logging.info("Encoding LuxTTS prompt: %s", voice.prompt_wav_path)
+            return self._model.encode_prompt(
+                voice.prompt_wav_path,
+                duration=self.prompt_duration,
+                rms=self.target_rms,
+            )
+
+        encoded = self.conditioning_cache.get_or_create(self._prompt_cache_key(voice), encode)
+        return to_device(encoded, self.device)
 
     def set_voice(self, voice: Union[LuxTTSVoice, str]):
         if not isinstance(voice, LuxTTSVoice):
@@ -240,14 +241,13 @@ class LuxTTSEngine(BaseEngine):
             if audio.ndim > 1:
                 audio = audio[0]
             audio = np.clip(audio, -1.0, 1.0)
-            self.queue.put((audio * 32767).astype(np.int16).tobytes())
+            self._queue_pcm16((audio * 32767).astype(np.int16))
             return True
         except Exception:
             logging.exception("LuxTTS synthesis failed")
             return False
 
     def shutdown(self):
-        self._prompt_cache.clear()
         self._encoded_prompt = None
         if hasattr(self, "_model"):
             del self._model
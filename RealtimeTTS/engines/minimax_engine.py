@@ -1,7 +1,9 @@
 from .base_engine import BaseEngine
+from .http_client import get_http_client, iter_sse_data
 from typing import Union
 import requests
 import pyaudio
+import json
 import time
 import os
 import logging
@@ -30,6 +32,10 @@ class MiniMaxEngine(BaseEngine):
     multiple voice presets and two model variants (speech-2.8-hd for quality,
     speech-2.8-turbo for speed).
 
+    With streaming=True the API streams server-sent events. Each event carries
+    a hex encoded audio fragment that is decoded and queued as soon as it
+    arrives, so time to first audio no longer equals the full synthesis time.
+
     API Docs: https://platform.minimaxi.com/document/T2A%20V2
     """
 
@@ -57,6 +63,9 @@ class MiniMaxEngine(BaseEngine):
         speed: float = 1.0,
         volume: float = 1.0,
         pitch: int = 0,
+        streaming: bool = False,
+        audio_format: str = "mp3",
+        sample_rate: int = 32000,
         debug: bool = False,
     ):
         """
@@ -72,6 +81,12 @@ class MiniMaxEngine(BaseEngine):
             speed (float, optional): Speech speed (0.5 to 2.0). Defaults to 1.0.
             volume (float, optional): Audio volume (0.1 to 10.0). Defaults to 1.0.
             pitch (int, optional): Pitch adjustment (-12 to 12 semitones). Defaults to 0.
+            streaming (bool, optional): If True, requests the streaming (SSE) output and
+                queues audio per event instead of waiting for the whole response. Defaults to False.
+            audio_format (str, optional): "mp3" or "pcm". "pcm" requests raw 16-bit PCM,
+                which plays without an mpeg decoder. Defaults to "mp3".
+            sample_rate (int, optional): Output sample rate (8000, 16000, 22050, 24000,
+                32000 or 44100). Defaults to 32000.
             debug (bool, optional): If True, prints debugging information.
         """
         self.api_key = api_key or os.environ.get("MINIMAX_API_KEY")
@@ -80,14 +95,20 @@ class MiniMaxEngine(BaseEngine):
                 "MiniMax API key is required. Provide it via api_key parameter "
                 "or MINIMAX_API_KEY environment variable."
             )
+        if audio_format not in ("mp3", "pcm"):
+            raise ValueError(f"Unsupported MiniMax audio_format '{audio_format}', use 'mp3' or 'pcm'.")
 
         self.model = model
         self.voice = voice
         self.speed = speed
         self.volume = volume
         self.pitch = pitch
+        self.streaming = streaming
+        self.audio_format = audio_format
+        self.sample_rate = sample_rate
         self.debug = debug
         self.queue = None
+        self.http = get_http_client()
 
         self.base_url = "https://api.minimax.io/v1/t2a_v2"
 
@@ -97,12 +118,14 @@ class MiniMaxEngine(BaseEngine):
     def get_stream_info(self):
         """
         Returns the PyAudio stream configuration for MiniMax audio.
-        MiniMax returns MP3 audio.
+        MiniMax returns MP3 audio unless PCM output was requested.
 
         Returns:
             tuple: (format, channels, sample_rate)
         """
-        return pyaudio.paCustomFormat, 1, 32000
+        if self.audio_format == "pcm":
+            return pyaudio.paInt16, 1, self.sample_rate
+        return pyaudio.paCustomFormat, 1, self.sample_rate
 
     def synthesize(self, text: str, sentence_count: int = 0) -> bool:
         """
@@ -137,54 +160,142 @@ class MiniMaxEngine(BaseEngine):
                 "pitch": self.pitch,
             },
             "audio_setting": {
-                "format": "mp3",
+                "format": self.audio_format,
+                "sample_rate": self.sample_rate,
             },
         }
 
+        if self.streaming:
+            payload["stream"] = True
+            # The last event would otherwise repeat the complete audio.
+            payload["stream_options"] = {"exclude_aggregated_audio": True}
+            return self._synthesize_streaming(headers, payload, start_time)
+
         try:
-            response = requests.post(
+            response = self.http.post(
                 self.base_url,
                 headers=headers,
                 json=payload,
                 timeout=60,
             )
             response.raise_for_status()
-            result = response.json()
-
-            # Check for API errors
-            base_resp = result.get("base_resp", {})
-            status_code = base_resp.get("status_code", 0)
-            if status_code != 0:
-                error_msg = base_resp.get("status_msg", "Unknown error")
-                logging.error(f"MiniMax TTS API error: {error_msg} (code: {status_code})")
-                if self.debug:
-                    print(f"{COLOR_YELLOW}MiniMax API error: {error_msg}{COLOR_RESET}")
-                return False
+            return self._queue_response_audio(response.json(), start_time)
 
-            # Extract audio data (hex-encoded MP3 bytes)
-            audio_hex = result.get("data", {}).get("audio", "")
-            if not audio_hex:
-                logging.error("MiniMax TTS returned empty audio data")
-                if self.debug:
-                    print(f"{COLOR_YELLOW}MiniMax returned empty audio{COLOR_RESET}")
-                return False
+        except requests.exceptions.RequestException as e:
+            logging.error(f"MiniMax TTS request error: {e}")
+            if self.debug:
+                print(f"{COLOR_YELLOW}MiniMax request error: {e}{COLOR_RESET}")
+            return False
+        except ValueError as e:
+            logging.error(f"MiniMax TTS decode error: {e}")
+            if self.debug:
+                print(f"{COLOR_YELLOW}MiniMax decode error: {e}{COLOR_RESET}")
+            return False
 
-            # Decode hex string to bytes
-            audio_bytes = bytes.fromhex(audio_hex)
+    def _queue_response_audio(self, result: dict, start_time: float) -> bool:
+        """
+        Queues the audio of a complete (non-stream) JSON response.
+        """
+        # Check for API errors
+        if not self._check_base_resp(result):
+            return False
 
-            elapsed = time.time() - start_time
+        # Extract audio data (hex-encoded MP3 bytes)
+        audio_hex = (result.get("data") or {}).get("audio", "")
+        if not audio_hex:
+            logging.error("MiniMax TTS returned empty audio data")
             if self.debug:
-                print(
-                    f"MiniMax time to audio: {COLOR_YELLOW}{elapsed:.2f}{COLOR_RESET} seconds "
-                    f"({len(audio_bytes)} bytes)"
-                )
+                print(f"{COLOR_YELLOW}MiniMax returned empty audio{COLOR_RESET}")
+            return False
 
-            if self.stop_synthesis_event.is_set():
-                return False
+        # Decode hex string to bytes
+        audio_bytes = bytes.fromhex(audio_hex)
+
+        elapsed = time.time() - start_time
+        if self.debug:
+            print(
+                f"MiniMax time to audio: {COLOR_YELLOW}{elapsed:.2f}{COLOR_RESET} seconds "
+                f"({len(audio_bytes)} bytes)"
+            )
+
+        if self.stop_synthesis_event.is_set():
+            return False
+
+        # Put audio data in queue (MP3 or PCM bytes)
+        self.queue.put(audio_bytes)
+        self._add_audio_duration(len(audio_bytes))
+
+        return True
 
-            # Put audio data in queue (MP3 bytes)
-            self.queue.put(audio_bytes)
+    def _add_audio_duration(self, byte_count: int):
+        if self.audio_format == "pcm":
+            self.audio_duration += byte_count / (2 * self.sample_rate)
 
+    def _check_base_resp(self, result: dict) -> bool:
+        """
+        Logs API errors reported in base_resp. Returns True if the response is ok.
+        """
+        base_resp = result.get("base_resp") or {}
+        status_code = base_resp.get("status_code", 0)
+        if status_code != 0:
+            error_msg = base_resp.get("status_msg", "Unknown error")
+            logging.error(f"MiniMax TTS API error: {error_msg} (code: {status_code})")
+            if self.debug:
+                print(f"{COLOR_YELLOW}MiniMax API error: {error_msg}{COLOR_RESET}")
+            return False
+        return True
+
+    def _synthesize_streaming(self, headers: dict, payload: dict, start_time: float) -> bool:
+        """
+        Streams the synthesis response and queues each decoded audio fragment as it arrives.
+        """
+        first_chunk = True
+        # PCM fragments are queued in whole 16-bit samples, a trailing odd byte waits for the next event.
+        pending = b""
+        try:
+            with self.http.stream("POST", self.base_url, headers=headers, json=payload, timeout=60) as response:
+                response.raise_for_status()
+
+                # Errors, and responses of servers that ignore "stream", come as a
+                # plain JSON body instead of an event stream. The body is consumed here.
+                if "json" in response.headers.get("Content-Type", ""):
+                    return self._queue_response_audio(response.json(), start_time)
+
+                for data in iter_sse_data(response.iter_content(chunk_size=None)):
+                    if self.stop_synthesis_event.is_set():
+                        return False
+
+                    event = json.loads(data)
+                    if not self._check_base_resp(event):
+                        return False
+
+                    event_data = event.get("data") or {}
+                    # status 2 marks the final event, which only carries aggregated audio.
+                    if event_data.get("status") == 2:
+                        break
+
+                    audio_hex = event_data.get("audio")
+                    if not audio_hex:
+                        continue
+
+                    chunk = pending + bytes.fromhex(audio_hex)
+                    if self.audio_format == "pcm":
+                        cut = len(chunk) - len(chunk) % 2
+                        chunk, pending = chunk[:cut], chunk[cut:]
+                    if not chunk:
+                        continue
+
+                    if first_chunk and self.debug:
+                        elapsed = time.time() - start_time
+                        print(f"MiniMax time to first audio: {COLOR_YELLOW}{elapsed:.2f}{COLOR_RESET} seconds")
+                    first_chunk = False
+
+                    self.queue.put(chunk)
+                    self._add_audio_duration(len(chunk))
+
+            if first_chunk:
+                logging.error("MiniMax TTS stream returned no audio data")
+                return False
             return True
 
         except requests.exceptions.RequestException as e:
@@ -248,6 +359,8 @@ class MiniMaxEngine(BaseEngine):
             self.pitch = voice_parameters["pitch"]
         if "model" in voice_parameters:
             self.model = voice_parameters["model"]
+        if "streaming" in voice_parameters:
+            self.streaming = voice_parameters["streaming"]
 
     def shutdown(self):
         """
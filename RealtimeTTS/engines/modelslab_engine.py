@@ -1,6 +1,10 @@
 from .base_engine import BaseEngine
+from .http_client import get_http_client
+from .sentence_prefetcher import SentencePrefetcher
 import requests
 import pyaudio
+import json
+import threading
 import time
 import os
 
@@ -86,6 +90,10 @@ class ModelsLabEngine(BaseEngine):
         speed: float = 1.0,
         emotion: bool = False,
         debug: bool = False,
+        prefetch_sentences: int = 2,
+        poll_interval: float = 0.25,
+        max_poll_interval: float = 2.0,
+        poll_timeout: float = 60.0,
     ):
         """
         Initialize the ModelsLab TTS engine.
@@ -100,6 +108,15 @@ class ModelsLabEngine(BaseEngine):
             speed (float, optional): Speech speed. Defaults to 1.0.
             emotion (bool, optional): Enable emotion support (English only). Defaults to False.
             debug (bool, optional): Print debug information. Defaults to False.
+            prefetch_sentences (int, optional): Number of upcoming sentences submitted
+                as ModelsLab jobs while the current one plays. 0 disables prefetching.
+                Defaults to 2.
+            poll_interval (float, optional): First wait in seconds before polling a
+                processing job. Defaults to 0.25.
+            max_poll_interval (float, optional): Upper bound for the growing wait
+                between polls in seconds. Defaults to 2.0.
+            poll_timeout (float, optional): Seconds after which a processing job is
+                given up. Defaults to 60.
         """
         self.api_key = api_key or os.environ.get("MODELSLAB_API_KEY")
         if not self.api_key:
@@ -110,12 +127,23 @@ class ModelsLabEngine(BaseEngine):
         self.speed = speed
         self.emotion = emotion
         self.debug = debug
+        self.prefetch_sentences = prefetch_sentences
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.poll_timeout = poll_timeout
         
         self.queue = None
+        self.http = get_http_client()
         self.base_url = "https://modelslab.com/api/v6/voice/text_to_speech"
+        self._prefetcher = SentencePrefetcher(
+            self._fetch_audio,
+            max_ahead=max(1, prefetch_sentences),
+            name="modelslab",
+        )
 
     def post_init(self):
         self.engine_name = "modelslab"
+        self.can_prefetch = self.prefetch_sentences > 0
 
     def get_stream_info(self):
         """
@@ -127,10 +155,23 @@ class ModelsLabEngine(BaseEngine):
         """
         return pyaudio.paCustomFormat, 1, 22050
 
+    def prefetch(self, text: str):
+        """
+        Submits the ModelsLab job for an upcoming sentence in the background.
+
+        Args:
+            text (str): Text of the upcoming sentence.
+        """
+        payload = self._build_payload(text)
+        self._prefetcher.submit(self._payload_key(payload), payload, self._prefetcher.cancel_event)
+
     def synthesize(self, text: str, sentence_count: int = 0) -> bool:
         """
         Synthesizes text to audio stream.
 
+        Uses the prefetched job result if the sentence was announced through
+        prefetch() with the current voice settings, otherwise runs the job now.
+
         Args:
             text (str): Text to synthesize.
             sentence_count (int): The count of sentences synthesized so far, used for tracking progress.
@@ -144,75 +185,20 @@ class ModelsLabEngine(BaseEngine):
             print(f"{COLOR_GREEN}ModelsLab synthesizing: {text[:50]}{'...' if len(text) > 50 else ''}{COLOR_RESET}")
 
         start_time = time.time()
-        first_token_printed = False
-
-        # Build request payload
-        payload = {
-            "key": self.api_key,
-            "prompt": text,
-            "voice_id": self.voice,
-            "language": self.language,
-            "speed": self.speed,
-            "emotion": self.emotion,
-        }
+        payload = self._build_payload(text)
 
         try:
-            response = requests.post(self.base_url, json=payload, timeout=30)
-            response.raise_for_status()
-            result = response.json()
+            audio_data = self._prefetcher.take(
+                self._payload_key(payload), payload, self._prefetcher.cancel_event
+            )
 
             if self.debug:
-                print(f"{COLOR_WHITE}ModelsLab response: {result.get('status')}{COLOR_RESET}")
-
-            # Check if result is processing (async)
-            if result.get("status") == "processing":
-                fetch_url = result.get("fetch_result")
-                if not fetch_url:
-                    if self.debug:
-                        print(f"{COLOR_YELLOW}No fetch_url in processing response{COLOR_RESET}")
-                    return False
-                
-                # Poll for result
-                max_retries = 30
-                for _ in range(max_retries):
-                    time.sleep(1)
-                    poll_response = requests.get(fetch_url, timeout=30)
-                    poll_result = poll_response.json()
-                    
-                    if poll_result.get("status") == "success":
-                        result = poll_result
-                        break
-                    elif poll_result.get("status") == "error":
-                        if self.debug:
-                            print(f"{COLOR_YELLOW}ModelsLab error: {poll_result.get('message')}{COLOR_RESET}")
-                        return False
-
-            if result.get("status") != "success":
-                if self.debug:
-                    print(f"{COLOR_YELLOW}ModelsLab synthesis failed: {result.get('message')}{COLOR_RESET}")
-                return False
+                elapsed = time.time() - start_time
+                print(f"{COLOR_YELLOW}ModelsLab time to first audio: {elapsed:.2f} seconds{COLOR_RESET}")
 
-            # Get audio URL from result
-            audio_urls = result.get("output") or result.get("proxy_links") or result.get("links")
-            if not audio_urls or not audio_urls[0]:
-                if self.debug:
-                    print(f"{COLOR_YELLOW}No audio URL in response{COLOR_RESET}")
+            if self.stop_synthesis_event.is_set():
                 return False
 
-            audio_url = audio_urls[0]
-
-            # Download and stream audio
-            audio_response = requests.get(audio_url, timeout=30)
-            audio_response.raise_for_status()
-
-            audio_data = audio_response.content
-
-            if not first_token_printed:
-                elapsed = time.time() - start_time
-                if self.debug:
-                    print(f"{COLOR_YELLOW}ModelsLab time to first audio: {elapsed:.2f} seconds{COLOR_RESET}")
-                first_token_printed = True
-
             # Put audio data in queue (MP3 bytes)
             self.queue.put(audio_data)
 
@@ -227,6 +213,83 @@ class ModelsLabEngine(BaseEngine):
                 print(f"{COLOR_YELLOW}ModelsLab synthesis error: {e}{COLOR_RESET}")
             return False
 
+    def _build_payload(self, text: str) -> dict:
+        return {
+            "key": self.api_key,
+            "prompt": text,
+            "voice_id": self.voice,
+            "language": self.language,
+            "speed": self.speed,
+            "emotion": self.emotion,
+        }
+
+    @staticmethod
+    def _payload_key(payload: dict) -> str:
+        # Includes voice, language, speed and emotion, so prefetched jobs for
+        # outdated settings are not played.
+        return json.dumps(payload, sort_keys=True)
+
+    def _poll_delays(self):
+        """
+        Yields the waits between polls: short at first, then growing up to max_poll_interval.
+        """
+        delay = self.poll_interval
+        while True:
+            yield delay
+            delay = min(delay * 1.5, self.max_poll_interval)
+
+    def _fetch_audio(self, payload: dict, cancel_event: threading.Event) -> bytes:
+        """
+        Runs one ModelsLab job: submits it, polls until it is finished and downloads the audio.
+
+        Runs on the prefetch worker threads, so several jobs are processed concurrently.
+        Polling ends once cancel_event is set by stop(). The engine-wide stop event is
+        not used here, since it stays set until the next synthesize() while the
+        following play() already prefetches its sentences.
+
+        Returns:
+            bytes: MP3 audio data.
+        """
+        response = self.http.post(self.base_url, json=payload, timeout=30)
+        response.raise_for_status()
+        result = response.json()
+
+        if self.debug:
+            print(f"{COLOR_WHITE}ModelsLab response: {result.get('status')}{COLOR_RESET}")
+
+        # Check if result is processing (async)
+        if result.get("status") == "processing":
+            fetch_url = result.get("fetch_result")
+            if not fetch_url:
+                raise RuntimeError("No fetch_url in processing response")
+
+            deadline = time.monotonic() + self.poll_timeout
+            for delay in self._poll_delays():
+                if time.monotonic() + delay > deadline:
+                    raise RuntimeError("ModelsLab job timed out")
+                if cancel_event.wait(delay):
+                    raise RuntimeError("ModelsLab job cancelled")
+
+                poll_response = self.http.get(fetch_url, timeout=30)
+                result = poll_response.json()
+                status = result.get("status")
+                if status == "success":
+                    break
+                if status in ("error", "failed"):
+                    raise RuntimeError(f"ModelsLab error: {result.get('message')}")
+
+        if result.get("status") != "success":
+            raise RuntimeError(f"ModelsLab synthesis failed: {result.get('message')}")
+
+        # Get audio URL from result
+        audio_urls = result.get("output") or result.get("proxy_links") or result.get("links")
+        if not audio_urls or not audio_urls[0]:
+            raise RuntimeError("No audio URL in response")
+
+        audio_response = self.http.get(audio_urls[0], timeout=30)
+        audio_response.raise_for_status()
+        return audio_response.content
+
     def get_voices(self):
         """
         Retrieves the available voices for ModelsLab TTS.
@@ -280,3 +343,13 @@ class ModelsLabEngine(BaseEngine):
             self.language = voice_parameters["language"]
         if "emotion" in voice_parameters:
             self.emotion = voice_parameters["emotion"]
+
+    def stop(self):
+        """
+        Stops the current synthesis and drops the prefetched jobs.
+        """
+        self._prefetcher.clear()
+        super().stop()
+
+    def shutdown(self):
+        self._prefetcher.shutdown()
@@ -8,6 +8,8 @@ reference instead of registering a whole emotion folder.
 
 import logging
 import os
+import queue
+import threading
 import time
 import uuid
 from pathlib import Path
@@ -84,6 +86,7 @@ class MossTTSEngine(BaseEngine):
         audio_top_k: int = 25,
         audio_repetition_penalty: float = 1.2,
         stream_decode_frames: int = 1,
+        pipeline_codec_decode: bool = True,
         enable_wetext_processing: bool = False,
         enable_normalize_tts_text: bool = True,
         seed: Optional[int] = None,
@@ -134,6 +137,7 @@ class MossTTSEngine(BaseEngine):
         self.audio_top_k = int(audio_top_k)
         self.audio_repetition_penalty = float(audio_repetition_penalty)
         self.stream_decode_frames = max(1, int(stream_decode_frames))
+        self.pipeline_codec_decode = bool(pipeline_codec_decode)
         self.enable_wetext_processing = bool(enable_wetext_processing)
         self.enable_normalize_tts_text = bool(enable_normalize_tts_text)
         self.seed = seed
@@ -141,6 +145,9 @@ class MossTTSEngine(BaseEngine):
         self._voices: dict[str, MossTTSVoice] = {}
         self._current_voice = None
         self._dll_directory_handles = []
+        self._decode_jobs = queue.Queue()
+        self._decode_thread = None
+        self._pcm_scratch = None
 
         self._init_runtime()
         if voice is not None:
@@ -385,6 +392,7 @@ class MossTTSEngine(BaseEngine):
             "audio_top_k",
             "audio_repetition_penalty",
             "stream_decode_frames",
+            "pipeline_codec_decode",
             "enable_wetext_processing",
             "enable_normalize_tts_text",
         }
@@ -449,6 +457,61 @@ class MossTTSEngine(BaseEngine):
             axis=1,
         ).astype(np.float32, copy=False)
 
+    def _queue_codec_audio(self, audio, audio_length: int) -> None:
+        """
+        Queues one streaming codec block of shape (1, channels, samples) as
+        interleaved PCM16, converting through a reused float32 scratch buffer.
+        """
+        if audio_length <= 0:
+            return
+        block = np.asarray(audio)[0, :, :audio_length]
+        if block.shape[0] != self.channels:
+            self._queue_audio(self._decode_onnx_audio(audio, audio_length))
+            return
+        scratch = self._pcm_scratch
+        if scratch is None or scratch.shape[0] != self.channels or scratch.shape[1] < audio_length:
+            scratch = self._pcm_scratch = np.empty((self.channels, audio_length), dtype=np.float32)
+        scaled = scratch[:, :audio_length]
+        np.clip(block, -1.0, 1.0, out=scaled)
+        np.multiply(scaled, 32767.0, out=scaled)
+        np.rint(scaled, out=scaled)
+        self.queue.put(np.ascontiguousarray(scaled.T, dtype=np.int16).tobytes())
+
+    def _decode_frames(self, frames: list) -> None:
+        decoded = self._runtime.codec_streaming_session.run_frames(frames)
+        if decoded is None:
+            return
+        audio, audio_length = decoded
+        self._queue_codec_audio(audio, int(audio_length))
+
+    def _submit_decode(self, frames: Optional[list], job: dict) -> None:
+        """
+        Queues a block of generated frames for the long-lived codec decode
+        worker. frames=None marks the end of the job.
+        """
+        if self._decode_thread is None or not self._decode_thread.is_alive():
+            self._decode_thread = threading.Thread(
+                target=self._decode_worker, name="moss-codec-decode", daemon=True
+            )
+            self._decode_thread.start()
+        self._decode_jobs.put((frames, job))
+
+    def _decode_worker(self) -> None:
+        while True:
+            item = self._decode_jobs.get()
+            if item is None:
+                break
+            frames, job = item
+            if frames is None:
+                job["done"].set()
+                continue
+            if job["error"] is not None or self.stop_synthesis_event.is_set():
+                continue
+            try:
+                self._decode_frames(frames)
+            except Exception as exc:
+                job["error"] = exc
+
     def _synthesize_onnx_text_chunk(self, text: str, prompt_audio_codes) -> bool:
         request_rows = self._runtime.build_voice_clone_request_rows(
             prompt_audio_codes,
@@ -463,6 +526,9 @@ class MossTTSEngine(BaseEngine):
 
         pending_decode_frames = []
         self._runtime.codec_streaming_session.reset()
+        # With pipelining, the codec decodes finished blocks on the worker
+        # while the talker generates the next frames.
+        job = {"done": threading.Event(), "error": None} if self.pipeline_codec_decode else None
 
         class _Stopped(Exception):
             pass
@@ -471,6 +537,8 @@ class MossTTSEngine(BaseEngine):
             if self.stop_synthesis_event.is_set():
                 pending_decode_frames.clear()
                 raise _Stopped()
+            if job is not None and job["error"] is not None:
+                raise job["error"]
             if not pending_decode_frames:
                 return
             if not force and len(pending_decode_frames) < self.stream_decode_frames:
@@ -478,13 +546,10 @@ class MossTTSEngine(BaseEngine):
             frame_budget = len(pending_decode_frames) if force else self.stream_decode_frames
             frame_chunk = pending_decode_frames[:frame_budget]
             del pending_decode_frames[:frame_budget]
-            decoded = self._runtime.codec_streaming_session.run_frames(frame_chunk)
-            if decoded is None:
-                return
-            audio, audio_length = decoded
-            waveform = self._decode_onnx_audio(audio, int(audio_length))
-            if waveform is not None:
-                self._queue_audio(waveform)
+            if job is not None:
+                self._submit_decode(frame_chunk, job)
+            else:
+                self._decode_frames(frame_chunk)
 
         def on_frame(_generated_frames, _step_index, frame) -> None:
             if self.stop_synthesis_event.is_set():
@@ -498,7 +563,13 @@ class MossTTSEngine(BaseEngine):
         except _Stopped:
             return True
         finally:
+            if job is not None:
+                # The streaming codec state may only be reset once the worker is idle
+                self._submit_decode(None, job)
+                job["done"].wait()
             self._runtime.codec_streaming_session.reset()
+        if job is not None and job["error"] is not None:
+            raise job["error"]
         return True
 
     def _synthesize_onnx(self, text: str) -> bool:
@@ -610,6 +681,10 @@ class MossTTSEngine(BaseEngine):
             return False
 
     def shutdown(self):
+        if self._decode_thread is not None:
+            self._decode_jobs.put(None)
+            self._decode_thread.join(timeout=5)
+            self._decode_thread = None
         self._runtime = None
         self._voices.clear()
         self._current_voice = None
@@ -8,9 +8,13 @@ https://github.com/neuphonic/neutts
 import logging
 import os
 import sys
+import time
 from typing import Optional, Union
 
+import numpy as np
+
 from .base_engine import BaseEngine
+from .conditioning_cache import ConditioningCache, get_conditioning_cache, make_key
 
 # Add NeuTTS to path if installed as a git clone (not a package).
 _neutts_paths = [
@@ -45,6 +49,44 @@ class NeuTTSVoice:
         )
 
 
+class _OverlapAdd:
+    """
+    Incremental triangular overlap-add of decoded codec windows.
+
+    Every window is weighted with a triangle as in NeuTTS' own overlap-add.
+    Samples are returned as soon as no later window can overlap them; only the
+    weighted tail of the last window is carried, so windows may change size
+    between calls.
+    """
+    def __init__(self):
+        self._sum = np.zeros(0, dtype=np.float32)
+        self._weight = np.zeros(0, dtype=np.float32)
+
+    def add(self, window, emit: Optional[int] = None) -> np.ndarray:
+        """
+        Adds a window that starts where the previous returned samples ended.
+
+        Args:
+            window: Decoded samples of the window.
+            emit (int, optional): Samples of the window that are final. None
+                returns everything (last window).
+        """
+        window = np.asarray(window, dtype=np.float32).reshape(-1)
+        t = np.linspace(0.0, 1.0, window.size + 2, dtype=np.float32)[1:-1]
+        weight = 0.5 - np.abs(t - 0.5)
+        total = window * weight
+        carried = self._sum.size
+        if carried > total.size:
+            total = np.pad(total, (0, carried - total.size))
+            weight = np.pad(weight, (0, carried - weight.size))
+        total[:carried] += self._sum
+        weight[:carried] += self._weight
+
+        emit = total.size if emit is None else min(emit, total.size)
+        self._sum, self._weight = total[emit:], weight[emit:]
+        return total[:emit] / weight[:emit]
+
+
 class NeuTTSEngine(BaseEngine):
     """
     NeuTTS engine for on-device text-to-speech with voice cloning.
@@ -83,6 +125,9 @@ class NeuTTSEngine(BaseEngine):
         streaming_lookforward: Optional[int] = None,
         streaming_lookback: Optional[int] = None,
         streaming_overlap_frames: Optional[int] = None,
+        adaptive_streaming: bool = True,
+        streaming_initial_frames_per_chunk: int = 8,
+        conditioning_cache: Optional[ConditioningCache] = None,
     ):
         super().__init__()
         self.engine_name = "neutts"
@@ -102,12 +147,14 @@ class NeuTTSEngine(BaseEngine):
         self.streaming_lookforward = streaming_lookforward
         self.streaming_lookback = streaming_lookback
         self.streaming_overlap_frames = streaming_overlap_frames
+        self.adaptive_streaming = adaptive_streaming
+        self.streaming_initial_frames_per_chunk = int(streaming_initial_frames_per_chunk)
         self.sampling_rate = 24000
 
         self._tts = None
         self._voices: dict[str, NeuTTSVoice] = {}
         self._current_voice: Optional[NeuTTSVoice] = None
-        self._reference_cache = {}
+        self.conditioning_cache = conditioning_cache or get_conditioning_cache()
 
         self._init_model()
         if voice is not None:
@@ -239,26 +286,6 @@ class NeuTTSEngine(BaseEngine):
 
         return pyaudio.paInt16, 1, self.sampling_rate
 
-    def _voice_cache_key(self, audio_path: str, transcript: str):
-        try:
-            stat = os.stat(audio_path)
-            mtime = stat.st_mtime
-            size = stat.st_size
-        except OSError:
-            mtime = 0
-            size = 0
-        return (
-            os.path.abspath(audio_path),
-            mtime,
-            size,
-            transcript,
-            self.backbone_repo,
-            self.codec_repo,
-            self.backbone_device,
-            self.codec_device,
-            self._resolved_language(),
-        )
-
     @staticmethod
     def _normalize_ref_codes(ref_codes):
         try:
@@ -275,15 +302,16 @@ class NeuTTSEngine(BaseEngine):
         return [int(value) for value in values]
 
     def _encode_reference(self, audio_path: str, transcript: str):
-        key = self._voice_cache_key(audio_path, transcript)
-        cached = self._reference_cache.get(key)
-        if cached is not None:
-            return cached
+        # Reference codes only depend on the audio and the codec.
+        key = make_key(f"neutts:{self.codec_repo}", [audio_path])
+
+        def encode():
+            import numpy as np
+
+            ref_codes = self._normalize_ref_codes(self._tts.encode_reference(audio_path))
+            return np.asarray(ref_codes, dtype=np.int32)
 
-        ref_codes = self._tts.encode_reference(audio_path)
-        ref_codes = self._normalize_ref_codes(ref_codes)
-        self._reference_cache[key] = ref_codes
-        return ref_codes
+        return self._normalize_ref_codes(self.conditioning_cache.get_or_create(key, encode))
 
     def _ensure_voice_encoded(self, voice: NeuTTSVoice) -> NeuTTSVoice:
         if voice.ref_codes is not None:
@@ -302,7 +330,91 @@ class NeuTTSEngine(BaseEngine):
         audio = np.clip(audio, -1.0, 1.0)
         return (audio * 32767).astype(np.int16).tobytes()
 
+    def _supports_adaptive_streaming(self) -> bool:
+        return all(
+            hasattr(self._tts, name)
+            for name in ("_ggml_prompt", "_decode", "_call_seed", "backbone")
+        )
+
+    def _synthesize_adaptive_stream(self, text: str, ref_codes, ref_text: str) -> bool:
+        """
+        Streams GGUF generation with a growing decode window.
+
+        Follows NeuTTS' infer_stream, but starts with
+        streaming_initial_frames_per_chunk frames and doubles the window up
+        to streaming_frames_per_chunk once the queued audio covers the wider
+        chunk. Windows are joined by _OverlapAdd.
+        """
+        tts = self._tts
+        hop = int(tts.hop_length)
+        overlap = int(tts.streaming_overlap_frames)
+        lookforward = int(tts.streaming_lookforward)
+        lookback = int(tts.streaming_lookback)
+        max_frames = int(tts.streaming_frames_per_chunk)
+        frames = max(1, min(self.streaming_initial_frames_per_chunk, max_frames))
+        watermarker = getattr(tts, "watermarker", None)
+
+        def decode(codes) -> np.ndarray:
+            recon = tts._decode("".join(codes))
+            if watermarker is not None:
+                recon = watermarker.apply_watermark(recon, sample_rate=24_000)
+            return recon
+
+        prompt = tts._ggml_prompt(ref_codes, ref_text, text)
+        tts.backbone.reset()
+        tokens = ["<|speech_%d|>" % code for code in ref_codes]
+        decoded = len(tokens)
+        overlap_add = _OverlapAdd()
+        queued_samples = 0
+        first_audio_time = None
+
+        for item in tts.backbone(
+            prompt,
+            max_tokens=tts.max_context,
+            temperature=1.0,
+            top_k=50,
+            stop=["<|SPEECH_GENERATION_END|>"],
+            stream=True,
+            seed=tts._call_seed(),
+        ):
+            if self.stop_synthesis_event.is_set():
+                logging.debug("NeuTTS streaming synthesis stopped")
+                return True
+            tokens.append(item["choices"][0]["text"])
+            if len(tokens) - decoded < frames + lookforward:
+                continue
+
+            start = max(decoded - lookback - overlap, 0)
+            recon = decode(tokens[start : decoded + frames + lookforward + overlap])
+            offset = (decoded - start) * hop
+            audio = overlap_add.add(
+                recon[offset : offset + (frames + 2 * overlap) * hop], frames * hop
+            )
+            self.queue.put(self._to_pcm16(audio))
+            decoded += frames
+
+            now = time.perf_counter()
+            if first_audio_time is None:
+                first_audio_time = now
+            queued_samples += audio.size
+            buffered = queued_samples / self.sampling_rate - (now - first_audio_time)
+            wider = min(frames * 2, max_frames)
+            if wider > frames and buffered >= wider * hop / self.sampling_rate:
+                frames = wider
+
+        if self.stop_synthesis_event.is_set():
+            return True
+        if len(tokens) > decoded:
+            start = max(decoded - lookback - overlap, 0)
+            recon = decode(tokens[start:])
+            audio = overlap_add.add(recon[(decoded - start) * hop :])
+            if audio.size:
+                self.queue.put(self._to_pcm16(audio))
+        return True
+
     def _synthesize_streaming(self, text: str, ref_codes, ref_text: str) -> bool:
+        if self.adaptive_streaming and self._supports_adaptive_streaming():
+            return self._synthesize_adaptive_stream(text, ref_codes, ref_text)
         for wav_chunk in self._tts.infer_stream(text, ref_codes, ref_text):
             if self.stop_synthesis_event.is_set():
                 logging.debug("NeuTTS streaming synthesis stopped")
@@ -424,7 +536,6 @@ class NeuTTSEngine(BaseEngine):
         self._tts = None
         self._voices.clear()
         self._current_voice = None
-        self._reference_cache.clear()
         try:
             import torch
         except ImportError:
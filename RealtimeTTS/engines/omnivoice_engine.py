@@ -13,6 +13,7 @@ except ImportError:
     OmniVoice = None
 
 from .base_engine import BaseEngine
+from .quality_levels import QualityLevel, step_levels
 
 # --- ANSI escape codes for debug styling ---
 COLOR_BLUE   = "\033[94m"
@@ -111,6 +112,7 @@ class OmniVoiceEngine(BaseEngine):
         self.device_map = device_map
         self.dtype = dtype
         self.num_steps_schedule = self._normalize_num_steps_schedule(num_steps_schedule)
+        self._quality_num_steps = None
         self.debug = debug
         self.preprocess_prompt = preprocess_prompt
         self.postprocess_output = postprocess_output
@@ -168,7 +170,11 @@ class OmniVoiceEngine(BaseEngine):
         - second sentence -> second entry
         - ...
         - once the list is exhausted, reuse the last entry
+        - a quality level set by the stream's quality governor overrides the schedule
         """
+        if self._quality_num_steps is not None:
+            return self._quality_num_steps
+
         if sentence_count <= 1:
             index = 0
         else:
@@ -177,6 +183,22 @@ class OmniVoiceEngine(BaseEngine):
         index = min(index, len(self.num_steps_schedule) - 1)
         return self.num_steps_schedule[index]
 
+    def get_quality_levels(self) -> List[QualityLevel]:
+        """
+        Returns one quality level per distinct step count of num_steps_schedule.
+        """
+        return step_levels("num_steps", self.num_steps_schedule)
+
+    def set_quality_level(self, level: Optional[int]):
+        """
+        Uses the step count of the given level for all following sentences.
+        None returns to num_steps_schedule.
+        """
+        if level is None:
+            self._quality_num_steps = None
+        else:
+            self._quality_num_steps = self.get_quality_levels()[level].settings["num_steps"]
+
     def _warmup(self):
         """
         Performs a warm-up generation run to initialize GPU caches.
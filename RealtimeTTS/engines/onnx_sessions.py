@@ -0,0 +1,137 @@
+"""
+ONNX Runtime session setup shared by the ONNX engine backends.
+
+cpu_session_options() derives the SessionOptions from an explicit CPU budget.
+create_session() additionally keeps the optimized graph of CPU sessions on
+disk. ONNX Runtime otherwise repeats its graph optimizations (constant
+folding, node fusions, layout transforms) on every process start. The stored
+model is loaded with graph optimizations disabled.
+
+Entries are keyed by the SHA-256 of the source model, the ONNX Runtime
+version, the machine architecture and the optimization level. Optimized
+graphs can contain hardware specific nodes, so only CPU-only sessions are
+cached, and an entry that fails to load is rebuilt.
+"""
+
+import hashlib
+import logging
+import os
+import platform
+import uuid
+from pathlib import Path
+from typing import Any, List, Optional, Union
+
+from .conditioning_cache import content_hash
+
+logger = logging.getLogger(__name__)
+
+
+def default_cache_dir() -> Path:
+    """
+    Returns the directory for optimized models when no cache_dir is given.
+
+    REALTIMETTS_ONNX_CACHE overrides the platform default.
+    """
+    override = os.environ.get("REALTIMETTS_ONNX_CACHE")
+    if override:
+        return Path(override)
+    if platform.system() == "Windows":
+        root = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+        return root / "RealtimeTTS" / "onnx"
+    root = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return root / "realtimetts" / "onnx"
+
+
+def cpu_session_options(ort: Any, threads: int) -> Any:
+    """
+    Returns SessionOptions for running within a budget of threads CPU cores.
+
+    Args:
+        ort: The onnxruntime module.
+        threads (int): Cores one inference may use.
+    """
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = threads
+    # Sessions run one after another; parallel graph branches would only
+    # oversubscribe the budget.
+    options.inter_op_num_threads = 1
+    options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    # Keep freed buffers for the next run instead of returning them to the OS.
+    options.enable_cpu_mem_arena = True
+    # Memory patterns are planned per input shape, and TTS inputs change
+    # shape with every sentence.
+    options.enable_mem_pattern = False
+    return options
+
+
+def optimized_model_key(ort: Any, model_digest: str, optimization_level: Any) -> str:
+    """
+    Returns the cache key of an optimized model.
+    """
+    identity = "|".join((
+        model_digest,
+        str(getattr(ort, "__version__", "unknown")),
+        platform.machine(),
+        str(optimization_level),
+    ))
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()[:32]
+
+
+def create_session(
+    ort: Any,
+    model_path: Union[str, Path],
+    options: Any,
+    providers: List[str],
+    cache_dir: Optional[Union[str, Path]] = None,
+    model_digest: Optional[str] = None,
+) -> Any:
+    """
+    Creates an InferenceSession, reusing a stored optimized model on CPU.
+
+    Args:
+        ort: The onnxruntime module.
+        model_path (str or Path): Source .onnx file.
+        options: SessionOptions of this session; not shared with other sessions.
+        providers (List[str]): Execution providers.
+        cache_dir (str or Path, optional): Directory for optimized models.
+            Defaults to default_cache_dir().
+        model_digest (str, optional): SHA-256 of model_path if already known.
+    """
+    model_path = Path(model_path)
+    if list(providers) != ["CPUExecutionProvider"]:
+        return ort.InferenceSession(str(model_path), sess_options=options, providers=providers)
+
+    cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+    key = optimized_model_key(
+        ort, model_digest or content_hash(model_path), options.graph_optimization_level
+    )
+    cached_path = cache_dir / f"{model_path.stem}-{key}.onnx"
+
+    if cached_path.is_file():
+        optimization_level = options.graph_optimization_level
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+        try:
+            return ort.InferenceSession(str(cached_path), sess_options=options, providers=providers)
+        except Exception as exc:
+            logger.warning("Rebuilding optimized ONNX model %s: %s", cached_path, exc)
+            options.graph_optimization_level = optimization_level
+            try:
+                cached_path.unlink()
+            except OSError:
+                pass
+
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    except OSError as exc:
+        logger.warning("Cannot store optimized ONNX models in %s: %s", cache_dir, exc)
+        return ort.InferenceSession(str(model_path), sess_options=options, providers=providers)
+
+    temp_path = cached_path.with_name(f"{cached_path.name}.{uuid.uuid4().hex}.tmp")
+    options.optimized_model_filepath = str(temp_path)
+    session = ort.InferenceSession(str(model_path), sess_options=options, providers=providers)
+    try:
+        os.replace(temp_path, cached_path)
+    except OSError as exc:
+        logger.warning("Could not store optimized ONNX model %s: %s", cached_path, exc)
+    return session
@@ -1,6 +1,6 @@
 from .base_engine import BaseEngine
 from openai import OpenAI
-from typing import Union
+from typing import Iterator, Union
 import pyaudio
 import time
 from os import getenv
@@ -11,6 +11,26 @@ COLOR_YELLOW = "\033[93m"  # Yellow for time messages
 COLOR_WHITE = "\033[97m"   # White for all else
 COLOR_RESET = "\033[0m"
 
+
+def _coalesce_pcm(chunks: Iterator[bytes], frame_bytes: int) -> Iterator[bytes]:
+    """
+    Regroups network chunks of 16-bit PCM into frames of at least frame_bytes.
+
+    Frames always contain whole samples. The last frame may be shorter.
+    """
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        if len(buffer) >= frame_bytes:
+            size = len(buffer) - (len(buffer) % 2)
+            # A single odd byte has no whole sample yet
+            if size > 0:
+                yield bytes(buffer[:size])
+                del buffer[:size]
+    if len(buffer) > 1:
+        yield bytes(buffer[:len(buffer) - (len(buffer) % 2)])
+
+
 class OpenAIVoice:
     def __init__(self, name):
         self.name = name
@@ -28,7 +48,10 @@ class OpenAIEngine(BaseEngine):
             speed: float = None,
             response_format: str = "mp3",
             timeout: float = None,
-            api_key: str = getenv("OPENAI_API_KEY")
+            api_key: str = getenv("OPENAI_API_KEY"),
+            base_url: str = None,
+            sample_rate: int = 24000,
+            chunk_duration_ms: float = 40,
         ):
         """
         Initializes an OpenAI realtime text to speech engine object.
@@ -45,6 +68,11 @@ class OpenAIEngine(BaseEngine):
             response_format (str, optional): Audio format for the response. Only "mp3" and "pcm" are allowed.
             timeout (float, optional): Timeout for the API call in seconds.
             api_key (str, optional): Your OpenAI API key. If unspecified, uses the OPENAI_API_KEY environment variable.
+            base_url (str, optional): Base URL of an OpenAI-compatible server, e.g. "http://127.0.0.1:8000/v1".
+              Defaults to the OpenAI API.
+            sample_rate (int, optional): Sample rate of "pcm" responses. OpenAI returns 24000 Hz. Defaults to 24000.
+            chunk_duration_ms (float, optional): With "pcm", network chunks are combined into frames of at
+              least this duration before they are queued. 0 queues chunks as they arrive. Defaults to 40.
         """
         self.voices = ["alloy", "ash", "coral", "echo", "fable", "onyx", "nova", "sage", "shimmer"]
         self.model = model
@@ -59,8 +87,12 @@ class OpenAIEngine(BaseEngine):
         self.response_format = response_format.lower()
 
         self.timeout = timeout
+        self.sample_rate = sample_rate
+        self.chunk_duration_ms = chunk_duration_ms
 
-        self.client = OpenAI(api_key=api_key)
+        # One client for all sentences, so its connection pool keeps the
+        # connection to the API open between requests.
+        self.client = OpenAI(api_key=api_key, base_url=base_url)
         # Assuming queue is defined elsewhere or should be initialized
         self.queue = None
 
@@ -84,11 +116,11 @@ class OpenAIEngine(BaseEngine):
         Returns:
             tuple: A tuple containing the audio format, number of channels,
               and the sample rate.
-              For "pcm" response_format, returns (pyaudio.paInt16, 1, 22050).
+              For "pcm" response_format, returns (pyaudio.paInt16, 1, sample_rate).
               For "mp3", returns (pyaudio.paCustomFormat, 1, 22050).
         """
         if self.response_format == "pcm":
-            return pyaudio.paInt16, 1, 22050
+            return pyaudio.paInt16, 1, self.sample_rate
         else:
             return pyaudio.paCustomFormat, 1, 22050
 
@@ -116,24 +148,39 @@ class OpenAIEngine(BaseEngine):
             "model": self.model,
             "voice": self.voice,
             "input": text,
-            "instructions": self.instructions,
             "response_format": self.response_format
         }
+        if self.instructions is not None:
+            params["instructions"] = self.instructions
         if self.speed is not None:
             params["speed"] = self.speed
         if self.timeout is not None:
             params["timeout"] = self.timeout
 
-        response = self.client.audio.speech.create(**params)
-
-        for data in response.iter_bytes():
-            if not first_token_printed:
-                elapsed = time.time() - start_time
-                if self.debug:
-                    print(f"Time to first audio token: {COLOR_YELLOW}{elapsed:.2f}{COLOR_RESET} seconds.")
-                first_token_printed = True
-            # Write the raw audio data into the queue for the stream player to handle
-            self.queue.put(data)
+        # The streaming response yields audio while it is still being generated
+        # instead of reading the whole body first.
+        with self.client.audio.speech.with_streaming_response.create(**params) as response:
+            chunks = response.iter_bytes()
+            if self.response_format == "pcm":
+                if self.chunk_duration_ms > 0:
+                    frame_bytes = int(self.sample_rate * self.chunk_duration_ms / 1000) * 2
+                    chunks = _coalesce_pcm(chunks, frame_bytes)
+                else:
+                    # Still keep samples from being split across queued chunks.
+                    chunks = _coalesce_pcm(chunks, 1)
+
+            for data in chunks:
+                if self.stop_synthesis_event.is_set():
+                    return False
+                if not first_token_printed:
+                    elapsed = time.time() - start_time
+                    if self.debug:
+                        print(f"Time to first audio token: {COLOR_YELLOW}{elapsed:.2f}{COLOR_RESET} seconds.")
+                    first_token_printed = True
+                if self.response_format == "pcm":
+                    self.audio_duration += len(data) / (2 * self.sample_rate)
+                # Write the raw audio data into the queue for the stream player to handle
+                self.queue.put(data)
 
         return True
 
@@ -1,85 +1,241 @@
-from snac import SNAC
+"""
+SNAC decoding for the Orpheus engine.
+
+Orpheus emits seven audio tokens per 12 Hz frame. Token 0 of a frame is the
+coarse SNAC code, tokens 1 and 4 the middle codes, and tokens 2, 3, 5 and 6 the
+fine codes. Audio is decoded over a sliding window of the last four frames and
+only the samples of the second frame are kept, so every frame after the
+fourth yields 2048 new samples.
+
+The SNAC model is loaded on first use, not at import.
+"""
+
+from typing import Iterable, Optional
 import numpy as np
-import torch
-import asyncio
 import threading
+import asyncio
 import queue
 
 
-model = SNAC.from_pretrained("hubertsiuzdak/snac_24khz").eval()
+SNAC_MODEL_ID = "hubertsiuzdak/snac_24khz"
+TOKENS_PER_FRAME = 7
+WINDOW_FRAMES = 4
+MAX_CODE = 4096
+AUDIO_SLICE = slice(2048, 4096)
+
+# Positions of the codes of each SNAC level inside a frame of seven tokens.
+LEVEL_POSITIONS = ((0,), (1, 4), (2, 3, 5, 6))
+
+_model = None
+_device = None
+_model_lock = threading.Lock()
+
+
+def get_snac_model(device: Optional[str] = None):
+    """
+    Returns the shared SNAC model, loading it on the first call.
+
+    Args:
+        device (str, optional): Device for the first load. Defaults to CUDA,
+            then MPS, then CPU. Ignored once the model is loaded.
+
+    Returns:
+        tuple: The model and the device it lives on.
+    """
+    global _model, _device
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                import torch
+                from snac import SNAC
+
+                if device is None:
+                    device = "cuda" if torch.cuda.is_available() else "mps" if torch.backends.mps.is_available() else "cpu"
+                model = SNAC.from_pretrained(SNAC_MODEL_ID).eval()
+                _device = device
+                _model = model.to(device)
+    return _model, _device
+
+
+def frame_gather_index(frames: int) -> np.ndarray:
+    """
+    Index that reorders `frames` frames of interleaved tokens level by level.
+
+    Taking a window of tokens with this index yields the coarse codes of all
+    frames, then the middle codes, then the fine codes, each in time order.
+    """
+    offsets = np.arange(frames)[:, None] * TOKENS_PER_FRAME
+    return np.concatenate(
+        [(offsets + np.array(positions)).reshape(-1) for positions in LEVEL_POSITIONS]
+    ).astype(np.intp)
+
+
+def assemble_codes(multiframe) -> tuple:
+    """
+    Splits interleaved frame tokens into the three SNAC code levels.
+
+    Trailing tokens that do not fill a whole frame are ignored.
+
+    Returns:
+        tuple: Three int32 arrays with 1, 2 and 4 codes per frame.
+    """
+    tokens = np.asarray(multiframe, dtype=np.int32)
+    frames = len(tokens) // TOKENS_PER_FRAME
+    grid = tokens[:frames * TOKENS_PER_FRAME].reshape(frames, TOKENS_PER_FRAME)
+    return tuple(grid[:, positions].reshape(-1) for positions in LEVEL_POSITIONS)
+
+
+class SnacFrameRing:
+    """
+    Fixed-size ring of the most recent audio tokens.
+
+    Every token is written twice, `capacity` slots apart, so the latest
+    `capacity` tokens are always one contiguous slice of the preallocated
+    int32 buffer and no copy is needed to read the window.
+    """
+
+    def __init__(self, frames: int = WINDOW_FRAMES):
+        self.capacity = frames * TOKENS_PER_FRAME
+        self._buffer = np.zeros(2 * self.capacity, dtype=np.int32)
+        self.count = 0
+
+    def push(self, token: int) -> bool:
+        """
+        Appends one token.
+
+        Returns:
+            bool: True if the token completed a frame.
+        """
+        position = self.count % self.capacity
+        self._buffer[position] = token
+        self._buffer[position + self.capacity] = token
+        self.count += 1
+        return self.count % TOKENS_PER_FRAME == 0
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+    def window(self) -> np.ndarray:
+        """Returns the latest `capacity` tokens, oldest first, as a view."""
+        start = self.count % self.capacity
+        return self._buffer[start:start + self.capacity]
+
+    def reset(self):
+        self.count = 0
+
+
+class SnacWindowDecoder:
+    """
+    Decodes sliding windows of Orpheus tokens with reused buffers.
 
-# Check if CUDA is available and set device accordingly
-snac_device = "cuda" if torch.cuda.is_available() else "mps" if torch.backends.mps.is_available() else "cpu"
-model = model.to(snac_device)
+    The code tensors handed to SNAC are allocated once per window size and
+    refilled for every window: one gather on the host and, off the CPU, one
+    copy to the device. On the CPU the tensors share the host buffer.
+    """
+
+    def __init__(self, frames: int = WINDOW_FRAMES, device: Optional[str] = None):
+        self.frames = frames
+        self.ring = SnacFrameRing(frames)
+        self._requested_device = device
+        self._buffers = {}
+
+    def _window_buffers(self, frames: int):
+        buffers = self._buffers.get(frames)
+        if buffers is None:
+            import torch
+
+            model, device = get_snac_model(self._requested_device)
+            index = frame_gather_index(frames)
+            host = np.zeros(len(index), dtype=np.int32)
+            device_codes = None if device == "cpu" else torch.zeros(len(index), dtype=torch.int32, device=device)
+            target = torch.from_numpy(host) if device_codes is None else device_codes
+            levels, start = [], 0
+            for positions in LEVEL_POSITIONS:
+                size = frames * len(positions)
+                levels.append(target[start:start + size].unsqueeze(0))
+                start += size
+            buffers = self._buffers[frames] = (model, index, host, device_codes, levels)
+        return buffers
+
+    def decode(self, window) -> Optional[bytes]:
+        """
+        Decodes a window of whole frames into 16-bit PCM bytes.
+
+        Returns:
+            bytes: The samples of the window's second frame, or None if the
+            window is shorter than one frame or holds an invalid code.
+        """
+        import torch
+
+        window = np.asarray(window, dtype=np.int32)
+        frames = len(window) // TOKENS_PER_FRAME
+        if frames == 0:
+            return None
+        model, index, host, device_codes, levels = self._window_buffers(frames)
+        np.take(window, index, out=host)
+        if host.min() < 0 or host.max() > MAX_CODE:
+            return None
+        if device_codes is not None:
+            device_codes.copy_(torch.from_numpy(host))
+
+        with torch.inference_mode():
+            audio_hat = model.decode(levels)
+
+        audio_np = audio_hat[:, :, AUDIO_SLICE].detach().cpu().numpy()
+        return (audio_np * 32767).astype(np.int16).tobytes()
+
+    def push(self, token: int) -> Optional[bytes]:
+        """
+        Adds one token and decodes the window once a new frame is complete.
+
+        Returns:
+            bytes: New audio, or None while no new frame could be decoded.
+        """
+        if self.ring.push(token) and self.ring.full:
+            return self.decode(self.ring.window())
+        return None
+
+    def reset(self):
+        """Starts a new utterance; the buffers are kept."""
+        self.ring.reset()
+
+
+_default_decoder = None
+_default_decoder_lock = threading.Lock()
 
 
 def convert_to_audio(multiframe, count):
-  frames = []
-  if len(multiframe) < 7:
-    return
-  
-  codes_0 = torch.tensor([], device=snac_device, dtype=torch.int32)
-  codes_1 = torch.tensor([], device=snac_device, dtype=torch.int32)
-  codes_2 = torch.tensor([], device=snac_device, dtype=torch.int32)
-
-  num_frames = len(multiframe) // 7
-  frame = multiframe[:num_frames*7]
-
-  for j in range(num_frames):
-    i = 7*j
-    if codes_0.shape[0] == 0:
-      codes_0 = torch.tensor([frame[i]], device=snac_device, dtype=torch.int32)
-    else:
-      codes_0 = torch.cat([codes_0, torch.tensor([frame[i]], device=snac_device, dtype=torch.int32)])
+    """
+    Decodes a list of frame tokens into 16-bit PCM bytes.
+
+    Returns:
+        bytes: The samples of the second frame, or None for fewer than seven
+        tokens or an invalid code.
+    """
+    global _default_decoder
+    if len(multiframe) < TOKENS_PER_FRAME:
+        return None
+    with _default_decoder_lock:
+        if _default_decoder is None:
+            _default_decoder = SnacWindowDecoder()
+        return _default_decoder.decode(multiframe)
 
-    if codes_1.shape[0] == 0:
-      
-      codes_1 = torch.tensor([frame[i+1]], device=snac_device, dtype=torch.int32)
-      codes_1 = torch.cat([codes_1, torch.tensor([frame[i+4]], device=snac_device, dtype=torch.int32)])
-    else:
-      codes_1 = torch.cat([codes_1, torch.tensor([frame[i+1]], device=snac_device, dtype=torch.int32)])
-      codes_1 = torch.cat([codes_1, torch.tensor([frame[i+4]], device=snac_device, dtype=torch.int32)])
-    
-    if codes_2.shape[0] == 0:
-      codes_2 = torch.tensor([frame[i+2]], device=snac_device, dtype=torch.int32)
-      codes_2 = torch.cat([codes_2, torch.tensor([frame[i+3]], device=snac_device, dtype=torch.int32)])
-      codes_2 = torch.cat([codes_2, torch.tensor([frame[i+5]], device=snac_device, dtype=torch.int32)])
-      codes_2 = torch.cat([codes_2, torch.tensor([frame[i+6]], device=snac_device, dtype=torch.int32)])
-    else:
-      codes_2 = torch.cat([codes_2, torch.tensor([frame[i+2]], device=snac_device, dtype=torch.int32)])
-      codes_2 = torch.cat([codes_2, torch.tensor([frame[i+3]], device=snac_device, dtype=torch.int32)])
-      codes_2 = torch.cat([codes_2, torch.tensor([frame[i+5]], device=snac_device, dtype=torch.int32)])
-      codes_2 = torch.cat([codes_2, torch.tensor([frame[i+6]], device=snac_device, dtype=torch.int32)])
-
-  codes = [codes_0.unsqueeze(0), codes_1.unsqueeze(0), codes_2.unsqueeze(0)]
-  # check that all tokens are between 0 and 4096 otherwise return *
-  if torch.any(codes[0] < 0) or torch.any(codes[0] > 4096) or torch.any(codes[1] < 0) or torch.any(codes[1] > 4096) or torch.any(codes[2] < 0) or torch.any(codes[2] > 4096):
-    return
-
-  with torch.inference_mode():
-    audio_hat = model.decode(codes)
-  
-  audio_slice = audio_hat[:, :, 2048:4096]
-  detached_audio = audio_slice.detach().cpu()
-  audio_np = detached_audio.numpy()
-  audio_int16 = (audio_np * 32767).astype(np.int16)
-  audio_bytes = audio_int16.tobytes()
-  return audio_bytes
 
 def turn_token_into_id(token_string, index):
     # Strip whitespace
     token_string = token_string.strip()
-    
+
     # Find the last token in the string
     last_token_start = token_string.rfind("<custom_token_")
-    
+
     if last_token_start == -1:
         print("No token found in the string")
         return None
-    
+
     # Extract the last token
     last_token = token_string[last_token_start:]
-    
+
     # Process the last token
     if last_token.startswith("<custom_token_") and last_token.endswith(">"):
         try:
@@ -89,25 +245,32 @@ def turn_token_into_id(token_string, index):
             return None
     else:
         return None
-  
-    
+
+
 async def tokens_decoder(token_gen):
-    buffer = []
+    decoder = SnacWindowDecoder()
     count = 0
-    async for token_sim in token_gen:       
+    async for token_sim in token_gen:
         token = turn_token_into_id(token_sim, count)
-        if token is None:
-            pass
-        else:
-            if token > 0:
-                buffer.append(token)
-                count += 1
+        if token is not None and token > 0:
+            count += 1
+            audio_samples = decoder.push(token)
+            if audio_samples is not None:
+                yield audio_samples
+
+
+def decode_token_ids(token_ids: Iterable[int], decoder: Optional[SnacWindowDecoder] = None):
+    """
+    Decodes already extracted audio token ids synchronously.
 
-                if count % 7 == 0 and count > 27:
-                    buffer_to_proc = buffer[-28:]
-                    audio_samples = convert_to_audio(buffer_to_proc, count)
-                    if audio_samples is not None:
-                        yield audio_samples
+    Yields:
+        bytes: One chunk of 16-bit PCM per frame after the fourth.
+    """
+    decoder = decoder or SnacWindowDecoder()
+    for token in token_ids:
+        audio_samples = decoder.push(token)
+        if audio_samples is not None:
+            yield audio_samples
 
 
 # ------------------ Synchronous Tokens Decoder Wrapper ------------------ #
@@ -138,4 +301,4 @@ def tokens_decoder_sync(syn_token_gen):
             break
         yield audio
 
-    thread.join()
\ No newline at end of file
+    thread.join()
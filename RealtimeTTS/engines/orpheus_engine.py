@@ -1,3 +1,4 @@
+import re
 import json
 import time
 import logging
@@ -8,6 +9,8 @@ import numpy as np
 from queue import Queue
 from typing import Optional, Union
 from .base_engine import BaseEngine
+from .http_client import get_http_client, iter_sse_data
+from .sentence_prefetcher import SentencePrefetcher
 
 # Default configuration values
 DEFAULT_API_URL = "http://127.0.0.1:1234/v1/completions"
@@ -21,6 +24,8 @@ SAMPLE_RATE = 24000  # Specific sample rate for Orpheus
 START_TOKEN_ID = 128259
 END_TOKEN_IDS = [128009, 128260, 128261, 128257]
 CUSTOM_TOKEN_PREFIX = "<custom_token_"
+CUSTOM_TOKEN_PATTERN = re.compile(re.escape(CUSTOM_TOKEN_PREFIX) + r"(\d+)>")
+LAST_CUSTOM_TOKEN_PATTERN = re.compile(re.escape(CUSTOM_TOKEN_PREFIX) + r"(\d+)>\s*$")
 
 
 class OrpheusVoice:
@@ -59,7 +64,8 @@ class OrpheusEngine(BaseEngine):
         top_p: float = 0.9,
         max_tokens: int = 1200,
         repetition_penalty: float = 1.1,
-        debug: bool = False
+        debug: bool = False,
+        prefetch_sentences: int = 1,
     ):
         """
         Initialize the Orpheus TTS engine with the given parameters.
@@ -74,6 +80,10 @@ class OrpheusEngine(BaseEngine):
             max_tokens (int): Maximum tokens to generate per API request.
             repetition_penalty (float): Penalty factor for repeated phrases.
             debug (bool): Flag to enable debug output.
+            prefetch_sentences (int): Number of upcoming sentences whose completion
+                requests are sent while the current sentence is still decoding.
+                Their tokens buffer on the open connection until they are played.
+                0 disables prefetching. Defaults to 1.
         """
         super().__init__()
         self.api_url = api_url
@@ -86,11 +96,21 @@ class OrpheusEngine(BaseEngine):
         self.repetition_penalty = repetition_penalty
         self.debug = debug
         self.queue = Queue()
+        self.http = get_http_client()
+        self._snac_decoder = None
+        self.prefetch_sentences = prefetch_sentences
+        self._prefetcher = SentencePrefetcher(
+            self._open_completion,
+            max_ahead=max(1, prefetch_sentences),
+            name="orpheus",
+            discard=lambda response: response.close(),
+        )
         self.post_init()
 
     def post_init(self):
         """Set up additional engine attributes."""
         self.engine_name = "orpheus"
+        self.can_prefetch = self.prefetch_sentences > 0
 
     def get_stream_info(self):
         """
@@ -101,9 +121,22 @@ class OrpheusEngine(BaseEngine):
         """
         return pyaudio.paInt16, 1, SAMPLE_RATE
 
+    def prefetch(self, text: str):
+        """
+        Sends the completion request for an upcoming sentence.
+
+        Args:
+            text (str): Text of the upcoming sentence.
+        """
+        payload = self._build_payload(text)
+        self._prefetcher.submit(self._payload_key(payload), payload)
+
     def synthesize(self, text: str, sentence_count: int = 0) -> bool:
         """
-        Synthesizes text to audio stream.
+        Convert text to speech and stream audio data via Orpheus.
+
+        Uses the completion request started by prefetch() if the sentence was
+        announced with the current settings, otherwise sends it now.
 
         Args:
             text (str): Text to synthesize.
@@ -114,28 +147,6 @@ class OrpheusEngine(BaseEngine):
         """
         super().synthesize(text, sentence_count)
 
-        try:
-            # Process tokens and put generated audio chunks into the queue
-            for audio_chunk in self._token_decoder(self._generate_tokens(text)):
-                # bail out immediately if someone called .stop()
-                if self.stop_synthesis_event.is_set():
-                    logging.info("OrpheusEngine: synthesis stopped by user")
-                    return False
-                print(f"Audio chunk size: {len(audio_chunk)}")
-                self.queue.put(audio_chunk)
-            return True
-        except Exception as e:
-            traceback.print_exc()
-            logging.error(f"Synthesis error: {e}")
-            return False
-
-    def synthesize(self, text: str) -> bool:
-        """
-        Convert text to speech and stream audio data via Orpheus.
-        Drops initial and trailing near-silent chunks.
-        """
-        super().synthesize(text)
-
         try:
             for audio_chunk in self._token_decoder(self._generate_tokens(text)):
                 # bail out if user called .stop()
@@ -153,11 +164,53 @@ class OrpheusEngine(BaseEngine):
             logging.error(f"Synthesis error: {e}")
             return False
 
+    def _build_payload(self, prompt: str) -> dict:
+        """
+        Build the completion request body for a text prompt.
+        """
+        return {
+            "model": self.model,
+            "prompt": self._format_prompt(prompt),
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "top_p": self.top_p,
+            "repeat_penalty": self.repetition_penalty,
+            "stream": True
+        }
+
+    def _payload_key(self, payload: dict) -> tuple:
+        # Endpoint, voice and sampling settings, so prefetched completions for
+        # outdated settings are dropped instead of played.
+        return self.api_url, json.dumps(payload, sort_keys=True)
+
+    def _open_completion(self, payload: dict):
+        """
+        Send a streaming completion request and return the open response.
+
+        Runs on the prefetch worker for upcoming sentences. Returns as soon as
+        the response headers arrive; the body is read by _generate_tokens.
+        """
+        logging.debug(f"Requesting API URL: {self.api_url} with payload: {payload} and headers: {self.headers}")
+        response = self.http.post(
+            self.api_url,
+            headers=self.headers,
+            json=payload,
+            stream=True
+        )
+        try:
+            response.raise_for_status()
+        except Exception:
+            response.close()
+            raise
+        return response
 
     def _generate_tokens(self, prompt: str):
         """
         Generate a token stream using the LM Studio API.
 
+        Server-sent events are parsed incrementally from the raw response
+        bytes, so every token is yielded as soon as its event is complete.
+
         Args:
             prompt (str): The input text prompt.
 
@@ -165,56 +218,41 @@ class OrpheusEngine(BaseEngine):
             str: Each token's text as it is received from the API.
         """
         logging.debug(f"Generating tokens for prompt: {prompt}")
-        formatted_prompt = self._format_prompt(prompt)
-        
-        payload = {
-            "model": self.model,
-            "prompt": formatted_prompt,
-            "max_tokens": self.max_tokens,
-            "temperature": self.temperature,
-            "top_p": self.top_p,
-            "repeat_penalty": self.repetition_penalty,
-            "stream": True
-        }
+        payload = self._build_payload(prompt)
 
         try:
-            logging.debug(f"Requesting API URL: {self.api_url} with payload: {payload} and headers: {self.headers}")
-            response = requests.post(
-                self.api_url,
-                headers=self.headers,
-                json=payload,
-                stream=True
-            )
-            response.raise_for_status()
-
-            token_counter = 0
             start_time = time.time()  # Start timing token generation
-            for line in response.iter_lines():
-                # stop on demand
-                if self.stop_synthesis_event.is_set():
-                    logging.debug("OrpheusEngine: token generation aborted")
-                    break
-                if line:
-                    line = line.decode('utf-8')
-                    if line.startswith('data: '):
-                        data_str = line[6:]
-                        if data_str.strip() == '[DONE]':
-                            break
-                        
-                        try:
-                            data = json.loads(data_str)
-                            if 'choices' in data and data['choices']:
-                                token_text = data['choices'][0].get('text', '')
-                                if token_text:
-                                    token_counter += 1
-                                    # Print the time it took to get the first token
-                                    if token_counter == 1:
-                                        elapsed = time.time() - start_time
-                                        logging.info(f"Time to first token: {elapsed:.2f} seconds")
-                                    yield token_text
-                        except json.JSONDecodeError as e:
-                            logging.error(f"Error decoding JSON: {e}")
-                            continue
+            response = self._prefetcher.take(self._payload_key(payload), payload)
+            try:
+                token_counter = 0
+                for data in iter_sse_data(response.iter_content(chunk_size=None)):
+                    # stop on demand
+                    if self.stop_synthesis_event.is_set():
+                        logging.debug("OrpheusEngine: token generation aborted")
+                        break
+                    if data.strip() == b"[DONE]":
+                        # Read on to the end of the body so the connection
+                        # goes back to the keep-alive pool.
+                        continue
+
+                    try:
+                        event = json.loads(data)
+                    except json.JSONDecodeError as e:
+                        logging.error(f"Error decoding JSON: {e}")
+                        continue
+
+                    choices = event.get("choices") if isinstance(event, dict) else None
+                    if choices:
+                        token_text = choices[0].get("text", "")
+                        if token_text:
+                            token_counter += 1
+                            # Print the time it took to get the first token
+                            if token_counter == 1:
+                                elapsed = time.time() - start_time
+                                logging.info(f"Time to first token: {elapsed:.2f} seconds")
+                            yield token_text
+            finally:
+                response.close()
 
         except requests.RequestException as e:
             logging.error(f"API request failed: {e}")
@@ -235,8 +273,8 @@ class OrpheusEngine(BaseEngine):
         """
         Decode tokens from the generator and convert them into audio samples.
 
-        This method aggregates tokens in a buffer and converts them into audio chunks
-        once enough tokens have been collected.
+        Token ids are written into a preallocated ring of the last four frames,
+        which is decoded every time a frame of seven tokens completes.
 
         Args:
             token_gen: Generator yielding token strings.
@@ -244,26 +282,53 @@ class OrpheusEngine(BaseEngine):
         Yields:
             Audio samples ready to be streamed.
         """
-        buffer = []
-        count = 0
+        decoder = self._get_snac_decoder()
+        decoder.reset()
 
         logging.debug("Starting token decoding from token generator.")
+        for token in self._iter_token_ids(token_gen):
+            # Decode the last four frames whenever a frame completes
+            try:
+                audio_samples = decoder.push(token)
+            except Exception as e:
+                logging.error(f"Failed to convert buffer to audio: {e}")
+                continue
+            if audio_samples is not None:
+                yield audio_samples
+
+    def _iter_token_ids(self, token_gen):
+        """
+        Extract audio token ids from token texts with a precompiled pattern.
+
+        A text can carry several custom tokens if the server batches them into
+        one event; every one of them is used.
+
+        Yields:
+            int: Audio token ids, offset by their position within the frame.
+        """
+        count = 0
         for token_text in token_gen:
             # bail out if stop was requested
             if self.stop_synthesis_event.is_set():
                 logging.debug("OrpheusEngine: token decoding aborted")
                 break
-            token = self.turn_token_into_id(token_text, count)
-            if token is not None and token > 0:
-                buffer.append(token)
-                count += 1
-
-                # Process every 7 tokens after an initial threshold
-                if count % 7 == 0 and count > 27:
-                    buffer_to_proc = buffer[-28:]
-                    audio_samples = self._convert_buffer(buffer_to_proc, count)
-                    if audio_samples is not None:
-                        yield audio_samples
+            for match in CUSTOM_TOKEN_PATTERN.finditer(token_text):
+                token = int(match.group(1)) - 10 - ((count % 7) * 4096)
+                if token > 0:
+                    count += 1
+                    yield token
+
+    def _get_snac_decoder(self):
+        """
+        Return the engine's SNAC window decoder, creating it on first use.
+
+        The SNAC model itself is loaded by the decoder when the first frame
+        window is decoded.
+        """
+        if self._snac_decoder is None:
+            from .orpheus_decoder import SnacWindowDecoder
+            self._snac_decoder = SnacWindowDecoder()
+        return self._snac_decoder
 
     def turn_token_into_id(self, token_string: str, index: int) -> Optional[int]:
         """
@@ -278,23 +343,10 @@ class OrpheusEngine(BaseEngine):
         Returns:
             Optional[int]: The numeric token ID or None if conversion fails.
         """
-        token_string = token_string.strip()
-        last_token_start = token_string.rfind(CUSTOM_TOKEN_PREFIX)
-        
-        if last_token_start == -1:
-            return None
-        
-        last_token = token_string[last_token_start:]
-        
-        if last_token.startswith(CUSTOM_TOKEN_PREFIX) and last_token.endswith(">"):
-            try:
-                number_str = last_token[14:-1]
-                token_id = int(number_str) - 10 - ((index % 7) * 4096)
-                return token_id
-            except ValueError:
-                return None
-        else:
+        match = LAST_CUSTOM_TOKEN_PATTERN.search(token_string)
+        if match is None:
             return None
+        return int(match.group(1)) - 10 - ((index % 7) * 4096)
 
     def _convert_buffer(self, multiframe, count: int):
         """
@@ -365,6 +417,16 @@ class OrpheusEngine(BaseEngine):
             elif self.debug:
                 logging.warning(f"Ignoring invalid parameter: {param}")
 
+    def stop(self):
+        """
+        Stops the current synthesis and drops prefetched completions.
+        """
+        self._prefetcher.clear()
+        super().stop()
+
+    def shutdown(self):
+        self._prefetcher.shutdown()
+
     def __del__(self):
         """
         Destructor to clean up resources.
@@ -1,9 +1,14 @@
 from parler_tts import ParlerTTSForConditionalGeneration, ParlerTTSStreamer
 from transformers import AutoTokenizer
+from transformers.modeling_outputs import BaseModelOutput
 from .base_engine import BaseEngine
-from threading import Thread
+from collections import OrderedDict
+from threading import Event, Thread
 from typing import Union
+import numpy as np
+import logging
 import pyaudio
+import queue
 import torch
 import time
 
@@ -26,6 +31,7 @@ class ParlerEngine(BaseEngine):
         buffer_duration_s=1.0,
         play_steps_in_s=0.5,
         print_time_to_first_token=False,
+        description_cache_size=8,
     ):
         """
         Initializes the Parler TTS engine.
@@ -36,6 +42,9 @@ class ParlerEngine(BaseEngine):
             torch_dtype (torch.dtype): Torch data type to use.
             voice_prompt (str): Voice prompt for the model.
             play_steps_in_s (float): Duration in seconds for each play step.
+            description_cache_size (int): Number of voice descriptions whose text
+                encoder outputs are kept and reused across sentences. 0 encodes
+                the description again for every sentence.
         """
         super().__init__()
         self.model_name = model_name
@@ -46,6 +55,10 @@ class ParlerEngine(BaseEngine):
         self.voice_parameters = {}
         self.buffer_duration_s = buffer_duration_s
         self.print_time_to_first_token = print_time_to_first_token
+        self.description_cache_size = description_cache_size
+        self._description_cache = OrderedDict()
+        self._generation_jobs = queue.Queue()
+        self._generation_thread = None
 
         self.initialize_model()
 
@@ -107,13 +120,11 @@ class ParlerEngine(BaseEngine):
         if not self.voice_prompt:
             self.voice_prompt = "Female voice, calm and uplifting."
 
-        inputs = self.tokenizer(self.voice_prompt, return_tensors="pt").to(self.device)
         prompt = self.tokenizer(text, return_tensors="pt").to(self.device)
 
         generation_kwargs = {
-            "input_ids": inputs.input_ids,
+            **self._description_kwargs(self.voice_prompt),
             "prompt_input_ids": prompt.input_ids,
-            "attention_mask": inputs.attention_mask,
             "prompt_attention_mask": prompt.attention_mask,
             "streamer": streamer,
             "do_sample": True,
@@ -127,13 +138,8 @@ class ParlerEngine(BaseEngine):
         buffer_length_s = 0.0
         generation_completed = False
 
-        # Start the audio generation (blocking call)
-        def generate_audio():
-            self.model.generate(**generation_kwargs)
-
-        # Start the generation in a separate thread
-        generation_thread = Thread(target=generate_audio)
-        generation_thread.start()
+        # Hand the generation to the worker thread
+        generation_job = self._submit_generation(generation_kwargs)
 
         # Process the streamer in the main thread
         while not generation_completed:
@@ -179,8 +185,94 @@ class ParlerEngine(BaseEngine):
                 generation_completed = True
                 break
 
-        # Ensure the generation thread has completed
-        generation_thread.join()
+        # Ensure the generation has completed
+        generation_job["done"].wait()
+        if generation_job["error"] is not None:
+            raise generation_job["error"]
+
+    def _description_kwargs(self, description: str) -> dict:
+        """
+        Returns the generate() inputs for a voice description.
+
+        The text encoder output of a description only depends on the description
+        itself, so it is computed once and passed to generate() as
+        encoder_outputs for every following sentence with the same voice.
+
+        Args:
+            description (str): Natural-language voice description.
+
+        Returns:
+            dict: input_ids and attention_mask, plus encoder_outputs if cached.
+        """
+        entry = self._description_cache.get(description)
+        if entry is None:
+            inputs = self.tokenizer(description, return_tensors="pt").to(self.device)
+            entry = (inputs.input_ids, inputs.attention_mask, None)
+            if self.description_cache_size > 0:
+                try:
+                    entry = (inputs.input_ids, inputs.attention_mask, self._encode_description(inputs))
+                except Exception as e:
+                    logging.warning(f"Could not encode the voice description ahead of generation, encoding per sentence: {e}")
+                    self.description_cache_size = 0
+            if self.description_cache_size > 0:
+                self._description_cache[description] = entry
+                while len(self._description_cache) > self.description_cache_size:
+                    self._description_cache.popitem(last=False)
+        else:
+            self._description_cache.move_to_end(description)
+
+        input_ids, attention_mask, hidden_states = entry
+        kwargs = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if hidden_states is not None:
+            # A fresh wrapper per call, generate() may replace its fields
+            kwargs["encoder_outputs"] = BaseModelOutput(last_hidden_state=hidden_states)
+        return kwargs
+
+    def _encode_description(self, inputs) -> torch.Tensor:
+        """
+        Runs the text encoder on a tokenized description the way
+        ParlerTTSForConditionalGeneration.generate() does.
+        """
+        with torch.no_grad():
+            hidden_states = self.model.text_encoder(
+                input_ids=inputs.input_ids,
+                attention_mask=inputs.attention_mask,
+            ).last_hidden_state
+            if (
+                self.model.text_encoder.config.hidden_size != self.model.decoder.config.hidden_size
+                and getattr(self.model.decoder.config, "cross_attention_hidden_size", None) is None
+            ):
+                hidden_states = self.model.enc_to_dec_proj(hidden_states)
+            return hidden_states * inputs.attention_mask[..., None]
+
+    def _submit_generation(self, generation_kwargs: dict) -> dict:
+        """
+        Queues a generate() call for the long-lived generation worker.
+
+        Returns:
+            dict: Job state with a "done" event and the "error" raised, if any.
+        """
+        if self._generation_thread is None or not self._generation_thread.is_alive():
+            self._generation_thread = Thread(target=self._generation_worker, name="parler-generate", daemon=True)
+            self._generation_thread.start()
+        job = {"done": Event(), "error": None}
+        self._generation_jobs.put((generation_kwargs, job))
+        return job
+
+    def _generation_worker(self):
+        while True:
+            item = self._generation_jobs.get()
+            if item is None:
+                break
+            generation_kwargs, job = item
+            try:
+                self.model.generate(**generation_kwargs)
+            except Exception as e:
+                job["error"] = e
+                # Release the consumer waiting on the streamer
+                generation_kwargs["streamer"].on_finalized_audio(np.zeros(0, dtype=np.float32), stream_end=True)
+            finally:
+                job["done"].set()
 
     def get_voices(self):
         """
@@ -225,6 +317,9 @@ class ParlerEngine(BaseEngine):
 
     def shutdown(self):
         """
-        Shuts down the engine.
+        Shuts down the engine and its generation worker.
         """
-        pass  
+        if self._generation_thread is not None:
+            self._generation_jobs.put(None)
+            self._generation_thread.join(timeout=5)
+            self._generation_thread = None  
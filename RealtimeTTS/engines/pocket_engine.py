@@ -15,7 +15,9 @@ Features:
 """
 
 from .base_engine import BaseEngine
-from queue import Queue
+from .conditioning_cache import _nbytes
+from collections import OrderedDict, deque
+from queue import Empty, Queue
 from pathlib import Path
 from typing import Union, Optional
 import numpy as np
@@ -27,6 +29,10 @@ import os
 import hashlib
 
 
+# Returned by the worker's request poll when no new request is waiting.
+_NO_REQUEST = object()
+
+
 def _patch_pocket_tts_serial_streaming(TTSModel) -> None:
     """Avoid PocketTTS' per-call decoder thread on Windows/Torch CPU.
 
@@ -173,6 +179,8 @@ class PocketTTSEngine(BaseEngine):
         device: str = "cpu",
         voice_cache_dir: Optional[str] = None,
         cache_voice_states: bool = True,
+        voice_state_cache_bytes: int = 512 * 1024 * 1024,
+        frames_per_turn: int = 4,
         debug: bool = False
     ):
         """
@@ -190,6 +198,11 @@ class PocketTTSEngine(BaseEngine):
             max_tokens: Maximum generation tokens passed to Pocket TTS
             frames_after_eos: Optional trailing frames after EOS for Pocket TTS
             device: Torch device for the Pocket TTS model, for example "cpu" or "cuda"
+            voice_state_cache_bytes: Memory limit for cached voice states. The least
+                recently used states beyond it are dropped and later reloaded from
+                their safetensors file (voice_cache_dir) or recreated
+            frames_per_turn: Audio frames one request generates before the worker
+                turns to the next waiting request
             debug: Enable debug output
         """
         super().__init__()
@@ -211,11 +224,16 @@ class PocketTTSEngine(BaseEngine):
         self.device = device
         self.voice_cache_dir = Path(voice_cache_dir) if voice_cache_dir else None
         self.cache_voice_states = cache_voice_states
+        self.voice_state_cache_bytes = voice_state_cache_bytes
+        self.frames_per_turn = max(1, int(frames_per_turn))
 
         # Initialize the model
         self.model = None
         self.sample_rate = None
-        self._voice_states = {}  # Cache for voice states
+        # LRU of voice states: cache key -> (state, bytes, safetensors path or None)
+        self._voice_states = OrderedDict()
+        self._voice_state_bytes = 0
+        self._voice_state_lock = threading.RLock()
         self.current_voice = None
         self.current_voice_state = None
 
@@ -238,32 +256,67 @@ class PocketTTSEngine(BaseEngine):
         self._synthesis_worker_thread.start()
 
     def _synthesis_worker_loop(self):
+        """
+        Runs all requests on one thread, taking turns between them.
+
+        Every request is a generator that yields after each queued audio frame.
+        The worker advances the oldest active request by frames_per_turn frames
+        and then moves it behind the others, so a long utterance cannot hold
+        back short requests for other voices.
+        """
+        active = deque()
         while True:
-            job = self._synthesis_requests.get()
+            try:
+                job = self._synthesis_requests.get(block=not active)
+            except Empty:
+                job = _NO_REQUEST
+
             if job is None:
                 self._synthesis_requests.task_done()
+                for steps, response_queue in active:
+                    steps.close()
+                    response_queue.put((False, None))
                 break
+            if job is not _NO_REQUEST:
+                # Admit every waiting request before the next turn
+                active.append(job)
+                self._synthesis_requests.task_done()
+                continue
 
-            text, sentence_count, response_queue = job
+            steps, response_queue = active.popleft()
             try:
-                response_queue.put((self._synthesize_impl(text, sentence_count), None))
+                for _ in range(self.frames_per_turn):
+                    next(steps)
+            except StopIteration as finished:
+                response_queue.put((finished.value, None))
             except Exception as exc:
                 response_queue.put((False, exc))
-            finally:
-                self._synthesis_requests.task_done()
+            else:
+                active.append((steps, response_queue))
 
-    def _synthesize_on_worker(self, text: str, sentence_count: int = 0) -> bool:
+    @staticmethod
+    def _run_steps(steps) -> bool:
+        while True:
+            try:
+                next(steps)
+            except StopIteration as finished:
+                return finished.value
+
+    def _run_on_worker(self, steps) -> bool:
         worker = getattr(self, "_synthesis_worker_thread", None)
         if worker is None or threading.current_thread() is worker:
-            return self._synthesize_impl(text, sentence_count)
+            return self._run_steps(steps)
 
         response_queue = Queue(maxsize=1)
-        self._synthesis_requests.put((text, sentence_count, response_queue))
+        self._synthesis_requests.put((steps, response_queue))
         success, error = response_queue.get()
         if error is not None:
             raise error
         return success
 
+    def _synthesize_on_worker(self, text: str, sentence_count: int = 0) -> bool:
+        return self._run_on_worker(self._synthesis_steps(text, sentence_count))
+
     def _load_model(self):
         """Load the Pocket TTS model."""
         try:
@@ -354,18 +407,33 @@ class PocketTTSEngine(BaseEngine):
 
         # Check cache
         cache_key = f"{voice_name}:{state_path or audio_path or 'builtin'}"
-        if cache_key in self._voice_states:
-            if self.debug:
-                print(f"[PocketTTSEngine] Using cached voice state for: {cache_key}")
-            return self._voice_states[cache_key]
+        with self._voice_state_lock:
+            if cache_key in self._voice_states:
+                if self.debug:
+                    print(f"[PocketTTSEngine] Using cached voice state for: {cache_key}")
+                self._voice_states.move_to_end(cache_key)
+                return self._voice_states[cache_key][0]
+            voice_state, disk_path = self._create_voice_state(voice_name, audio_path, state_path)
+            self._remember_voice_state(cache_key, voice_state, disk_path)
+            return voice_state
+
+    def _create_voice_state(
+        self, voice_name: str, audio_path: Optional[str], state_path: Optional[str]
+    ):
+        """
+        Creates a voice state.
 
-        # Create new voice state
+        Returns:
+            tuple: (voice state, safetensors path it can be reloaded from or None)
+        """
+        disk_path = None
         if state_path:
             if not os.path.exists(state_path):
                 raise FileNotFoundError(f"Voice state file not found: {state_path}")
             if self.debug:
                 print(f"[PocketTTSEngine] Loading voice state from: {state_path}")
             voice_state = self.model.get_state_for_audio_prompt(state_path)
+            disk_path = Path(state_path)
         elif audio_path:
             # Voice cloning from WAV file
             if not os.path.exists(audio_path):
@@ -384,6 +452,7 @@ class PocketTTSEngine(BaseEngine):
                 voice_state = self.model.get_state_for_audio_prompt(str(prompt_path))
                 if cached_state_path is not None:
                     self._export_voice_state(voice_state, cached_state_path)
+            disk_path = cached_state_path
         else:
             # Built-in voice
             if voice_name not in PocketTTSVoice.BUILTIN_VOICES:
@@ -397,9 +466,23 @@ class PocketTTSEngine(BaseEngine):
 
             voice_state = self.model.get_state_for_audio_prompt(voice_name)
 
-        # Cache and return
-        self._voice_states[cache_key] = voice_state
-        return voice_state
+        return voice_state, disk_path
+
+    def _remember_voice_state(self, cache_key: str, voice_state, disk_path: Optional[Path]) -> None:
+        """
+        Adds a voice state to the LRU and drops the least recently used states
+        beyond voice_state_cache_bytes. The newest state is always kept.
+        """
+        size = _nbytes(voice_state)
+        self._voice_states[cache_key] = (voice_state, size, disk_path)
+        self._voice_state_bytes += size
+        while self._voice_state_bytes > self.voice_state_cache_bytes and len(self._voice_states) > 1:
+            evicted_key, (evicted_state, evicted_size, evicted_path) = self._voice_states.popitem(last=False)
+            self._voice_state_bytes -= evicted_size
+            if evicted_path is not None and not evicted_path.exists():
+                self._export_voice_state(evicted_state, evicted_path)
+            if self.debug:
+                print(f"[PocketTTSEngine] Evicted voice state: {evicted_key}")
 
     def _cached_state_path(self, voice_name: str, audio_path: str) -> Optional[Path]:
         if not self.cache_voice_states or self.voice_cache_dir is None:
@@ -484,57 +567,100 @@ class PocketTTSEngine(BaseEngine):
             audio_float32 = audio_float32.squeeze()
         return audio_float32.reshape(-1)
 
-    def _queue_audio(self, audio_float32: np.ndarray) -> int:
+    def _queue_audio(self, audio_float32: np.ndarray, audio_queue: Optional[Queue] = None) -> int:
         if audio_float32.size == 0:
             return 0
         audio_float32 = np.clip(audio_float32, -1.0, 1.0)
         audio_int16 = (audio_float32 * 32767).astype(np.int16).tobytes()
+        if audio_queue is not None:
+            audio_queue.put(audio_int16)
+            return len(audio_int16)
         self.audio_duration += len(audio_float32) / self.sample_rate
         self.queue.put(audio_int16)
         return len(audio_int16)
 
-    def _synthesize_streaming(self, text: str, start_time: float) -> bool:
-        chunk_count = 0
-        sample_count = 0
-        for audio_chunk in self.model.generate_audio_stream(
-            self.current_voice_state,
+    def _trim_chunk(self, audio_float32: np.ndarray, start_pending: bool):
+        """
+        Trims silence like _trim_silence, with the start-of-utterance flag of
+        one request. Requests take turns on the worker, so the engine's own
+        flag is restored afterwards.
+
+        Returns:
+            tuple: (trimmed audio, whether the start is still pending)
+        """
+        saved = self._trim_silence_start_pending
+        self._trim_silence_start_pending = start_pending
+        try:
+            audio_float32 = self._trim_silence(
+                audio_float32,
+                sample_rate=self.sample_rate,
+                silence_threshold=self.silence_threshold,
+                extra_start_ms=self.extra_start_ms,
+                extra_end_ms=self.extra_end_ms,
+                fade_in_ms=self.fade_in_ms,
+                fade_out_ms=self.fade_out_ms,
+            )
+            return audio_float32, self._trim_silence_start_pending
+        finally:
+            self._trim_silence_start_pending = saved
+
+    def _generate_chunks(self, voice_state, text: str):
+        """Yields the flat float32 audio of text, frame by frame when streaming."""
+        if self.streaming and hasattr(self.model, "generate_audio_stream"):
+            for audio_chunk in self.model.generate_audio_stream(
+                voice_state,
+                text,
+                max_tokens=self.max_tokens,
+                frames_after_eos=self.frames_after_eos,
+            ):
+                yield self._to_numpy_audio(audio_chunk)
+            return
+
+        audio_tensor = self.model.generate_audio(
+            voice_state,
             text,
             max_tokens=self.max_tokens,
             frames_after_eos=self.frames_after_eos,
-        ):
-            if self.stop_synthesis_event.is_set():
+        )
+        yield self._to_numpy_audio(audio_tensor)
+
+    def _generation_steps(
+        self,
+        voice_state,
+        text: str,
+        stop_event,
+        audio_queue: Optional[Queue] = None,
+    ):
+        """
+        Generates text into audio_queue (engine.queue if None), yielding after
+        every queued chunk. Returns True, also when stop_event ends it early.
+        """
+        start_time = time.time()
+        chunk_count = 0
+        sample_count = 0
+        start_pending = True
+        for audio_float32 in self._generate_chunks(voice_state, text):
+            if stop_event is not None and stop_event.is_set():
                 if self.debug:
-                    print("[PocketTTSEngine] Streaming synthesis stopped")
+                    print("[PocketTTSEngine] Synthesis stopped")
                 return True
-            audio_float32 = self._to_numpy_audio(audio_chunk)
             if self.trim_silence:
-                audio_float32 = self._trim_silence(
-                    audio_float32,
-                    sample_rate=self.sample_rate,
-                    silence_threshold=self.silence_threshold,
-                    extra_start_ms=self.extra_start_ms,
-                    extra_end_ms=self.extra_end_ms,
-                    fade_in_ms=self.fade_in_ms,
-                    fade_out_ms=self.fade_out_ms,
-                )
-            queued_bytes = self._queue_audio(audio_float32)
-            if queued_bytes:
+                audio_float32, start_pending = self._trim_chunk(audio_float32, start_pending)
+            if self._queue_audio(audio_float32, audio_queue):
                 chunk_count += 1
                 sample_count += len(audio_float32)
+            yield
 
         if self.debug:
             duration = time.time() - start_time
             audio_length_seconds = sample_count / self.sample_rate
             print(
-                f"[PocketTTSEngine] Streaming synthesis completed in {duration:.3f}s "
+                f"[PocketTTSEngine] Synthesis completed in {duration:.3f}s "
                 f"({audio_length_seconds:.2f}s of audio, {chunk_count} chunks)"
             )
         return True
 
     def synthesize(self, text: str, sentence_count: int = 0) -> bool:
-        return self._synthesize_on_worker(text, sentence_count)
-
-    def _synthesize_impl(self, text: str, sentence_count: int = 0) -> bool:
         """
         Synthesizes text to audio stream.
 
@@ -545,6 +671,45 @@ class PocketTTSEngine(BaseEngine):
         Returns:
             bool: True if successful, False otherwise.
         """
+        return self._synthesize_on_worker(text, sentence_count)
+
+    def synthesize_with_voice(
+        self,
+        text: str,
+        voice: Union[str, PocketTTSVoice],
+        audio_queue: Queue,
+        stop_event: Optional[threading.Event] = None,
+    ) -> bool:
+        """
+        Synthesizes text with another voice than the current one into audio_queue.
+
+        Serves several listeners from one engine: calls from different threads
+        share the synthesis worker, which interleaves their generation in turns
+        of frames_per_turn frames. engine.queue, the current voice and stop()
+        are not affected.
+
+        Args:
+            text (str): Text to synthesize.
+            voice: Voice identifier (string) or PocketTTSVoice object.
+            audio_queue (Queue): Receives the 16-bit PCM chunks.
+            stop_event (threading.Event, optional): Ends the synthesis when set.
+
+        Returns:
+            bool: True if successful, False otherwise.
+        """
+        return self._run_on_worker(self._voice_steps(text, voice, audio_queue, stop_event))
+
+    def _voice_steps(self, text: str, voice, audio_queue: Queue, stop_event):
+        if not text or not text.strip():
+            return True
+        if self.model is None:
+            print("[PocketTTSEngine] Model not loaded")
+            return False
+        voice_state = self._get_voice_state(self._resolve_voice(voice))
+        return (yield from self._generation_steps(voice_state, text, stop_event, audio_queue))
+
+    def _synthesis_steps(self, text: str, sentence_count: int = 0):
+        """Generator behind synthesize(); yields after every queued chunk."""
         super().synthesize(text, sentence_count)
 
         if self.stop_synthesis_event.is_set():
@@ -555,8 +720,6 @@ class PocketTTSEngine(BaseEngine):
                 print("[PocketTTSEngine] Empty text, skipping synthesis")
             return True
 
-        start_time = time.time()
-
         try:
             if self.model is None:
                 print("[PocketTTSEngine] Model not loaded")
@@ -569,39 +732,9 @@ class PocketTTSEngine(BaseEngine):
             if self.debug:
                 print(f"[PocketTTSEngine] Synthesizing: '{text[:50]}...'")
 
-            if self.streaming and hasattr(self.model, "generate_audio_stream"):
-                return self._synthesize_streaming(text, start_time)
-
-            # Generate audio
-            audio_tensor = self.model.generate_audio(
-                self.current_voice_state,
-                text,
-                max_tokens=self.max_tokens,
-                frames_after_eos=self.frames_after_eos,
-            )
-            audio_float32 = self._to_numpy_audio(audio_tensor)
-
-            # Trim silence if enabled
-            if self.trim_silence:
-                audio_float32 = self._trim_silence(
-                    audio_float32,
-                    sample_rate=self.sample_rate,
-                    silence_threshold=self.silence_threshold,
-                    extra_start_ms=self.extra_start_ms,
-                    extra_end_ms=self.extra_end_ms,
-                    fade_in_ms=self.fade_in_ms,
-                    fade_out_ms=self.fade_out_ms,
-                )
-
-            self._queue_audio(audio_float32)
-
-            if self.debug:
-                duration = time.time() - start_time
-                audio_length_seconds = len(audio_float32) / self.sample_rate
-                print(f"[PocketTTSEngine] Synthesis completed in {duration:.3f}s "
-                      f"({audio_length_seconds:.2f}s of audio)")
-
-            return True
+            return (yield from self._generation_steps(
+                self.current_voice_state, text, self.stop_synthesis_event
+            ))
 
         except Exception as e:
             traceback.print_exc()
@@ -617,6 +750,23 @@ class PocketTTSEngine(BaseEngine):
         """
         return [PocketTTSVoice(name) for name in PocketTTSVoice.BUILTIN_VOICES]
 
+    @staticmethod
+    def _resolve_voice(voice: Union[str, PocketTTSVoice]) -> PocketTTSVoice:
+        if not isinstance(voice, str):
+            return voice
+        # Check if it's a built-in voice
+        if voice in PocketTTSVoice.BUILTIN_VOICES:
+            return PocketTTSVoice(voice)
+        # Assume it's a path to a WAV file for cloning
+        if os.path.exists(voice):
+            if str(voice).lower().endswith(".safetensors"):
+                return PocketTTSVoice(name=os.path.basename(voice), state_path=voice)
+            return PocketTTSVoice(name=os.path.basename(voice), audio_prompt_path=voice)
+        raise ValueError(
+            f"Unknown voice: {voice}. "
+            f"Available voices: {PocketTTSVoice.BUILTIN_VOICES}"
+        )
+
     def set_voice(self, voice: Union[str, PocketTTSVoice]):
         """
         Set the current voice for synthesis.
@@ -625,30 +775,7 @@ class PocketTTSEngine(BaseEngine):
             voice: Voice identifier (string) or PocketTTSVoice object
         """
         try:
-            if isinstance(voice, str):
-                # Check if it's a built-in voice
-                if voice in PocketTTSVoice.BUILTIN_VOICES:
-                    self.current_voice = PocketTTSVoice(voice)
-                else:
-                    # Assume it's a path to a WAV file for cloning
-                    if os.path.exists(voice):
-                        if str(voice).lower().endswith(".safetensors"):
-                            self.current_voice = PocketTTSVoice(
-                                name=os.path.basename(voice),
-                                state_path=voice
-                            )
-                        else:
-                            self.current_voice = PocketTTSVoice(
-                                name=os.path.basename(voice),
-                                audio_prompt_path=voice
-                            )
-                    else:
-                        raise ValueError(
-                            f"Unknown voice: {voice}. "
-                            f"Available voices: {PocketTTSVoice.BUILTIN_VOICES}"
-                        )
-            else:
-                self.current_voice = voice
+            self.current_voice = self._resolve_voice(voice)
 
             # Get/create voice state
             self.current_voice_state = self._get_voice_state(self.current_voice)
@@ -693,5 +820,6 @@ class PocketTTSEngine(BaseEngine):
 
         # Clear caches
         self._voice_states.clear()
+        self._voice_state_bytes = 0
         self.current_voice_state = None
         self.model = None
@@ -0,0 +1,130 @@
+"""
+Quality levels and the buffer-aware quality governor.
+
+Several engines have a setting that trades output quality for synthesis
+speed (diffusion or flow-matching steps, for example). An engine declares
+the values it supports through BaseEngine.get_quality_levels(), ordered from
+the fastest to the best, and applies one with set_quality_level().
+
+QualityGovernor picks the level for every sentence while a stream plays. It
+learns the realtime factor (synthesis seconds per audio second) of each level
+and how many seconds of audio a character of text yields. A sentence gets
+the best level whose expected synthesis time fits into a share of the audio
+that is still buffered for playback; with nothing buffered (first sentence,
+after an underrun) or on a slow machine it falls back to the fastest level.
+The estimate assumes the whole sentence has to be synthesized before its
+first audio plays, which is exact for non-streaming engines and conservative
+for streaming ones.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+
+@dataclass(frozen=True)
+class QualityLevel:
+    """
+    One quality setting of an engine.
+
+    Attributes:
+        name (str): Short label, e.g. "8 steps".
+        cost (float): Expected compute relative to the other levels of the
+            same engine. Only used until the level has been measured.
+        settings (dict): Engine settings the level applies, for logging.
+    """
+    name: str
+    cost: float = 1.0
+    settings: Dict[str, Any] = field(default_factory=dict)
+
+
+def step_levels(parameter: str, steps: Sequence[int]) -> List[QualityLevel]:
+    """
+    Builds levels for a number-of-steps setting, cost proportional to the steps.
+    """
+    return [
+        QualityLevel(f"{value} steps", float(value), {parameter: value})
+        for value in sorted(set(int(value) for value in steps if int(value) > 0))
+    ]
+
+
+class QualityGovernor:
+    """
+    Picks a quality level per sentence from buffered audio and measured speed.
+    """
+    def __init__(
+        self,
+        levels: Sequence[QualityLevel],
+        headroom: float = 0.5,
+        smoothing: float = 0.5,
+        seconds_per_character: float = 0.065,
+    ):
+        """
+        Args:
+            levels (Sequence[QualityLevel]): Levels from fastest to best.
+            headroom (float): Share of the buffered audio a sentence may take
+                to synthesize.
+            smoothing (float): Weight of the newest measurement in the running
+                averages.
+            seconds_per_character (float): Initial estimate of audio seconds
+                per character of text, refined from every sentence.
+        """
+        if not levels:
+            raise ValueError("QualityGovernor needs at least one quality level")
+        self.levels = list(levels)
+        self.headroom = headroom
+        self.smoothing = smoothing
+        self.seconds_per_character = seconds_per_character
+        self.realtime_factors: Dict[int, float] = {}
+        self._last_measured: Optional[int] = None
+
+    def _average(self, current: Optional[float], value: float) -> float:
+        if current is None:
+            return value
+        return current + self.smoothing * (value - current)
+
+    def estimated_realtime_factor(self, level: int) -> Optional[float]:
+        """
+        Returns the measured realtime factor of a level, or one scaled by cost
+        from the last measured level, or None before any measurement.
+        """
+        if level in self.realtime_factors:
+            return self.realtime_factors[level]
+        if self._last_measured is None:
+            return None
+        reference = self.levels[self._last_measured]
+        scale = self.levels[level].cost / reference.cost if reference.cost > 0 else 1.0
+        return self.realtime_factors[self._last_measured] * scale
+
+    def choose(self, text: str, buffered_seconds: float) -> int:
+        """
+        Returns the index of the level to use for the next sentence.
+
+        Args:
+            text (str): The sentence.
+            buffered_seconds (float): Audio seconds queued for playback.
+        """
+        if buffered_seconds <= 0 or self._last_measured is None:
+            return 0
+        budget = buffered_seconds * self.headroom
+        audio_seconds = max(1, len(text)) * self.seconds_per_character
+        chosen = 0
+        for level in range(len(self.levels)):
+            factor = self.estimated_realtime_factor(level)
+            if factor is not None and factor * audio_seconds <= budget:
+                chosen = level
+        return chosen
+
+    def record(self, level: int, text: str, synthesis_seconds: float, audio_seconds: float):
+        """
+        Records how long a sentence took and how much audio it produced.
+        """
+        if audio_seconds <= 0 or synthesis_seconds <= 0:
+            return
+        self.realtime_factors[level] = self._average(
+            self.realtime_factors.get(level), synthesis_seconds / audio_seconds
+        )
+        self._last_measured = level
+        if text:
+            self.seconds_per_character = self._average(
+                self.seconds_per_character, audio_seconds / len(text)
+            )
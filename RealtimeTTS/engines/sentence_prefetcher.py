@@ -0,0 +1,140 @@
+"""
+Ordered lookahead for engines that can start work on upcoming sentences.
+
+TextToAudioStream synthesizes one sentence at a time. Engines whose per-sentence
+cost is mostly waiting (remote jobs, HTTP downloads, completion requests) can
+opt in with can_prefetch and receive every upcoming sentence through
+BaseEngine.prefetch() as soon as it has been split off the text stream. A
+SentencePrefetcher runs the engine's fetch function for a bounded number of
+those sentences in the background and hands the results back in order when
+synthesize() asks for them.
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Hashable, Optional
+
+
+class SentencePrefetcher:
+    """
+    Runs fetch(*args) for up to max_ahead upcoming sentences concurrently.
+
+    Finished results count against max_ahead until they are taken, so at most
+    max_ahead results are held in memory.
+
+    Entries are identified by a key that must capture everything the result
+    depends on (text, voice, speed, ...). If the engine settings change between
+    submit() and take(), the keys no longer match and the stale result is
+    dropped instead of being played.
+
+    Fetches that wait on remote work can watch cancel_event, which is set by
+    clear() and replaced by a fresh event afterwards, so sentences submitted
+    after a clear() are not cancelled by it.
+    """
+    def __init__(
+        self,
+        fetch: Callable[..., Any],
+        max_ahead: int = 2,
+        name: str = "prefetch",
+        discard: Optional[Callable[[Any], None]] = None,
+    ):
+        """
+        Args:
+            fetch (Callable): Function producing the result for one sentence.
+            max_ahead (int): Maximum number of sentences fetched at the same time.
+            name (str): Thread name prefix of the worker threads.
+            discard (Callable, optional): Called with the result of every fetch
+                that finishes but is dropped, for results holding resources
+                such as open responses.
+        """
+        self.fetch = fetch
+        self.discard = discard
+        self.max_ahead = max(1, max_ahead)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_ahead, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        # Each entry is [key, args, future or None]
+        self._entries = deque()
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancel_event(self) -> threading.Event:
+        """
+        Event set by the next clear(). Pass it to fetch together with the
+        sentence, so the fetch knows whether it belongs to a dropped generation.
+        """
+        with self._lock:
+            return self._cancel_event
+
+    def submit(self, key: Hashable, *args):
+        """
+        Registers an upcoming sentence. Fetching starts once a slot is free.
+        """
+        with self._lock:
+            self._entries.append([key, args, None])
+            self._start_pending()
+
+    def take(self, key: Hashable, *args) -> Any:
+        """
+        Returns the result for key, waiting for a prefetched fetch if there is one.
+
+        Entries queued before key are discarded. If key was never submitted, all
+        pending entries are considered stale and fetch(*args) runs synchronously.
+        Exceptions raised by fetch are re-raised here.
+        """
+        future = None
+        with self._lock:
+            position = next(
+                (i for i, entry in enumerate(self._entries) if entry[0] == key),
+                None,
+            )
+            discard = len(self._entries) if position is None else position
+            for _ in range(discard):
+                self._cancel(self._entries.popleft())
+            if position is not None:
+                entry = self._entries.popleft()
+                future = entry[2]
+                if future is None:
+                    future = self._executor.submit(self.fetch, *entry[1])
+            self._start_pending()
+
+        if future is None:
+            return self.fetch(*args)
+        return future.result()
+
+    def has_pending(self) -> bool:
+        with self._lock:
+            return bool(self._entries)
+
+    def clear(self):
+        """
+        Drops all upcoming sentences. Fetches that already run finish in the background.
+        """
+        with self._lock:
+            while self._entries:
+                self._cancel(self._entries.popleft())
+            self._cancel_event.set()
+            self._cancel_event = threading.Event()
+
+    def shutdown(self):
+        self.clear()
+        self._executor.shutdown(wait=False)
+
+    def _start_pending(self):
+        running = 0
+        for entry in self._entries:
+            if running >= self.max_ahead:
+                break
+            if entry[2] is None:
+                entry[2] = self._executor.submit(self.fetch, *entry[1])
+            running += 1
+
+    def _cancel(self, entry):
+        future: Future = entry[2]
+        if future is not None and not future.cancel():
+            # Already running, keep errors of discarded fetches out of the log noise.
+            future.add_done_callback(self._discard_result)
+
+    def _discard_result(self, future: Future):
+        if future.exception() is None and self.discard is not None:
+            self.discard(future.result())
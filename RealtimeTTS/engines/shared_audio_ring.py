@@ -0,0 +1,210 @@
+"""
+Shared-memory ring buffer for audio chunks produced in a worker process.
+
+Sending every chunk over a multiprocessing pipe pickles it, copies it through
+the kernel and, with ParentPipe, hands it through an extra thread and result
+queue. SharedAudioRing lets one producer process write chunks straight into a
+shared memory block and one consumer in the parent read them back, with a
+semaphore as doorbell instead of polling. The pipe stays in use for commands
+and status messages.
+
+Records are stored as a 4 byte little-endian length followed by the payload.
+The header holds the total number of bytes written and read so far and the
+number of notices (status messages waiting on the pipe), each updated by only
+one side.
+"""
+
+import multiprocessing as mp
+import struct
+import time
+from multiprocessing import shared_memory
+from typing import List, Optional
+
+_HEADER = struct.Struct("<QQQ")
+_LENGTH = struct.Struct("<I")
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    try:
+        # Python 3.13+: the creating process owns the block
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            from multiprocessing import resource_tracker
+
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+        return shm
+
+
+class SharedAudioRing:
+    """
+    Single producer, single consumer byte ring in shared memory.
+
+    Create it in the parent process and pass it to the worker process as a
+    Process argument; the worker attaches to the same memory block.
+    """
+    def __init__(self, capacity: int = 4 * 1024 * 1024, context=mp):
+        """
+        Args:
+            capacity (int): Ring size in bytes. Chunks larger than capacity - 4 cannot be written.
+            context: multiprocessing module or context used to create the doorbell semaphore.
+        """
+        self.capacity = capacity
+        self._shm = shared_memory.SharedMemory(create=True, size=_HEADER.size + capacity)
+        self._owner = True
+        _HEADER.pack_into(self._shm.buf, 0, 0, 0, 0)
+        self._notices_seen = 0
+        self._doorbell = context.Semaphore(0)
+        # Released by the consumer after reading, wakes a producer waiting for space.
+        self._space = context.Semaphore(0)
+
+    def __getstate__(self):
+        return {
+            "name": self._shm.name,
+            "capacity": self.capacity,
+            "doorbell": self._doorbell,
+            "space": self._space,
+        }
+
+    def __setstate__(self, state):
+        self.capacity = state["capacity"]
+        self._shm = _attach(state["name"])
+        self._owner = False
+        self._notices_seen = 0
+        self._doorbell = state["doorbell"]
+        self._space = state["space"]
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def _counters(self):
+        return _HEADER.unpack_from(self._shm.buf, 0)[:2]
+
+    def _copy_in(self, position: int, data) -> int:
+        start = position % self.capacity
+        first = min(len(data), self.capacity - start)
+        base = _HEADER.size
+        self._shm.buf[base + start:base + start + first] = data[:first]
+        if first < len(data):
+            self._shm.buf[base:base + len(data) - first] = data[first:]
+        return position + len(data)
+
+    def _copy_out(self, position: int, size: int) -> bytes:
+        start = position % self.capacity
+        first = min(size, self.capacity - start)
+        base = _HEADER.size
+        data = bytes(self._shm.buf[base + start:base + start + first])
+        if first < size:
+            data += bytes(self._shm.buf[base:base + size - first])
+        return data
+
+    def fits(self, size: int) -> bool:
+        return _LENGTH.size + size <= self.capacity
+
+    def write(self, data, stop_event=None, timeout: Optional[float] = None) -> bool:
+        """
+        Writes one chunk and rings the doorbell. Producer side.
+
+        Waits while the ring is full.
+
+        Args:
+            data: bytes-like chunk (bytes, memoryview or a contiguous numpy array).
+            stop_event: Optional event; writing is abandoned when it is set.
+            timeout (float, optional): Maximum seconds to wait for free space.
+
+        Returns:
+            bool: False if the chunk was not written (too large, stopped or timed out).
+        """
+        payload = memoryview(data).cast("B")
+        needed = _LENGTH.size + len(payload)
+        if needed > self.capacity:
+            return False
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            written, read = self._counters()
+            if self.capacity - (written - read) >= needed:
+                break
+            if stop_event is not None and stop_event.is_set():
+                return False
+            wait = 0.05
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+                if wait <= 0:
+                    return False
+            self._space.acquire(timeout=wait)
+
+        position = self._copy_in(written, _LENGTH.pack(len(payload)))
+        position = self._copy_in(position, payload)
+        # Publish the record only after its bytes are in place.
+        struct.pack_into("<Q", self._shm.buf, 0, position)
+        self._doorbell.release()
+        return True
+
+    def notify(self):
+        """
+        Posts a notice and rings the doorbell. Producer side.
+
+        Call it after sending a status message over the pipe, so the consumer
+        knows the pipe needs to be read.
+        """
+        notices = struct.unpack_from("<Q", self._shm.buf, 16)[0]
+        struct.pack_into("<Q", self._shm.buf, 16, notices + 1)
+        self._doorbell.release()
+
+    def take_notice(self) -> bool:
+        """
+        Returns True and consumes one notice if the producer posted one. Consumer side.
+        """
+        notices = struct.unpack_from("<Q", self._shm.buf, 16)[0]
+        if notices > self._notices_seen:
+            self._notices_seen += 1
+            return True
+        return False
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until the producer rang the doorbell. Consumer side.
+
+        Returns:
+            bool: True if the doorbell rang, False on timeout.
+        """
+        rang = self._doorbell.acquire(timeout=timeout)
+        if rang:
+            # One wake-up covers all rings so far.
+            while self._doorbell.acquire(False):
+                pass
+        return rang
+
+    def read_available(self) -> List[bytes]:
+        """
+        Returns all complete chunks written so far, in order. Consumer side.
+        """
+        written, read = self._counters()
+        chunks = []
+        while read < written:
+            size = _LENGTH.unpack(self._copy_out(read, _LENGTH.size))[0]
+            chunks.append(self._copy_out(read + _LENGTH.size, size))
+            read += _LENGTH.size + size
+        if chunks:
+            struct.pack_into("<Q", self._shm.buf, 8, read)
+            self._space.release()
+        return chunks
+
+    def close(self):
+        """
+        Detaches from the memory block. The creating process also removes it.
+        """
+        if self._shm is None:
+            return
+        self._shm.close()
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+        self._shm = None
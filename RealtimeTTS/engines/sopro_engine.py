@@ -5,6 +5,8 @@ from typing import Optional, Union
 import numpy as np
 
 from .base_engine import BaseEngine
+from .conditioning_cache import ConditioningCache, get_conditioning_cache, make_key, to_device
+from .utterance_pieces import PieceLimits
 
 
 class SoproTTSVoice:
@@ -42,7 +44,9 @@ class SoproTTSEngine(BaseEngine):
     SoproTTS engine for RealtimeTTS.
 
     Sopro exposes a native streaming API. This wrapper prepares the reference
-    voice once, then queues each generated audio chunk as 16-bit PCM.
+    voice once, then queues each generated audio chunk as 16-bit PCM. With
+    streaming disabled, long sentences are synthesized in pieces
+    (`piece_limits`, None disables it).
     """
 
     def __init__(
@@ -70,6 +74,8 @@ class SoproTTSEngine(BaseEngine):
         extra_end_ms: int = 10,
         fade_in_ms: int = 5,
         fade_out_ms: int = 10,
+        conditioning_cache: Optional[ConditioningCache] = None,
+        piece_limits: Optional[PieceLimits] = PieceLimits(),
     ):
         try:
             from sopro import SoproTTS
@@ -102,11 +108,12 @@ class SoproTTSEngine(BaseEngine):
         self.extra_end_ms = extra_end_ms
         self.fade_in_ms = fade_in_ms
         self.fade_out_ms = fade_out_ms
+        self.piece_limits = piece_limits
         self.sampling_rate = int(TARGET_SR)
         self.voice = None
         self._prepared_ref = None
         self._prepared_voice_key = None
-        self._reference_cache = {}
+        self.conditioning_cache = conditioning_cache or get_conditioning_cache()
 
         if cache_dir:
             os.environ["HF_HOME"] = cache_dir
@@ -127,6 +134,7 @@ class SoproTTSEngine(BaseEngine):
 
     def post_init(self):
         self.engine_name = "sopro"
+        self.whole_utterance_only = not self.streaming
 
     def get_stream_info(self):
         import pyaudio
@@ -137,31 +145,25 @@ class SoproTTSEngine(BaseEngine):
         return []
 
     def _voice_cache_key(self, voice: SoproTTSVoice):
-        try:
-            mtime = os.path.getmtime(voice.ref_audio_path)
-        except OSError:
-            mtime = 0
-        return (
-            os.path.abspath(voice.ref_audio_path),
-            mtime,
-            self.ref_seconds,
+        return make_key(
+            f"sopro:{self.model_name}:{self.revision}",
+            [voice.ref_audio_path],
+            ref_seconds=self.ref_seconds,
         )
 
     def _prepare_reference(self, voice: SoproTTSVoice):
         if not voice.ref_audio_path:
             raise ValueError("SoproTTS requires a reference audio path.")
-        key = self._voice_cache_key(voice)
-        cached = self._reference_cache.get(key)
-        if cached is not None:
-            return cached
-
-        logging.info("Encoding SoproTTS reference: %s", voice.ref_audio_path)
-        prepared = self._model.prepare_reference(
-            ref_audio_path=voice.ref_audio_path,
-            ref_seconds=self.ref_seconds,
-        )
-        self._reference_cache[key] = prepared
-        return prepared
+
+        def prepare():
+            logging.info("Encoding SoproTTS reference: %s", voice.ref_audio_path)
+            return self._model.prepare_reference(
+                ref_audio_path=voice.ref_audio_path,
+                ref_seconds=self.ref_seconds,
+            )
+
+        prepared = self.conditioning_cache.get_or_create(self._voice_cache_key(voice), prepare)
+        return to_device(prepared, self.device)
 
     def set_voice(self, voice: Union[SoproTTSVoice, str]):
         if isinstance(voice, str):
@@ -203,6 +205,8 @@ class SoproTTSEngine(BaseEngine):
             if param not in valid_params:
                 continue
             setattr(self, param, value)
+            if param == "streaming":
+                self.whole_utterance_only = not value
             if param == "ref_seconds":
                 should_reprepare = True
         if should_reprepare and self.voice is not None:
@@ -249,7 +253,7 @@ class SoproTTSEngine(BaseEngine):
                 fade_out_ms=self.fade_out_ms,
             )
         if audio.size:
-            self.queue.put((audio * 32767).astype(np.int16).tobytes())
+            self._queue_pcm16((audio * 32767).astype(np.int16))
 
     def synthesize(self, text: str, sentence_count: int = 0) -> bool:
         super().synthesize(text, sentence_count)
@@ -299,7 +303,6 @@ class SoproTTSEngine(BaseEngine):
             return False
 
     def shutdown(self):
-        self._reference_cache.clear()
         self._prepared_ref = None
         if hasattr(self, "_model"):
             del self._model
@@ -0,0 +1,116 @@
+"""
+Chunk size schedule and pacing for streaming XTTS synthesis.
+
+XTTS streams audio every stream_chunk_size GPT tokens and decodes all latents
+produced so far for each chunk. Small chunks reach the first audio sooner but
+repeat more vocoder work and send more, smaller messages; large chunks are
+cheaper overall but the listener waits longer for the first one.
+
+StreamChunkScheduler estimates how much audio the listener still has queued,
+assuming playback starts with the first chunk and runs continuously. While
+that buffer is empty (first sentence, or after a pause) it picks the smallest
+scheduled size. Once audio is buffered it picks the largest size whose first
+chunk, at the measured realtime factor, arrives well before the buffer runs
+dry. The same estimate replaces the old load balancing sleep: the worker only
+waits while more audio is buffered than requested.
+"""
+
+import time
+from typing import Callable, Optional, Sequence
+
+# One XTTS GPT token decodes to 1024 samples at 24 kHz.
+AUDIO_SECONDS_PER_TOKEN = 1024 / 24000
+
+
+class StreamChunkScheduler:
+    """
+    Picks stream_chunk_size per inference_stream call from the playback buffer estimate.
+    """
+    def __init__(
+        self,
+        schedule: Optional[Sequence[int]] = None,
+        stream_chunk_size: int = 20,
+        headroom: float = 0.5,
+        smoothing: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            schedule (Sequence[int], optional): Allowed chunk sizes in tokens.
+                If None, stream_chunk_size is always used.
+            stream_chunk_size (int): Fixed chunk size when no schedule is given.
+            headroom (float): Share of the buffered audio the first chunk of a
+                sentence may take to generate.
+            smoothing (float): Weight of the newest measurement in the
+                realtime factor average.
+            clock (Callable): Monotonic time source in seconds.
+        """
+        self.schedule = sorted(set(int(size) for size in schedule)) if schedule else None
+        if self.schedule is not None and self.schedule[0] < 1:
+            raise ValueError("stream chunk sizes must be positive")
+        self.stream_chunk_size = stream_chunk_size
+        self.headroom = headroom
+        self.smoothing = smoothing
+        self.clock = clock
+        self.realtime_factor: Optional[float] = None
+        self._playback_end = 0.0
+
+    def set_fixed(self, stream_chunk_size: int):
+        """
+        Turns the schedule off and uses stream_chunk_size for every sentence.
+        """
+        self.schedule = None
+        self.stream_chunk_size = stream_chunk_size
+
+    def reset(self):
+        """
+        Forgets the buffered audio, e.g. after playback was stopped.
+        """
+        self._playback_end = 0.0
+
+    def buffered_seconds(self) -> float:
+        """
+        Returns the seconds of sent audio the listener has not heard yet.
+        """
+        return max(0.0, self._playback_end - self.clock())
+
+    def add_audio(self, seconds: float):
+        """
+        Records a chunk of the given length sent to the listener.
+        """
+        self._playback_end = max(self._playback_end, self.clock()) + seconds
+
+    def record_realtime_factor(self, factor: float):
+        """
+        Records the realtime factor (synthesis seconds per audio second) of a finished sentence.
+        """
+        if factor <= 0:
+            return
+        if self.realtime_factor is None:
+            self.realtime_factor = factor
+        else:
+            self.realtime_factor += self.smoothing * (factor - self.realtime_factor)
+
+    def next_chunk_size(self) -> int:
+        """
+        Returns the stream_chunk_size to use for the next sentence.
+        """
+        if not self.schedule:
+            return self.stream_chunk_size
+
+        buffered = self.buffered_seconds()
+        if buffered <= 0 or self.realtime_factor is None:
+            return self.schedule[0]
+
+        budget = buffered * self.headroom
+        chosen = self.schedule[0]
+        for size in self.schedule:
+            if size * AUDIO_SECONDS_PER_TOKEN * self.realtime_factor <= budget:
+                chosen = size
+        return chosen
+
+    def pacing_delay(self, target_seconds: float) -> float:
+        """
+        Returns how long to wait so that no more than target_seconds of audio stay buffered.
+        """
+        return max(0.0, self.buffered_seconds() - target_seconds)
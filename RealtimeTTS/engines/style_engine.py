@@ -1,6 +1,11 @@
 from .base_engine import BaseEngine
+from .conditioning_cache import ConditioningCache, get_conditioning_cache, make_key, to_device
+from .quality_levels import QualityLevel, step_levels
+from .utterance_pieces import PieceLimits
+from typing import List, Optional
 from queue import Queue
 import numpy as np
+import logging
 import random
 import torch
 import sys
@@ -46,6 +51,24 @@ class StyleTTSVoice:
             f"  Reference Audio Path: {self.ref_audio_path}"
         )
 
+class _CachedSigmaSchedule:
+    """
+    Wraps a diffusion sigma schedule and reuses its sigmas per step count and device.
+
+    DiffusionSampler otherwise rebuilds the same schedule for every sentence.
+    """
+    def __init__(self, schedule):
+        self.schedule = schedule
+        self._sigmas = {}
+
+    def __call__(self, num_steps: int, device):
+        key = (num_steps, str(device))
+        sigmas = self._sigmas.get(key)
+        if sigmas is None:
+            sigmas = self._sigmas[key] = self.schedule(num_steps, device)
+        return sigmas
+
+
 class StyleTTSEngine(BaseEngine):
     def __init__(
         self,
@@ -64,9 +87,12 @@ class StyleTTSEngine(BaseEngine):
         extra_end_ms: int = 15,
         fade_in_ms: int = 10,
         fade_out_ms: int = 10,
-        comma_silence_duration=0.3,
-        sentence_silence_duration=0.6,
-        default_silence_duration=0.3,
+        comma_silence_duration=None,
+        sentence_silence_duration=None,
+        default_silence_duration=None,
+        diffusion_steps_levels: Optional[List[int]] = None,
+        piece_limits: Optional[PieceLimits] = PieceLimits(),
+        conditioning_cache: Optional[ConditioningCache] = None,
     ):
         """
         Initializes the StyleTTS engine with customizable parameters.
@@ -144,6 +170,19 @@ class StyleTTSEngine(BaseEngine):
 
             fade_out_ms (int): Fade-out duration in milliseconds for the end of the audio.
 
+            comma_silence_duration, sentence_silence_duration, default_silence_duration:
+                No longer used. Pass them to TextToAudioStream.play(), which inserts
+                the silence after each sentence for every engine.
+
+            diffusion_steps_levels (List[int]): Diffusion step counts offered as quality levels
+                to play(adaptive_quality=True). Defaults to half, once and twice diffusion_steps.
+
+            piece_limits (PieceLimits): Length limits for synthesizing long sentences in pieces,
+                which bounds the time to first audio. None synthesizes every sentence whole.
+
+            conditioning_cache (ConditioningCache): Cache for reference style embeddings.
+                Defaults to the shared cache.
+
         """
         self.device = device if torch.cuda.is_available() else 'cpu'
         self.style_root = style_root.replace("\\", "/")
@@ -159,14 +198,23 @@ class StyleTTSEngine(BaseEngine):
         self.extra_end_ms = extra_end_ms
         self.fade_in_ms = fade_in_ms
         self.fade_out_ms = fade_out_ms
-        self.comma_silence_duration = comma_silence_duration
-        self.sentence_silence_duration = sentence_silence_duration
-        self.default_silence_duration = default_silence_duration
+        if any(duration is not None for duration in (
+            comma_silence_duration, sentence_silence_duration, default_silence_duration
+        )):
+            logging.warning(
+                "StyleTTSEngine no longer inserts silence after sentences; pass "
+                "comma_silence_duration, sentence_silence_duration and "
+                "default_silence_duration to TextToAudioStream.play() instead."
+            )
+        self.conditioning_cache = conditioning_cache or get_conditioning_cache()
 
         # Parameters for synthesis
         self.alpha = alpha
         self.beta = beta
         self.diffusion_steps = diffusion_steps
+        self.diffusion_steps_levels = diffusion_steps_levels
+        self._quality_diffusion_steps = None
+        self.piece_limits = piece_limits
         self.embedding_scale = embedding_scale
         self.cuda_reset_delay = cuda_reset_delay  # Store the delay parameter
         self.seed = seed
@@ -194,6 +242,7 @@ class StyleTTSEngine(BaseEngine):
 
     def post_init(self):
         self.engine_name = "styletts"
+        self.whole_utterance_only = True
 
     def unload_model(self):
         """
@@ -285,7 +334,7 @@ class StyleTTSEngine(BaseEngine):
             text,
             alpha=self.alpha,
             beta=self.beta,
-            diffusion_steps=self.diffusion_steps,
+            diffusion_steps=self._quality_diffusion_steps or self.diffusion_steps,
             embedding_scale=self.embedding_scale
         )
         if audio_float32 is not None:
@@ -299,31 +348,30 @@ class StyleTTSEngine(BaseEngine):
                     fade_out_ms = self.fade_out_ms,
                 )
 
-            audio_data = (audio_float32 * 32767).astype(np.int16).tobytes()
-
-            # Send silent audio
-            sample_rate = 24000
-
-            end_sentence_delimeters = ".!?…。¡¿"
-            mid_sentence_delimeters = ";:,\n()[]{}-“”„”—/|《》"
-
-            text_stripped = text.strip()
-            if text_stripped and text_stripped[-1] in end_sentence_delimeters:
-                silence_duration = self.sentence_silence_duration
-            elif text_stripped and text_stripped[-1] in mid_sentence_delimeters:
-                silence_duration = self.comma_silence_duration
-            else:
-                silence_duration = self.default_silence_duration
-
-            silent_samples = int(sample_rate * silence_duration)
-            silent_chunk = np.zeros(silent_samples, dtype=np.float32)
-
-            self.queue.put(audio_data)
-            self.queue.put(silent_chunk.tobytes())
+            audio_data = (audio_float32 * 32767).astype(np.int16)
+            # Silence after the sentence is added by TextToAudioStream
+            self.audio_duration += len(audio_data) / self.sample_rate
+            self._queue_pcm16(audio_data)
             return True
         else:
             return False
 
+    def get_quality_levels(self) -> List[QualityLevel]:
+        """
+        Returns the diffusion step counts the quality governor can choose from.
+        """
+        steps = self.diffusion_steps_levels or [max(1, self.diffusion_steps // 2), self.diffusion_steps, self.diffusion_steps * 2]
+        return step_levels("diffusion_steps", steps)
+
+    def set_quality_level(self, level: Optional[int]):
+        """
+        Uses the diffusion steps of the given level; None returns to diffusion_steps.
+        """
+        if level is None:
+            self._quality_diffusion_steps = None
+        else:
+            self._quality_diffusion_steps = self.get_quality_levels()[level].settings["diffusion_steps"]
+
     def load_model(self):
         """
         Loads the StyleTTS model and necessary components.
@@ -407,29 +455,45 @@ class StyleTTSEngine(BaseEngine):
         self.sampler = DiffusionSampler(
             self.model.diffusion.diffusion,
             sampler=ADPM2Sampler(),
-            sigma_schedule=KarrasSchedule(sigma_min=0.0001, sigma_max=3.0, rho=9.0),
+            sigma_schedule=_CachedSigmaSchedule(KarrasSchedule(sigma_min=0.0001, sigma_max=3.0, rho=9.0)),
             clamp=False
         )
 
         self.sample_rate = 24000
 
+    def _reference_style_key(self, path):
+        checkpoint = os.stat(self.model_checkpoint_path)
+        return make_key(
+            f"styletts:{os.path.abspath(self.model_checkpoint_path)}",
+            [path],
+            checkpoint_size=checkpoint.st_size,
+            checkpoint_mtime_ns=checkpoint.st_mtime_ns,
+        )
+
     def compute_reference_style(self, path):
         """
         Compute the style embedding from a reference audio.
+
+        Embeddings are stored in the conditioning cache by reference audio
+        content and checkpoint, so each reference is encoded once.
         """
-        import librosa
-        import torch
-        wave, sr = librosa.load(path, sr=24000)
-        audio, _ = librosa.effects.trim(wave, top_db=30)
-        if sr != 24000:
-            audio = librosa.resample(audio, sr, 24000)
-        wave_tensor = torch.from_numpy(audio).float().to(self.device)
-        mel_tensor = self.to_mel(wave_tensor.unsqueeze(0))
-        mel_tensor = (torch.log(1e-5 + mel_tensor) - self.mean) / self.std
-        with torch.no_grad():
-            ref_s = self.model.style_encoder(mel_tensor.unsqueeze(1))
-            ref_p = self.model.predictor_encoder(mel_tensor.unsqueeze(1))
-        self.ref_s = torch.cat([ref_s, ref_p], dim=1)
+        def compute():
+            import librosa
+            import torch
+            wave, sr = librosa.load(path, sr=24000)
+            audio, _ = librosa.effects.trim(wave, top_db=30)
+            if sr != 24000:
+                audio = librosa.resample(audio, sr, 24000)
+            wave_tensor = torch.from_numpy(audio).float().to(self.device)
+            mel_tensor = self.to_mel(wave_tensor.unsqueeze(0))
+            mel_tensor = (torch.log(1e-5 + mel_tensor) - self.mean) / self.std
+            with torch.no_grad():
+                ref_s = self.model.style_encoder(mel_tensor.unsqueeze(1))
+                ref_p = self.model.predictor_encoder(mel_tensor.unsqueeze(1))
+            return torch.cat([ref_s, ref_p], dim=1)
+
+        ref_s = self.conditioning_cache.get_or_create(self._reference_style_key(path), compute)
+        self.ref_s = to_device(ref_s, self.device)
 
     def length_to_mask(self, lengths):
         mask = torch.arange(lengths.max()).unsqueeze(0).expand(lengths.shape[0], -1).type_as(lengths)
@@ -544,6 +608,13 @@ class StyleTTSEngine(BaseEngine):
         """
         if isinstance(voice, StyleTTSVoice):
             self.voice = voice
+            if (
+                voice.model_config_path.replace("\\", "/") == self.model_config_path
+                and voice.model_checkpoint_path.replace("\\", "/") == self.model_checkpoint_path
+            ):
+                # Same model, only the reference style changes
+                self.set_ref_audio_path(voice.ref_audio_path)
+                return
             self.set_all_parameters(
                 model_config_path=voice.model_config_path,
                 model_checkpoint_path=voice.model_checkpoint_path,
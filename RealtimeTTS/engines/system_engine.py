@@ -1,14 +1,20 @@
 from .base_engine import BaseEngine
-from pydub.utils import mediainfo
 from pydub import AudioSegment
-from typing import Union
+from typing import Optional, Union
+import subprocess
 import tempfile
+import logging
+import shutil
+import struct
 import pyaudio
 import pyttsx3
 import wave
+import sys
 import os
 
-SYNTHESIS_FILE = "system_speech_synthesis.wav"
+SAMPLE_RATE = 22050
+WAV_HEADER_SIZE = 44
+READ_SIZE = 4096
 
 
 class SystemVoice:
@@ -22,19 +28,28 @@ class SystemVoice:
 
 
 class SystemEngine(BaseEngine):
-    def __init__(self, voice: str = "Zira", print_installed_voices: bool = False):
+    def __init__(
+        self,
+        voice: str = "Zira",
+        print_installed_voices: bool = False,
+        stream_espeak: bool = True,
+    ):
         """
         Initializes a system realtime text to speech engine object.
 
         Args:
             voice (str, optional): Voice name. Defaults to "Zira".
             print_installed_voices (bool, optional): Indicates if the list of installed voices should be printed. Defaults to False.
+            stream_espeak (bool, optional): On Linux, run espeak-ng (or espeak) directly and stream its
+                raw output while it is synthesized instead of going through a WAV file. Defaults to True.
         """
 
         self.engine = pyttsx3.init()
         self.set_voice(voice)
-        temp_file_path = tempfile.gettempdir()
-        self.file_path = os.path.join(temp_file_path, SYNTHESIS_FILE)
+        # Created on first use, one file per engine so engines do not overwrite each other.
+        self.file_path = None
+        self.espeak_path = self._find_espeak() if stream_espeak else None
+        self._process = None
 
         if print_installed_voices:
             print(self.get_voices())
@@ -52,7 +67,7 @@ class SystemEngine(BaseEngine):
                   - Channels (int): The number of audio channels. 1 represents mono audio.
                   - Sample Rate (int): The sample rate of the audio in Hz. 16000 represents 16kHz sample rate.
         """
-        return pyaudio.paInt16, 1, 22050
+        return pyaudio.paInt16, 1, SAMPLE_RATE
 
     def synthesize(self, text: str, sentence_count: int = 0) -> bool:
         """
@@ -67,14 +82,20 @@ class SystemEngine(BaseEngine):
         """
         super().synthesize(text, sentence_count)
 
+        if self.espeak_path:
+            return self._synthesize_espeak(text)
+
+        if self.file_path is None:
+            fd, self.file_path = tempfile.mkstemp(prefix="realtimetts_system_", suffix=".wav")
+            os.close(fd)
+
         self.engine.save_to_file(text, self.file_path)
         self.engine.runAndWait()
 
-        # Get media info of the file
-        info = mediainfo(self.file_path)
-
-        # Check if the file format is AIFF and convert to WAV if necessary
-        if info["format_name"] == "aiff":
+        # macOS saves AIFF regardless of the file extension
+        with open(self.file_path, "rb") as f:
+            is_aiff = f.read(4) == b"FORM"
+        if is_aiff:
             audio = AudioSegment.from_file(self.file_path, format="aiff")
             audio.export(self.file_path, format="wav")
 
@@ -87,6 +108,104 @@ class SystemEngine(BaseEngine):
         # Return False if the process failed
         return False
 
+    @staticmethod
+    def _find_espeak() -> Optional[str]:
+        """
+        Returns the espeak-ng or espeak executable on Linux, where pyttsx3 uses espeak anyway.
+        """
+        if not sys.platform.startswith("linux"):
+            return None
+        return shutil.which("espeak-ng") or shutil.which("espeak")
+
+    def _get_property(self, name: str):
+        try:
+            return self.engine.getProperty(name)
+        except Exception:
+            return None
+
+    def _espeak_command(self, text: str) -> list:
+        """
+        Builds the espeak command line from the voice, rate and volume set on the pyttsx3 engine.
+        """
+        command = [self.espeak_path, "--stdout"]
+        voice = self._get_property("voice")
+        if voice:
+            command += ["-v", str(voice)]
+        rate = self._get_property("rate")
+        if rate:
+            command += ["-s", str(int(rate))]
+        volume = self._get_property("volume")
+        if volume is not None:
+            command += ["-a", str(int(float(volume) * 100))]
+        # "--" keeps text starting with "-" from being read as an option
+        return command + ["--", text]
+
+    def _synthesize_espeak(self, text: str) -> bool:
+        """
+        Streams the raw PCM that espeak writes to stdout into the queue while it is synthesized.
+        """
+        try:
+            process = subprocess.Popen(
+                self._espeak_command(text),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as e:
+            logging.error(f"Could not start {self.espeak_path}: {e}")
+            return False
+
+        self._process = process
+        header = b""
+        pending = b""
+        try:
+            while True:
+                data = process.stdout.read1(READ_SIZE)
+                if not data:
+                    break
+                if self.stop_synthesis_event.is_set():
+                    process.kill()
+                    return False
+
+                if len(header) < WAV_HEADER_SIZE:
+                    missing = WAV_HEADER_SIZE - len(header)
+                    header += data[:missing]
+                    data = data[missing:]
+                    if len(header) == WAV_HEADER_SIZE:
+                        self._check_espeak_header(header)
+
+                # Only queue whole 16-bit samples
+                data = pending + data
+                usable = len(data) - (len(data) % 2)
+                pending = data[usable:]
+                if usable:
+                    self.queue.put(data[:usable])
+                    self.audio_duration += usable / (2 * SAMPLE_RATE)
+        finally:
+            process.stdout.close()
+            returncode = process.wait()
+            self._process = None
+
+        if self.stop_synthesis_event.is_set():
+            # stop() killed the process, which is not an error
+            return False
+        if returncode != 0:
+            logging.error(f"{self.espeak_path} exited with code {returncode}")
+            return False
+        return True
+
+    @staticmethod
+    def _check_espeak_header(header: bytes):
+        if header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            logging.warning("Unexpected espeak output, expected a WAV header")
+            return
+        channels, rate = struct.unpack_from("<HI", header, 22)
+        bits = struct.unpack_from("<H", header, 34)[0]
+        if (channels, rate, bits) != (1, SAMPLE_RATE, 16):
+            logging.warning(
+                f"espeak writes {channels} channel(s), {rate} Hz, {bits} bit; "
+                f"the stream expects mono {SAMPLE_RATE} Hz 16 bit"
+            )
+
     def get_voices(self):
         """
         Retrieves the voices available in the underlying system's speech engine.
@@ -134,3 +253,20 @@ class SystemEngine(BaseEngine):
         """
         for parameter, value in voice_parameters.items():
             self.engine.setProperty(parameter, value)
+
+    def stop(self):
+        """
+        Stops the current synthesis and ends a running espeak process.
+        """
+        super().stop()
+        process = self._process
+        if process is not None:
+            process.kill()
+
+    def shutdown(self):
+        """
+        Removes the engine's temporary WAV file.
+        """
+        if self.file_path and os.path.exists(self.file_path):
+            os.remove(self.file_path)
+        self.file_path = None
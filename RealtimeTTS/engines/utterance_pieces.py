@@ -0,0 +1,129 @@
+"""
+Sub-sentence pieces for engines that only synthesize whole utterances.
+
+Engines like Chatterbox, LuxTTS, StyleTTS, Inflect and Sopro (non-streaming)
+generate the complete waveform of a sentence before the first sample can be
+queued, so the time to first audio grows with the sentence length. For these
+engines (BaseEngine.whole_utterance_only) TextToAudioStream splits long
+sentences at clause boundaries into a short lead piece and larger remainder
+pieces, synthesizes them one after another and joins their audio with a short
+crossfade (PieceJoiner). PieceLimits holds the length limits of one engine.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+import re
+
+import numpy as np
+
+
+# A piece that ends with one of these closes a clause.
+CLAUSE_END_CHARACTERS = ",;:)]}—–…，、；："
+
+# Whitespace, or the position right after CJK clause punctuation (no spaces there).
+_BOUNDARY = re.compile(r"\s+|(?<=[，、；：])(?=\S)")
+
+
+@dataclass(frozen=True)
+class PieceLimits:
+    """
+    Length limits for splitting a sentence into pieces.
+
+    Attributes:
+        lead_chars (int): Maximum length of the first piece. Bounds the time
+            to first audio; sentences up to this length stay whole.
+        max_chars (int): Maximum length of the following pieces.
+        min_chars (int): No piece is cut shorter than this.
+        crossfade_ms (int): Overlap used to join the audio of two pieces.
+    """
+    lead_chars: int = 80
+    max_chars: int = 200
+    min_chars: int = 20
+    crossfade_ms: int = 20
+
+
+def _find_cut(text: str, limit: int, min_chars: int) -> Optional[Tuple[int, int]]:
+    """
+    Returns (end of the piece, start of the rest) for the best boundary that
+    keeps the piece within limit, preferring clause boundaries, or None.
+    """
+    clause_cut = None
+    word_cut = None
+    for match in _BOUNDARY.finditer(text):
+        start, end = match.span()
+        if start > limit:
+            break
+        if start < min_chars:
+            continue
+        if len(text) - end < min_chars:
+            break
+        if text[start - 1] in CLAUSE_END_CHARACTERS:
+            clause_cut = (start, end)
+        word_cut = (start, end)
+    return clause_cut or word_cut
+
+
+def split_utterance(text: str, limits: PieceLimits) -> List[str]:
+    """
+    Splits a sentence into a lead piece of at most limits.lead_chars and
+    remainder pieces of at most limits.max_chars characters.
+
+    Cuts go after clause punctuation where possible, otherwise between words.
+    Text without a usable boundary stays in one piece.
+    """
+    text = text.strip()
+    pieces = []
+    limit = limits.lead_chars
+    while len(text) > limit:
+        cut = _find_cut(text, limit, limits.min_chars)
+        if cut is None:
+            break
+        pieces.append(text[:cut[0]])
+        text = text[cut[1]:]
+        limit = limits.max_chars
+    pieces.append(text)
+    return pieces
+
+
+class PieceJoiner:
+    """
+    Joins the 16-bit mono audio of consecutive pieces with a linear crossfade.
+
+    Until the final piece, the last crossfade_ms of every audio block are held
+    back and blended into the start of the next block.
+    """
+    def __init__(self, sample_rate: int, crossfade_ms: int):
+        self.overlap = max(0, int(sample_rate * crossfade_ms / 1000))
+        self.final = False
+        self._tail = np.zeros(0, dtype=np.int16)
+
+    def join(self, pcm: np.ndarray) -> np.ndarray:
+        """
+        Returns the samples of pcm (and of the held tail) that can be played now.
+        """
+        pcm = np.asarray(pcm, dtype=np.int16)
+        overlap = min(self._tail.size, pcm.size)
+        if overlap:
+            fade = np.linspace(0.0, 1.0, overlap, dtype=np.float32)
+            mixed = self._tail[-overlap:] * (1.0 - fade) + pcm[:overlap] * fade
+            pcm = np.concatenate((
+                self._tail[:-overlap],
+                np.clip(np.round(mixed), -32768, 32767).astype(np.int16),
+                pcm[overlap:],
+            ))
+        elif self._tail.size:
+            pcm = np.concatenate((self._tail, pcm))
+        self._tail = np.zeros(0, dtype=np.int16)
+
+        if not self.final and self.overlap:
+            hold = min(self.overlap, pcm.size)
+            self._tail = pcm[pcm.size - hold:]
+            pcm = pcm[:pcm.size - hold]
+        return pcm
+
+    def flush(self) -> np.ndarray:
+        """
+        Returns and clears the held tail.
+        """
+        tail, self._tail = self._tail, np.zeros(0, dtype=np.int16)
+        return tail
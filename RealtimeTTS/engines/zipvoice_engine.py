@@ -1,15 +1,16 @@
 import sys
 import os
-import hashlib
 import torch
 import torchaudio
 import numpy as np
 import json
 import logging
-from typing import Optional, Union
+from typing import List, Optional, Union
 
 # RealtimeTTS imports
 from .base_engine import BaseEngine
+from .quality_levels import QualityLevel, step_levels
+from .conditioning_cache import ConditioningCache, get_conditioning_cache, make_key
 
 class ZipVoiceVoice:
     """
@@ -37,10 +38,8 @@ class ZipVoiceEngine(BaseEngine):
     ZipVoice Text-to-Speech Engine for RealtimeTTS.
 
     This engine uses the ZipVoice model to synthesize speech based on a voice prompt.
-    It caches extracted voice features to disk for faster subsequent runs.
+    Extracted voice features are kept in the shared conditioning cache.
     """
-    _CACHE_VERSION = 2
-
     def __init__(self,
                  zipvoice_root: str,
                  voice: ZipVoiceVoice,
@@ -58,7 +57,9 @@ class ZipVoiceEngine(BaseEngine):
                  num_step: Optional[int] = None,
                  t_shift: float = 0.5,
                  target_rms: float = 0.1,
-                 feat_scale: float = 0.1
+                 feat_scale: float = 0.1,
+                 conditioning_cache: Optional[ConditioningCache] = None,
+                 num_step_levels: Optional[List[int]] = None
                  ):
         """
         Initializes the ZipVoice engine.
@@ -107,6 +108,13 @@ class ZipVoiceEngine(BaseEngine):
                 Defaults to 0.1.
             feat_scale (float, optional):
                 Scale factor for fbank features. Defaults to 0.1.
+            conditioning_cache (Optional[ConditioningCache], optional):
+                Cache for extracted prompt features. Defaults to the shared
+                cache returned by get_conditioning_cache().
+            num_step_levels (Optional[List[int]], optional):
+                Sampling step counts offered as quality levels to
+                play(adaptive_quality=True). Defaults to half, once and
+                twice num_step.
         """
         # 1. Add zipvoice_root to sys.path to allow imports
         self.zipvoice_root = zipvoice_root.replace("\\", "/")
@@ -139,6 +147,8 @@ class ZipVoiceEngine(BaseEngine):
         self.feat_scale = feat_scale
         self.current_prompt_features = None
         self.current_prompt_features_lens = None
+        self.current_prompt_tokens = None
+        self.conditioning_cache = conditioning_cache or get_conditioning_cache()
 
         # Set device
         if device == 'cuda' and torch.cuda.is_available():
@@ -157,6 +167,8 @@ class ZipVoiceEngine(BaseEngine):
         model_specific_defaults = model_defaults.get(self.model_name, {})
         self.num_step = num_step if num_step is not None else model_specific_defaults.get('num_step')
         self.guidance_scale = guidance_scale if guidance_scale is not None else model_specific_defaults.get('guidance_scale')
+        self.num_step_levels = num_step_levels
+        self._quality_num_step = None
 
         # 5. Load components (model, tokenizer, vocoder)
         HUGGINGFACE_REPO = "k2-fsa/ZipVoice"
@@ -208,93 +220,7 @@ class ZipVoiceEngine(BaseEngine):
         self._prepare_voice_prompt(self.voice)
         logging.info("ZipVoiceEngine initialized successfully.")
 
-    @staticmethod
-    def _file_sha256(path: str) -> str:
-        digest = hashlib.sha256()
-        with open(path, "rb") as handle:
-            for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-                digest.update(chunk)
-        return digest.hexdigest()
-
-    @staticmethod
-    def _safe_cache_stem(path: str) -> str:
-        stem = os.path.splitext(os.path.basename(path))[0]
-        safe_stem = "".join(
-            char if char.isalnum() or char in "._-" else "_"
-            for char in stem
-        ).strip("._")
-        return safe_stem or "prompt"
-
-    def _prompt_cache_metadata(self, voice: ZipVoiceVoice):
-        prompt_path = os.path.abspath(voice.prompt_wav_path)
-        prompt_stat = os.stat(prompt_path)
-        return {
-            "cache_version": self._CACHE_VERSION,
-            "prompt_path": os.path.normcase(prompt_path),
-            "prompt_size": prompt_stat.st_size,
-            "prompt_mtime_ns": getattr(
-                prompt_stat,
-                "st_mtime_ns",
-                int(prompt_stat.st_mtime * 1_000_000_000),
-            ),
-            "prompt_sha256": self._file_sha256(prompt_path),
-            "prompt_text": voice.prompt_text,
-            "target_rms": float(self.target_rms),
-            "feat_scale": float(self.feat_scale),
-            "sampling_rate": int(self.sampling_rate),
-        }
-
-    def _prompt_cache_path(self, cache_dir: str, voice: ZipVoiceVoice):
-        metadata = self._prompt_cache_metadata(voice)
-        identity_json = json.dumps(metadata, sort_keys=True, separators=(",", ":"))
-        identity_hash = hashlib.sha256(identity_json.encode("utf-8")).hexdigest()
-        cache_filename = "%s-%s.pt" % (
-            self._safe_cache_stem(voice.prompt_wav_path),
-            identity_hash[:16],
-        )
-        return os.path.join(cache_dir, cache_filename), metadata
-
-    @staticmethod
-    def _cache_metadata_matches(cached_data, expected_metadata) -> bool:
-        if not isinstance(cached_data, dict):
-            return False
-        if "features" not in cached_data or "lens" not in cached_data:
-            return False
-        return cached_data.get("metadata") == expected_metadata
-
-    def _prepare_voice_prompt(self, voice: ZipVoiceVoice):
-        """
-        Extracts features from a voice prompt, using a cache if available.
-        The extracted features are stored in the engine's state.
-        """
-        cache_dir = "zipvoice_voices"
-        os.makedirs(cache_dir, exist_ok=True)
-
-        cache_path, cache_metadata = self._prompt_cache_path(cache_dir, voice)
-        legacy_cache_path = os.path.join(
-            cache_dir,
-            "%s.pt" % os.path.splitext(os.path.basename(voice.prompt_wav_path))[0],
-        )
-        if os.path.exists(legacy_cache_path) and legacy_cache_path != cache_path:
-            logging.info(
-                "Ignoring legacy ZipVoice prompt cache at %s; cache keys now "
-                "include prompt audio identity, transcript, target_rms, and feat_scale.",
-                legacy_cache_path,
-            )
-
-        if os.path.exists(cache_path):
-            logging.info(f"Loading cached prompt features from {cache_path}")
-            cached_data = torch.load(cache_path, map_location=self.device)
-            if self._cache_metadata_matches(cached_data, cache_metadata):
-                self.current_prompt_features = cached_data['features']
-                self.current_prompt_features_lens = cached_data['lens']
-                return
-            logging.info(
-                "Ignoring stale ZipVoice prompt cache at %s; metadata did not match.",
-                cache_path,
-            )
-
-        logging.info(f"No cache found for '{voice.prompt_wav_path}'. Extracting and caching new features.")
+    def _extract_prompt_features(self, voice: ZipVoiceVoice):
         prompt_wav, prompt_sampling_rate = torchaudio.load(voice.prompt_wav_path)
         if prompt_sampling_rate != self.sampling_rate:
             print(f"Resampling prompt from {prompt_sampling_rate}Hz to {self.sampling_rate}Hz")
@@ -305,24 +231,51 @@ class ZipVoiceEngine(BaseEngine):
         if self.target_rms > 0 and prompt_rms < self.target_rms:
             prompt_wav = prompt_wav * self.target_rms / prompt_rms
 
-        prompt_features = self.feature_extractor.extract(prompt_wav, sampling_rate=self.sampling_rate).to(self.device)
+        prompt_features = self.feature_extractor.extract(prompt_wav, sampling_rate=self.sampling_rate)
         prompt_features = prompt_features.unsqueeze(0) * self.feat_scale
-        prompt_features_lens = torch.tensor([prompt_features.size(1)], device=self.device)
-
-        # Store features in instance and save to cache
-        self.current_prompt_features = prompt_features
-        self.current_prompt_features_lens = prompt_features_lens
-
-        logging.info(f"Saving prompt features to {cache_path}")
-        data_to_cache = {
-            'features': self.current_prompt_features,
-            'lens': self.current_prompt_features_lens,
-            'metadata': cache_metadata,
+        return {
+            "features": prompt_features,
+            "lens": torch.tensor([prompt_features.size(1)]),
         }
-        torch.save(data_to_cache, cache_path)
+
+    def _prepare_voice_prompt(self, voice: ZipVoiceVoice):
+        """
+        Extracts features from a voice prompt, using the shared conditioning cache if available.
+        The extracted features and the tokenized prompt text are stored in the engine's state.
+        """
+        key = make_key(
+            "zipvoice:vocos-fbank",
+            [voice.prompt_wav_path],
+            target_rms=float(self.target_rms),
+            feat_scale=float(self.feat_scale),
+            sampling_rate=int(self.sampling_rate),
+        )
+        cached = self.conditioning_cache.get_or_create(
+            key, lambda: self._extract_prompt_features(voice)
+        )
+        self.current_prompt_features = cached["features"].to(self.device)
+        self.current_prompt_features_lens = cached["lens"].to(self.device)
+        self.current_prompt_tokens = self.tokenizer.texts_to_token_ids([voice.prompt_text])
 
     def post_init(self):
         self.engine_name = "zipvoice"
+        self.can_batch = True
+
+    def get_quality_levels(self) -> List[QualityLevel]:
+        """
+        Returns the sampling step counts the quality governor can choose from.
+        """
+        steps = self.num_step_levels or [max(1, self.num_step // 2), self.num_step, self.num_step * 2]
+        return step_levels("num_step", steps)
+
+    def set_quality_level(self, level: Optional[int]):
+        """
+        Uses the sampling steps of the given level; None returns to num_step.
+        """
+        if level is None:
+            self._quality_num_step = None
+        else:
+            self._quality_num_step = self.get_quality_levels()[level].settings["num_step"]
 
     def get_stream_info(self):
         import pyaudio
@@ -350,14 +303,13 @@ class ZipVoiceEngine(BaseEngine):
                 return False
 
             tokens = self.tokenizer.texts_to_token_ids([text])
-            prompt_tokens = self.tokenizer.texts_to_token_ids([self.voice.prompt_text])
 
             (pred_features, _, _, _) = self.model.sample(
-                tokens=tokens, prompt_tokens=prompt_tokens,
+                tokens=tokens, prompt_tokens=self.current_prompt_tokens,
                 prompt_features=self.current_prompt_features,
                 prompt_features_lens=self.current_prompt_features_lens,
                 speed=self.speed, t_shift=self.t_shift, duration="predict",
-                num_step=self.num_step, guidance_scale=self.guidance_scale,
+                num_step=self._quality_num_step or self.num_step, guidance_scale=self.guidance_scale,
             )
 
             pred_features = pred_features.permute(0, 2, 1) / self.feat_scale
@@ -374,6 +326,58 @@ class ZipVoiceEngine(BaseEngine):
             logging.error(f"ZipVoice synthesis error: {e}")
             return False
 
+    def synthesize_batch(self, sentences: List[str], sentence_count: int = 0):
+        """
+        Synthesizes several sentences in one padded model and vocoder pass.
+
+        Args:
+            sentences (List[str]): Sentences to synthesize.
+            sentence_count (int): The count of sentences synthesized before this batch.
+
+        Yields:
+            bool: Success per sentence, after its audio is queued.
+        """
+        audio = None
+        if self.current_prompt_features is not None and len(sentences) > 1:
+            try:
+                audio = self._synthesize_batch_audio(sentences)
+            except Exception as e:
+                logging.error(f"ZipVoice batch synthesis error, synthesizing sentences one by one: {e}")
+
+        for index, sentence in enumerate(sentences):
+            if audio is None:
+                yield self.synthesize(sentence, sentence_count + index + 1)
+                continue
+            super().synthesize(sentence, sentence_count + index + 1)
+            self.queue.put(audio[index])
+            yield True
+
+    @torch.inference_mode()
+    def _synthesize_batch_audio(self, texts: List[str]) -> List[bytes]:
+        """
+        Returns the int16 audio per text from one batched model and vocoder pass.
+        """
+        batch_size = len(texts)
+        tokens = self.tokenizer.texts_to_token_ids(texts)
+        (pred_features, pred_features_lens, _, _) = self.model.sample(
+            tokens=tokens, prompt_tokens=self.current_prompt_tokens * batch_size,
+            prompt_features=self.current_prompt_features.expand(batch_size, -1, -1),
+            prompt_features_lens=self.current_prompt_features_lens.expand(batch_size),
+            speed=self.speed, t_shift=self.t_shift, duration="predict",
+            num_step=self._quality_num_step or self.num_step, guidance_scale=self.guidance_scale,
+        )
+
+        pred_features = pred_features.permute(0, 2, 1) / self.feat_scale
+        wavs = self.vocoder.decode(pred_features).squeeze(1).clamp(-1, 1)
+
+        # Padded frames are cut off per sentence.
+        samples_per_frame = wavs.shape[-1] / pred_features.shape[-1]
+        audio = []
+        for wav, frames in zip(wavs.cpu().numpy(), pred_features_lens.tolist()):
+            wav = wav[:int(round(frames * samples_per_frame))]
+            audio.append((wav * 32767).astype(np.int16).tobytes())
+        return audio
+
     def set_voice(self, voice: ZipVoiceVoice):
         if isinstance(voice, ZipVoiceVoice):
             self.voice = voice
@@ -354,6 +354,7 @@ class AudioBufferManager:
         self.audio_buffer = audio_buffer
         self.timings = timings
         self.total_samples = 0
+        self.retrieved_bytes = 0
 
     def add_to_buffer(self, audio_data):
         """
@@ -379,6 +380,45 @@ class AudioBufferManager:
                 continue
         self.total_samples = 0
 
+    def bytes_per_frame(self) -> int:
+        """
+        Returns the bytes of one frame (one sample per channel) in the configured format.
+        """
+        # Map PyAudio format to bytes per sample
+        format_bytes = {
+            pyaudio.paCustomFormat: 4,
+            pyaudio.paFloat32: 4,
+            pyaudio.paInt32: 4,
+            pyaudio.paInt24: 3,
+            pyaudio.paInt16: 2,
+            pyaudio.paInt8: 1,
+            pyaudio.paUInt8: 1,
+        }
+
+        # Get format and channels from config
+        audio_format = self.config.format
+        channels = self.config.channels
+
+        # Log if format is unknown
+        if audio_format not in format_bytes:
+            print(
+                f"Warning: Unknown audio format {audio_format} (0x{audio_format:x})"
+            )
+            print(f"Available formats: {[hex(k) for k in format_bytes.keys()]}")
+            format_bytes[audio_format] = 4  # Default to 4 bytes
+
+        # Calculate bytes per frame
+        return format_bytes[audio_format] * channels
+
+    def get_queued_bytes(self) -> int:
+        """
+        Returns the bytes of audio waiting in the queue, counted from the queued chunks.
+
+        Unlike total_samples this includes chunks engines put into the queue directly.
+        """
+        with self.audio_buffer.mutex:
+            return sum(len(chunk) for chunk in self.audio_buffer.queue if chunk)
+
     def get_from_buffer(self, timeout: float = 0.05):
         """
         Retrieves audio data from the buffer.
@@ -393,35 +433,10 @@ class AudioBufferManager:
         try:
             chunk = self.audio_buffer.get(timeout=timeout)
 
-            # Map PyAudio format to bytes per sample
-            format_bytes = {
-                pyaudio.paCustomFormat: 4,
-                pyaudio.paFloat32: 4,
-                pyaudio.paInt32: 4,
-                pyaudio.paInt24: 3,
-                pyaudio.paInt16: 2,
-                pyaudio.paInt8: 1,
-                pyaudio.paUInt8: 1,
-            }
-
-            # Get format and channels from config
-            audio_format = self.config.format
-            channels = self.config.channels
-
-            # Log if format is unknown
-            if audio_format not in format_bytes:
-                print(
-                    f"Warning: Unknown audio format {audio_format} (0x{audio_format:x})"
-                )
-                print(f"Available formats: {[hex(k) for k in format_bytes.keys()]}")
-                format_bytes[audio_format] = 4  # Default to 4 bytes
-
-            # Calculate bytes per frame
-            bytes_per_frame = format_bytes[audio_format] * channels
-
             # Update total samples counter
             if chunk:
-                self.total_samples -= len(chunk) // bytes_per_frame
+                self.total_samples -= len(chunk) // self.bytes_per_frame()
+                self.retrieved_bytes += len(chunk)
             return True, chunk
         except queue.Empty:
             return False, None
@@ -673,6 +688,28 @@ class StreamPlayer:
         else:  # mpeg
             return self.buffer_manager.get_buffered_seconds(16000)
 
+    def get_queued_seconds(self) -> float:
+        """
+        Returns the seconds of audio the engine has queued that were not played yet.
+        """
+        return self._bytes_to_seconds(self.buffer_manager.get_queued_bytes())
+
+    def get_produced_seconds(self) -> float:
+        """
+        Returns the seconds of audio taken from or waiting in the engine queue so far.
+
+        The difference between two calls is the audio produced in between.
+        """
+        return self._bytes_to_seconds(
+            self.buffer_manager.retrieved_bytes + self.buffer_manager.get_queued_bytes()
+        )
+
+    def _bytes_to_seconds(self, byte_count: int) -> float:
+        if self.buffer_manager.config.format == pyaudio.paCustomFormat:
+            return 0.0  # compressed audio, the duration is unknown
+        bytes_per_second = self.buffer_manager.bytes_per_frame() * self.buffer_manager.config.rate
+        return byte_count / bytes_per_second if bytes_per_second else 0.0
+
     def start(self):
         """Starts audio playback."""
         self.first_chunk_played = False
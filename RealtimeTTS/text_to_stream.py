@@ -16,6 +16,7 @@ from .threadsafe_generators import CharIterator, AccumulatingThreadSafeGenerator
 from .stream_player import StreamPlayer, AudioConfiguration
 from typing import Union, Iterator, List
 from .engines import BaseEngine
+from .engines.quality_levels import QualityGovernor
 from ._audio_backend import pa, pyaudio
 import re
 import numpy as np
@@ -437,6 +438,8 @@ class TextToAudioStream:
         sentence_fragment_delimiters: str = ".?!;:,\n…。",
         force_first_fragment_after_words=30,
         debug=False,
+        batch_size: int = 1,
+        adaptive_quality: bool = False,
     ):
         """
         Async handling of text to audio synthesis, see play() method.
@@ -469,6 +472,8 @@ class TextToAudioStream:
                 force_first_fragment_after_words,
                 True,
                 debug,
+                batch_size,
+                adaptive_quality,
             )
             self.play_thread = threading.Thread(target=self.play, args=args)
             self.play_thread.start()
@@ -502,6 +507,8 @@ class TextToAudioStream:
         force_first_fragment_after_words=30,
         is_external_call=True,
         debug=False,
+        batch_size: int = 1,
+        adaptive_quality: bool = False,
     ):
         """
         Handles the synthesis of text to audio.
@@ -539,6 +546,15 @@ class TextToAudioStream:
             Default is 30 words.
         - is_external_call: If True, the method is called from an external source.
         - debug: If True, enables debug mode.
+        - batch_size (int): For rendering (e.g. muted with output_wavfile), engines
+            that support it synthesize up to this many already queued sentences
+            in one batched pass (KokoroEngine, ZipVoiceEngine). Callbacks and
+            silences still run per sentence. Default is 1 (no batching).
+        - adaptive_quality (bool): For engines that declare quality levels
+            (get_quality_levels()), picks the level of every sentence from the
+            audio still buffered for playback and the measured realtime factor:
+            better quality while the buffer is comfortable, the fastest level
+            when it runs low. Default is False (engine settings are used as is).
         """
         if self.global_muted:
             muted = True
@@ -633,6 +649,7 @@ class TextToAudioStream:
                     self.is_playing_flag = False
                     self.play_lock.release()
         else:
+            governor = None
             try:
                 # Start the audio player to handle playback
                 if self.player:
@@ -669,10 +686,180 @@ class TextToAudioStream:
                 sentence_queue = queue.Queue()
                 sentence_count = 0
 
+                quality_engine = self.engine
+                quality_levels = quality_engine.get_quality_levels() if adaptive_quality and self.player else []
+                governor = QualityGovernor(quality_levels) if quality_levels else None
+
+                def choose_quality_level(sentence):
+                    if governor is None or self.engine is not quality_engine:
+                        return None
+                    level = governor.choose(sentence, self.player.get_queued_seconds())
+                    self.engine.set_quality_level(level)
+                    logging.debug(f'quality level "{quality_levels[level].name}" for sentence "{sentence}"')
+                    return level
+
+                def enqueue_sentence_silence(sentence):
+                    end_sentence_delimeters = ".!?…。¡¿"
+                    mid_sentence_delimeters = ";:,\n()[]{}-“”„”—/|《》"
+
+                    text_stripped = sentence.strip()
+                    if text_stripped and text_stripped[-1] in end_sentence_delimeters:
+                        silence_duration = sentence_silence_duration
+                    elif text_stripped and text_stripped[-1] in mid_sentence_delimeters:
+                        silence_duration = comma_silence_duration
+                    else:
+                        silence_duration = default_silence_duration
+
+                    self._enqueue_silence(silence_duration)
+
+                def announce_sentence(sentence):
+                    if log_synthesized_text:
+                        print(f"\033[96m\033[1m⚡ synthesizing\033[0m \033[37m→ \033[2m'\033[22m{sentence}\033[2m'\033[0m")
+                    if before_sentence_synthesized:
+                        before_sentence_synthesized(sentence)
+
+                def switch_to_next_engine():
+                    logging.warning(
+                        "fallback engine(s) available, switching to next engine"
+                    )
+                    self.engine_index = (self.engine_index + 1) % len(
+                        self.engines
+                    )
+
+                    self.player.stop()
+                    self.load_engine(self.engines[self.engine_index])
+                    self._reapply_active_voice()
+                    self.player.start()
+                    self.player.on_audio_chunk = self._on_audio_chunk
+
+                def synthesize_sentence(sentence, announced=False):
+                    # announced: the batch path already logged the sentence and ran before_sentence_synthesized
+                    synthesis_successful = False
+                    if log_synthesized_text and not announced:
+                        print(f"\033[96m\033[1m⚡ synthesizing\033[0m \033[37m→ \033[2m'\033[22m{sentence}\033[2m'\033[0m")
+
+                    while not synthesis_successful:
+                        try:
+                            if abort_event.is_set():
+                                break
+
+                            if announced:
+                                announced = False
+                            elif before_sentence_synthesized:
+                                before_sentence_synthesized(sentence)
+
+                            quality_level = choose_quality_level(sentence)
+                            if quality_level is not None:
+                                started = time.monotonic()
+                                produced_seconds = self.player.get_produced_seconds()
+
+                            # Whole-utterance engines get long sentences in pieces to bound the time to first audio
+                            pieces = self.engine.split_into_pieces(sentence)
+                            if len(pieces) > 1:
+                                success = self.engine.synthesize_pieces(pieces, sentence_count)
+                            else:
+                                success = self.engine.synthesize(sentence, sentence_count)
+
+                            if quality_level is not None and success:
+                                governor.record(
+                                    quality_level,
+                                    sentence,
+                                    time.monotonic() - started,
+                                    self.player.get_produced_seconds() - produced_seconds,
+                                )
+
+                            enqueue_sentence_silence(sentence)
+
+                            if success:
+                                if on_sentence_synthesized:
+                                    on_sentence_synthesized(sentence)
+                                synthesis_successful = True
+                            else:
+                                logging.warning(
+                                    f'engine {self.engine.engine_name} failed to synthesize sentence "{sentence}", unknown error'
+                                )
+
+                        except Exception as e:
+                            logging.warning(
+                                f'engine {self.engine.engine_name} failed to synthesize sentence "{sentence}" with error: {e}'
+                            )
+                            tb_str = traceback.format_exc()
+                            print(f"Traceback: {tb_str}")
+                            print(f"Error: {e}")
+
+                        if log_synthesized_text:
+                            print(f"\033[92m\033[1m✔ SYNTHESIS FINISHED\033[0m")
+                            
+                        if not synthesis_successful:
+                            if len(self.engines) == 1:
+                                time.sleep(0.2)
+                                logging.warning(
+                                    f"engine {self.engine.engine_name} is the only engine available, can't switch to another engine"
+                                )
+                                break
+                            else:
+                                switch_to_next_engine()
+
+                def synthesize_batch(sentences):
+                    nonlocal sentence_count
+                    first_count = sentence_count
+                    announced = 0
+                    done = 0
+                    failed = False
+                    results = self.engine.synthesize_batch(sentences, first_count)
+                    try:
+                        for sentence in sentences:
+                            # Announced right before its result is requested, like on the single sentence path
+                            announce_sentence(sentence)
+                            announced += 1
+                            success = next(results, None)
+                            if success is None:
+                                break
+                            sentence_count += 1
+                            if not success:
+                                failed = True
+                                logging.warning(
+                                    f'engine {self.engine.engine_name} failed to synthesize sentence "{sentence}", unknown error'
+                                )
+                                break
+                            done += 1
+                            enqueue_sentence_silence(sentence)
+                            if on_sentence_synthesized:
+                                on_sentence_synthesized(sentence)
+                            if log_synthesized_text:
+                                print(f"\033[92m\033[1m✔ SYNTHESIS FINISHED\033[0m")
+                            if abort_event.is_set():
+                                return
+                    except Exception as e:
+                        failed = announced > done
+                        logging.warning(
+                            f"engine {self.engine.engine_name} failed to synthesize a batch of {len(sentences)} sentences with error: {e}"
+                        )
+                    finally:
+                        results.close()
+
+                    # Remaining sentences take the single sentence path with its engine fallback.
+                    for index in range(done, len(sentences)):
+                        if abort_event.is_set():
+                            break
+                        sentence_count = first_count + index + 1
+                        if failed and index == done:
+                            # The failed sentence is only retried on a fallback engine.
+                            if len(self.engines) == 1:
+                                logging.warning(
+                                    f"engine {self.engine.engine_name} is the only engine available, can't switch to another engine"
+                                )
+                                # same timing as a failed sentence on the single sentence path
+                                enqueue_sentence_silence(sentences[index])
+                                continue
+                            switch_to_next_engine()
+                        synthesize_sentence(sentences[index], announced=index < announced)
+
                 def synthesize_worker():
                     nonlocal sentence_count
+                    held_items = []
                     while not abort_event.is_set():
-                        sentence_item = sentence_queue.get()
+                        sentence_item = held_items.pop() if held_items else sentence_queue.get()
                         if sentence_item is None:  # Sentinel value to stop the worker
                             break
 
@@ -699,79 +886,25 @@ class TextToAudioStream:
                                 sentence_queue.task_done()
                             continue
 
-                        sentence = action_value
-
-                        sentence_count += 1
-
-                        synthesis_successful = False
-                        if log_synthesized_text:
-                            print(f"\033[96m\033[1m⚡ synthesizing\033[0m \033[37m→ \033[2m'\033[22m{sentence}\033[2m'\033[0m")
-
-                        while not synthesis_successful:
-                            try:
-                                if abort_event.is_set():
+                        batch = [action_value]
+                        if batch_size > 1 and self.engine.can_batch:
+                            # Render path: synthesize the sentences that are already queued together.
+                            while len(batch) < batch_size:
+                                try:
+                                    next_item = sentence_queue.get_nowait()
+                                except queue.Empty:
                                     break
-
-                                if before_sentence_synthesized:
-                                    before_sentence_synthesized(sentence)
-
-                                success = self.engine.synthesize(sentence, sentence_count)
-
-
-                                end_sentence_delimeters = ".!?…。¡¿"
-                                mid_sentence_delimeters = ";:,\n()[]{}-“”„”—/|《》"
-
-                                text_stripped = sentence.strip()
-                                if text_stripped and text_stripped[-1] in end_sentence_delimeters:
-                                    silence_duration = sentence_silence_duration
-                                elif text_stripped and text_stripped[-1] in mid_sentence_delimeters:
-                                    silence_duration = comma_silence_duration
-                                else:
-                                    silence_duration = default_silence_duration
-
-                                self._enqueue_silence(silence_duration)
-
-
-                                if success:
-                                    if on_sentence_synthesized:
-                                        on_sentence_synthesized(sentence)
-                                    synthesis_successful = True
-                                else:
-                                    logging.warning(
-                                        f'engine {self.engine.engine_name} failed to synthesize sentence "{sentence}", unknown error'
-                                    )
-
-                            except Exception as e:
-                                logging.warning(
-                                    f'engine {self.engine.engine_name} failed to synthesize sentence "{sentence}" with error: {e}'
-                                )
-                                tb_str = traceback.format_exc()
-                                print(f"Traceback: {tb_str}")
-                                print(f"Error: {e}")
-
-                            if log_synthesized_text:
-                                print(f"\033[92m\033[1m✔ SYNTHESIS FINISHED\033[0m")
-                            
-                            if not synthesis_successful:
-                                if len(self.engines) == 1:
-                                    time.sleep(0.2)
-                                    logging.warning(
-                                        f"engine {self.engine.engine_name} is the only engine available, can't switch to another engine"
-                                    )
+                                if next_item is None or next_item[0] != "text":
+                                    held_items.append(next_item)
                                     break
-                                else:
-                                    logging.warning(
-                                        "fallback engine(s) available, switching to next engine"
-                                    )
-                                    self.engine_index = (self.engine_index + 1) % len(
-                                        self.engines
-                                    )
-
-                                    self.player.stop()
-                                    self.load_engine(self.engines[self.engine_index])
-                                    self._reapply_active_voice()
-                                    self.player.start()
-                                    self.player.on_audio_chunk = self._on_audio_chunk
+                                batch.append(next_item[1])
+                                sentence_queue.task_done()
+
+                        if len(batch) > 1:
+                            synthesize_batch(batch)
+                        else:
+                            sentence_count += 1
+                            synthesize_sentence(action_value)
 
                         sentence_queue.task_done()
 
@@ -791,6 +924,8 @@ class TextToAudioStream:
                         if action_type == "text":
                             action_value = action_value.strip()
                             if action_value:
+                                if self.engine.can_prefetch:
+                                    self.engine.prefetch(action_value)
                                 sentence_queue.put((action_type, action_value))
                         else:
                             sentence_queue.put((action_type, action_value))
@@ -810,6 +945,9 @@ class TextToAudioStream:
 
             finally:
                 try:
+                    if governor is not None:
+                        quality_engine.set_quality_level(None)
+
                     if self.player:
                         self.player.stop()
 
@@ -855,6 +993,8 @@ class TextToAudioStream:
                     force_first_fragment_after_words=force_first_fragment_after_words,
                     is_external_call=False,
                     debug=debug,
+                    batch_size=batch_size,
+                    adaptive_quality=adaptive_quality,
                 )
 
             if is_external_call:
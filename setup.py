@@ -112,6 +112,7 @@ gtts_requirements = [requirements.get("gtts", "gtts")]
 coqui_requirements = [requirements.get("coqui_tts", "coqui_tts")]
 edge_requirements = [requirements.get("edge-tts", "edge-tts")]
 kokoro_requirements = [requirements.get("kokoro", "kokoro")]
+kokoro_onnx_requirements = kokoro_requirements + [requirements.get("onnxruntime", "onnxruntime")]
 camb_requirements = [requirements.get("camb-sdk", "camb-sdk")]
 requests_requirements = [requirements.get("requests", "requests")]
 cartesia_requirements = [requirements.get("cartesia", "cartesia")]
@@ -259,19 +260,20 @@ extras_require = {
     "nltk": base_requirements,
     "stanza": base_requirements + stanza_tokenizer_requirements,
     "system": standard_requirements + system_requirements,
-    "azure": standard_requirements + azure_requirements,
+    "azure": standard_requirements + azure_requirements + requests_requirements,
     "elevenlabs": standard_requirements + elevenlabs_requirements,
     "openai": standard_requirements + openai_requirements,
     "gtts": standard_requirements + gtts_requirements,
     "coqui": standard_requirements + coqui_requirements,
     "edge": standard_requirements + edge_requirements,
     "kokoro": standard_requirements + kokoro_requirements,
+    "kokoro-onnx": standard_requirements + kokoro_onnx_requirements,
     "camb": standard_requirements + camb_requirements,
     "minimax": standard_requirements + requests_requirements,
     "modelslab": standard_requirements + requests_requirements,
     "cartesia": standard_requirements + cartesia_requirements,
     "typecast": standard_requirements + typecast_requirements,
-    "orpheus": standard_requirements + orpheus_requirements,
+    "orpheus": standard_requirements + orpheus_requirements + requests_requirements,
     "omnivoice": standard_requirements + omnivoice_requirements,
     "luxtts": standard_requirements + luxtts_requirements,
     "zipvoice": standard_requirements + zipvoice_requirements,
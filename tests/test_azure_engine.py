@@ -0,0 +1,196 @@
+import datetime
+import importlib
+import sys
+import types
+
+import pytest
+
+
+class _Signal:
+    def __init__(self):
+        self.handlers = []
+
+    def connect(self, handler):
+        self.handlers.append(handler)
+
+
+class _Future:
+    def __init__(self, result):
+        self._result = result
+
+    def get(self):
+        return self._result
+
+
+def _fake_speech_sdk():
+    sdk = types.ModuleType("azure.cognitiveservices.speech")
+    audio = types.ModuleType("azure.cognitiveservices.speech.audio")
+    created = {"configs": 0, "synthesizers": [], "connections": []}
+
+    class SpeechSynthesisOutputFormat:
+        Riff16Khz16BitMonoPcm = "riff16"
+        Riff24Khz16BitMonoPcm = "riff24"
+        Riff48Khz16BitMonoPcm = "riff48"
+
+    class ResultReason:
+        SynthesizingAudioCompleted = "completed"
+        Canceled = "canceled"
+
+    class CancellationReason:
+        Error = "error"
+
+    class SpeechConfig:
+        def __init__(self, subscription, region):
+            created["configs"] += 1
+            self.subscription = subscription
+            self.region = region
+
+        def set_speech_synthesis_output_format(self, output_format):
+            self.output_format = output_format
+
+    class PushAudioOutputStreamCallback:
+        pass
+
+    class PushAudioOutputStream:
+        def __init__(self, callback):
+            self.callback = callback
+
+    class AudioOutputConfig:
+        def __init__(self, stream):
+            self.stream = stream
+
+    class SpeechSynthesizer:
+        def __init__(self, speech_config, audio_config):
+            self.speech_config = speech_config
+            self.callback = audio_config.stream.callback
+            self.synthesis_word_boundary = _Signal()
+            self.ssml = []
+            created["synthesizers"].append(self)
+
+        def speak_ssml_async(self, ssml):
+            self.ssml.append(ssml)
+            self.callback.write(memoryview(b"\x00\x01" * 4))
+            result = types.SimpleNamespace(
+                reason=ResultReason.SynthesizingAudioCompleted,
+                audio_duration=datetime.timedelta(milliseconds=250),
+            )
+            return _Future(result)
+
+    class Connection:
+        def __init__(self, synthesizer):
+            self.synthesizer = synthesizer
+            self.opened = False
+            self.closed = False
+
+        @classmethod
+        def from_speech_synthesizer(cls, synthesizer):
+            connection = cls(synthesizer)
+            created["connections"].append(connection)
+            return connection
+
+        def open(self, for_continuous_recognition):
+            self.opened = True
+
+        def close(self):
+            self.closed = True
+
+    audio.PushAudioOutputStreamCallback = PushAudioOutputStreamCallback
+    audio.PushAudioOutputStream = PushAudioOutputStream
+    audio.AudioOutputConfig = AudioOutputConfig
+    sdk.audio = audio
+    sdk.SpeechSynthesisOutputFormat = SpeechSynthesisOutputFormat
+    sdk.ResultReason = ResultReason
+    sdk.CancellationReason = CancellationReason
+    sdk.SpeechConfig = SpeechConfig
+    sdk.SpeechSynthesizer = SpeechSynthesizer
+    sdk.Connection = Connection
+    return sdk, audio, created
+
+
+@pytest.fixture
+def azure_module(monkeypatch):
+    sdk, audio, created = _fake_speech_sdk()
+    azure = types.ModuleType("azure")
+    cognitiveservices = types.ModuleType("azure.cognitiveservices")
+    azure.cognitiveservices = cognitiveservices
+    cognitiveservices.speech = sdk
+    monkeypatch.setitem(sys.modules, "azure", azure)
+    monkeypatch.setitem(sys.modules, "azure.cognitiveservices", cognitiveservices)
+    monkeypatch.setitem(sys.modules, "azure.cognitiveservices.speech", sdk)
+    monkeypatch.setitem(sys.modules, "azure.cognitiveservices.speech.audio", audio)
+
+    if "pyaudio" not in sys.modules:
+        fake_pyaudio = types.ModuleType("pyaudio")
+        fake_pyaudio.paInt16 = 8
+        monkeypatch.setitem(sys.modules, "pyaudio", fake_pyaudio)
+
+    monkeypatch.delitem(sys.modules, "RealtimeTTS.engines.azure_engine", raising=False)
+    module = importlib.import_module("RealtimeTTS.engines.azure_engine")
+    yield module, created
+    sys.modules.pop("RealtimeTTS.engines.azure_engine", None)
+
+
+def _drain(engine):
+    chunks = []
+    while not engine.queue.empty():
+        chunks.append(engine.queue.get_nowait())
+    return chunks
+
+
+def test_connection_is_opened_at_creation(azure_module):
+    module, created = azure_module
+    module.AzureEngine("key", "westeurope")
+
+    assert len(created["synthesizers"]) == 1
+    assert created["connections"][0].opened is True
+
+
+def test_prewarm_waits_for_credentials(azure_module):
+    module, created = azure_module
+    module.AzureEngine()
+
+    assert created["synthesizers"] == []
+
+
+def test_synthesizer_is_reused_across_sentences_and_voices(azure_module):
+    module, created = azure_module
+    engine = module.AzureEngine("key", "westeurope")
+
+    assert engine.synthesize("Hello.") is True
+    engine.set_voice(module.AzureVoice("Microsoft Server Speech (en-GB, RyanNeural)", "en-GB", "Male"))
+    engine.set_voice_parameters(rate=10)
+    assert engine.synthesize("World.") is True
+
+    assert created["configs"] == 1
+    synthesizer = created["synthesizers"][0]
+    first, second = synthesizer.ssml
+    assert "Hello.</prosody>" in first
+    assert 'name="en-US-AshleyNeural"' in first
+    assert 'rate="10%"' in second
+    assert "RyanNeural" in second
+    assert _drain(engine) == [b"\x00\x01" * 4] * 2
+    assert engine.audio_duration == pytest.approx(0.5)
+
+
+def test_audio_follows_replaced_engine_queue(azure_module):
+    module, _ = azure_module
+    engine = module.AzureEngine("key", "westeurope")
+    old_queue = engine.queue
+    engine.queue = type(old_queue)()
+
+    engine.synthesize("Hi.")
+
+    assert old_queue.empty()
+    assert len(_drain(engine)) == 1
+
+
+def test_changing_region_rebuilds_synthesizer(azure_module):
+    module, created = azure_module
+    engine = module.AzureEngine("key", "westeurope")
+
+    engine.set_service_region("eastus")
+    engine.synthesize("Hi.")
+
+    assert len(created["synthesizers"]) == 2
+    assert created["connections"][0].closed is True
+    assert created["synthesizers"][1].speech_config.region == "eastus"
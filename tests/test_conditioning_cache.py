@@ -0,0 +1,226 @@
+import dataclasses
+import multiprocessing as mp
+import threading
+
+import numpy as np
+import pytest
+
+from RealtimeTTS.engines.conditioning_cache import (
+    ConditioningCache,
+    make_key,
+    read_entry,
+    write_entry,
+)
+
+
+@pytest.fixture
+def reference(tmp_path):
+    path = tmp_path / "voice.wav"
+    path.write_bytes(b"RIFF" + bytes(range(200)))
+    return path
+
+
+def test_entries_round_trip_through_memory_mapped_file(tmp_path):
+    value = {
+        "latent": np.arange(12, dtype=np.float32).reshape(3, 4),
+        "codes": [np.array([1, 2, 3], dtype=np.int64), np.zeros(0, dtype=np.int16)],
+        "meta": ("text", 1.5, None, True),
+    }
+    path = tmp_path / "entry.cond"
+    write_entry(path, value)
+
+    loaded = read_entry(path)
+
+    assert isinstance(loaded["latent"], np.memmap) or isinstance(loaded["latent"].base, np.memmap)
+    np.testing.assert_array_equal(loaded["latent"], value["latent"])
+    np.testing.assert_array_equal(loaded["codes"][0], value["codes"][0])
+    assert loaded["codes"][1].shape == (0,)
+    assert loaded["meta"] == ("text", 1.5, None, True)
+    # copy-on-write: callers may modify loaded arrays without touching the file
+    loaded["latent"][0, 0] = 99
+    assert read_entry(path)["latent"][0, 0] == 0
+
+
+def test_torch_tensors_keep_their_type(tmp_path):
+    torch = pytest.importorskip("torch")
+    value = {"a": torch.arange(4, dtype=torch.bfloat16), "b": torch.ones(2, 3)}
+    path = tmp_path / "entry.cond"
+    write_entry(path, value)
+
+    loaded = read_entry(path)
+
+    assert loaded["a"].dtype == torch.bfloat16
+    assert torch.equal(loaded["a"], value["a"])
+    assert torch.equal(loaded["b"], value["b"])
+
+
+def test_key_follows_content_not_path(tmp_path, reference):
+    copy = tmp_path / "copy.wav"
+    copy.write_bytes(reference.read_bytes())
+
+    key = make_key("engine:model", [reference], transcript="hi")
+
+    assert make_key("engine:model", [copy], transcript="hi") == key
+    assert make_key("engine:other", [reference], transcript="hi") != key
+    assert make_key("engine:model", [reference], transcript="hello") != key
+
+    copy.write_bytes(b"changed")
+    assert make_key("engine:model", [copy], transcript="hi") != key
+
+
+def test_get_or_create_persists_across_instances(tmp_path, reference):
+    calls = []
+
+    def create():
+        calls.append(1)
+        return {"codes": np.arange(5)}
+
+    key = make_key("engine:model", [reference])
+    first = ConditioningCache(tmp_path / "cache")
+    assert first.get_or_create(key, create)["codes"].tolist() == [0, 1, 2, 3, 4]
+    assert first.get_or_create(key, create)["codes"].tolist() == [0, 1, 2, 3, 4]
+
+    second = ConditioningCache(tmp_path / "cache")
+    assert second.get_or_create(key, create)["codes"].tolist() == [0, 1, 2, 3, 4]
+    assert len(calls) == 1
+
+
+def test_memory_lru_respects_byte_limit(tmp_path):
+    cache = ConditioningCache(tmp_path, max_memory_bytes=1000, persist=False)
+    cache.put("a", np.zeros(100, dtype=np.float32))
+    cache.put("b", np.zeros(100, dtype=np.float32))
+    assert cache.get("a") is not None  # a is now the most recent entry
+    cache.put("c", np.zeros(100, dtype=np.float32))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.memory_bytes == 800
+
+    cache.put("huge", np.zeros(1000, dtype=np.float32))
+    assert cache.get("huge") is not None
+    assert cache.get("a") is None
+
+
+def test_unsupported_values_stay_in_memory(tmp_path):
+    cache = ConditioningCache(tmp_path)
+    opaque = object()
+    cache.put("key", opaque)
+
+    assert cache.get("key") is opaque
+    assert not (tmp_path / "key.cond").exists()
+    assert ConditioningCache(tmp_path).get("key") is None
+
+
+def test_corrupt_entry_is_recomputed(tmp_path):
+    cache = ConditioningCache(tmp_path)
+    (tmp_path / "key.cond").write_bytes(b"garbage")
+
+    assert cache.get_or_create("key", lambda: [1, 2]) == [1, 2]
+    assert ConditioningCache(tmp_path).get("key") == [1, 2]
+
+
+def test_concurrent_threads_compute_once(tmp_path):
+    cache = ConditioningCache(tmp_path)
+    calls = []
+    barrier = threading.Barrier(4)
+
+    def create():
+        calls.append(1)
+        return np.ones(3)
+
+    def worker():
+        barrier.wait()
+        ConditioningCache(tmp_path).get_or_create("key", create)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert cache.get("key").tolist() == [1.0, 1.0, 1.0]
+
+
+def test_lock_files_are_a_fixed_striped_set(tmp_path):
+    cache = ConditioningCache(tmp_path)
+
+    for index in range(200):
+        cache.get_or_create(f"key-{index}", lambda: np.zeros(2))
+
+    lock_files = list((tmp_path / "locks").glob("*.lock"))
+    assert 1 < len(lock_files) <= 64
+    assert not list(tmp_path.glob("*.lock"))
+    assert len(list(tmp_path.glob("*.cond"))) == 200
+
+
+def test_slow_creation_does_not_block_other_keys(tmp_path):
+    cache = ConditioningCache(tmp_path)
+    started, release = threading.Event(), threading.Event()
+    slow_key = "slow"
+    other_key = next(
+        f"other-{index}" for index in range(1000)
+        if cache._lock_path(f"other-{index}") != cache._lock_path(slow_key)
+    )
+
+    def slow():
+        started.set()
+        assert release.wait(timeout=5)
+        return np.ones(2)
+
+    thread = threading.Thread(target=cache.get_or_create, args=(slow_key, slow))
+    thread.start()
+    assert started.wait(timeout=5)
+    try:
+        # finishes while the slow key is still being computed
+        assert cache.get_or_create(other_key, lambda: np.zeros(2)).tolist() == [0.0, 0.0]
+    finally:
+        release.set()
+        thread.join(timeout=5)
+    assert cache.get(slow_key).tolist() == [1.0, 1.0]
+
+
+def _create_in_process(cache_dir, start, counter):
+    start.wait()
+
+    def create():
+        with counter.get_lock():
+            counter.value += 1
+        return np.arange(3)
+
+    ConditioningCache(cache_dir).get_or_create("shared", create)
+
+
+def test_processes_share_one_computation(tmp_path):
+    context = mp.get_context("spawn")
+    start = context.Event()
+    counter = context.Value("i", 0)
+    processes = [
+        context.Process(target=_create_in_process, args=(str(tmp_path), start, counter))
+        for _ in range(3)
+    ]
+    for process in processes:
+        process.start()
+    start.set()
+    for process in processes:
+        process.join(timeout=60)
+
+    assert all(process.exitcode == 0 for process in processes)
+    assert counter.value == 1
+
+
+@dataclasses.dataclass
+class PreparedReference:
+    codes: np.ndarray
+    seconds: float
+
+
+def test_dataclasses_are_rebuilt(tmp_path):
+    path = tmp_path / "entry.cond"
+    write_entry(path, PreparedReference(np.arange(4), 2.5))
+
+    loaded = read_entry(path)
+
+    assert isinstance(loaded, PreparedReference)
+    assert loaded.codes.tolist() == [0, 1, 2, 3]
+    assert loaded.seconds == 2.5
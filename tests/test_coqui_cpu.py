@@ -0,0 +1,64 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from RealtimeTTS.engines.coqui_cpu import quantize_int8, replace_conv1d_with_linear
+
+
+class Conv1D(torch.nn.Module):
+    """Same layout as transformers.pytorch_utils.Conv1D."""
+
+    def __init__(self, nf, nx):
+        super().__init__()
+        self.nf = nf
+        self.weight = torch.nn.Parameter(torch.randn(nx, nf))
+        self.bias = torch.nn.Parameter(torch.randn(nf))
+
+    def forward(self, x):
+        return torch.addmm(self.bias, x.view(-1, x.size(-1)), self.weight).view(x.size()[:-1] + (self.nf,))
+
+
+class Block(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.c_fc = Conv1D(32, 16)
+        self.c_proj = Conv1D(16, 32)
+
+    def forward(self, x):
+        return self.c_proj(torch.relu(self.c_fc(x)))
+
+
+class Model(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.blocks = torch.nn.ModuleList([Block(), Block()])
+        self.head = torch.nn.Linear(16, 4)
+
+    def forward(self, x):
+        for block in self.blocks:
+            x = block(x)
+        return self.head(x)
+
+
+def test_conv1d_replacement_keeps_outputs():
+    torch.manual_seed(0)
+    model = Model().eval()
+    x = torch.randn(2, 5, 16)
+    expected = model(x)
+
+    assert replace_conv1d_with_linear(model) == 4
+    assert isinstance(model.blocks[0].c_fc, torch.nn.Linear)
+    torch.testing.assert_close(model(x), expected, rtol=1e-5, atol=1e-5)
+
+
+def test_quantization_is_in_place_for_shared_blocks():
+    torch.manual_seed(0)
+    model = Model().eval()
+    shared = model.blocks  # like XTTS' inference wrapper holding the transformer
+    x = torch.randn(2, 5, 16)
+    expected = model(x)
+
+    quantize_int8(model)
+
+    assert "Quantized" in type(shared[0].c_fc).__name__ or "quantized" in type(shared[0].c_fc).__module__
+    assert torch.allclose(model(x), expected, atol=0.2 * expected.abs().max().item())
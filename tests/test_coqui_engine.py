@@ -0,0 +1,77 @@
+import importlib
+import multiprocessing
+import sys
+import threading
+import types
+
+import pytest
+
+from RealtimeTTS.engines.stream_chunk_schedule import StreamChunkScheduler
+
+
+class FakePipe:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, message):
+        self.sent.append(message)
+
+    def recv(self):
+        return "finished", None
+
+
+@pytest.fixture
+def coqui_module(monkeypatch):
+    fake_torch = types.ModuleType("torch")
+    fake_torch.multiprocessing = multiprocessing
+    fake_torch.nn = types.SimpleNamespace(Module=object, Linear=object)
+    monkeypatch.setitem(sys.modules, "torch", fake_torch)
+    monkeypatch.setitem(sys.modules, "torch.multiprocessing", multiprocessing)
+    if "pyaudio" not in sys.modules:
+        fake_pyaudio = types.ModuleType("pyaudio")
+        fake_pyaudio.paFloat32 = 1
+        monkeypatch.setitem(sys.modules, "pyaudio", fake_pyaudio)
+
+    monkeypatch.delitem(sys.modules, "RealtimeTTS.engines.coqui_engine", raising=False)
+    module = importlib.import_module("RealtimeTTS.engines.coqui_engine")
+    yield module
+    sys.modules.pop("RealtimeTTS.engines.coqui_engine", None)
+
+
+def _engine(module):
+    # only the parent side of synthesize(), without the worker process
+    engine = object.__new__(module.CoquiEngine)
+    engine.stop_synthesis_event = threading.Event()
+    engine._synthesize_lock = threading.Lock()
+    engine.add_sentence_filter = False
+    engine.audio_ring = None
+    engine.language = "en"
+    engine.parent_synthesize_pipe = FakePipe()
+    return engine
+
+
+def test_first_chunk_after_stop_uses_initial_chunk_size(coqui_module):
+    now = [100.0]
+    scheduler = StreamChunkScheduler([10, 20, 40, 80], clock=lambda: now[0])
+    scheduler.record_realtime_factor(0.1)
+    scheduler.add_audio(30.0)
+    assert scheduler.next_chunk_size() == 80
+
+    engine = _engine(coqui_module)
+    engine.stop()
+    engine.synthesize("After the stop.")
+    engine.synthesize("Next sentence.")
+
+    after_stop, following = [message["data"] for message in engine.parent_synthesize_pipe.sent]
+    assert after_stop["reset_schedule"] is True
+    assert following["reset_schedule"] is False
+    assert coqui_module.CoquiEngine._next_chunk_size(scheduler, after_stop) == 10
+
+
+def test_chunk_size_keeps_buffer_estimate_without_stop(coqui_module):
+    now = [100.0]
+    scheduler = StreamChunkScheduler([10, 20, 40, 80], clock=lambda: now[0])
+    scheduler.record_realtime_factor(0.1)
+    scheduler.add_audio(30.0)
+
+    assert coqui_module.CoquiEngine._next_chunk_size(scheduler, {"reset_schedule": False}) == 80
@@ -0,0 +1,124 @@
+import base64
+import importlib
+import json
+import sys
+import threading
+import types
+
+import pytest
+
+pytest.importorskip("websockets")
+
+from websockets.sync.server import serve
+
+
+@pytest.fixture
+def elevenlabs_module(monkeypatch):
+    """Import elevenlabs_engine with stand-ins for the SDK and PyAudio."""
+    fake_client = types.ModuleType("elevenlabs.client")
+
+    class FakeElevenLabs:
+        def __init__(self, api_key):
+            self.api_key = api_key
+
+    fake_client.ElevenLabs = FakeElevenLabs
+    fake_package = types.ModuleType("elevenlabs")
+    fake_package.client = fake_client
+    monkeypatch.setitem(sys.modules, "elevenlabs", fake_package)
+    monkeypatch.setitem(sys.modules, "elevenlabs.client", fake_client)
+
+    if "pyaudio" not in sys.modules:
+        fake_pyaudio = types.ModuleType("pyaudio")
+        fake_pyaudio.paInt16 = 8
+        fake_pyaudio.paCustomFormat = 65536
+        monkeypatch.setitem(sys.modules, "pyaudio", fake_pyaudio)
+
+    monkeypatch.delitem(
+        sys.modules, "RealtimeTTS.engines.elevenlabs_engine", raising=False
+    )
+    module = importlib.import_module("RealtimeTTS.engines.elevenlabs_engine")
+    yield module
+    sys.modules.pop("RealtimeTTS.engines.elevenlabs_engine", None)
+
+
+@pytest.fixture
+def fake_stream_input_server():
+    """Local stand-in for the ElevenLabs stream-input websocket."""
+    received = {"messages": [], "path": None, "api_key": None}
+    pcm = b"\x01\x00\x02\x00\x03\x00\x04\x00"
+
+    def handler(connection):
+        received["path"] = connection.request.path
+        received["api_key"] = connection.request.headers.get("xi-api-key")
+        for message in connection:
+            data = json.loads(message)
+            received["messages"].append(data)
+            if data["text"] == "":
+                break
+            if data["text"].strip():
+                connection.send(
+                    json.dumps({"audio": base64.b64encode(pcm).decode("ascii")})
+                )
+        connection.send(json.dumps({"isFinal": True}))
+
+    server = serve(handler, "127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.socket.getsockname()[:2]
+    try:
+        yield f"ws://{host}:{port}", received, pcm
+    finally:
+        server.shutdown()
+        thread.join(timeout=5)
+
+
+def test_input_streaming_declares_generator_consumption(elevenlabs_module):
+    engine = elevenlabs_module.ElevenlabsEngine(
+        api_key="key", input_streaming=True, output_format="pcm_24000"
+    )
+
+    assert engine.can_consume_generators is True
+    assert engine.get_stream_info()[1:] == (1, 24000)
+
+
+def test_default_mode_keeps_sentence_synthesis(elevenlabs_module):
+    engine = elevenlabs_module.ElevenlabsEngine(api_key="key")
+
+    assert engine.can_consume_generators is False
+    assert engine.get_stream_info()[1:] == (-1, -1)
+
+
+def test_input_streaming_forwards_words_and_queues_audio(
+    elevenlabs_module, fake_stream_input_server
+):
+    url, received, pcm = fake_stream_input_server
+    engine = elevenlabs_module.ElevenlabsEngine(
+        api_key="key",
+        id="voice-1",
+        input_streaming=True,
+        output_format="pcm_16000",
+        chunk_length_schedule=[50, 120],
+        websocket_url=url,
+    )
+
+    assert engine.synthesize(iter("Hello there, world")) is True
+
+    assert received["api_key"] == "key"
+    assert received["path"].startswith("/v1/text-to-speech/voice-1/stream-input?")
+    assert "output_format=pcm_16000" in received["path"]
+
+    init, *texts = received["messages"]
+    assert init["text"] == " "
+    assert init["generation_config"] == {"chunk_length_schedule": [50, 120]}
+    assert [message["text"] for message in texts] == [
+        "Hello ",
+        "there,",
+        " world ",
+        "",
+    ]
+
+    chunks = []
+    while not engine.queue.empty():
+        chunks.append(engine.queue.get_nowait())
+    assert chunks == [pcm, pcm, pcm]
+    assert engine.audio_duration == pytest.approx(3 * len(pcm) / (2 * 16000))
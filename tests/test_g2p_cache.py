@@ -0,0 +1,131 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from RealtimeTTS.engines.g2p_cache import G2PCache, normalize_text
+
+
+@dataclass
+class FakeToken:
+    text: str
+    phonemes: str
+    whitespace: str = " "
+    start_ts: Optional[float] = None
+    end_ts: Optional[float] = None
+
+    @dataclass
+    class Underscore:
+        is_head: bool = True
+        stress: Optional[float] = None
+
+    _: Optional[Underscore] = None
+
+
+class FakeG2P:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, text, preprocess=True):
+        self.calls.append(text)
+        tokens = [FakeToken(word, word.lower(), _=FakeToken.Underscore(stress=1.0)) for word in text.split()]
+        return " ".join(token.phonemes for token in tokens), tokens
+
+
+def join_timestamps(tokens, durations):
+    # stands in for KPipeline.join_timestamps, which writes into the tokens
+    position = 0.0
+    for token, duration in zip(tokens, durations):
+        token.start_ts = position
+        position += duration
+        token.end_ts = position
+
+
+def test_repeated_text_is_served_from_memory():
+    g2p = FakeG2P()
+    cached = G2PCache().wrap(g2p, "kokoro:a")
+
+    first = cached("Hello World")
+    second = cached("Hello World")
+
+    assert g2p.calls == ["Hello World"]
+    assert first == second
+    stats = cached.cache.stats()
+    assert (stats.hits, stats.misses, stats.hit_rate) == (1, 1, 0.5)
+
+
+def test_cached_tokens_are_independent_copies():
+    cached = G2PCache().wrap(FakeG2P(), "kokoro:a")
+    uncached = FakeG2P()
+
+    _, first = cached("one two")
+    join_timestamps(first, [0.5, 0.25])
+    _, second = cached("one two")
+    join_timestamps(second, [0.1, 0.2])
+    _, reference = uncached("one two")
+    join_timestamps(reference, [0.1, 0.2])
+
+    assert first[1].end_ts == 0.75
+    assert [(t.start_ts, t.end_ts, t.text) for t in second] == [(t.start_ts, t.end_ts, t.text) for t in reference]
+
+
+def test_namespaces_and_extra_arguments():
+    g2p = FakeG2P()
+    cache = G2PCache()
+    american = cache.wrap(g2p, "kokoro:a")
+    british = cache.wrap(g2p, "kokoro:b")
+
+    american("tomato")
+    british("tomato")
+    american("tomato", preprocess=False)
+
+    assert g2p.calls == ["tomato", "tomato", "tomato"]
+    assert cache.stats().lookups == 2
+
+
+def test_memory_is_bounded():
+    g2p = FakeG2P()
+    cached = G2PCache(max_entries=2).wrap(g2p, "kokoro:a")
+
+    for text in ("a", "b", "a", "c", "b"):
+        cached(text)
+
+    assert len(cached.cache) == 2
+    assert g2p.calls == ["a", "b", "c", "b"]
+
+
+def test_results_persist_on_disk(tmp_path):
+    path = tmp_path / "g2p.sqlite3"
+    first_cache = G2PCache(path=path)
+    first_cache.wrap(FakeG2P(), "kokoro:a")("Repeat me")
+    first_cache.close()
+
+    g2p = FakeG2P()
+    cache = G2PCache(path=path)
+    phonemes, tokens = cache.wrap(g2p, "kokoro:a")("Repeat me")
+
+    assert g2p.calls == []
+    assert phonemes == "repeat me"
+    assert tokens == FakeG2P()("Repeat me")[1]
+    assert isinstance(tokens[0]._, FakeToken.Underscore)
+    assert cache.stats().disk_hits == 1
+    cache.close()
+
+
+def test_unstorable_results_stay_in_memory(tmp_path):
+    cache = G2PCache(path=tmp_path / "g2p.sqlite3")
+    cached = cache.wrap(lambda text: (text, object()), "kokoro:a")
+
+    cached("x")
+    cached("x")
+
+    assert cache.stats().hits == 1
+    cache.close()
+
+    reopened = G2PCache(path=tmp_path / "g2p.sqlite3")
+    reopened.wrap(lambda text: (text, object()), "kokoro:a")("x")
+    assert reopened.stats().misses == 1
+    reopened.close()
+
+
+def test_normalization_is_nfc_only():
+    assert normalize_text("cafe\u0301") == "caf\u00e9"
+    assert normalize_text(" Hello ") == " Hello "
@@ -0,0 +1,124 @@
+import importlib
+import sys
+import threading
+import types
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pydub")
+
+
+@pytest.fixture
+def gtts_module(monkeypatch):
+    requests_seen = []
+    lock = threading.Lock()
+
+    class FakeGTTS:
+        def __init__(self, text, lang, tld):
+            self.text = text
+            with lock:
+                requests_seen.append((text, lang, tld))
+
+        def write_to_fp(self, fp):
+            fp.write(self.text.encode())
+
+    fake_lang = types.ModuleType("gtts.lang")
+    fake_lang.tts_langs = lambda: {"en": "English"}
+    fake_gtts = types.ModuleType("gtts")
+    fake_gtts.gTTS = FakeGTTS
+    fake_gtts.lang = fake_lang
+    monkeypatch.setitem(sys.modules, "gtts", fake_gtts)
+    monkeypatch.setitem(sys.modules, "gtts.lang", fake_lang)
+
+    if "pyaudio" not in sys.modules:
+        fake_pyaudio = types.ModuleType("pyaudio")
+        fake_pyaudio.paInt16 = 8
+        monkeypatch.setitem(sys.modules, "pyaudio", fake_pyaudio)
+
+    monkeypatch.delitem(sys.modules, "RealtimeTTS.engines.gtts_engine", raising=False)
+    module = importlib.import_module("RealtimeTTS.engines.gtts_engine")
+    # Decoding real MP3 needs ffmpeg; the fake "MP3" is the text itself.
+    monkeypatch.setattr(
+        module.GTTSEngine,
+        "_decode_mp3",
+        staticmethod(lambda mp3: np.frombuffer(mp3.ljust(8, b"\0")[:8], dtype=np.int16)),
+    )
+    yield module, requests_seen
+    sys.modules.pop("RealtimeTTS.engines.gtts_engine", None)
+
+
+def _drain(engine):
+    chunks = []
+    while not engine.queue.empty():
+        chunks.append(engine.queue.get_nowait())
+    return chunks
+
+
+def test_prefetched_sentences_are_queued_in_order(gtts_module):
+    module, requests_seen = gtts_module
+    engine = module.GTTSEngine()
+    assert engine.can_prefetch is True
+
+    for text in ("one", "two", "three"):
+        engine.prefetch(text)
+    for text in ("one", "two", "three"):
+        assert engine.synthesize(text) is True
+
+    assert _drain(engine) == [b"one\0\0\0\0\0", b"two\0\0\0\0\0", b"three\0\0\0"]
+    assert sorted(requests_seen) == sorted(
+        [("one", "en", "com"), ("two", "en", "com"), ("three", "en", "com")]
+    )
+    engine.shutdown()
+
+
+def test_voice_change_invalidates_prefetch(gtts_module):
+    module, requests_seen = gtts_module
+    engine = module.GTTSEngine()
+
+    engine.prefetch("hello")
+    engine.set_voice(module.GTTSVoice("en", "co.uk"))
+    engine.synthesize("hello")
+
+    assert requests_seen[-1] == ("hello", "en", "co.uk")
+    assert not engine._prefetcher.has_pending()
+    engine.shutdown()
+
+
+def test_engines_do_not_share_output_files(gtts_module):
+    module, _ = gtts_module
+    engines = [module.GTTSEngine(prefetch_sentences=0) for _ in range(2)]
+
+    threads = [
+        threading.Thread(target=engine.synthesize, args=(text,))
+        for engine, text in zip(engines, ("first", "second"))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert _drain(engines[0]) == [b"first\0\0\0"]
+    assert _drain(engines[1]) == [b"second\0\0"]
+
+
+@pytest.mark.parametrize("speed", [0.8, 1.25, 1.5, 2.5])
+def test_speedup_changes_duration_not_pitch(gtts_module, speed):
+    module, _ = gtts_module
+    rate = module.SAMPLE_RATE
+    t = np.arange(rate * 2) / rate
+    samples = (np.sin(2 * np.pi * 200 * t) * 10000).astype(np.int16)
+
+    faster = module._speedup(samples, speed, 100, 10)
+
+    assert faster.dtype == np.int16
+    assert len(faster) == pytest.approx(len(samples) / speed, rel=0.02)
+    spectrum = np.abs(np.fft.rfft(faster.astype(np.float32)))
+    peak_hz = np.argmax(spectrum) * rate / len(faster)
+    assert peak_hz == pytest.approx(200, abs=5)
+
+
+def test_speedup_handles_short_input(gtts_module):
+    module, _ = gtts_module
+    assert len(module._speedup(np.zeros(0, dtype=np.int16), 1.5, 100, 10)) == 0
+    assert len(module._speedup(np.ones(100, dtype=np.int16), 1.5, 100, 10)) == 67
@@ -0,0 +1,120 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from RealtimeTTS.engines.http_client import (
+    HttpClient,
+    HttpPoolStats,
+    RetryPolicy,
+    get_http_client,
+    iter_sse_data,
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    failures_left = 0
+
+    def _reply(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/flaky" and type(self).failures_left > 0:
+            type(self).failures_left -= 1
+            self._reply(503, b"busy")
+            return
+        self._reply(200, b"audio-bytes")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self._reply(200, self.rfile.read(length))
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    try:
+        yield f"http://{host}:{port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=5)
+
+
+def test_requests_reuse_one_keep_alive_connection(server_url):
+    client = HttpClient()
+    try:
+        for _ in range(3):
+            assert client.get(f"{server_url}/audio").content == b"audio-bytes"
+        assert client.post(f"{server_url}/echo", data=b"hello").content == b"hello"
+
+        stats = client.stats()["127.0.0.1"]
+        assert stats.requests == 4
+        assert stats.connections == 1
+        assert stats.reuse_ratio == pytest.approx(0.75)
+        assert stats.connect_time > 0
+    finally:
+        client.close()
+
+
+def test_transient_status_is_retried(server_url):
+    _Handler.failures_left = 2
+    client = HttpClient(retry=RetryPolicy(total=2, backoff_factor=0))
+    try:
+        response = client.get(f"{server_url}/flaky")
+        assert response.status_code == 200
+    finally:
+        client.close()
+
+
+def test_exhausted_retries_return_last_response(server_url):
+    _Handler.failures_left = 5
+    client = HttpClient(retry=RetryPolicy(total=1, backoff_factor=0))
+    try:
+        response = client.get(f"{server_url}/flaky")
+        assert response.status_code == 503
+    finally:
+        _Handler.failures_left = 0
+        client.close()
+
+
+def test_stream_releases_connection(server_url):
+    client = HttpClient()
+    try:
+        with client.stream("GET", f"{server_url}/audio") as response:
+            assert b"".join(response.iter_content(chunk_size=4)) == b"audio-bytes"
+        client.get(f"{server_url}/audio")
+        assert client.stats()["127.0.0.1"].connections == 1
+    finally:
+        client.close()
+
+
+def test_pool_stats_ratios():
+    stats = HttpPoolStats(requests=10, connections=2, connect_time=0.5)
+    assert stats.reuse_ratio == pytest.approx(0.8)
+    assert stats.average_connect_time == pytest.approx(0.25)
+    assert HttpPoolStats().as_dict()["reuse_ratio"] == 0.0
+
+
+def test_shared_client_is_a_singleton():
+    assert get_http_client() is get_http_client()
+
+
+def test_sse_parser_handles_split_and_multiline_events():
+    chunks = [
+        b'data: {"a"',
+        b":1}\n\nda",
+        b"ta: x\r\ndata: y\r\n\r\n: comment\nevent: done\n",
+        b"data: [DONE]",
+    ]
+    assert list(iter_sse_data(chunks)) == [b'{"a":1}', b"x\ny", b"[DONE]"]
@@ -16,6 +16,7 @@ from RealtimeTTS.engines.inflect_engine import (
     _load_upstream_module,
     _module_is_below,
 )
+from RealtimeTTS.engines.utterance_pieces import PieceLimits
 
 
 class FakeInflectRuntime:
@@ -257,6 +258,25 @@ def test_stop_during_generation_discards_waveform(engine_factory, fake_runtime):
     assert engine.audio_duration == 0
 
 
+def test_long_sentences_are_synthesized_in_pieces(engine_factory, fake_runtime, monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyaudio", SimpleNamespace(paInt16=8))
+    fake_runtime.waveform = np.full(2400, 0.5, dtype=np.float32)
+    engine = engine_factory(piece_limits=PieceLimits(lead_chars=20, max_chars=40, min_chars=8))
+    text = "When the rain stops, we walk down to the harbour and watch the boats."
+
+    pieces = engine.split_into_pieces(text)
+    assert engine.whole_utterance_only is True
+    assert pieces == ["When the rain stops,", "we walk down to the harbour and watch", "the boats."]
+    assert engine.synthesize_pieces(pieces) is True
+
+    assert [call["text"] for call in fake_runtime.calls] == pieces
+    audio = b"".join(engine.queue.get_nowait() for _ in range(engine.queue.qsize()))
+    overlap = 24_000 * 20 // 1000
+    assert len(audio) // 2 == 3 * 2400 - 2 * overlap
+
+    assert engine_factory(piece_limits=None).split_into_pieces(text) == [text]
+
+
 def test_empty_text_is_success_without_model_call(engine_factory, fake_runtime):
     engine = engine_factory()
 
@@ -390,18 +410,19 @@ def test_auto_backend_uses_pytorch_cpu_when_onnx_is_not_installed(monkeypatch):
     )
 
 
-def test_onnx_runtime_uses_tuned_session_options(tmp_path):
-    sessions = []
-
+def _fake_onnx_entry_module(sessions, provider="CPUExecutionProvider"):
     class FakeSessionOptions:
         pass
 
     class FakeOrt:
+        __version__ = "1.0-test"
+
         class ExecutionMode:
             ORT_SEQUENTIAL = "sequential"
 
         class GraphOptimizationLevel:
             ORT_ENABLE_ALL = "all"
+            ORT_DISABLE_ALL = "disabled"
 
         SessionOptions = FakeSessionOptions
 
@@ -411,24 +432,42 @@ def test_onnx_runtime_uses_tuned_session_options(tmp_path):
                 path=path,
                 options=sess_options,
                 providers=providers,
+                optimization_level=sess_options.graph_optimization_level,
             )
+            optimized_path = getattr(sess_options, "optimized_model_filepath", None)
+            if optimized_path:
+                Path(optimized_path).write_bytes(b"optimized " + Path(path).read_bytes())
             sessions.append(session)
             return session
 
     class FakeInflectONNX:
         pass
 
-    entry_module = SimpleNamespace(
+    return SimpleNamespace(
         ort=FakeOrt,
         InflectONNX=FakeInflectONNX,
-        available_provider=lambda name: "CPUExecutionProvider",
+        available_provider=lambda name: provider,
     )
+
+
+def _bare_onnx_engine(tmp_path, **attributes):
     engine = object.__new__(InflectEngine)
     engine.device = "cpu"
     engine.cpu_threads = 8
     engine.model_dir = tmp_path
+    engine.verify_files = False
+    engine.cache_optimized_model = False
+    engine.onnx_cache_dir = None
+    for name, value in attributes.items():
+        setattr(engine, name, value)
+    return engine
+
+
+def test_onnx_runtime_uses_tuned_session_options(tmp_path):
+    sessions = []
+    engine = _bare_onnx_engine(tmp_path)
 
-    runtime = engine._create_onnx_runtime(entry_module)
+    runtime = engine._create_onnx_runtime(_fake_onnx_entry_module(sessions))
 
     assert runtime.duration is sessions[0]
     assert runtime.decode is sessions[1]
@@ -436,14 +475,63 @@ def test_onnx_runtime_uses_tuned_session_options(tmp_path):
         "duration.onnx",
         "decode.onnx",
     ]
-    assert sessions[0].options is sessions[1].options
+    assert sessions[0].options is not sessions[1].options
     assert sessions[0].options.intra_op_num_threads == 8
     assert sessions[0].options.inter_op_num_threads == 1
     assert sessions[0].options.execution_mode == "sequential"
     assert sessions[0].options.graph_optimization_level == "all"
+    assert sessions[0].options.enable_cpu_mem_arena is True
+    assert sessions[0].options.enable_mem_pattern is False
     assert sessions[0].providers == ["CPUExecutionProvider"]
 
 
+def test_onnx_optimized_models_are_cached(tmp_path):
+    model_dir = tmp_path / "model"
+    (model_dir / "onnx").mkdir(parents=True)
+    (model_dir / "onnx" / "duration.onnx").write_bytes(b"duration")
+    (model_dir / "onnx" / "decode.onnx").write_bytes(b"decode")
+    cache_dir = tmp_path / "cache"
+    sessions = []
+    engine = _bare_onnx_engine(
+        model_dir, cache_optimized_model=True, onnx_cache_dir=str(cache_dir)
+    )
+
+    engine._create_onnx_runtime(_fake_onnx_entry_module(sessions))
+    cached = sorted(cache_dir.iterdir())
+    assert [path.name.split("-")[0] for path in cached] == ["decode", "duration"]
+    assert all(path.suffix == ".onnx" for path in cached)
+    assert [session.optimization_level for session in sessions] == ["all", "all"]
+
+    # The next start loads the stored graphs without optimizing again.
+    engine._create_onnx_runtime(_fake_onnx_entry_module(sessions))
+    assert [Path(session.path) for session in sessions[2:]] == [cached[1], cached[0]]
+    assert [session.optimization_level for session in sessions[2:]] == ["disabled", "disabled"]
+
+    # Changed model content misses the cache.
+    (model_dir / "onnx" / "decode.onnx").write_bytes(b"decode v2")
+    engine._create_onnx_runtime(_fake_onnx_entry_module(sessions))
+    assert Path(sessions[-1].path) == model_dir / "onnx" / "decode.onnx"
+    assert len(list(cache_dir.glob("decode-*.onnx"))) == 2
+
+
+def test_onnx_cache_is_skipped_for_gpu_providers(tmp_path):
+    (tmp_path / "onnx").mkdir()
+    sessions = []
+    engine = _bare_onnx_engine(
+        tmp_path,
+        device="cuda",
+        cache_optimized_model=True,
+        onnx_cache_dir=str(tmp_path / "cache"),
+    )
+
+    engine._create_onnx_runtime(
+        _fake_onnx_entry_module(sessions, provider="CUDAExecutionProvider")
+    )
+
+    assert sessions[0].providers == ["CUDAExecutionProvider", "CPUExecutionProvider"]
+    assert not (tmp_path / "cache").exists()
+
+
 def test_shutdown_releases_runtime(engine_factory):
     engine = engine_factory()
 
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from RealtimeTTS.engines.base_engine import BaseEngine
+from RealtimeTTS.engines.kokoro_batch import pack_sentences, split_packed_output
+
+
+def test_pack_sentences_respects_length_and_unpackable_sentences():
+    phonemes = ["a" * 200, "b" * 200, "c" * 200, None, "d" * 10, "", "e" * 10]
+
+    assert pack_sentences(phonemes, max_phonemes=510) == [[0, 1], [2], [3], [4], [5], [6]]
+    assert pack_sentences(["ab", "cd", "ef"], max_phonemes=5) == [[0, 1], [2]]
+
+
+def test_split_cuts_in_the_middle_of_the_separator():
+    # start id, 2 ids sentence A, separator, 3 ids sentence B, end id
+    durations = np.array([2, 3, 3, 4, 1, 1, 1, 2])
+    audio = np.arange(durations.sum() * 10, dtype=np.float32)
+
+    (first_audio, first_durations), (second_audio, second_durations) = split_packed_output(
+        audio, durations, [2, 3]
+    )
+
+    # separator spans frames 8..12, the cut is at frame 10
+    assert len(first_audio) == 100 and first_audio[0] == 0
+    assert len(second_audio) == len(audio) - 100 and second_audio[0] == 100
+    assert first_durations.tolist() == [2, 3, 3, 2]
+    assert second_durations.tolist() == [2, 1, 1, 1, 2]
+    assert first_durations.sum() + second_durations.sum() == durations.sum()
+
+
+def test_split_without_separator_ids():
+    durations = np.array([1, 2, 2, 1])
+    audio = np.zeros(60, dtype=np.float32)
+
+    parts = split_packed_output(audio, durations, [1, 1], separator_ids=0)
+
+    assert [len(part) for part, _ in parts] == [30, 30]
+    assert [d.tolist() for _, d in parts] == [[1, 2, 0], [0, 2, 1]]
+
+
+class SequentialEngine(BaseEngine):
+    def __init__(self):
+        self.calls = []
+
+    def get_stream_info(self):
+        return 8, 1, 24000
+
+    def synthesize(self, text, sentence_count=0):
+        super().synthesize(text, sentence_count)
+        self.calls.append((text, sentence_count))
+        return text != "fail"
+
+
+def test_default_synthesize_batch_runs_sentences_in_order():
+    engine = SequentialEngine()
+    results = engine.synthesize_batch(["one", "fail", "three"], sentence_count=4)
+
+    assert engine.calls == []  # nothing runs before the first result is requested
+    assert list(results) == [True, False, True]
+    assert engine.calls == [("one", 5), ("fail", 6), ("three", 7)]
+    assert engine.can_batch is False
+
+
+@pytest.mark.parametrize("count", [1, 3])
+def test_packed_split_covers_whole_audio(count):
+    # start id, sentences of one id separated by one id, end id
+    durations = np.array([1] + [2, 1] * (count - 1) + [2, 1])
+    audio = np.ones(int(durations.sum()) * 600, dtype=np.float32)
+
+    parts = split_packed_output(audio, durations, [1] * count)
+
+    assert len(parts) == count
+    assert sum(len(part) for part, _ in parts) == len(audio)
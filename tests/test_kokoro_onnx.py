@@ -0,0 +1,104 @@
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from RealtimeTTS.engines.kokoro_onnx import KokoroOnnxModel
+
+
+class FakeSession:
+    def __init__(self, path, *, sess_options, providers, ids_name="input_ids", outputs=("waveform", "durations")):
+        self.path = path
+        self.options = sess_options
+        self.providers = providers
+        self.ids_name = ids_name
+        self.output_names = outputs
+        self.feeds = []
+
+    def get_inputs(self):
+        return [SimpleNamespace(name=name) for name in (self.ids_name, "style", "speed")]
+
+    def get_outputs(self):
+        return [SimpleNamespace(name=name) for name in self.output_names]
+
+    def run(self, output_names, feeds):
+        self.feeds.append(feeds)
+        ids = feeds[self.ids_name]
+        results = {
+            "waveform": np.ones((1, 600 * ids.shape[1]), dtype=np.float32),
+            "durations": np.full((1, ids.shape[1]), 2, dtype=np.int64),
+        }
+        return [results[name] for name in self.output_names]
+
+
+@pytest.fixture
+def fake_ort(monkeypatch):
+    sessions = []
+
+    def InferenceSession(path, **kwargs):
+        session = FakeSession(path, **kwargs)
+        sessions.append(session)
+        return session
+
+    module = SimpleNamespace(
+        SessionOptions=SimpleNamespace,
+        ExecutionMode=SimpleNamespace(ORT_SEQUENTIAL="sequential"),
+        GraphOptimizationLevel=SimpleNamespace(ORT_ENABLE_ALL="all"),
+        InferenceSession=InferenceSession,
+    )
+    monkeypatch.setitem(sys.modules, "onnxruntime", module)
+    return sessions
+
+
+VOCAB = {"h": 1, "ə": 2, "l": 3, "o": 4, " ": 5}
+
+
+def test_session_uses_tuned_options(fake_ort):
+    KokoroOnnxModel(model_path="kokoro.onnx", vocab=VOCAB, threads=3)
+
+    options = fake_ort[0].options
+    assert fake_ort[0].path == "kokoro.onnx"
+    assert options.intra_op_num_threads == 3
+    assert options.inter_op_num_threads == 1
+    assert options.execution_mode == "sequential"
+    assert options.graph_optimization_level == "all"
+    assert fake_ort[0].providers == ["CPUExecutionProvider"]
+
+
+def test_encode_pads_and_skips_unknown_phonemes(fake_ort):
+    model = KokoroOnnxModel(model_path="kokoro.onnx", vocab=VOCAB)
+
+    assert model.encode("həlo?").tolist() == [[0, 1, 2, 3, 4, 0]]
+
+
+def test_infer_selects_style_by_phoneme_count(fake_ort):
+    model = KokoroOnnxModel(model_path="kokoro.onnx", vocab=VOCAB)
+    voice_pack = np.arange(510 * 256, dtype=np.float32).reshape(510, 1, 256)
+
+    audio, durations = model.infer("həlo", voice_pack, speed=1.2)
+
+    feeds = fake_ort[0].feeds[0]
+    assert feeds["style"].shape == (1, 256)
+    assert feeds["style"][0, 0] == voice_pack[3, 0, 0]
+    assert feeds["speed"].dtype == np.float32 and feeds["speed"][0] == pytest.approx(1.2)
+    assert audio.dtype == np.float32 and audio.shape == (600 * 6,)
+    assert durations.tolist() == [2] * 6
+    assert model.returns_durations
+
+
+def test_export_without_durations(fake_ort, monkeypatch):
+    def InferenceSession(path, **kwargs):
+        session = FakeSession(path, ids_name="tokens", outputs=("audio",), **kwargs)
+        fake_ort.append(session)
+        return session
+
+    monkeypatch.setattr(sys.modules["onnxruntime"], "InferenceSession", InferenceSession)
+    model = KokoroOnnxModel(model_path="kokoro.onnx", vocab=VOCAB)
+    fake_ort[0].run = lambda names, feeds: [np.zeros((1, 1200), dtype=np.float32)]
+
+    audio, durations = model.infer("lo", np.zeros((510, 1, 256), dtype=np.float32))
+
+    assert audio.shape == (1200,)
+    assert durations is None
+    assert not model.returns_durations
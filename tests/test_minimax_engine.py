@@ -9,8 +9,10 @@ import json
 import queue
 import sys
 import importlib
+import threading
 import types
 import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch, MagicMock
 
 # --- Isolated import of minimax_engine to avoid heavy RealtimeTTS deps ---
@@ -30,6 +32,7 @@ def _import_minimax_engine():
         "RealtimeTTS",
         "RealtimeTTS.engines",
         "RealtimeTTS.engines.base_engine",
+        "RealtimeTTS.engines.http_client",
         "RealtimeTTS.engines.minimax_engine",
     ]
     saved_modules = {name: sys.modules.get(name) for name in module_names}
@@ -45,6 +48,7 @@ def _import_minimax_engine():
     if saved_modules["pyaudio"] is None:
         pyaudio_stub = types.ModuleType("pyaudio")
         pyaudio_stub.paCustomFormat = 8
+        pyaudio_stub.paInt16 = 16
         sys.modules["pyaudio"] = pyaudio_stub
 
     # Create a minimal base_engine module
@@ -89,6 +93,21 @@ def _import_minimax_engine():
     sys.modules["RealtimeTTS.engines"] = engines_pkg
     sys.modules["RealtimeTTS.engines.base_engine"] = base_engine_mod
 
+    # The shared HTTP client has no heavy dependencies, load the real module
+    http_spec = importlib.util.spec_from_file_location(
+        "RealtimeTTS.engines.http_client",
+        os.path.join(
+            os.path.dirname(__file__),
+            "..",
+            "RealtimeTTS",
+            "engines",
+            "http_client.py",
+        ),
+    )
+    http_mod = importlib.util.module_from_spec(http_spec)
+    sys.modules["RealtimeTTS.engines.http_client"] = http_mod
+    http_spec.loader.exec_module(http_mod)
+
     # Now load the minimax engine
     spec = importlib.util.spec_from_file_location(
         "RealtimeTTS.engines.minimax_engine",
@@ -111,10 +130,10 @@ def _import_minimax_engine():
             else:
                 sys.modules[name] = saved
 
-    return mod.MiniMaxEngine, mod.MiniMaxVoice, mod
+    return mod.MiniMaxEngine, mod.MiniMaxVoice, mod, http_mod
 
 
-MiniMaxEngine, MiniMaxVoice, _MINIMAX_MODULE = _import_minimax_engine()
+MiniMaxEngine, MiniMaxVoice, _MINIMAX_MODULE, _HTTP_MODULE = _import_minimax_engine()
 
 
 # --- Fixtures ---
@@ -337,7 +356,7 @@ class TestMiniMaxSynthesize:
         }
         return mock_resp
 
-    @patch.object(_MINIMAX_MODULE.requests, "post")
+    @patch.object(_HTTP_MODULE.HttpClient, "post")
     def test_synthesize_success(self, mock_post, engine):
         """Test successful synthesis."""
         audio_hex = "ff" * 100
@@ -350,7 +369,7 @@ class TestMiniMaxSynthesize:
         audio_data = engine.queue.get()
         assert len(audio_data) == 100
 
-    @patch.object(_MINIMAX_MODULE.requests, "post")
+    @patch.object(_HTTP_MODULE.HttpClient, "post")
     def test_synthesize_sends_correct_payload(self, mock_post, engine):
         """Test that synthesize sends the correct API payload."""
         mock_post.return_value = self._make_success_response()
@@ -369,7 +388,7 @@ class TestMiniMaxSynthesize:
         assert payload["voice_setting"]["pitch"] == 0
         assert payload["audio_setting"]["format"] == "mp3"
 
-    @patch.object(_MINIMAX_MODULE.requests, "post")
+    @patch.object(_HTTP_MODULE.HttpClient, "post")
     def test_synthesize_sends_auth_header(self, mock_post, engine):
         """Test that synthesize includes authorization header."""
         mock_post.return_value = self._make_success_response()
@@ -381,7 +400,7 @@ class TestMiniMaxSynthesize:
         assert headers["Authorization"] == "Bearer test-api-key-123"
         assert headers["Content-Type"] == "application/json"
 
-    @patch.object(_MINIMAX_MODULE.requests, "post")
+    @patch.object(_HTTP_MODULE.HttpClient, "post")
     def test_synthesize_api_error(self, mock_post, engine):
         """Test handling of API error response."""
         mock_post.return_value = self._make_error_response(1000, "Invalid API key")
@@ -391,7 +410,7 @@ class TestMiniMaxSynthesize:
         assert result is False
         assert engine.queue.empty()
 
-    @patch.object(_MINIMAX_MODULE.requests, "post")
+    @patch.object(_HTTP_MODULE.HttpClient, "post")
     def test_synthesize_empty_audio(self, mock_post, engine):
         """Test handling of empty audio response."""
         mock_post.return_value = self._make_success_response("")
@@ -401,7 +420,7 @@ class TestMiniMaxSynthesize:
         assert result is False
         assert engine.queue.empty()
 
-    @patch.object(_MINIMAX_MODULE.requests, "post")
+    @patch.object(_HTTP_MODULE.HttpClient, "post")
     def test_synthesize_request_exception(self, mock_post, engine):
         """Test handling of network request failure."""
         import requests as req
@@ -413,7 +432,7 @@ class TestMiniMaxSynthesize:
         assert result is False
         assert engine.queue.empty()
 
-    @patch.object(_MINIMAX_MODULE.requests, "post")
+    @patch.object(_HTTP_MODULE.HttpClient, "post")
     def test_synthesize_invalid_hex(self, mock_post, engine):
         """Test handling of invalid hex audio data."""
         mock_resp = MagicMock()
@@ -428,7 +447,7 @@ class TestMiniMaxSynthesize:
 
         assert result is False
 
-    @patch.object(_MINIMAX_MODULE.requests, "post")
+    @patch.object(_HTTP_MODULE.HttpClient, "post")
     def test_synthesize_stop_event(self, mock_post, engine):
         """Test that synthesis respects stop event."""
         mock_post.return_value = self._make_success_response("ff" * 50)
@@ -438,7 +457,7 @@ class TestMiniMaxSynthesize:
 
         assert result is False
 
-    @patch.object(_MINIMAX_MODULE.requests, "post")
+    @patch.object(_HTTP_MODULE.HttpClient, "post")
     def test_synthesize_with_turbo_model(self, mock_post, engine):
         """Test synthesis with turbo model."""
         engine.model = "speech-2.8-turbo"
@@ -450,7 +469,7 @@ class TestMiniMaxSynthesize:
         payload = mock_post.call_args.kwargs.get("json") or mock_post.call_args[1].get("json")
         assert payload["model"] == "speech-2.8-turbo"
 
-    @patch.object(_MINIMAX_MODULE.requests, "post")
+    @patch.object(_HTTP_MODULE.HttpClient, "post")
     def test_synthesize_custom_voice_params(self, mock_post, engine):
         """Test synthesis with custom voice parameters."""
         engine.speed = 1.5
@@ -465,7 +484,7 @@ class TestMiniMaxSynthesize:
         assert payload["voice_setting"]["vol"] == 0.8
         assert payload["voice_setting"]["pitch"] == -3
 
-    @patch.object(_MINIMAX_MODULE.requests, "post")
+    @patch.object(_HTTP_MODULE.HttpClient, "post")
     def test_synthesize_http_error(self, mock_post, engine):
         """Test handling of HTTP error status."""
         import requests as req
@@ -478,7 +497,7 @@ class TestMiniMaxSynthesize:
 
         assert result is False
 
-    @patch.object(_MINIMAX_MODULE.requests, "post")
+    @patch.object(_HTTP_MODULE.HttpClient, "post")
     def test_synthesize_timeout(self, mock_post, engine):
         """Test handling of request timeout."""
         import requests as req
@@ -490,6 +509,157 @@ class TestMiniMaxSynthesize:
         assert result is False
 
 
+# --- Unit Tests: Streaming ---
+
+
+class _MockStreamHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the MiniMax SSE endpoint."""
+
+    protocol_version = "HTTP/1.1"
+    events = []
+    requests = []
+    # When set, answered as a plain JSON body instead of an event stream.
+    json_body = None
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        type(self).requests.append(json.loads(self.rfile.read(length)))
+        self.send_response(200)
+        if type(self).json_body is not None:
+            body = json.dumps(type(self).json_body).encode("utf-8")
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for event in type(self).events:
+            body = f"data: {json.dumps(event)}\n\n".encode("utf-8")
+            # Split every event over two network chunks.
+            for part in (body[:7], body[7:]):
+                self.wfile.write(f"{len(part):x}\r\n".encode() + part + b"\r\n")
+                self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def mock_stream_server():
+    _MockStreamHandler.requests = []
+    _MockStreamHandler.json_body = None
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _MockStreamHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    try:
+        yield f"http://{host}:{port}/v1/t2a_v2"
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=5)
+
+
+def _audio_event(audio_hex, status=1):
+    return {
+        "data": {"audio": audio_hex, "status": status},
+        "base_resp": {"status_code": 0, "status_msg": "success"},
+    }
+
+
+class TestMiniMaxStreaming:
+    def test_pcm_stream_info(self, mock_env_key):
+        eng = MiniMaxEngine(audio_format="pcm", sample_rate=24000)
+        assert eng.get_stream_info() == (
+            _MINIMAX_MODULE.pyaudio.paInt16,
+            1,
+            24000,
+        )
+
+    def test_rejects_unknown_audio_format(self, mock_env_key):
+        with pytest.raises(ValueError, match="audio_format"):
+            MiniMaxEngine(audio_format="wav")
+
+    def test_streaming_queues_each_event(self, engine, mock_stream_server):
+        _MockStreamHandler.events = [
+            _audio_event("0102"),
+            _audio_event("030405"),
+            _audio_event("010203040506", status=2),
+        ]
+        engine.base_url = mock_stream_server
+        engine.streaming = True
+
+        assert engine.synthesize("Hello") is True
+
+        chunks = []
+        while not engine.queue.empty():
+            chunks.append(engine.queue.get_nowait())
+        # The aggregated final event is not queued a second time.
+        assert chunks == [b"\x01\x02", b"\x03\x04\x05"]
+
+        payload = _MockStreamHandler.requests[-1]
+        assert payload["stream"] is True
+        assert payload["stream_options"] == {"exclude_aggregated_audio": True}
+
+    def test_streaming_pcm_keeps_sample_alignment(self, mock_env_key, mock_stream_server):
+        eng = MiniMaxEngine(streaming=True, audio_format="pcm", sample_rate=16000)
+        eng.queue = queue.Queue()
+        eng.audio_duration = 0
+        eng.stop_synthesis_event = MagicMock()
+        eng.stop_synthesis_event.is_set.return_value = False
+        eng.base_url = mock_stream_server
+        _MockStreamHandler.events = [_audio_event("010203"), _audio_event("04")]
+
+        assert eng.synthesize("Hello") is True
+
+        assert eng.queue.get_nowait() == b"\x01\x02"
+        assert eng.queue.get_nowait() == b"\x03\x04"
+        assert eng.audio_duration == pytest.approx(2 / 16000)
+        assert _MockStreamHandler.requests[-1]["audio_setting"] == {
+            "format": "pcm",
+            "sample_rate": 16000,
+        }
+
+    def test_streaming_api_error_event(self, engine, mock_stream_server):
+        _MockStreamHandler.events = [
+            {"base_resp": {"status_code": 1004, "status_msg": "auth failed"}},
+        ]
+        engine.base_url = mock_stream_server
+        engine.streaming = True
+
+        assert engine.synthesize("Hello") is False
+        assert engine.queue.empty()
+
+    def test_streaming_json_body_is_queued_as_complete_audio(self, engine, mock_stream_server):
+        _MockStreamHandler.json_body = _audio_event("0a0b0c", status=2)
+        engine.base_url = mock_stream_server
+        engine.streaming = True
+
+        assert engine.synthesize("Hello") is True
+        assert engine.queue.get_nowait() == b"\x0a\x0b\x0c"
+        assert engine.queue.empty()
+
+    def test_streaming_json_error_body(self, engine, mock_stream_server):
+        _MockStreamHandler.json_body = {"base_resp": {"status_code": 2013, "status_msg": "invalid params"}}
+        engine.base_url = mock_stream_server
+        engine.streaming = True
+
+        assert engine.synthesize("Hello") is False
+        assert engine.queue.empty()
+
+    def test_streaming_stop_event(self, engine, mock_stream_server):
+        _MockStreamHandler.events = [_audio_event("0102")]
+        engine.base_url = mock_stream_server
+        engine.streaming = True
+        engine.stop_synthesis_event.is_set.return_value = True
+
+        assert engine.synthesize("Hello") is False
+        assert engine.queue.empty()
+
+
 # --- Unit Tests: Shutdown ---
 
 
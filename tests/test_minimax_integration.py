@@ -34,6 +34,7 @@ def _import_minimax_engine():
         "RealtimeTTS",
         "RealtimeTTS.engines",
         "RealtimeTTS.engines.base_engine",
+        "RealtimeTTS.engines.http_client",
         "RealtimeTTS.engines.minimax_engine",
     ]
     saved_modules = {name: sys.modules.get(name) for name in module_names}
@@ -79,6 +80,20 @@ def _import_minimax_engine():
     sys.modules["RealtimeTTS.engines"] = engines_pkg
     sys.modules["RealtimeTTS.engines.base_engine"] = base_engine_mod
 
+    http_spec = importlib.util.spec_from_file_location(
+        "RealtimeTTS.engines.http_client",
+        os.path.join(
+            os.path.dirname(__file__),
+            "..",
+            "RealtimeTTS",
+            "engines",
+            "http_client.py",
+        ),
+    )
+    http_mod = importlib.util.module_from_spec(http_spec)
+    sys.modules["RealtimeTTS.engines.http_client"] = http_mod
+    http_spec.loader.exec_module(http_mod)
+
     spec = importlib.util.spec_from_file_location(
         "RealtimeTTS.engines.minimax_engine",
         os.path.join(
@@ -0,0 +1,172 @@
+import importlib
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+
+class _Response:
+    def __init__(self, payload=None, content=b""):
+        self._payload = payload
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+class _FakeModelsLabApi:
+    """Answers every job with processing once, then success after a delay."""
+
+    def __init__(self, job_seconds=0.2):
+        self.job_seconds = job_seconds
+        self.lock = threading.Lock()
+        self.submitted = []
+        self.started = {}
+        self.polls = 0
+
+    def post(self, url, json=None, timeout=None):
+        with self.lock:
+            job_id = len(self.submitted)
+            self.submitted.append(json["prompt"])
+            self.started[job_id] = time.monotonic()
+        return _Response(
+            {"status": "processing", "fetch_result": f"https://api/fetch/{job_id}"}
+        )
+
+    def get(self, url, timeout=None):
+        job_id = int(url.rsplit("/", 1)[1])
+        if url.startswith("https://api/fetch/"):
+            with self.lock:
+                self.polls += 1
+            if time.monotonic() - self.started[job_id] < self.job_seconds:
+                return _Response({"status": "processing"})
+            return _Response(
+                {"status": "success", "output": [f"https://api/audio/{job_id}"]}
+            )
+        with self.lock:
+            prompt = self.submitted[job_id]
+        return _Response(content=prompt.encode())
+
+
+@pytest.fixture
+def modelslab_module(monkeypatch):
+    if "pyaudio" not in sys.modules:
+        fake_pyaudio = types.ModuleType("pyaudio")
+        fake_pyaudio.paInt16 = 8
+        fake_pyaudio.paCustomFormat = 65536
+        monkeypatch.setitem(sys.modules, "pyaudio", fake_pyaudio)
+
+    monkeypatch.delitem(
+        sys.modules, "RealtimeTTS.engines.modelslab_engine", raising=False
+    )
+    module = importlib.import_module("RealtimeTTS.engines.modelslab_engine")
+    yield module
+    sys.modules.pop("RealtimeTTS.engines.modelslab_engine", None)
+
+
+def _engine(module, api, **kwargs):
+    engine = module.ModelsLabEngine(
+        api_key="key", poll_interval=0.05, max_poll_interval=0.1, **kwargs
+    )
+    engine.http = api
+    return engine
+
+
+def _drain(engine):
+    chunks = []
+    while not engine.queue.empty():
+        chunks.append(engine.queue.get_nowait())
+    return chunks
+
+
+def test_prefetched_jobs_run_concurrently_and_release_in_order(modelslab_module):
+    api = _FakeModelsLabApi(job_seconds=0.3)
+    engine = _engine(modelslab_module, api, prefetch_sentences=3)
+    assert engine.can_prefetch is True
+
+    sentences = ["One.", "Two.", "Three."]
+    start = time.monotonic()
+    for sentence in sentences:
+        engine.prefetch(sentence)
+    for sentence in sentences:
+        assert engine.synthesize(sentence) is True
+    elapsed = time.monotonic() - start
+
+    assert _drain(engine) == [b"One.", b"Two.", b"Three."]
+    assert api.submitted == sentences
+    # Sequential processing would need at least 3 * 0.3 seconds.
+    assert elapsed < 0.8
+    engine.shutdown()
+
+
+def test_changed_voice_drops_stale_prefetch(modelslab_module):
+    api = _FakeModelsLabApi(job_seconds=0.0)
+    engine = _engine(modelslab_module, api)
+
+    engine.prefetch("Hello.")
+    engine.set_voice("james")
+    assert engine.synthesize("Hello.") is True
+
+    assert _drain(engine) == [b"Hello."]
+    assert len(api.submitted) == 2
+    assert not engine._prefetcher.has_pending()
+    engine.shutdown()
+
+
+def test_prefetch_can_be_disabled(modelslab_module):
+    api = _FakeModelsLabApi(job_seconds=0.0)
+    engine = _engine(modelslab_module, api, prefetch_sentences=0)
+
+    assert engine.can_prefetch is False
+    assert engine.synthesize("Hi.") is True
+    assert _drain(engine) == [b"Hi."]
+    engine.shutdown()
+
+
+def test_poll_delays_grow_up_to_limit(modelslab_module):
+    engine = modelslab_module.ModelsLabEngine(
+        api_key="key", poll_interval=0.2, max_poll_interval=0.5
+    )
+    delays = engine._poll_delays()
+
+    assert [next(delays) for _ in range(5)] == pytest.approx(
+        [0.2, 0.3, 0.45, 0.5, 0.5]
+    )
+    engine.shutdown()
+
+
+def test_failed_job_returns_false(modelslab_module):
+    class FailingApi(_FakeModelsLabApi):
+        def get(self, url, timeout=None):
+            return _Response({"status": "error", "message": "quota"})
+
+    engine = _engine(modelslab_module, FailingApi())
+
+    assert engine.synthesize("Hi.") is False
+    assert _drain(engine) == []
+    engine.shutdown()
+
+
+def test_stop_does_not_cancel_jobs_of_the_next_play(modelslab_module):
+    api = _FakeModelsLabApi(job_seconds=0.3)
+    engine = _engine(modelslab_module, api)
+
+    engine.prefetch("Old.")
+    time.sleep(0.1)
+    engine.stop()
+    # the engine-wide stop event stays set until the next synthesize() ...
+    assert engine.stop_synthesis_event.is_set()
+
+    # ... but jobs prefetched for the next play() keep polling
+    engine.prefetch("New.")
+    time.sleep(0.1)
+    engine.stop_synthesis_event.clear()
+    assert engine.synthesize("New.") is True
+
+    assert _drain(engine) == [b"New."]
+    engine.shutdown()
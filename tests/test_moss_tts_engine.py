@@ -0,0 +1,168 @@
+import sys
+import threading
+import types
+
+import numpy as np
+import pytest
+
+from RealtimeTTS.engines.moss_tts_engine import MossTTSEngine
+
+
+class FakeCodecSession:
+    def __init__(self, runtime):
+        self.runtime = runtime
+        self.resets = 0
+        self.decoded = []
+
+    def reset(self):
+        self.resets += 1
+
+    def run_frames(self, frames):
+        self.decoded.append((len(frames), threading.current_thread()))
+        if self.runtime.decode_gate is not None:
+            self.runtime.decode_gate.wait(timeout=5)
+        if self.runtime.fail_decode:
+            raise RuntimeError("codec failed")
+        values = [frame[0] / 10 for frame in frames]
+        audio = np.array([[values + [0.0], [-value for value in values] + [0.0]]], dtype=np.float32)
+        return audio, len(values)
+
+
+class FakeOnnxTtsRuntime:
+    def __init__(self, **kwargs):
+        self.manifest = {"generation_defaults": {}}
+        self.codec_meta = {"codec_config": {"sample_rate": 8000, "channels": 2}}
+        self.codec_streaming_session = FakeCodecSession(self)
+        self.frames = 4
+        self.decode_gate = None
+        self.fail_decode = False
+        self.frame_log = []
+
+    def prepare_synthesis_text(self, text, **kwargs):
+        return {"text": text}
+
+    def resolve_prompt_audio_codes(self, voice, prompt_audio_path):
+        return None
+
+    def split_voice_clone_text(self, text, max_tokens):
+        return [chunk for chunk in text.split("|") if chunk]
+
+    def encode_text(self, text):
+        return text
+
+    def build_voice_clone_request_rows(self, prompt_audio_codes, text_ids):
+        return [text_ids]
+
+    def estimate_voice_clone_inter_chunk_pause_seconds(self, text):
+        return 0.001
+
+    def generate_audio_frames(self, request_rows, on_frame=None):
+        frames = []
+        for step in range(self.frames):
+            frame = [step + 1]
+            frames.append(frame)
+            self.frame_log.append(("generated", step))
+            if on_frame is not None:
+                on_frame(frames, step, frame)
+        return frames
+
+
+@pytest.fixture
+def moss_runtime(monkeypatch, tmp_path):
+    module = types.ModuleType("onnx_tts_runtime")
+    runtimes = []
+
+    def create(**kwargs):
+        runtimes.append(FakeOnnxTtsRuntime(**kwargs))
+        return runtimes[-1]
+
+    module.OnnxTtsRuntime = create
+    monkeypatch.setitem(sys.modules, "onnx_tts_runtime", module)
+
+    def make_engine(**kwargs):
+        engine = MossTTSEngine(output_dir=str(tmp_path), **kwargs)
+        return engine, runtimes[-1]
+
+    yield make_engine
+
+
+def _drain(engine):
+    chunks = []
+    while not engine.queue.empty():
+        chunks.append(engine.queue.get_nowait())
+    return chunks
+
+
+def test_pipelined_decode_matches_synchronous_audio(moss_runtime):
+    results = []
+    for pipeline in (False, True):
+        engine, runtime = moss_runtime(pipeline_codec_decode=pipeline, stream_decode_frames=3)
+        assert engine.synthesize("first|second")
+        results.append(_drain(engine))
+        engine.shutdown()
+
+    assert results[0] == results[1]
+    first = np.frombuffer(results[1][0], dtype=np.int16).reshape(-1, 2)
+    assert first[:, 0].tolist() == [3277, 6553, 9830]
+    assert first[:, 1].tolist() == [-3277, -6553, -9830]
+    # two blocks per text chunk with the pause in between
+    assert len(results[1]) == 5
+    assert runtime.codec_streaming_session.resets == 4
+
+
+def test_decode_runs_on_worker_while_generation_continues(moss_runtime):
+    engine, runtime = moss_runtime()
+    runtime.decode_gate = threading.Event()
+    original = runtime.generate_audio_frames
+
+    def generate_then_release(request_rows, on_frame=None):
+        frames = original(request_rows, on_frame=on_frame)
+        # all frames were generated while the first decode was still blocked
+        runtime.decode_gate.set()
+        return frames
+
+    runtime.generate_audio_frames = generate_then_release
+    assert engine.synthesize("hello")
+
+    assert [count for count, _ in runtime.codec_streaming_session.decoded] == [1, 1, 1, 1]
+    assert {thread for _, thread in runtime.codec_streaming_session.decoded} == {engine._decode_thread}
+    assert len(_drain(engine)) == 4
+
+    thread = engine._decode_thread
+    engine.shutdown()
+    assert not thread.is_alive()
+
+
+def test_decode_error_fails_the_sentence(moss_runtime):
+    engine, runtime = moss_runtime()
+    runtime.fail_decode = True
+
+    assert engine.synthesize("hello") is False
+    assert _drain(engine) == []
+
+    runtime.fail_decode = False
+    assert engine.synthesize("again")
+    assert len(_drain(engine)) == 4
+    engine.shutdown()
+
+
+def test_stop_skips_pending_decodes(moss_runtime):
+    engine, runtime = moss_runtime()
+    runtime.decode_gate = threading.Event()
+    original = runtime.generate_audio_frames
+
+    def generate_and_stop(request_rows, on_frame=None):
+        def stop_after_first(frames, step, frame):
+            on_frame(frames, step, frame)
+            if step == 1:
+                engine.stop_synthesis_event.set()
+                runtime.decode_gate.set()
+
+        return original(request_rows, on_frame=stop_after_first)
+
+    runtime.generate_audio_frames = generate_and_stop
+    assert engine.synthesize("hello")
+
+    assert len(runtime.codec_streaming_session.decoded) <= 2
+    assert runtime.codec_streaming_session.resets == 2
+    engine.shutdown()
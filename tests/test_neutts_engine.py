@@ -0,0 +1,140 @@
+import re
+import sys
+import types
+
+import numpy as np
+import pytest
+
+from RealtimeTTS.engines.conditioning_cache import ConditioningCache
+from RealtimeTTS.engines.neutts_engine import NeuTTSEngine, _OverlapAdd
+
+
+HOP = 4
+
+
+class FakeBackbone:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.resets = 0
+
+    def reset(self):
+        self.resets += 1
+
+    def __call__(self, prompt, stream=False, **kwargs):
+        for token in self.tokens:
+            yield {"choices": [{"text": "<|speech_%d|>" % token}]}
+
+
+class FakeNeuTTS:
+    encoded = []
+
+    def __init__(self, **kwargs):
+        self.sample_rate = 200
+        self.max_context = 2048
+        self.hop_length = HOP
+        self.streaming_overlap_frames = 1
+        self.streaming_frames_per_chunk = 25
+        self.streaming_lookforward = 5
+        self.streaming_lookback = 50
+        self.watermarker = None
+        self.backbone = FakeBackbone(list(range(100, 160)))
+
+    def encode_reference(self, path):
+        FakeNeuTTS.encoded.append(path)
+        return np.array([1, 2, 3])
+
+    def _ggml_prompt(self, ref_codes, ref_text, input_text):
+        return input_text
+
+    def _call_seed(self):
+        return 0
+
+    def _decode(self, codes):
+        # every code decodes to its own samples, independent of the context
+        ids = [int(value) for value in re.findall(r"<\|speech_(\d+)\|>", codes)]
+        return np.repeat(np.array(ids, dtype=np.float32) / 1000.0, HOP)
+
+
+@pytest.fixture
+def neutts(monkeypatch, tmp_path):
+    module = types.ModuleType("neutts")
+    module.NeuTTS = FakeNeuTTS
+    monkeypatch.setitem(sys.modules, "neutts", module)
+    FakeNeuTTS.encoded = []
+
+    voices = tmp_path / "voices"
+    voices.mkdir()
+    (voices / "demo.wav").write_bytes(b"RIFF demo")
+    (voices / "demo.txt").write_text("Demo transcript.", encoding="utf-8")
+
+    def make_engine(**kwargs):
+        # a fresh cache per engine, so references can only be shared on disk
+        return NeuTTSEngine(
+            backbone_repo="local-model.gguf",
+            voices_dir=str(voices),
+            conditioning_cache=ConditioningCache(cache_dir=tmp_path / "cache"),
+            **kwargs,
+        )
+
+    yield make_engine
+
+
+def _drain(engine):
+    chunks = []
+    while not engine.queue.empty():
+        chunks.append(np.frombuffer(engine.queue.get_nowait(), dtype=np.int16))
+    return chunks
+
+
+def test_overlap_add_joins_windows_of_changing_size():
+    signal = np.linspace(-0.5, 0.5, 40, dtype=np.float32)
+    overlap_add = _OverlapAdd()
+
+    parts = [
+        overlap_add.add(signal[0:8], 6),
+        overlap_add.add(signal[6:20], 12),
+        overlap_add.add(signal[18:24], 4),
+        overlap_add.add(signal[22:]),
+    ]
+
+    assert [part.size for part in parts] == [6, 12, 4, 18]
+    np.testing.assert_allclose(np.concatenate(parts), signal, atol=1e-6)
+
+
+def test_adaptive_stream_starts_small_widens_and_has_no_seams(neutts):
+    engine = neutts(streaming_initial_frames_per_chunk=4)
+
+    assert engine.synthesize("Hello there.")
+
+    chunks = _drain(engine)
+    sizes = [chunk.size // HOP for chunk in chunks]
+    assert sizes[0] == 4
+    assert max(sizes[:-1]) > 4
+    assert all(size <= 25 for size in sizes[:-1])
+    expected = (np.repeat(np.arange(100, 160, dtype=np.float32) / 1000.0, HOP) * 32767).astype(np.int16)
+    np.testing.assert_allclose(np.concatenate(chunks), expected, atol=1)
+
+
+def test_fixed_window_falls_back_to_infer_stream(neutts):
+    engine = neutts(adaptive_streaming=False)
+    engine._tts.infer_stream = lambda text, ref_codes, ref_text: iter([np.full(HOP, 0.5, dtype=np.float32)])
+
+    assert engine.synthesize("Hello there.")
+
+    assert [chunk.tolist() for chunk in _drain(engine)] == [[16383] * HOP]
+
+
+def test_stop_ends_the_stream(neutts):
+    engine = neutts()
+    engine.stop_synthesis_event.set()
+
+    assert engine._synthesize_streaming("Hello there.", [1, 2, 3], "Demo transcript.")
+    assert _drain(engine) == []
+
+
+def test_voices_dir_references_are_encoded_once(neutts):
+    first = neutts()
+    second = neutts()
+
+    assert FakeNeuTTS.encoded == [first.get_voices()[0].ref_audio_path]
+    assert second.get_voices()[0].ref_codes == [1, 2, 3]
@@ -0,0 +1,115 @@
+import importlib
+import sys
+import types
+
+import pytest
+
+
+class _StreamedResponse:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.closed = True
+
+    def iter_bytes(self):
+        yield from self.chunks
+
+
+@pytest.fixture
+def openai_module(monkeypatch):
+    calls = {"clients": [], "requests": [], "chunks": []}
+
+    class FakeOpenAI:
+        def __init__(self, api_key=None, base_url=None):
+            self.base_url = base_url
+            calls["clients"].append(self)
+
+            def create(**params):
+                calls["requests"].append(params)
+                return _StreamedResponse(list(calls["chunks"]))
+
+            self.audio = types.SimpleNamespace(
+                speech=types.SimpleNamespace(
+                    with_streaming_response=types.SimpleNamespace(create=create)
+                )
+            )
+
+    fake_openai = types.ModuleType("openai")
+    fake_openai.OpenAI = FakeOpenAI
+    monkeypatch.setitem(sys.modules, "openai", fake_openai)
+
+    if "pyaudio" not in sys.modules:
+        fake_pyaudio = types.ModuleType("pyaudio")
+        fake_pyaudio.paInt16 = 8
+        fake_pyaudio.paCustomFormat = 65536
+        monkeypatch.setitem(sys.modules, "pyaudio", fake_pyaudio)
+
+    monkeypatch.delitem(sys.modules, "RealtimeTTS.engines.openai_engine", raising=False)
+    module = importlib.import_module("RealtimeTTS.engines.openai_engine")
+    yield module, calls
+    sys.modules.pop("RealtimeTTS.engines.openai_engine", None)
+
+
+def _drain(engine):
+    chunks = []
+    while not engine.queue.empty():
+        chunks.append(engine.queue.get_nowait())
+    return chunks
+
+
+def test_pcm_chunks_are_coalesced_into_whole_sample_frames(openai_module):
+    module, calls = openai_module
+    # 10 ms at 8000 Hz is 160 bytes per frame.
+    engine = module.OpenAIEngine(
+        api_key="key", response_format="pcm", sample_rate=8000, chunk_duration_ms=10
+    )
+    calls["chunks"] = [b"\x01" * 51] * 7
+
+    assert engine.synthesize("Hello.") is True
+
+    frames = _drain(engine)
+    assert [len(frame) for frame in frames] == [204, 152]
+    assert b"".join(frames) == b"\x01" * 356
+    assert engine.audio_duration == pytest.approx(356 / 16000)
+    assert engine.get_stream_info()[1:] == (1, 8000)
+
+
+def test_pcm_without_coalescing_keeps_samples_whole(openai_module):
+    module, calls = openai_module
+    engine = module.OpenAIEngine(api_key="key", response_format="pcm", chunk_duration_ms=0)
+    calls["chunks"] = [b"\x01\x02\x03", b"\x04", b"\x05\x06"]
+
+    engine.synthesize("Hi.")
+
+    assert _drain(engine) == [b"\x01\x02", b"\x03\x04", b"\x05\x06"]
+
+
+def test_odd_single_byte_chunks_are_not_queued_empty(openai_module):
+    module, calls = openai_module
+    engine = module.OpenAIEngine(api_key="key", response_format="pcm", chunk_duration_ms=0)
+    calls["chunks"] = [b"\x01", b"\x02\x03", b"\x04"]
+
+    assert list(module._coalesce_pcm(iter([b"\x01"]), 1)) == []
+    engine.synthesize("Hi.")
+
+    assert _drain(engine) == [b"\x01\x02", b"\x03\x04"]
+
+
+def test_client_is_reused_and_mp3_passes_through(openai_module):
+    module, calls = openai_module
+    engine = module.OpenAIEngine(api_key="key", base_url="http://127.0.0.1:8000/v1")
+    calls["chunks"] = [b"ID3", b"mp3"]
+
+    engine.synthesize("One.")
+    engine.synthesize("Two.")
+
+    assert len(calls["clients"]) == 1
+    assert calls["clients"][0].base_url == "http://127.0.0.1:8000/v1"
+    assert [request["input"] for request in calls["requests"]] == ["One.", "Two."]
+    assert "instructions" not in calls["requests"][0]
+    assert _drain(engine) == [b"ID3", b"mp3", b"ID3", b"mp3"]
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from RealtimeTTS.engines import orpheus_decoder
+from RealtimeTTS.engines.orpheus_decoder import (
+    SnacFrameRing,
+    SnacWindowDecoder,
+    assemble_codes,
+    frame_gather_index,
+)
+
+
+def legacy_assemble(frame):
+    codes_0, codes_1, codes_2 = [], [], []
+    for j in range(len(frame) // 7):
+        i = 7 * j
+        codes_0.append(frame[i])
+        codes_1 += [frame[i + 1], frame[i + 4]]
+        codes_2 += [frame[i + 2], frame[i + 3], frame[i + 5], frame[i + 6]]
+    return codes_0, codes_1, codes_2
+
+
+def test_assemble_codes_matches_per_token_layout():
+    tokens = list(range(1, 31))  # four frames and two trailing tokens
+
+    codes = assemble_codes(tokens)
+
+    assert [level.tolist() for level in codes] == [list(level) for level in legacy_assemble(tokens)]
+    assert all(level.dtype == np.int32 for level in codes)
+    assert np.concatenate(codes).tolist() == np.asarray(tokens)[frame_gather_index(4)].tolist()
+
+
+def test_ring_keeps_latest_window_contiguous():
+    ring = SnacFrameRing(frames=2)
+    completed = [ring.push(token) for token in range(1, 31)]
+
+    assert completed.count(True) == 4
+    assert ring.full
+    window = ring.window()
+    assert window.tolist() == list(range(17, 31))
+    assert window.base is not None  # a view, not a copy
+
+    ring.reset()
+    assert not ring.full
+
+
+class FakeSnac:
+    def __init__(self, torch):
+        self.torch = torch
+        self.calls = []
+
+    def decode(self, codes):
+        self.calls.append([level.clone() for level in codes])
+        samples = codes[2].shape[1] * 512
+        return self.torch.full((1, 1, samples), 0.5)
+
+
+@pytest.fixture
+def fake_snac(monkeypatch):
+    torch = pytest.importorskip("torch")
+    model = FakeSnac(torch)
+    monkeypatch.setattr(orpheus_decoder, "_model", model)
+    monkeypatch.setattr(orpheus_decoder, "_device", "cpu")
+    return model
+
+
+def test_window_decoder_decodes_each_new_frame(fake_snac):
+    decoder = SnacWindowDecoder()
+    chunks = [chunk for chunk in map(decoder.push, range(1, 43)) if chunk is not None]
+
+    assert len(chunks) == 3  # frames four, five and six
+    assert all(len(chunk) == 2048 * 2 for chunk in chunks)
+    first = fake_snac.calls[0]
+    assert [level.tolist() for level in first] == [
+        [list(level)] for level in legacy_assemble(list(range(1, 29)))
+    ]
+    last = fake_snac.calls[-1]
+    assert last[0].tolist() == [[15, 22, 29, 36]]
+
+
+def test_window_decoder_rejects_out_of_range_codes(fake_snac):
+    decoder = SnacWindowDecoder()
+
+    assert decoder.decode([5000] + [1] * 27) is None
+    assert fake_snac.calls == []
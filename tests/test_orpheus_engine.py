@@ -0,0 +1,160 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from RealtimeTTS.engines.orpheus_engine import OrpheusEngine
+
+
+def custom_tokens(ids):
+    return [f"<custom_token_{token + 10 + (index % 7) * 4096}>" for index, token in enumerate(ids)]
+
+
+class CompletionServer:
+    """Local stand-in for an LM Studio / llama.cpp completions endpoint."""
+
+    def __init__(self):
+        self.requests = []
+        self.arrived = {}
+        self.hold = {}
+        self.tokens = {}
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length))
+                text = payload["prompt"].split(": ", 1)[1].split("<|eot_id|>")[0]
+                server.requests.append((text, self.client_address))
+                server.arrived.setdefault(text, threading.Event()).set()
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+
+                body = b"".join(
+                    b"data: " + json.dumps({"choices": [{"text": token}]}).encode() + b"\n\n"
+                    for token in server.tokens.get(text, [])
+                ) + b"data: [DONE]\n\n"
+                middle = len(body) // 2
+                # Odd-sized writes so events are split across chunks
+                try:
+                    for start in range(0, len(body), 37):
+                        if start <= middle < start + 37 and text in server.hold:
+                            server.hold[text].wait(timeout=5)
+                        self._chunk(body[start:start + 37])
+                    self._chunk(b"")
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # the client dropped a stale completion
+
+            def _chunk(self, data):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}/v1/completions"
+
+
+@pytest.fixture
+def completion_server():
+    server = CompletionServer()
+    server.thread.start()
+    try:
+        yield server
+    finally:
+        server.httpd.shutdown()
+        server.httpd.server_close()
+        server.thread.join(timeout=5)
+
+
+class FakeSnacDecoder:
+    def __init__(self):
+        self.tokens = []
+        self.resets = 0
+
+    def reset(self):
+        self.resets += 1
+
+    def push(self, token):
+        self.tokens.append(token)
+        if len(self.tokens) % 7 == 0:
+            return bytes([len(self.tokens) // 7])
+        return None
+
+
+@pytest.fixture
+def engine(completion_server):
+    engine = OrpheusEngine(api_url=completion_server.url)
+    engine._snac_decoder = FakeSnacDecoder()
+    yield engine
+    engine.shutdown()
+
+
+def drain(engine):
+    chunks = []
+    while not engine.queue.empty():
+        chunks.append(engine.queue.get_nowait())
+    return chunks
+
+
+def test_streams_token_ids_through_the_decoder(engine, completion_server):
+    ids = list(range(1, 15))
+    completion_server.tokens["Hello."] = ["<|audio|>"] + custom_tokens(ids)
+
+    assert engine.synthesize("Hello.")
+
+    assert engine._snac_decoder.tokens == ids
+    assert drain(engine) == [b"\x01", b"\x02"]
+    assert engine.can_prefetch
+
+
+def test_next_completion_starts_while_current_sentence_decodes(engine, completion_server):
+    completion_server.tokens = {"One.": custom_tokens(range(1, 8)), "Two.": custom_tokens(range(8, 15))}
+    # The first stream pauses halfway until the second request has arrived.
+    completion_server.hold["One."] = completion_server.arrived.setdefault("Two.", threading.Event())
+
+    engine.prefetch("One.")
+    engine.prefetch("Two.")
+    begin = time.perf_counter()
+    assert engine.synthesize("One.", 1)
+    assert time.perf_counter() - begin < 4
+    assert engine.synthesize("Two.", 2)
+
+    assert [text for text, _ in completion_server.requests] == ["One.", "Two."]
+    assert engine._snac_decoder.tokens == list(range(1, 15))
+    assert drain(engine) == [b"\x01", b"\x02"]
+
+
+def test_stale_prefetch_is_dropped_and_connection_reused(engine, completion_server):
+    completion_server.tokens = {"Old.": custom_tokens(range(1, 8)), "New.": custom_tokens(range(1, 8))}
+
+    engine.prefetch("Old.")
+    # the stale completion must have started, otherwise dropping it just cancels it
+    assert completion_server.arrived.setdefault("Old.", threading.Event()).wait(timeout=5)
+    engine.set_voice("leo")
+    assert engine.synthesize("Old.")
+
+    texts = [text for text, _ in completion_server.requests]
+    assert texts == ["Old.", "Old."]
+    assert engine.synthesize("New.")
+    ports = {address[1] for _, address in completion_server.requests[1:]}
+    assert len(ports) == 1
+
+
+def test_turn_token_into_id_uses_last_token(engine):
+    assert engine.turn_token_into_id(" <custom_token_5><custom_token_4110> ", 1) == 4110 - 10 - 4096
+    assert engine.turn_token_into_id("<custom_token_12>tail", 0) is None
+    assert engine.turn_token_into_id("no token", 0) is None
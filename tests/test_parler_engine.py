@@ -0,0 +1,162 @@
+import contextlib
+import importlib
+import queue
+import sys
+import threading
+import types
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+
+class FakeInputs(SimpleNamespace):
+    def to(self, device):
+        return self
+
+
+class FakeTokenizer:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, text, return_tensors=None):
+        self.calls.append(text)
+        ids = np.arange(1, len(text.split()) + 1)[None, :]
+        return FakeInputs(input_ids=ids, attention_mask=np.ones_like(ids))
+
+
+class FakeStreamer:
+    def __init__(self, model, device=None, play_steps=None):
+        self.audio_queue = queue.Queue()
+
+    def on_finalized_audio(self, audio, stream_end=False):
+        self.audio_queue.put(audio)
+        if stream_end:
+            self.audio_queue.put(None)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        value = self.audio_queue.get(timeout=5)
+        if value is None:
+            raise StopIteration()
+        return value
+
+
+class FakeTextEncoder:
+    def __init__(self, encoded):
+        self.encoded = encoded
+        self.config = SimpleNamespace(hidden_size=8)
+
+    def __call__(self, input_ids, attention_mask):
+        self.encoded.append(input_ids.tolist())
+        return SimpleNamespace(last_hidden_state=np.ones(input_ids.shape + (8,), dtype=np.float32))
+
+
+class FakeModel:
+    def __init__(self):
+        self.encoded = []
+        self.generations = []
+        self.fail = False
+        self.audio_encoder = SimpleNamespace(config=SimpleNamespace(frame_rate=10, sampling_rate=4))
+        self.text_encoder = FakeTextEncoder(self.encoded)
+        self.decoder = SimpleNamespace(config=SimpleNamespace(hidden_size=8, cross_attention_hidden_size=None))
+
+    def to(self, device, dtype=None):
+        return self
+
+    def generate(self, **kwargs):
+        self.generations.append((kwargs, threading.current_thread()))
+        if self.fail:
+            raise RuntimeError("generation failed")
+        streamer = kwargs["streamer"]
+        streamer.on_finalized_audio(np.full(4, 0.5, dtype=np.float32))
+        streamer.on_finalized_audio(np.full(2, 0.25, dtype=np.float32), stream_end=True)
+
+
+@pytest.fixture
+def parler_module(monkeypatch):
+    model = FakeModel()
+    tokenizer = FakeTokenizer()
+
+    fake_torch = types.ModuleType("torch")
+    fake_torch.bfloat16 = "bfloat16"
+    fake_torch.Tensor = np.ndarray
+    fake_torch.no_grad = contextlib.nullcontext
+    fake_parler = types.ModuleType("parler_tts")
+    fake_parler.ParlerTTSForConditionalGeneration = SimpleNamespace(from_pretrained=lambda name: model)
+    fake_parler.ParlerTTSStreamer = FakeStreamer
+    fake_transformers = types.ModuleType("transformers")
+    fake_transformers.AutoTokenizer = SimpleNamespace(from_pretrained=lambda name: tokenizer)
+    fake_outputs = types.ModuleType("transformers.modeling_outputs")
+    fake_outputs.BaseModelOutput = lambda last_hidden_state: {"last_hidden_state": last_hidden_state}
+
+    monkeypatch.setitem(sys.modules, "torch", fake_torch)
+    monkeypatch.setitem(sys.modules, "parler_tts", fake_parler)
+    monkeypatch.setitem(sys.modules, "transformers", fake_transformers)
+    monkeypatch.setitem(sys.modules, "transformers.modeling_outputs", fake_outputs)
+    if "pyaudio" not in sys.modules:
+        fake_pyaudio = types.ModuleType("pyaudio")
+        fake_pyaudio.paFloat32 = 1
+        monkeypatch.setitem(sys.modules, "pyaudio", fake_pyaudio)
+
+    monkeypatch.delitem(sys.modules, "RealtimeTTS.engines.parler_engine", raising=False)
+    module = importlib.import_module("RealtimeTTS.engines.parler_engine")
+    yield module, model, tokenizer
+    sys.modules.pop("RealtimeTTS.engines.parler_engine", None)
+
+
+def _drain(engine):
+    chunks = []
+    while not engine.queue.empty():
+        chunks.append(engine.queue.get_nowait())
+    return chunks
+
+
+def test_description_is_encoded_once_and_worker_is_reused(parler_module):
+    module, model, tokenizer = parler_module
+    engine = module.ParlerEngine(voice_prompt="A calm voice.", device="cpu")
+
+    assert engine.synthesize("Hello there.")
+    assert engine.synthesize("Second sentence.")
+
+    assert model.encoded == [[[1, 2, 3]]]
+    assert tokenizer.calls.count("A calm voice.") == 1
+    (first, first_thread), (second, second_thread) = model.generations
+    assert first_thread is second_thread is engine._generation_thread
+    assert first["encoder_outputs"]["last_hidden_state"] is second["encoder_outputs"]["last_hidden_state"]
+    assert first["encoder_outputs"] is not second["encoder_outputs"]
+    assert first["prompt_input_ids"].tolist() == [[1, 2]]
+    assert len(_drain(engine)) == 4
+
+    engine.set_voice("A different voice entirely.")
+    assert engine.synthesize("Third.")
+    assert len(model.encoded) == 2
+    engine.shutdown()
+    assert engine._generation_thread is None
+
+
+def test_cache_disabled_lets_generate_encode(parler_module):
+    module, model, tokenizer = parler_module
+    engine = module.ParlerEngine(voice_prompt="A calm voice.", device="cpu", description_cache_size=0)
+
+    assert engine.synthesize("Hello.")
+    assert engine.synthesize("Hello.")
+
+    assert model.encoded == []
+    assert all("encoder_outputs" not in kwargs for kwargs, _ in model.generations)
+    assert tokenizer.calls.count("A calm voice.") == 2
+    engine.shutdown()
+
+
+def test_generation_error_fails_the_sentence(parler_module):
+    module, model, _ = parler_module
+    engine = module.ParlerEngine(voice_prompt="A calm voice.", device="cpu")
+    model.fail = True
+
+    assert engine.synthesize("Hello.") is False
+
+    model.fail = False
+    assert engine.synthesize("Hello.") is True
+    engine.shutdown()
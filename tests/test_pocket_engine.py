@@ -86,3 +86,92 @@ def test_pocket_engine_loads_model_on_requested_device(monkeypatch):
         assert engine.sample_rate == 24000
     finally:
         engine.shutdown()
+
+
+def _engine_with_model(monkeypatch, model, **kwargs):
+    def fake_load_model(self):
+        self.model = model
+        self.sample_rate = model.sample_rate
+
+    monkeypatch.setattr(PocketTTSEngine, "_load_model", fake_load_model)
+    monkeypatch.setattr(PocketTTSEngine, "set_voice", lambda self, voice: None)
+    return PocketTTSEngine(trim_silence=False, **kwargs)
+
+
+def test_voice_states_are_bounded_and_evicted_to_disk(monkeypatch, tmp_path):
+    class FakeModel:
+        sample_rate = 24000
+        created = []
+
+        def get_state_for_audio_prompt(self, source):
+            self.created.append(source)
+            return {"kv": np.zeros(1000, dtype=np.float32)}
+
+    exported = []
+    monkeypatch.setattr(
+        PocketTTSEngine, "_export_voice_state",
+        lambda self, state, path: exported.append(path.name),
+    )
+    monkeypatch.setattr(PocketTTSEngine, "_pcm16_prompt_path", lambda self, name, path: path)
+    engine = _engine_with_model(
+        monkeypatch, FakeModel(), voice_cache_dir=str(tmp_path), voice_state_cache_bytes=8000
+    )
+    prompt = tmp_path / "custom.wav"
+    prompt.write_bytes(b"RIFF")
+    try:
+        engine._get_voice_state("alba")
+        engine._get_voice_state(PocketTTSVoice("custom", audio_prompt_path=str(prompt)))
+        engine._get_voice_state("alba")  # most recently used now
+        engine._get_voice_state("marius")
+
+        assert list(engine._voice_states) == ["alba:builtin", "marius:builtin"]
+        assert engine._voice_state_bytes == 8000
+        # created once and stored again when evicted, because no file exists yet
+        assert exported[0] == exported[1] and exported[0].startswith("custom_")
+        assert FakeModel.created == ["alba", str(prompt), "marius"]
+    finally:
+        engine.shutdown()
+
+
+def test_worker_interleaves_requests_of_different_voices(monkeypatch):
+    import queue
+    import threading
+    import time
+
+    generated = []
+
+    class FakeModel:
+        sample_rate = 24000
+
+        def get_state_for_audio_prompt(self, voice_name):
+            return voice_name
+
+        def generate_audio_stream(self, voice_state, text, **kwargs):
+            for index in range(int(text)):
+                if voice_state == "alba" and index == 1:
+                    deadline = time.time() + 5
+                    while engine._synthesis_requests.empty() and time.time() < deadline:
+                        time.sleep(0.001)
+                generated.append((voice_state, index))
+                yield np.full(2, 0.5, dtype=np.float32)
+
+    engine = _engine_with_model(monkeypatch, FakeModel(), frames_per_turn=1)
+    engine.current_voice_state = "alba"
+    try:
+        long_request = threading.Thread(target=engine.synthesize, args=("20",))
+        long_request.start()
+        while not generated:
+            time.sleep(0.001)
+        marius_audio = queue.Queue()
+        assert engine.synthesize_with_voice("3", "marius", marius_audio)
+        long_request.join(timeout=5)
+
+        marius_done = generated.index(("marius", 2))
+        assert marius_done < generated.index(("alba", 19))
+        assert generated[:6] == [
+            ("alba", 0), ("alba", 1), ("alba", 2), ("marius", 0), ("alba", 3), ("marius", 1),
+        ]
+        assert marius_audio.qsize() == 3
+        assert engine.queue.qsize() == 20
+    finally:
+        engine.shutdown()
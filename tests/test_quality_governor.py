@@ -0,0 +1,70 @@
+import pytest
+
+from RealtimeTTS.engines.base_engine import BaseEngine
+from RealtimeTTS.engines.quality_levels import QualityGovernor, QualityLevel, step_levels
+
+
+LEVELS = step_levels("num_step", [16, 4, 8, 8])
+
+
+def test_step_levels_are_sorted_and_unique():
+    assert [level.name for level in LEVELS] == ["4 steps", "8 steps", "16 steps"]
+    assert [level.settings for level in LEVELS] == [{"num_step": 4}, {"num_step": 8}, {"num_step": 16}]
+    assert [level.cost for level in LEVELS] == [4.0, 8.0, 16.0]
+
+
+def test_fastest_level_until_audio_is_buffered_and_measured():
+    governor = QualityGovernor(LEVELS)
+
+    assert governor.choose("Hello there.", buffered_seconds=10.0) == 0
+    governor.record(0, "x" * 20, synthesis_seconds=0.2, audio_seconds=2.0)
+    assert governor.choose("Hello there.", buffered_seconds=0.0) == 0
+
+
+def test_better_levels_when_the_buffer_is_comfortable():
+    governor = QualityGovernor(LEVELS, headroom=0.5)
+    # 0.1 RTF at 4 steps, one character is 0.1 s of audio
+    governor.record(0, "x" * 20, synthesis_seconds=0.2, audio_seconds=2.0)
+    sentence = "x" * 20  # 2 s of audio: 0.2 s at 4 steps, 0.4 s at 8, 0.8 s at 16
+
+    assert governor.seconds_per_character == pytest.approx(0.0825)
+    assert governor.choose(sentence, buffered_seconds=3.0) == 2
+    assert governor.choose(sentence, buffered_seconds=1.0) == 1
+    assert governor.choose(sentence, buffered_seconds=0.3) == 0
+
+
+def test_measured_slowdown_degrades_the_level():
+    governor = QualityGovernor(LEVELS, smoothing=1.0)
+    governor.record(0, "x" * 10, synthesis_seconds=0.1, audio_seconds=1.0)
+    assert governor.choose("x" * 10, buffered_seconds=4.0) == 2
+
+    # An oversubscribed CPU: the best level now runs slower than realtime.
+    governor.record(2, "x" * 10, synthesis_seconds=3.0, audio_seconds=1.0)
+    assert governor.estimated_realtime_factor(2) == pytest.approx(3.0)
+    assert governor.estimated_realtime_factor(1) == pytest.approx(1.5)  # scaled from the latest load
+    assert governor.choose("x" * 10, buffered_seconds=4.0) == 1
+
+
+def test_invalid_measurements_are_ignored():
+    governor = QualityGovernor([QualityLevel("only")])
+
+    governor.record(0, "text", synthesis_seconds=1.0, audio_seconds=0.0)
+
+    assert governor.realtime_factors == {}
+    with pytest.raises(ValueError):
+        QualityGovernor([])
+
+
+class PlainEngine(BaseEngine):
+    def get_stream_info(self):
+        return 8, 1, 24000
+
+    def synthesize(self, text, sentence_count=0):
+        return True
+
+
+def test_engines_without_knobs_declare_no_levels():
+    engine = PlainEngine()
+
+    assert engine.get_quality_levels() == []
+    engine.set_quality_level(None)
@@ -0,0 +1,81 @@
+import multiprocessing as mp
+import threading
+
+import numpy as np
+import pytest
+
+from RealtimeTTS.engines.shared_audio_ring import SharedAudioRing
+
+
+def _produce(ring, count, size, close=False):
+    for index in range(count):
+        ring.write(np.full(size // 4, index, dtype=np.float32))
+    ring.notify()
+    if close:
+        ring.close()
+
+
+@pytest.fixture
+def ring():
+    ring = SharedAudioRing(capacity=1024)
+    yield ring
+    ring.close()
+
+
+def test_chunks_wrap_around_in_order(ring):
+    received = []
+    producer = threading.Thread(target=_produce, args=(ring, 50, 200))
+    producer.start()
+    while len(received) < 50:
+        ring.wait(timeout=1)
+        received.extend(ring.read_available())
+    producer.join()
+
+    assert [np.frombuffer(chunk, dtype=np.float32)[0] for chunk in received] == list(range(50))
+    assert all(len(chunk) == 200 for chunk in received)
+
+
+def test_accepts_numpy_memoryview_and_bytes(ring):
+    ring.write(np.arange(3, dtype=np.float32))
+    ring.write(memoryview(b"abc"))
+    ring.write(b"")
+
+    assert ring.wait(timeout=0) is True
+    assert ring.read_available() == [np.arange(3, dtype=np.float32).tobytes(), b"abc", b""]
+    assert ring.wait(timeout=0) is False
+
+
+def test_oversized_chunk_is_rejected(ring):
+    assert ring.fits(1020) is True
+    assert ring.fits(1021) is False
+    assert ring.write(b"x" * 1021) is False
+    assert ring.read_available() == []
+
+
+def test_full_ring_gives_up_when_stopped(ring):
+    stop = threading.Event()
+    assert ring.write(b"x" * 600) is True
+    stop.set()
+    assert ring.write(b"y" * 600, stop_event=stop) is False
+    assert ring.write(b"y" * 600, timeout=0.01) is False
+
+    assert ring.read_available() == [b"x" * 600]
+    assert ring.write(b"y" * 600, timeout=0.01) is True
+
+
+def test_worker_process_writes_into_parent_ring():
+    context = mp.get_context("spawn")
+    ring = SharedAudioRing(capacity=4096, context=context)
+    try:
+        process = context.Process(target=_produce, args=(ring, 40, 400, True))
+        process.start()
+        received = []
+        while len(received) < 40:
+            assert ring.wait(timeout=30)
+            received.extend(ring.read_available())
+        process.join(timeout=30)
+
+        assert process.exitcode == 0
+        assert [np.frombuffer(chunk, dtype=np.float32)[-1] for chunk in received] == list(range(40))
+    finally:
+        ring.close()
@@ -0,0 +1,104 @@
+import time
+
+import pyaudio
+
+from RealtimeTTS import BaseEngine, TextToAudioStream
+import RealtimeTTS.stream_player as stream_player
+
+
+TEXT = "First one here. Second one here. This will fail now. Fourth one here."
+SENTENCES = ["First one here.", "Second one here.", "This will fail now.", "Fourth one here."]
+
+
+class _FakePyAudio:
+    def get_sample_size(self, format):
+        return 2
+
+
+class _BatchEngine(BaseEngine):
+    def __init__(self, name="batch-test", can_batch=True):
+        self.name = name
+        self.batch = can_batch
+        self.calls = []
+        self.batches = []
+
+    def post_init(self):
+        self.engine_name = self.name
+        self.can_batch = self.batch
+
+    def get_stream_info(self):
+        return pyaudio.paInt16, 1, 24_000
+
+    def synthesize(self, text, sentence_count=0):
+        super().synthesize(text, sentence_count)
+        self.calls.append(text)
+        if self.batch and not self.batches:
+            # a sentence taken alone, give the others time to queue up for a batch
+            time.sleep(0.2)
+        self.queue.put(b"\0\0" * 240)
+        return self.engine_name != "batch-test" or "fail" not in text
+
+    def synthesize_batch(self, sentences, sentence_count=0):
+        self.batches.append(list(sentences))
+        return super().synthesize_batch(sentences, sentence_count)
+
+    def get_voices(self):
+        return []
+
+    def set_voice(self, voice):
+        pass
+
+    def set_voice_parameters(self, **voice_parameters):
+        pass
+
+
+def _play(monkeypatch, engines, silences=None, **kwargs):
+    monkeypatch.setattr(stream_player.pyaudio, "PyAudio", _FakePyAudio)
+    announced, synthesized = [], []
+    stream = TextToAudioStream(engines, muted=True, tokenizer="rule-based")
+    if silences is not None:
+        stream._enqueue_silence = silences.append
+    stream.feed(TEXT)
+    stream.play(
+        batch_size=8,
+        muted=True,
+        before_sentence_synthesized=announced.append,
+        on_sentence_synthesized=synthesized.append,
+        **kwargs,
+    )
+    return announced, synthesized
+
+
+def test_failed_batch_sentence_is_announced_once_and_not_rerun(monkeypatch):
+    engine = _BatchEngine()
+
+    announced, synthesized = _play(monkeypatch, engine)
+
+    assert SENTENCES[2:] == engine.batches[-1][-2:]
+    assert announced == SENTENCES
+    assert engine.calls == SENTENCES
+    assert synthesized == [sentence for sentence in SENTENCES if "fail" not in sentence]
+
+
+def test_failed_batch_sentence_keeps_its_silence(monkeypatch):
+    engine = _BatchEngine()
+    silences = []
+
+    _play(monkeypatch, engine, silences, sentence_silence_duration=0.5)
+
+    assert SENTENCES[2:] == engine.batches[-1][-2:]
+    # one pause per sentence, as on the single sentence path
+    assert silences == [0.5] * len(SENTENCES)
+
+
+def test_failed_batch_sentence_moves_to_fallback_engine(monkeypatch):
+    engine = _BatchEngine()
+    fallback = _BatchEngine(name="fallback", can_batch=False)
+
+    announced, synthesized = _play(monkeypatch, [engine, fallback])
+
+    assert SENTENCES[2:] == engine.batches[-1][-2:]
+    assert announced == SENTENCES
+    assert engine.calls == SENTENCES[:3]
+    assert fallback.calls == SENTENCES[2:]
+    assert synthesized == SENTENCES
@@ -0,0 +1,105 @@
+import pytest
+
+from RealtimeTTS.engines.stream_chunk_schedule import (
+    AUDIO_SECONDS_PER_TOKEN,
+    StreamChunkScheduler,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_without_schedule_uses_fixed_size(clock):
+    scheduler = StreamChunkScheduler(None, stream_chunk_size=20, clock=clock)
+    scheduler.record_realtime_factor(0.2)
+    scheduler.add_audio(10.0)
+
+    assert scheduler.next_chunk_size() == 20
+
+
+def test_first_sentence_uses_smallest_size(clock):
+    scheduler = StreamChunkScheduler([40, 10, 20], clock=clock)
+
+    assert scheduler.schedule == [10, 20, 40]
+    assert scheduler.next_chunk_size() == 10
+
+    # buffered audio alone is not enough without a measured realtime factor
+    scheduler.add_audio(5.0)
+    assert scheduler.next_chunk_size() == 10
+
+
+def test_chunk_size_grows_with_buffer_and_speed(clock):
+    scheduler = StreamChunkScheduler([10, 20, 40, 80], headroom=0.5, clock=clock)
+    scheduler.record_realtime_factor(0.5)
+
+    # a 40 token chunk takes about 0.85 s at realtime factor 0.5
+    scheduler.add_audio(1.8)
+    assert scheduler.next_chunk_size() == 40
+
+    scheduler.add_audio(2.0)
+    assert scheduler.next_chunk_size() == 80
+
+    # playback catches up with synthesis
+    clock.now += 3.5
+    assert scheduler.buffered_seconds() == pytest.approx(0.3)
+    assert scheduler.next_chunk_size() == 10
+
+
+def test_slow_synthesis_keeps_small_chunks(clock):
+    scheduler = StreamChunkScheduler([10, 20, 40], clock=clock)
+    scheduler.record_realtime_factor(2.0)
+    scheduler.add_audio(20 * AUDIO_SECONDS_PER_TOKEN * 2.0 * 2 - 0.01)
+
+    assert scheduler.next_chunk_size() == 10
+
+
+def test_realtime_factor_is_smoothed(clock):
+    scheduler = StreamChunkScheduler([10], smoothing=0.5, clock=clock)
+    scheduler.record_realtime_factor(1.0)
+    scheduler.record_realtime_factor(0.0)
+    scheduler.record_realtime_factor(0.5)
+
+    assert scheduler.realtime_factor == pytest.approx(0.75)
+
+
+def test_buffer_continues_after_gaps_and_resets(clock):
+    scheduler = StreamChunkScheduler([10, 20], clock=clock)
+    scheduler.add_audio(1.0)
+    clock.now += 3.0
+    scheduler.add_audio(1.0)
+
+    # the pause emptied the buffer, playback restarts with the new chunk
+    assert scheduler.buffered_seconds() == pytest.approx(1.0)
+
+    scheduler.reset()
+    assert scheduler.buffered_seconds() == 0.0
+
+
+def test_pacing_delay_keeps_target_buffer(clock):
+    scheduler = StreamChunkScheduler(clock=clock)
+    scheduler.add_audio(3.0)
+
+    assert scheduler.pacing_delay(1.0) == pytest.approx(2.0)
+    assert scheduler.pacing_delay(5.0) == 0.0
+
+
+def test_set_fixed_disables_schedule(clock):
+    scheduler = StreamChunkScheduler([10, 20], clock=clock)
+    scheduler.set_fixed(60)
+
+    assert scheduler.next_chunk_size() == 60
+
+
+def test_rejects_non_positive_sizes():
+    with pytest.raises(ValueError):
+        StreamChunkScheduler([0, 10])
@@ -0,0 +1,153 @@
+import importlib
+import logging
+import os
+import sys
+import types
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+
+class RecordingCache:
+    """Stands in for ConditioningCache and records the requested keys."""
+
+    def __init__(self):
+        self.keys = []
+
+    def get_or_create(self, key, create):
+        self.keys.append(key)
+        return np.zeros((1, 256), dtype=np.float32)
+
+
+@pytest.fixture
+def style_module(monkeypatch):
+    fake_torch = types.ModuleType("torch")
+    fake_torch.cuda = SimpleNamespace(is_available=lambda: False, empty_cache=lambda: None)
+    fake_torch.backends = SimpleNamespace(cudnn=SimpleNamespace())
+    fake_torch.manual_seed = lambda seed: None
+    monkeypatch.setitem(sys.modules, "torch", fake_torch)
+
+    monkeypatch.delitem(sys.modules, "RealtimeTTS.engines.style_engine", raising=False)
+    module = importlib.import_module("RealtimeTTS.engines.style_engine")
+    loads = []
+
+    def load_model(self):
+        loads.append((self.model_config_path, self.model_checkpoint_path))
+        self.model = {}
+        self.sample_rate = 24000
+
+    monkeypatch.setattr(module.StyleTTSEngine, "load_model", load_model)
+    yield module, loads
+    sys.modules.pop("RealtimeTTS.engines.style_engine", None)
+
+
+@pytest.fixture
+def voice_files(tmp_path):
+    paths = {}
+    for name, content in {
+        "config.yml": b"model_params: {}",
+        "model.pth": b"checkpoint",
+        "other.pth": b"other checkpoint",
+        "first.wav": b"RIFF first",
+        "second.wav": b"RIFF second",
+    }.items():
+        path = tmp_path / name
+        path.write_bytes(content)
+        paths[name] = str(path)
+    return paths
+
+
+def _engine(module, files, **kwargs):
+    voice = module.StyleTTSVoice(files["config.yml"], files["model.pth"], files["first.wav"])
+    return module.StyleTTSEngine(
+        style_root=".",
+        voice=voice,
+        device="cpu",
+        seed=1,
+        trim_silence=False,
+        conditioning_cache=RecordingCache(),
+        **kwargs,
+    )
+
+
+def _drain(engine):
+    chunks = []
+    while not engine.queue.empty():
+        chunks.append(np.frombuffer(engine.queue.get_nowait(), dtype=np.int16))
+    return chunks
+
+
+def test_sigma_schedule_is_computed_once_per_steps_and_device(style_module):
+    module, _ = style_module
+    calls = []
+
+    def schedule(num_steps, device):
+        calls.append((num_steps, device))
+        return np.linspace(3.0, 0.0, num_steps)
+
+    cached = module._CachedSigmaSchedule(schedule)
+
+    first = cached(5, "cpu")
+    assert cached(5, "cpu") is first
+    cached(10, "cpu")
+    cached(5, "cuda")
+    cached(10, "cpu")
+
+    assert calls == [(5, "cpu"), (10, "cpu"), (5, "cuda")]
+
+
+def test_reference_style_key_changes_with_checkpoint_size_and_mtime(style_module, voice_files):
+    module, _ = style_module
+    engine = _engine(module, voice_files)
+    checkpoint = voice_files["model.pth"]
+
+    key = engine._reference_style_key(voice_files["first.wav"])
+    assert engine._reference_style_key(voice_files["first.wav"]) == key
+    assert engine._reference_style_key(voice_files["second.wav"]) != key
+
+    stat = os.stat(checkpoint)
+    os.utime(checkpoint, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    touched_key = engine._reference_style_key(voice_files["first.wav"])
+    assert touched_key != key
+
+    with open(checkpoint, "ab") as handle:
+        handle.write(b" retrained")
+    os.utime(checkpoint, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert engine._reference_style_key(voice_files["first.wav"]) not in (key, touched_key)
+
+
+def test_set_voice_with_same_model_only_switches_reference(style_module, voice_files):
+    module, loads = style_module
+    engine = _engine(module, voice_files)
+    assert len(loads) == 1
+
+    engine.set_voice(module.StyleTTSVoice(voice_files["config.yml"], voice_files["model.pth"], voice_files["second.wav"]))
+
+    assert len(loads) == 1
+    assert engine.ref_audio_path == voice_files["second.wav"]
+    assert engine.conditioning_cache.keys == [
+        engine._reference_style_key(voice_files["first.wav"]),
+        engine._reference_style_key(voice_files["second.wav"]),
+    ]
+
+    engine.set_voice(module.StyleTTSVoice(voice_files["config.yml"], voice_files["other.pth"], voice_files["second.wav"]))
+
+    assert loads[-1] == (voice_files["config.yml"], voice_files["other.pth"])
+    assert len(loads) == 2
+
+
+@pytest.mark.parametrize("silence", [None, 0.5])
+def test_no_silence_is_queued_after_a_sentence(style_module, voice_files, caplog, silence):
+    module, _ = style_module
+    with caplog.at_level(logging.WARNING):
+        engine = _engine(module, voice_files, sentence_silence_duration=silence)
+    assert ("no longer inserts silence" in caplog.text) == (silence is not None)
+    engine.inference = lambda text, **kwargs: np.full(2400, 0.5, dtype=np.float32)
+
+    assert engine.synthesize("Hello there.")
+
+    audio = np.concatenate(_drain(engine))
+    assert audio.size == 2400
+    assert np.all(audio == 16383)
+    assert engine.audio_duration == pytest.approx(0.1)
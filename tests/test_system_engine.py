@@ -0,0 +1,133 @@
+import importlib
+import os
+import stat
+import struct
+import sys
+import threading
+import types
+
+import pytest
+
+pytest.importorskip("pydub")
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="espeak streaming is Linux only"
+)
+
+FAKE_ESPEAK = """#!{python}
+import struct, sys, time
+args = sys.argv[1:]
+text = args[args.index("--") + 1]
+with open({log!r}, "a") as log:
+    log.write(" ".join(args) + "\\n")
+out = sys.stdout.buffer
+header = b"RIFF" + struct.pack("<I", 0x7FFFFFFF) + b"WAVEfmt "
+header += struct.pack("<IHHIIHH", 16, 1, 1, 22050, 44100, 2, 16)
+header += b"data" + struct.pack("<I", 0x7FFFFFFF)
+out.write(header[:30]); out.flush(); time.sleep(0.01)
+out.write(header[30:])
+for byte in text.encode():
+    out.write(bytes([byte])); out.flush(); time.sleep(0.005)
+"""
+
+
+@pytest.fixture
+def system_module(monkeypatch, tmp_path):
+    class FakePyttsx3Engine:
+        def __init__(self):
+            self.properties = {"voice": "gmw/en", "rate": 180, "volume": 0.5, "voices": []}
+
+        def getProperty(self, name):
+            return self.properties[name]
+
+        def setProperty(self, name, value):
+            self.properties[name] = value
+
+    fake_pyttsx3 = types.ModuleType("pyttsx3")
+    fake_pyttsx3.init = FakePyttsx3Engine
+    monkeypatch.setitem(sys.modules, "pyttsx3", fake_pyttsx3)
+
+    if "pyaudio" not in sys.modules:
+        fake_pyaudio = types.ModuleType("pyaudio")
+        fake_pyaudio.paInt16 = 8
+        monkeypatch.setitem(sys.modules, "pyaudio", fake_pyaudio)
+
+    log = tmp_path / "espeak.log"
+    script = tmp_path / "espeak-ng"
+    script.write_text(FAKE_ESPEAK.format(python=sys.executable, log=str(log)))
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ.get('PATH', '')}")
+
+    monkeypatch.delitem(sys.modules, "RealtimeTTS.engines.system_engine", raising=False)
+    module = importlib.import_module("RealtimeTTS.engines.system_engine")
+    yield module, log
+    sys.modules.pop("RealtimeTTS.engines.system_engine", None)
+
+
+def _drain(engine):
+    chunks = []
+    while not engine.queue.empty():
+        chunks.append(engine.queue.get_nowait())
+    return chunks
+
+
+def test_espeak_output_is_streamed_without_header(system_module):
+    module, log = system_module
+    engine = module.SystemEngine(voice=None)
+
+    assert engine.synthesize("-abcdef") is True
+
+    chunks = _drain(engine)
+    assert len(chunks) > 1
+    assert all(len(chunk) % 2 == 0 for chunk in chunks)
+    assert b"".join(chunks) == b"-abcde"
+    assert engine.audio_duration == pytest.approx(6 / (2 * 22050))
+    assert log.read_text().split()[:7] == [
+        "--stdout", "-v", "gmw/en", "-s", "180", "-a", "50",
+    ]
+    assert engine.file_path is None
+
+
+def test_engines_stream_concurrently(system_module):
+    module, _ = system_module
+    engines = [module.SystemEngine(voice=None) for _ in range(3)]
+    texts = ["first sentence", "second one", "third"]
+
+    threads = [
+        threading.Thread(target=engine.synthesize, args=(text,))
+        for engine, text in zip(engines, texts)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for engine, text in zip(engines, texts):
+        expected = text.encode()
+        assert b"".join(_drain(engine)) == expected[: len(expected) // 2 * 2]
+
+
+def test_stop_ends_espeak_without_logging_an_error(system_module, caplog):
+    module, _ = system_module
+    engine = module.SystemEngine(voice=None)
+    result = []
+
+    thread = threading.Thread(target=lambda: result.append(engine.synthesize("x" * 400)))
+    thread.start()
+    while engine.queue.empty() and thread.is_alive():
+        thread.join(timeout=0.01)
+    engine.stop()
+    thread.join(timeout=5)
+
+    assert result == [False]
+    assert "exited with code" not in caplog.text
+
+
+def test_header_check_warns_on_unexpected_format(system_module, caplog):
+    module, _ = system_module
+    header = b"RIFF" + b"\0" * 4 + b"WAVEfmt " + struct.pack("<IHHIIHH", 16, 1, 1, 16000, 32000, 2, 16)
+    header += b"data" + b"\0" * 4
+
+    module.SystemEngine._check_espeak_header(header)
+
+    assert "16000 Hz" in caplog.text
@@ -0,0 +1,117 @@
+import numpy as np
+
+from RealtimeTTS.engines.base_engine import BaseEngine
+from RealtimeTTS.engines.utterance_pieces import PieceJoiner, PieceLimits, split_utterance
+
+
+LIMITS = PieceLimits(lead_chars=30, max_chars=60, min_chars=8, crossfade_ms=1)
+
+
+def test_short_sentences_stay_whole():
+    assert split_utterance("  A short sentence.  ", LIMITS) == ["A short sentence."]
+
+
+def test_lead_piece_prefers_clause_boundaries():
+    text = "After a long day at work, we went home and cooked a very late dinner for two of us."
+
+    assert split_utterance(text, LIMITS) == [
+        "After a long day at work,",
+        "we went home and cooked a very late dinner for two of us.",
+    ]
+
+
+def test_falls_back_to_word_boundaries_and_keeps_tails_long():
+    text = "one two three four five six seven eight nine ten eleven"
+
+    pieces = split_utterance(text, PieceLimits(lead_chars=20, max_chars=25, min_chars=12))
+
+    assert pieces == ["one two three four", "five six seven eight", "nine ten eleven"]
+    assert split_utterance("x" * 100, LIMITS) == ["x" * 100]
+
+
+def test_cjk_clauses_split_without_spaces():
+    text = "今天天气很好，我们一起去公园散步吧，然后再去吃饭。"
+
+    pieces = split_utterance(text, PieceLimits(lead_chars=10, max_chars=12, min_chars=4))
+
+    assert pieces == ["今天天气很好，", "我们一起去公园散步吧，", "然后再去吃饭。"]
+
+
+def test_joiner_crossfades_and_keeps_samples_in_order():
+    joiner = PieceJoiner(sample_rate=4000, crossfade_ms=1)  # four samples overlap
+
+    first = joiner.join(np.full(10, 1000, dtype=np.int16))
+    joiner.final = True
+    second = joiner.join(np.full(10, -1000, dtype=np.int16))
+
+    assert first.tolist() == [1000] * 6
+    assert second[:4].tolist() == [1000, 333, -333, -1000]
+    assert second.size == 10
+    assert joiner.flush().size == 0
+
+
+class PieceEngine(BaseEngine):
+    def __init__(self):
+        self.piece_limits = LIMITS
+        self.texts = []
+
+    def post_init(self):
+        self.whole_utterance_only = True
+
+    def get_stream_info(self):
+        return 8, 1, 4000
+
+    def synthesize(self, text, sentence_count=0):
+        super().synthesize(text, sentence_count)
+        self.texts.append(text)
+        self._queue_pcm16(np.full(8, len(self.texts) * 100, dtype=np.int16))
+        return True
+
+
+def _drain(engine):
+    chunks = []
+    while not engine.queue.empty():
+        chunks.append(np.frombuffer(engine.queue.get_nowait(), dtype=np.int16))
+    return chunks
+
+
+def test_engine_synthesizes_pieces_with_joined_audio():
+    engine = PieceEngine()
+    text = "After a long day at work, we went home and cooked a very late dinner for two of us."
+
+    pieces = engine.split_into_pieces(text)
+    assert len(pieces) > 1
+    assert engine.synthesize_pieces(pieces)
+
+    assert engine.texts == pieces
+    audio = np.concatenate(_drain(engine))
+    assert audio.size == 8 * len(pieces) - 4 * (len(pieces) - 1)
+    assert audio[0] == 100 and audio[-1] == len(pieces) * 100
+
+    # outside synthesize_pieces the engine queues its audio unchanged
+    engine.synthesize("Hello.")
+    assert [chunk.size for chunk in _drain(engine)] == [8]
+
+
+def test_stop_between_pieces_drops_the_rest():
+    engine = PieceEngine()
+    pieces = ["First piece of text,", "second piece", "third piece."]
+    original = engine.synthesize
+
+    def synthesize_and_stop(text, sentence_count=0):
+        result = original(text, sentence_count)
+        engine.stop()
+        return result
+
+    engine.synthesize = synthesize_and_stop
+    assert engine.synthesize_pieces(pieces) is False
+
+    assert engine.texts == pieces[:1]
+    assert sum(chunk.size for chunk in _drain(engine)) == 4
+
+
+def test_engines_without_the_flag_are_not_split():
+    engine = PieceEngine()
+    engine.whole_utterance_only = False
+
+    assert engine.split_into_pieces("x " * 100) == ["x " * 100]
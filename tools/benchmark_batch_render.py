@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Compare sequential and batched offline rendering throughput (sentences/sec).
+
+Renders the same sentences once with one synthesize() call per sentence and
+once through synthesize_batch() in groups of --batch-size, and reports the
+sentences per second and the realtime factor of both paths. CPU by default.
+
+    python tools/benchmark_batch_render.py kokoro --batch-size 8
+    python tools/benchmark_batch_render.py kokoro --backend onnx
+    python tools/benchmark_batch_render.py zipvoice --zipvoice-root ../ZipVoice \\
+        --prompt-wav prompt.wav --prompt-text "Transcript of the prompt."
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from typing import Any
+
+
+SENTENCES = [
+    "Welcome back.",
+    "Your order has shipped.",
+    "It should arrive on Tuesday.",
+    "Thanks for shopping with us.",
+    "The meeting starts at ten.",
+    "Please bring your notes.",
+    "We will review the budget first.",
+    "Lunch is provided.",
+    "The weather looks fine today.",
+    "Expect light wind in the afternoon.",
+    "Call me when you land.",
+    "See you tomorrow.",
+]
+
+
+def _create_engine(args):
+    if args.engine == "kokoro":
+        from RealtimeTTS import KokoroEngine
+
+        return KokoroEngine(voice=args.voice or "af_heart", backend=args.backend)
+
+    from RealtimeTTS import ZipVoiceEngine, ZipVoiceVoice
+
+    return ZipVoiceEngine(
+        zipvoice_root=args.zipvoice_root,
+        voice=ZipVoiceVoice(args.prompt_wav, args.prompt_text),
+        device="cpu",
+    )
+
+
+def _drain_samples(engine) -> int:
+    samples = 0
+    while not engine.queue.empty():
+        samples += len(engine.queue.get_nowait()) // 2
+    return samples
+
+
+def _render(engine, sentences, batch_size: int) -> dict[str, Any]:
+    _, _, sample_rate = engine.get_stream_info()
+    begin = time.perf_counter()
+    samples = 0
+    if batch_size <= 1:
+        for count, sentence in enumerate(sentences, start=1):
+            if not engine.synthesize(sentence, count):
+                raise RuntimeError(f"synthesis failed: {sentence}")
+            samples += _drain_samples(engine)
+    else:
+        for start in range(0, len(sentences), batch_size):
+            group = sentences[start:start + batch_size]
+            for success in engine.synthesize_batch(group, start):
+                if not success:
+                    raise RuntimeError("batched synthesis failed")
+                samples += _drain_samples(engine)
+    seconds = time.perf_counter() - begin
+    return {
+        "sentences_per_s": len(sentences) / seconds,
+        "realtime_factor": seconds / (samples / sample_rate),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("engine", choices=["kokoro", "zipvoice"])
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--backend", default="torch", choices=["torch", "onnx"], help="kokoro backend")
+    parser.add_argument("--voice", default=None, help="kokoro voice")
+    parser.add_argument("--zipvoice-root", default=None)
+    parser.add_argument("--prompt-wav", default=None)
+    parser.add_argument("--prompt-text", default=None)
+    parser.add_argument("--output", default=None, help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+    if args.engine == "zipvoice" and not (args.zipvoice_root and args.prompt_wav and args.prompt_text):
+        parser.error("zipvoice needs --zipvoice-root, --prompt-wav and --prompt-text")
+
+    engine = _create_engine(args)
+    results: dict[str, list] = {"sequential": [], "batched": []}
+    try:
+        _render(engine, SENTENCES[:2], 1)  # warmup
+        for _ in range(args.runs):
+            results["sequential"].append(_render(engine, SENTENCES, 1))
+            results["batched"].append(_render(engine, SENTENCES, args.batch_size))
+    finally:
+        engine.shutdown()
+
+    report: dict[str, Any] = {
+        "engine": args.engine,
+        "sentences": len(SENTENCES),
+        "batch_size": args.batch_size,
+        "runs": args.runs,
+    }
+    for path, runs in results.items():
+        report[path] = {
+            field: statistics.median(run[field] for run in runs)
+            for field in ("sentences_per_s", "realtime_factor")
+        }
+    report["speedup"] = report["batched"]["sentences_per_s"] / report["sequential"]["sentences_per_s"]
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Compare CoquiEngine CPU modes: fp32, int8 quantization and compiled decoder.
+
+Every mode loads its own CoquiEngine on the CPU (``device="cpu"``) and
+synthesizes the same sentences. The report contains per mode the startup time,
+time to first audio, the realtime factor reported by the worker, and a quality
+score against the fp32 output: the log-spectral distance in dB between the
+average spectra of the same sentence (lower is closer). XTTS samples, so
+sampling is narrowed with ``--top-k 1`` by default to keep outputs comparable.
+Listen to the files written with ``--wav-dir`` as well.
+
+Runs on a plain Linux CPU box with the coqui extra installed::
+
+    python tools/benchmark_coqui_cpu.py --runs 3
+    python tools/benchmark_coqui_cpu.py --modes fp32 int8 --wav-dir cpu_wavs
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import queue
+import statistics
+import sys
+import time
+import wave
+from typing import Any
+
+import numpy as np
+
+
+SENTENCES = [
+    "That was a close one, but we made it through.",
+    "The quick brown fox jumps over the lazy dog near the river bank.",
+    "Please remember to bring your umbrella, it might rain this afternoon.",
+]
+
+MODES = {
+    "fp32": {},
+    "int8": {"cpu_quantize": True},
+    "compile": {"cpu_compile": True},
+    "int8+compile": {"cpu_quantize": True, "cpu_compile": True},
+}
+
+SAMPLE_RATE = 24000
+
+
+class RecordingQueue(queue.Queue):
+    def __init__(self) -> None:
+        super().__init__()
+        self.arrivals: list[int] = []
+        self.chunks: list[bytes] = []
+
+    def put(self, item, block=True, timeout=None):
+        self.arrivals.append(time.perf_counter_ns())
+        self.chunks.append(item)
+        return super().put(item, block=block, timeout=timeout)
+
+
+def _log_spectrum(audio: np.ndarray, frame: int = 1024, hop: int = 256) -> np.ndarray:
+    if len(audio) < frame:
+        audio = np.pad(audio, (0, frame - len(audio)))
+    count = 1 + (len(audio) - frame) // hop
+    frames = np.lib.stride_tricks.as_strided(
+        audio, shape=(count, frame), strides=(audio.strides[0] * hop, audio.strides[0])
+    )
+    spectrum = np.abs(np.fft.rfft(frames * np.hanning(frame), axis=1))
+    return 20 * np.log10(spectrum.mean(axis=0) + 1e-6)
+
+
+def log_spectral_distance(reference: np.ndarray, candidate: np.ndarray) -> float:
+    """Root mean square difference of the average log spectra in dB."""
+    difference = _log_spectrum(reference) - _log_spectrum(candidate)
+    return float(np.sqrt(np.mean(difference ** 2)))
+
+
+def _write_wav(path: str, audio: np.ndarray) -> None:
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+    with wave.open(path, "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(SAMPLE_RATE)
+        handle.writeframes(pcm.tobytes())
+
+
+def _measure_mode(name: str, args) -> dict[str, Any]:
+    from RealtimeTTS import CoquiEngine
+
+    started = time.perf_counter()
+    engine = CoquiEngine(
+        device="cpu",
+        thread_count=args.threads,
+        top_k=args.top_k,
+        voice=args.voice or "",
+        **MODES[name],
+    )
+    startup_s = time.perf_counter() - started
+
+    runs = []
+    audio: dict[int, np.ndarray] = {}
+    try:
+        engine.queue = RecordingQueue()
+        engine.synthesize(SENTENCES[0])  # warmup, already done by the worker in optimized modes
+        for run in range(args.runs):
+            for index, sentence in enumerate(SENTENCES):
+                recording = RecordingQueue()
+                engine.queue = recording
+                begin = time.perf_counter_ns()
+                if not engine.synthesize(sentence):
+                    raise RuntimeError(f"{name}: synthesis failed")
+                samples = np.frombuffer(b"".join(recording.chunks), dtype=np.float32)
+                runs.append({
+                    "first_audio_ms": (recording.arrivals[0] - begin) / 1_000_000,
+                    "realtime_factor": engine.realtime_factor,
+                    "audio_s": len(samples) / SAMPLE_RATE,
+                })
+                if run == 0:
+                    audio[index] = samples
+    finally:
+        engine.shutdown()
+
+    summary: dict[str, Any] = {"startup_s": startup_s}
+    for field in ("first_audio_ms", "realtime_factor", "audio_s"):
+        values = [run[field] for run in runs if run[field] is not None]
+        if values:
+            summary[field] = {"median": statistics.median(values), "mean": statistics.fmean(values)}
+    return {"summary": summary, "audio": audio}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES))
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--top-k", type=int, default=1)
+    parser.add_argument("--voice", default=None, help="reference WAV for cloning")
+    parser.add_argument("--wav-dir", default=None, help="write the first run of every sentence here")
+    parser.add_argument("--output", default=None, help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    modes = list(dict.fromkeys(["fp32"] + args.modes))
+    results = {mode: _measure_mode(mode, args) for mode in modes}
+
+    reference = results["fp32"]["audio"]
+    report: dict[str, Any] = {"runs": args.runs, "threads": args.threads, "modes": {}}
+    for mode, result in results.items():
+        summary = result["summary"]
+        summary["log_spectral_distance_db"] = statistics.fmean(
+            log_spectral_distance(reference[index], samples)
+            for index, samples in result["audio"].items()
+        )
+        report["modes"][mode] = summary
+        if args.wav_dir:
+            os.makedirs(args.wav_dir, exist_ok=True)
+            for index, samples in result["audio"].items():
+                _write_wav(os.path.join(args.wav_dir, f"{mode}_{index}.wav"), samples)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""Compare CoquiEngine's pipe and shared-memory audio transports.
+
+The default mode needs no model: a spawned worker process produces float32
+chunks the size XTTS streams (``--chunk-samples``) and the parent receives
+them the same way CoquiEngine does, once through SafePipe and once through
+SharedAudioRing. Each chunk carries its send timestamp, so the report contains
+per-chunk delivery latency, time to first audio and throughput.
+
+``--engine`` additionally loads CoquiEngine twice (one per transport) and
+measures time to first audio and wall time of real sentences.
+
+Example::
+
+    python tools/benchmark_coqui_transport.py --chunks 400 --runs 5
+    python tools/benchmark_coqui_transport.py --engine --runs 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import queue
+import statistics
+import sys
+import time
+from typing import Any
+
+import numpy as np
+import multiprocessing as mp
+
+from RealtimeTTS.engines.safepipe import SafePipe
+from RealtimeTTS.engines.shared_audio_ring import SharedAudioRing
+
+
+DEFAULT_TEXT = "That was a close one, but we made it through."
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = (len(ordered) - 1) * fraction
+    lower = int(index)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (index - lower)
+
+
+def _stats(values: list[float]) -> dict[str, float]:
+    return {
+        "median": statistics.median(values),
+        "mean": statistics.fmean(values),
+        "p95": _percentile(values, 0.95),
+    }
+
+
+def _stamped_chunk(samples: int) -> np.ndarray:
+    chunk = np.zeros(samples, dtype=np.float32)
+    chunk[:2].view(np.float64)[0] = time.perf_counter()
+    return chunk
+
+
+def _worker(conn, ring, chunks: int, samples: int, runs: int) -> None:
+    for _ in range(runs):
+        conn.recv()
+        for _ in range(chunks):
+            chunk = _stamped_chunk(samples)
+            if ring is None:
+                conn.send(("success", chunk.tobytes()))
+            else:
+                ring.write(chunk)
+        conn.send(("finished", ""))
+        if ring is not None:
+            ring.notify()
+    if ring is not None:
+        ring.close()
+
+
+def _receive_pipe(pipe, sink: list) -> None:
+    status, result = pipe.recv()
+    while "finished" not in status:
+        sink.append((time.perf_counter(), result))
+        status, result = pipe.recv()
+
+
+def _receive_ring(pipe, ring, sink: list) -> None:
+    while True:
+        rang = ring.wait(timeout=0.1)
+        chunks = ring.read_available()
+        now = time.perf_counter()
+        sink.extend((now, chunk) for chunk in chunks)
+        if rang and not ring.take_notice():
+            continue
+        while pipe.poll(0):
+            status, _ = pipe.recv()
+            if "finished" in status:
+                now = time.perf_counter()
+                sink.extend((now, chunk) for chunk in ring.read_available())
+                return
+
+
+def _measure_transport(transport: str, args) -> dict[str, Any]:
+    parent_pipe, child_pipe = SafePipe()
+    ring = SharedAudioRing(args.ring_size, context=mp) if transport == "shared_memory" else None
+    process = mp.Process(
+        target=_worker,
+        args=(child_pipe, ring, args.chunks, args.chunk_samples, args.runs + 1),
+    )
+    process.start()
+
+    runs = []
+    try:
+        for run in range(args.runs + 1):
+            received: list = []
+            started = time.perf_counter()
+            parent_pipe.send("go")
+            if ring is None:
+                _receive_pipe(parent_pipe, received)
+            else:
+                _receive_ring(parent_pipe, ring, received)
+            ended = time.perf_counter()
+            if run == 0:
+                continue  # warmup
+            latencies = [
+                (arrival - np.frombuffer(chunk[:8], dtype=np.float64)[0]) * 1000
+                for arrival, chunk in received
+            ]
+            runs.append({
+                "first_audio_ms": (received[0][0] - started) * 1000,
+                "wall_ms": (ended - started) * 1000,
+                "per_chunk_us": (ended - started) / len(received) * 1_000_000,
+                "latency_ms": latencies,
+            })
+    finally:
+        process.join(timeout=30)
+        parent_pipe.close()
+        if ring is not None:
+            ring.close()
+
+    all_latencies = [value for run in runs for value in run["latency_ms"]]
+    return {
+        "first_audio_ms": _stats([run["first_audio_ms"] for run in runs]),
+        "wall_ms": _stats([run["wall_ms"] for run in runs]),
+        "per_chunk_us": _stats([run["per_chunk_us"] for run in runs]),
+        "chunk_latency_ms": _stats(all_latencies),
+    }
+
+
+class _RecordingQueue(queue.Queue):
+    def __init__(self) -> None:
+        super().__init__()
+        self.arrivals: list[int] = []
+
+    def put(self, item, block=True, timeout=None):
+        self.arrivals.append(time.perf_counter_ns())
+        return super().put(item, block=block, timeout=timeout)
+
+
+def _measure_engine(transport: str, args) -> dict[str, Any]:
+    from RealtimeTTS import CoquiEngine
+
+    engine = CoquiEngine(audio_transport=transport, device=args.device)
+    try:
+        engine.queue = _RecordingQueue()
+        engine.synthesize(args.text)  # warmup
+        runs = []
+        for _ in range(args.runs):
+            recording_queue = _RecordingQueue()
+            engine.queue = recording_queue
+            started = time.perf_counter_ns()
+            if not engine.synthesize(args.text):
+                raise RuntimeError("CoquiEngine synthesis failed")
+            ended = time.perf_counter_ns()
+            runs.append({
+                "first_audio_ms": (recording_queue.arrivals[0] - started) / 1_000_000,
+                "wall_ms": (ended - started) / 1_000_000,
+                "chunks": len(recording_queue.arrivals),
+            })
+    finally:
+        engine.shutdown()
+    return {
+        field: _stats([float(run[field]) for run in runs])
+        for field in ("first_audio_ms", "wall_ms", "chunks")
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=200, help="chunks per synthetic sentence")
+    parser.add_argument("--chunk-samples", type=int, default=20 * 1024, help="float32 samples per chunk")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--ring-size", type=int, default=4 * 1024 * 1024)
+    parser.add_argument("--engine", action="store_true", help="also measure a real CoquiEngine")
+    parser.add_argument("--device", default=None)
+    parser.add_argument("--text", default=DEFAULT_TEXT)
+    parser.add_argument("--output", default=None, help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    try:
+        mp.set_start_method("spawn")
+    except RuntimeError:
+        pass
+
+    report: dict[str, Any] = {
+        "chunks": args.chunks,
+        "chunk_samples": args.chunk_samples,
+        "runs": args.runs,
+        "synthetic": {
+            transport: _measure_transport(transport, args)
+            for transport in ("pipe", "shared_memory")
+        },
+    }
+    if args.engine:
+        report["engine"] = {
+            transport: _measure_engine(transport, args)
+            for transport in ("pipe", "shared_memory")
+        }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
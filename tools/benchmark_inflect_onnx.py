@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Measure InflectEngine ONNX cold start with and without the optimized-model cache.
+
+Every mode runs in its own child process, so the startup time includes a cold
+ONNX Runtime session build:
+
+- ``uncached``: graph optimizations run at startup (``cache_optimized_model=False``).
+- ``cache_miss``: an empty cache directory; optimizations run and are stored.
+- ``cache_hit``: the stored optimized models are loaded without optimizing.
+
+The report contains per mode the engine construction time (``warmup=False``),
+the first synthesis, and the median per-sentence latency afterwards.
+
+    python tools/benchmark_inflect_onnx.py --runs 5 --threads 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any
+
+
+SENTENCES = [
+    "That was a close one, but we made it through.",
+    "The quick brown fox jumps over the lazy dog near the river bank.",
+    "Please remember to bring your umbrella, it might rain this afternoon.",
+]
+
+MODES = ("uncached", "cache_miss", "cache_hit")
+
+
+def _measure(mode: str, runs: int, threads: int, cache_dir: str) -> dict[str, Any]:
+    from RealtimeTTS import InflectEngine
+
+    started = time.perf_counter()
+    engine = InflectEngine(
+        backend="onnx",
+        device="cpu",
+        cpu_threads=threads,
+        cache_optimized_model=mode != "uncached",
+        onnx_cache_dir=cache_dir,
+        warmup=False,
+        piece_limits=None,
+    )
+    startup_ms = (time.perf_counter() - started) * 1000
+
+    latencies = []
+    try:
+        begin = time.perf_counter()
+        if not engine.synthesize(SENTENCES[0]):
+            raise RuntimeError(f"{mode}: synthesis failed")
+        first_ms = (time.perf_counter() - begin) * 1000
+        for _ in range(runs):
+            for sentence in SENTENCES:
+                begin = time.perf_counter()
+                if not engine.synthesize(sentence):
+                    raise RuntimeError(f"{mode}: synthesis failed")
+                latencies.append((time.perf_counter() - begin) * 1000)
+                while not engine.queue.empty():
+                    engine.queue.get_nowait()
+    finally:
+        engine.shutdown()
+
+    return {
+        "startup_ms": startup_ms,
+        "first_sentence_ms": first_ms,
+        "sentence_ms": {"median": statistics.median(latencies), "mean": statistics.fmean(latencies)},
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=min(8, os.cpu_count() or 1))
+    parser.add_argument("--output", default=None, help="write the JSON report to this file")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--cache-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_measure(args.child, args.runs, args.threads, args.cache_dir)))
+        return 0
+
+    cache_dir = tempfile.mkdtemp(prefix="inflect-onnx-cache-")
+    report: dict[str, Any] = {"runs": args.runs, "threads": args.threads, "modes": {}}
+    try:
+        for mode in MODES:
+            completed = subprocess.run(
+                [
+                    sys.executable, os.path.abspath(__file__), "--child", mode,
+                    "--runs", str(args.runs), "--threads", str(args.threads),
+                    "--cache-dir", cache_dir,
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+            report["modes"][mode] = json.loads(completed.stdout.strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    report["startup_saved_ms"] = (
+        report["modes"]["uncached"]["startup_ms"] - report["modes"]["cache_hit"]["startup_ms"]
+    )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Compare KokoroEngine backends: PyTorch against the quantized ONNX export.
+
+Every backend runs in its own child process so the reported peak resident set
+size (RSS) belongs to that backend only. The report contains per backend the
+startup time, the peak RSS after synthesis, and the realtime factor
+(synthesis seconds per audio second, lower is faster) over the test sentences.
+
+Runs on Linux and macOS with the kokoro extra and onnxruntime installed::
+
+    python tools/benchmark_kokoro_backends.py --runs 3
+    python tools/benchmark_kokoro_backends.py --backends onnx --threads 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any
+
+
+SENTENCES = [
+    "That was a close one, but we made it through.",
+    "The quick brown fox jumps over the lazy dog near the river bank.",
+    "Please remember to bring your umbrella, it might rain this afternoon.",
+]
+
+BACKENDS = ("torch", "onnx")
+SAMPLE_RATE = 24000
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _measure_backend(backend: str, runs: int, threads: int | None, voice: str) -> dict[str, Any]:
+    import torch
+
+    if threads:
+        torch.set_num_threads(threads)
+
+    from RealtimeTTS import KokoroEngine
+
+    started = time.perf_counter()
+    engine = KokoroEngine(voice=voice, backend=backend, onnx_threads=threads, g2p_cache_size=0)
+    startup_s = time.perf_counter() - started
+    rss_after_load = _peak_rss_mb()
+
+    factors = []
+    try:
+        engine.synthesize(SENTENCES[0])  # warmup
+        for _ in range(runs):
+            for sentence in SENTENCES:
+                while not engine.queue.empty():
+                    engine.queue.get_nowait()
+                begin = time.perf_counter()
+                if not engine.synthesize(sentence):
+                    raise RuntimeError(f"{backend}: synthesis failed")
+                seconds = time.perf_counter() - begin
+                samples = 0
+                while not engine.queue.empty():
+                    samples += len(engine.queue.get_nowait()) // 2
+                factors.append(seconds / (samples / SAMPLE_RATE))
+    finally:
+        engine.shutdown()
+
+    return {
+        "startup_s": startup_s,
+        "peak_rss_after_load_mb": rss_after_load,
+        "peak_rss_mb": _peak_rss_mb(),
+        "realtime_factor": {"median": statistics.median(factors), "mean": statistics.fmean(factors)},
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--voice", default="af_heart")
+    parser.add_argument("--output", default=None, help="write the JSON report to this file")
+    parser.add_argument("--child", choices=BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_measure_backend(args.child, args.runs, args.threads, args.voice)))
+        return 0
+
+    report: dict[str, Any] = {"runs": args.runs, "threads": args.threads, "backends": {}}
+    for backend in args.backends:
+        completed = subprocess.run(
+            [
+                sys.executable, os.path.abspath(__file__), "--child", backend,
+                "--runs", str(args.runs), "--threads", str(args.threads), "--voice", args.voice,
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        report["backends"][backend] = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
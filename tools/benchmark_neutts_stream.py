@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Measure NeuTTSEngine time to first audio and real-time factor with fixed and adaptive streaming windows.
+
+Loads a GGUF NeuTTS backbone once on the CPU and synthesizes the same
+sentences through NeuTTS' own ``infer_stream`` with a fixed decode window
+(``adaptive_streaming=False``, the previous behaviour) and with the adaptive
+window that starts at ``--initial-frames`` and grows once audio is buffered,
+interleaving the two modes. Nothing is played; the engine queue records when
+the first chunk arrived and how much audio was produced. The real-time factor
+is the synthesis time divided by the audio duration.
+
+    python tools/benchmark_neutts_stream.py --ref-audio voice.wav --ref-text "Transcript." --runs 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import queue
+import statistics
+import sys
+import time
+from typing import Any
+
+
+SENTENCES = [
+    "Hello there, how are you today?",
+    "The train leaves at half past nine, so we should hurry a little.",
+    "Please close the door behind you.",
+]
+
+MODES = {"fixed_window": False, "adaptive_window": True}
+
+
+class RecordingQueue(queue.Queue):
+    def __init__(self) -> None:
+        super().__init__()
+        self.first_put_ns: int | None = None
+        self.bytes = 0
+
+    def put(self, item, block=True, timeout=None):
+        if self.first_put_ns is None:
+            self.first_put_ns = time.perf_counter_ns()
+        self.bytes += len(item)
+        return super().put(item, block=block, timeout=timeout)
+
+
+def _measure(engine, text: str) -> tuple[float, float]:
+    recording_queue = RecordingQueue()
+    engine.queue = recording_queue
+    started_ns = time.perf_counter_ns()
+    if not engine.synthesize(text):
+        raise RuntimeError("NeuTTSEngine synthesis failed")
+    elapsed_s = (time.perf_counter_ns() - started_ns) / 1_000_000_000
+    if recording_queue.first_put_ns is None:
+        raise RuntimeError("NeuTTSEngine produced no audio")
+    audio_s = recording_queue.bytes / (2 * engine.sampling_rate)
+    return (recording_queue.first_put_ns - started_ns) / 1_000_000, elapsed_s / audio_s
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backbone-repo", default="neuphonic/neutts-nano-q4-gguf")
+    parser.add_argument("--ref-audio", required=True)
+    parser.add_argument("--ref-text", required=True)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--initial-frames", type=int, default=8)
+    parser.add_argument("--output", default=None, help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    from RealtimeTTS.engines.neutts_engine import NeuTTSEngine, NeuTTSVoice
+
+    engine = NeuTTSEngine(
+        backbone_repo=args.backbone_repo,
+        device="cpu",
+        voice=NeuTTSVoice("benchmark", args.ref_audio, args.ref_text),
+        streaming=True,
+        streaming_initial_frames_per_chunk=args.initial_frames,
+    )
+    results: dict[str, dict[str, list[float]]] = {
+        mode: {"first_audio_ms": [], "rtf": []} for mode in MODES
+    }
+    try:
+        _measure(engine, SENTENCES[0])  # warmup
+        for _ in range(args.runs):
+            for text in SENTENCES:
+                for mode, adaptive in MODES.items():
+                    engine.adaptive_streaming = adaptive
+                    first_audio_ms, rtf = _measure(engine, text)
+                    results[mode]["first_audio_ms"].append(first_audio_ms)
+                    results[mode]["rtf"].append(rtf)
+    finally:
+        engine.shutdown()
+
+    report: dict[str, Any] = {
+        "backbone_repo": args.backbone_repo,
+        "runs": args.runs,
+        "initial_frames": args.initial_frames,
+    }
+    for mode, values in results.items():
+        report[mode] = {
+            name: {"median": statistics.median(series), "mean": statistics.fmean(series)}
+            for name, series in values.items()
+        }
+    report["ttfa_saved_ms"] = (
+        report["fixed_window"]["first_audio_ms"]["median"]
+        - report["adaptive_window"]["first_audio_ms"]["median"]
+    )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Measure OpenAIEngine time to first audio against an OpenAI-compatible server.
+
+Runs the same sentences through OpenAIEngine with raw network chunks
+(``chunk_duration_ms=0``) and with coalesced PCM frames, interleaving the two
+modes. The engine instances and their HTTP clients are reused across requests,
+as in a real stream, so only the warmup pays connection setup. Nothing is
+played; the engine queue records when each chunk arrived.
+
+Example against the local Qwen server::
+
+    realtimetts-qwen-server --port 8000
+    python tools/benchmark_openai_ttfa.py \\
+        --base-url http://127.0.0.1:8000/v1 --voice my_voice --runs 10
+
+The official API works the same way with ``--base-url`` omitted and
+``OPENAI_API_KEY`` set.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import queue
+import statistics
+import sys
+import time
+from typing import Any
+
+from RealtimeTTS.engines.openai_engine import OpenAIEngine
+
+
+DEFAULT_TEXT = "That was a close one, but we made it through."
+
+
+class RecordingQueue(queue.Queue):
+    def __init__(self) -> None:
+        super().__init__()
+        self.arrivals: list[tuple[int, int]] = []
+
+    def put(self, item, block=True, timeout=None):
+        self.arrivals.append((time.perf_counter_ns(), len(item)))
+        return super().put(item, block=block, timeout=timeout)
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = (len(ordered) - 1) * fraction
+    lower = int(index)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (index - lower)
+
+
+def _summary(runs: list[dict[str, Any]]) -> dict[str, Any]:
+    result: dict[str, Any] = {"count": len(runs)}
+    for field in ("first_audio_ms", "wall_ms", "chunks", "mean_chunk_bytes"):
+        values = [float(run[field]) for run in runs if run.get(field) is not None]
+        if values:
+            result[field] = {
+                "median": statistics.median(values),
+                "mean": statistics.fmean(values),
+                "p95": _percentile(values, 0.95),
+            }
+    return result
+
+
+def _run_once(engine: OpenAIEngine, text: str) -> dict[str, Any]:
+    recording_queue = RecordingQueue()
+    engine.queue = recording_queue
+    started_ns = time.perf_counter_ns()
+    if not engine.synthesize(text):
+        raise RuntimeError("OpenAIEngine synthesis failed")
+    ended_ns = time.perf_counter_ns()
+    arrivals = recording_queue.arrivals
+    total_bytes = sum(size for _, size in arrivals)
+    return {
+        "first_audio_ms": (arrivals[0][0] - started_ns) / 1_000_000 if arrivals else None,
+        "wall_ms": (ended_ns - started_ns) / 1_000_000,
+        "chunks": len(arrivals),
+        "mean_chunk_bytes": total_bytes / len(arrivals) if arrivals else None,
+        "audio_bytes": total_bytes,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default=None, help="OpenAI-compatible base URL, e.g. http://127.0.0.1:8000/v1")
+    parser.add_argument("--api-key-env", default="OPENAI_API_KEY", help="environment variable holding the API key")
+    parser.add_argument("--model", default="tts-1")
+    parser.add_argument("--voice", default="nova")
+    parser.add_argument("--text", default=DEFAULT_TEXT)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--sample-rate", type=int, default=24000)
+    parser.add_argument("--chunk-ms", type=float, default=40, help="frame duration of the coalesced mode")
+    parser.add_argument("--output", default=None, help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    api_key = os.environ.get(args.api_key_env) or "unused"
+    modes = {
+        "raw": 0,
+        f"coalesced_{args.chunk_ms:g}ms": args.chunk_ms,
+    }
+    engines = {
+        name: OpenAIEngine(
+            model=args.model,
+            voice=args.voice,
+            response_format="pcm",
+            api_key=api_key,
+            base_url=args.base_url,
+            sample_rate=args.sample_rate,
+            chunk_duration_ms=chunk_ms,
+        )
+        for name, chunk_ms in modes.items()
+    }
+
+    # One unmeasured request per engine opens its connection.
+    for engine in engines.values():
+        _run_once(engine, args.text)
+
+    runs: dict[str, list[dict[str, Any]]] = {name: [] for name in engines}
+    for _ in range(args.runs):
+        for name, engine in engines.items():
+            runs[name].append(_run_once(engine, args.text))
+
+    report = {
+        "base_url": args.base_url or "https://api.openai.com/v1",
+        "model": args.model,
+        "voice": args.voice,
+        "text": args.text,
+        "sample_rate": args.sample_rate,
+        "modes": {name: _summary(mode_runs) for name, mode_runs in runs.items()},
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Measure Orpheus SNAC decode throughput (audio tokens/sec) on the CPU.
+
+Feeds random audio token ids through the streaming decoder the way
+OrpheusEngine does, one token at a time with a decode every seven tokens,
+and reports the tokens per second for frame assembly alone and for assembly
+plus SNAC decode. The legacy per-token torch.cat assembly is measured for
+comparison. Orpheus speaks at 7 * 12 = 84 audio tokens per second of audio,
+so the decode rate divided by 84 is the realtime margin of the decoder.
+
+    python tools/benchmark_orpheus_decode.py --tokens 2800 --threads 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from typing import Any
+
+import numpy as np
+
+
+TOKENS_PER_AUDIO_SECOND = 84
+
+
+def _legacy_assemble(torch, frame):
+    codes = [torch.tensor([], dtype=torch.int32) for _ in range(3)]
+    for j in range(len(frame) // 7):
+        i = 7 * j
+        for level, positions in enumerate(((0,), (1, 4), (2, 3, 5, 6))):
+            for position in positions:
+                codes[level] = torch.cat([codes[level], torch.tensor([frame[i + position]], dtype=torch.int32)])
+    return [level.unsqueeze(0) for level in codes]
+
+
+def _rate(tokens: int, seconds: list[float]) -> float:
+    return tokens / statistics.median(seconds)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=84 * 20, help="audio tokens per run")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    import torch
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    from RealtimeTTS.engines.orpheus_decoder import SnacFrameRing, SnacWindowDecoder, frame_gather_index, get_snac_model
+
+    started = time.perf_counter()
+    get_snac_model("cpu")
+    load_s = time.perf_counter() - started
+
+    tokens = np.random.default_rng(args.seed).integers(1, 4096, size=args.tokens).tolist()
+    index = frame_gather_index(4)
+    host = np.zeros(len(index), dtype=np.int32)
+
+    timings: dict[str, list[float]] = {"legacy_assembly": [], "assembly": [], "decode": []}
+    for _ in range(args.runs):
+        buffer = []
+        begin = time.perf_counter()
+        for count, token in enumerate(tokens, start=1):
+            buffer.append(token)
+            if count % 7 == 0 and count > 27:
+                _legacy_assemble(torch, buffer[-28:])
+        timings["legacy_assembly"].append(time.perf_counter() - begin)
+
+        ring = SnacFrameRing()
+        begin = time.perf_counter()
+        for token in tokens:
+            if ring.push(token) and ring.full:
+                np.take(ring.window(), index, out=host)
+        timings["assembly"].append(time.perf_counter() - begin)
+
+        decoder = SnacWindowDecoder(device="cpu")
+        begin = time.perf_counter()
+        for token in tokens:
+            decoder.push(token)
+        timings["decode"].append(time.perf_counter() - begin)
+
+    report: dict[str, Any] = {
+        "tokens": args.tokens,
+        "runs": args.runs,
+        "threads": torch.get_num_threads(),
+        "snac_load_s": load_s,
+    }
+    for name, seconds in timings.items():
+        report[f"{name}_tokens_per_s"] = _rate(args.tokens, seconds)
+    report["decode_realtime_margin"] = report["decode_tokens_per_s"] / TOKENS_PER_AUDIO_SECOND
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
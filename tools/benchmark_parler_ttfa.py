@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Measure ParlerEngine time to first audio with and without the description cache.
+
+Loads the model once on the CPU and synthesizes the same sentences with the
+voice description encoded for every sentence (``description_cache_size=0``,
+the previous behaviour) and with the cached encoder output, interleaving the
+two modes. Both modes use the long-lived generation worker. Nothing is
+played; the engine queue records when the first chunk arrived. Lower
+``buffer_duration_s`` and ``play_steps_in_s`` than the defaults keep the
+first chunk close to the first decoded audio.
+
+    python tools/benchmark_parler_ttfa.py --runs 5 --threads 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import queue
+import statistics
+import sys
+import time
+from typing import Any
+
+
+SENTENCES = [
+    "Hello there, how are you today?",
+    "The train leaves at half past nine.",
+    "Please close the door behind you.",
+]
+
+
+class RecordingQueue(queue.Queue):
+    def __init__(self) -> None:
+        super().__init__()
+        self.first_put_ns: int | None = None
+
+    def put(self, item, block=True, timeout=None):
+        if self.first_put_ns is None:
+            self.first_put_ns = time.perf_counter_ns()
+        return super().put(item, block=block, timeout=timeout)
+
+
+def _first_audio_ms(engine, text: str) -> float:
+    recording_queue = RecordingQueue()
+    engine.queue = recording_queue
+    started_ns = time.perf_counter_ns()
+    if not engine.synthesize(text):
+        raise RuntimeError("ParlerEngine synthesis failed")
+    if recording_queue.first_put_ns is None:
+        raise RuntimeError("ParlerEngine produced no audio")
+    return (recording_queue.first_put_ns - started_ns) / 1_000_000
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="parler-tts/parler-tts-mini-v1")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--output", default=None, help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    import torch
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    from RealtimeTTS.engines.parler_engine import ParlerEngine
+
+    engine = ParlerEngine(
+        model_name=args.model,
+        device="cpu",
+        torch_dtype=torch.float32,
+        buffer_duration_s=0.0,
+        play_steps_in_s=0.25,
+    )
+    cache_size = engine.description_cache_size
+    results: dict[str, list[float]] = {"per_sentence_encoding": [], "cached_description": []}
+    try:
+        _first_audio_ms(engine, SENTENCES[0])  # warmup
+        for _ in range(args.runs):
+            for text in SENTENCES:
+                engine.description_cache_size = 0
+                engine._description_cache.clear()
+                results["per_sentence_encoding"].append(_first_audio_ms(engine, text))
+
+                engine.description_cache_size = cache_size
+                engine._description_kwargs(engine.voice_prompt)  # encode outside the measurement
+                results["cached_description"].append(_first_audio_ms(engine, text))
+    finally:
+        engine.shutdown()
+
+    report: dict[str, Any] = {"model": args.model, "runs": args.runs, "threads": torch.get_num_threads()}
+    for mode, values in results.items():
+        report[mode] = {"first_audio_ms": {"median": statistics.median(values), "mean": statistics.fmean(values)}}
+    report["ttfa_saved_ms"] = (
+        report["per_sentence_encoding"]["first_audio_ms"]["median"]
+        - report["cached_description"]["first_audio_ms"]["median"]
+    )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())